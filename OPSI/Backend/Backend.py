@@ -43,6 +43,7 @@ import re
 import threading
 import time
 import warnings
+import weakref
 from hashlib import md5
 from twisted.conch.ssh import keys
 
@@ -61,7 +62,7 @@ from OPSI.Types import BackendError, BackendBadValueError
 from OPSI.Types import *  # this is needed for dynamic loading
 from OPSI.Object import *  # this is needed for dynamic loading
 from OPSI.Util import (blowfishEncrypt, blowfishDecrypt, compareVersions,
-	getfqdn, removeUnit, timestamp)
+	compileVersionCondition, getfqdn, removeUnit, timestamp)
 from OPSI.Util.File import ConfigFile
 import OPSI.SharedAlgorithm
 
@@ -73,6 +74,28 @@ OPSI_MODULES_FILE = u'/etc/opsi/modules'
 OPSI_PASSWD_FILE = u'/etc/opsi/passwd'
 OPSI_GLOBAL_CONF = u'/etc/opsi/global.conf'
 LOG_DIR = u'/var/log/opsi'
+_VERSION_FILTER_REGEX = re.compile('^\s*([>=<]+)\s*([\d\.]+)')
+
+# Results of inspecting methods, keyed by the underlying function.
+_ARG_AND_CALL_STRINGS = weakref.WeakKeyDictionary()
+_INTERFACE_METHOD_INFOS = weakref.WeakKeyDictionary()
+# Interfaces keyed by the public methods they are created from.
+_INTERFACE_CACHE = {}
+_INTERFACE_CACHE_SIZE = 64
+# Generated functions keyed by their source code.
+_GENERATED_FUNCTIONS = {}
+# Products and their dependencies in the versions installed on a depot,
+# keyed by the depot and the installed versions. Orders of products are
+# keyed by the ordering algorithm and everything it reads from the
+# products and their dependencies. Both are cleared if products, product
+# dependencies or products on depots are written.
+_DEPOT_PRODUCT_CACHE = {}
+_PRODUCT_SEQUENCE_CACHE = {}
+_PRODUCT_CACHE_SIZE = 256
+# Seconds after which cached depot products are read again. This limits
+# the time changes made by other processes are not noticed.
+_DEPOT_PRODUCT_CACHE_LIFETIME = 60
+_PRODUCT_CACHE_LOCK = threading.Lock()
 
 try:
 	with open(os.path.join('/etc', 'opsi', 'opsiconfd.conf')) as config:
@@ -90,6 +113,19 @@ except Exception as error:
 	DEFAULT_MAX_LOGFILE_SIZE = 5000000
 
 
+def clearProductDependencyCache():
+	"""
+	Clear the cached products, product dependencies and product orders.
+
+	The cache is used to process productOnClients. It is cleared \
+whenever products, product dependencies or products on depots are \
+written through a backend of this process.
+	"""
+	with _PRODUCT_CACHE_LOCK:
+		_DEPOT_PRODUCT_CACHE.clear()
+		_PRODUCT_SEQUENCE_CACHE.clear()
+
+
 def getArgAndCallString(method):
 	"""
 	Inspects `method` to gain information about the method signature.
@@ -97,6 +133,12 @@ def getArgAndCallString(method):
 	:type method: func
 	:returntype: (str, str)
 	"""
+	function = getattr(method, 'im_func', method)
+	try:
+		return _ARG_AND_CALL_STRINGS[function]
+	except KeyError:
+		pass
+
 	argString = []
 	callString = []
 	(args, varargs, varkwargs, argDefaults) = inspect.getargspec(method)
@@ -123,7 +165,233 @@ def getArgAndCallString(method):
 			argString.append(toAdd)
 			callString.append(toAdd)
 
-	return (u', '.join(argString), u', '.join(callString))
+	result = (u', '.join(argString), u', '.join(callString))
+	_ARG_AND_CALL_STRINGS[function] = result
+	return result
+
+
+def getPublicMethods(instance):
+	"""
+	Get the public methods of `instance`.
+
+	Works like `inspect.getmembers` but does not access attributes \
+starting with an underscore.
+
+	:returntype: [(str, instancemethod), ...]
+	"""
+	methods = []
+	for name in dir(instance):
+		if name.startswith('_'):
+			continue
+
+		try:
+			value = getattr(instance, name)
+		except AttributeError:
+			continue
+
+		if inspect.ismethod(value):
+			methods.append((name, value))
+
+	return methods
+
+
+def createInstanceMethod(instance, methodName, source):
+	"""
+	Binds the function `methodName` defined in `source` to `instance`.
+
+	Each source is only compiled once. The resulting function is \
+shared between all instances using the same source.
+	"""
+	try:
+		function = _GENERATED_FUNCTIONS[source]
+	except KeyError:
+		namespace = {}
+		exec source in namespace
+		function = _GENERATED_FUNCTIONS[source] = namespace[methodName]
+
+	setattr(instance, methodName, new.instancemethod(function, instance, instance.__class__))
+
+
+def _getInterfaceMethodInfo(method):
+	function = getattr(method, 'im_func', method)
+	try:
+		return _INTERFACE_METHOD_INFOS[function]
+	except KeyError:
+		pass
+
+	args, varargs, keywords, defaults = inspect.getargspec(method)
+	if args:
+		params = [arg for arg in forceList(args) if arg != 'self']
+	else:
+		params = []
+
+	if defaults is not None and len(defaults) > 0:
+		offset = len(params) - len(defaults)
+		for i in xrange(len(defaults)):
+			index = offset + i
+			params[index] = '*{0}'.format(params[index])
+
+	for (index, element) in enumerate((varargs, keywords), start=1):
+		if element:
+			stars = '*' * index
+			params.extend(['{0}{1}'.format(stars, arg) for arg in forceList(element)])
+
+	info = {
+		'params': params,
+		'args': args,
+		'varargs': varargs,
+		'keywords': keywords,
+		'defaults': defaults
+	}
+	_INTERFACE_METHOD_INFOS[function] = info
+	return info
+
+
+def _unfulfillableVersionCondition(version):
+	return False
+
+
+class _AttributeFilter(object):
+	"""
+	The filter for a single attribute of an object hash.
+
+	Everything that only depends on the filter value is prepared at
+	construction so that :py:meth:`matches` only has to look at the
+	value of the object.
+	"""
+
+	def __init__(self, attribute, filterValue):
+		self.attribute = attribute
+		self.filterValue = filterValue
+		self.values = forceUnicodeList(filterValue)
+		self.valueSet = set(self.values)
+
+		self.typeNames = None
+		self.typeError = None
+		if attribute == 'type':
+			self.typeNames = set()
+			for value in self.values:
+				try:
+					self.typeNames.update(eval(value).subClasses)
+				except Exception as error:
+					self.typeError = error
+
+		# (filterValue, version condition, wildcard regex)
+		self.checks = []
+		for value in self.values:
+			match = _VERSION_FILTER_REGEX.search(value)
+			if match:
+				try:
+					versionCheck = compileVersionCondition(match.group(1), match.group(2))
+				except Exception:
+					versionCheck = _unfulfillableVersionCondition
+			else:
+				versionCheck = None
+
+			wildcard = None
+			if '*' in value:
+				try:
+					wildcard = re.compile(u'^%s$' % value.replace('*', '.*'))
+				except re.error as error:
+					wildcard = error
+
+			self.checks.append((value, versionCheck, wildcard))
+
+	def matches(self, value):
+		if isinstance(value, (set, list, tuple)):
+			if forceUnicodeList(value) == self.values:
+				return True
+		if forceUnicode(value) in self.valueSet:
+			return True
+
+		if self.typeNames is not None:
+			if value in self.typeNames:
+				return True
+			elif self.typeError is not None:
+				raise self.typeError
+			return False
+
+		if isinstance(value, list):
+			for filterValue in self.values:
+				if filterValue in value:
+					return True
+			return False
+		elif value is None or isinstance(value, bool):
+			return False
+
+		isNumber = isinstance(value, (float, long, int))
+		for filterValue, versionCheck, wildcard in self.checks:
+			if versionCheck is not None:
+				try:
+					if versionCheck(value):
+						return True
+				except Exception:
+					pass
+
+				continue
+			elif isNumber:
+				try:
+					if compareVersions(value, '==', filterValue):
+						return True
+				except Exception:
+					pass
+
+				continue
+
+			if wildcard is not None:
+				if isinstance(wildcard, re.error):
+					raise wildcard
+
+				if wildcard.search(value):
+					return True
+
+		return False
+
+
+def compileFilter(**filter):
+	"""
+	Compiles `filter` into a predicate for opsi object hashes.
+
+	Forcing the filter values, resolving the subclasses of a `type`
+	filter, compiling wildcards and parsing version operators happens
+	once here instead of once per tested object.
+	The returned function accepts an object hash and returns `True`
+	if it matches the filter in the same way as
+	:py:meth:`Backend._objectHashMatches` does.
+
+	:returntype: func
+	"""
+	attributeFilters = [
+		_AttributeFilter(attribute, filterValue)
+		for attribute, filterValue in filter.iteritems()
+		if filterValue
+	]
+
+	if not attributeFilters:
+		return lambda objHash: True
+
+	def objectHashMatches(objHash):
+		for attributeFilter in attributeFilters:
+			try:
+				value = objHash[attributeFilter.attribute]
+			except KeyError:
+				continue
+
+			try:
+				if not attributeFilter.matches(value):
+					return False
+			except Exception as err:
+				raise Exception(
+					u"Testing match of filter {0!r} of attribute {1!r} with "
+					u"value {2!r} failed: {error}".format(
+						attributeFilter.filterValue, attributeFilter.attribute,
+						value, error=err
+					)
+				)
+
+		return True
+
+	return objectHashMatches
 
 
 class DeferredCall(object):
@@ -185,7 +453,7 @@ This defaults to ``self``.
 				self._password = value
 			elif option == 'context':
 				self._context = value
-				logger.info(u"Backend context was set to %s" % self._context)
+				logger.info(u"Backend context was set to {0}", self._context)
 			elif option == 'opsimodulesfile':
 				self._opsiModulesFile = forceFilename(value)
 			elif option == 'opsiversionfile':
@@ -211,79 +479,12 @@ This defaults to ``self``.
 		"""
 		Checks if the opsi object hash matches the filter.
 
+		When testing many objects against the same filter use
+		:py:func:`compileFilter` to create the predicate once.
+
 		:returntype: bool
 		"""
-		for attribute, value in objHash.iteritems():
-			if not filter.get(attribute):
-				continue
-			matched = False
-
-			try:
-				logger.debug(
-					u"Testing match of filter {0!r} of attribute {1!r} with "
-					u"value {2!r}", filter[attribute], attribute, value
-				)
-				filterValues = forceUnicodeList(filter[attribute])
-				if forceUnicodeList(value) == filterValues or forceUnicode(value) in filterValues:
-					matched = True
-				else:
-					for filterValue in filterValues:
-						if attribute == 'type':
-							match = False
-							Class = eval(filterValue)
-							for subClass in Class.subClasses:
-								if subClass == value:
-									matched = True
-									break
-
-							continue
-
-						if isinstance(value, list):
-							if filterValue in value:
-								matched = True
-								break
-
-							continue
-						elif value is None or isinstance(value, bool):
-							continue
-						elif isinstance(value, (float, long, int)) or re.search('^\s*([>=<]+)\s*([\d\.]+)', forceUnicode(filterValue)):
-							operator = '=='
-							v = forceUnicode(filterValue)
-							match = re.search('^\s*([>=<]+)\s*([\d\.]+)', filterValue)
-							if match:
-								operator = match.group(1)  # pylint: disable=maybe-no-member
-								v = match.group(2)  # pylint: disable=maybe-no-member
-
-							try:
-								matched = compareVersions(value, operator, v)
-								if matched:
-									break
-							except Exception:
-								pass
-
-							continue
-
-						if '*' in filterValue and re.search('^%s$' % filterValue.replace('*', '.*'), value):
-							matched = True
-							break
-
-				if matched:
-					logger.debug(
-						u"Value {0!r} matched filter {1!r}, attribute {2!r}",
-						value, filter[attribute], attribute
-					)
-				else:
-					# No match, we can stop further checks.
-					return False
-			except Exception as err:
-				raise Exception(
-					u"Testing match of filter {0!r} of attribute {1!r} with "
-					u"value {2!r} failed: {error}".format(
-						filter[attribute], attribute, value, error=err
-					)
-				)
-
-		return True
+		return compileFilter(**filter)(objHash)
 
 	def backend_setOptions(self, options):
 		"""
@@ -312,40 +513,38 @@ This defaults to ``self``.
 		return self._options
 
 	def backend_getInterface(self):
-		methods = {}
-		for methodName, function in inspect.getmembers(self, inspect.ismethod):
-			if methodName.startswith('_'):
-				# protected / private
-				continue
+		"""
+		Get the public methods of the backend with their parameters.
 
-			args, varargs, keywords, defaults = inspect.getargspec(function)
-			if args:
-				params = [arg for arg in forceList(args) if arg != 'self']
-			else:
-				params = []
-
-			if defaults is not None and len(defaults) > 0:
-				offset = len(params) - len(defaults)
-				for i in xrange(len(defaults)):
-					index = offset + i
-					params[index] = '*{0}'.format(params[index])
-
-			for (index, element) in enumerate((varargs, keywords), start=1):
-				if element:
-					stars = '*' * index
-					params.extend(['{0}{1}'.format(stars, arg) for arg in forceList(element)])
-
-			logger.debug2(u"{0} interface method: name {1!r}, params {2}", self.__class__.__name__, methodName, params)
-			methods[methodName] = {
-				'name': methodName,
-				'params': params,
-				'args': args,
-				'varargs': varargs,
-				'keywords': keywords,
-				'defaults': defaults
-			}
+		Interfaces are cached by the functions behind the public methods.
+		Backends of the same class with the same extensions therefore \
+share the returned list which must not be modified.
 
-		return [methods[name] for name in sorted(methods.keys())]
+		:returntype: [dict, ...]
+		"""
+		publicMethods = getPublicMethods(self)
+		cacheKey = tuple(
+			(methodName, getattr(method, 'im_func', method))
+			for methodName, method in publicMethods
+		)
+
+		try:
+			return _INTERFACE_CACHE[cacheKey]
+		except KeyError:
+			pass
+
+		interface = []
+		for methodName, method in publicMethods:
+			methodInterface = {'name': methodName}
+			methodInterface.update(_getInterfaceMethodInfo(method))
+			logger.debug2(u"{0} interface method: name {1!r}, params {2}", self.__class__.__name__, methodName, methodInterface['params'])
+			interface.append(methodInterface)
+
+		if len(_INTERFACE_CACHE) >= _INTERFACE_CACHE_SIZE:
+			_INTERFACE_CACHE.clear()
+		_INTERFACE_CACHE[cacheKey] = interface
+
+		return interface
 
 	def backend_info(self):
 		"""
@@ -450,30 +649,28 @@ class ExtendedBackend(Backend):
 		Backend.__init__(self)
 		self._backend = backend
 		if self._context is self:
-			logger.info(u"Setting context to backend %s" % self._context)
+			logger.info(u"Setting context to backend {0}", self._context)
 			self._context = self._backend
 		self._overwrite = forceBool(overwrite)
 		self._createInstanceMethods()
 
 	def _createInstanceMethods(self):
-		logger.debug(u"%s is creating instance methods" % self.__class__.__name__)
-		for methodName, functionRef in inspect.getmembers(self._backend, inspect.ismethod):
-			if methodName.startswith('_'):
-				# Not a public method
-				continue
-
+		logger.debug(u"{0} is creating instance methods", self.__class__.__name__)
+		for methodName, functionRef in getPublicMethods(self._backend):
 			logger.debug2(u"Found public {0} method {1!r}", self._backend.__class__.__name__, methodName)
 			if hasattr(self, methodName):
 				if self._overwrite:
-					logger.debug(u"%s: overwriting method %s of backend instance %s" % (self.__class__.__name__, methodName, self._backend))
+					logger.debug(u"{0}: overwriting method {1} of backend instance {2}", self.__class__.__name__, methodName, self._backend)
 					continue
 				else:
-					logger.debug(u"%s: not overwriting method %s of backend instance %s" % (self.__class__.__name__, methodName, self._backend))
+					logger.debug(u"{0}: not overwriting method {1} of backend instance {2}", self.__class__.__name__, methodName, self._backend)
 
 			argString, callString = getArgAndCallString(functionRef)
 
-			exec(u'def %s(self, %s): return self._executeMethod("%s", %s)' % (methodName, argString, methodName, callString))
-			setattr(self, methodName, new.instancemethod(eval(methodName), self, self.__class__))
+			createInstanceMethod(
+				self, methodName,
+				u'def %s(self, %s): return self._executeMethod("%s", %s)' % (methodName, argString, methodName, callString)
+			)
 
 	def _executeMethod(self, methodName, **kwargs):
 		logger.debug(u"ExtendedBackend {0!r}: executing {1!r} on backend {2!r}", self, methodName, self._backend)
@@ -508,7 +705,7 @@ class ExtendedBackend(Backend):
 
 	def backend_exit(self):
 		if self._backend:
-			logger.debug(u"Calling backend_exit() on backend %s" % self._backend)
+			logger.debug(u"Calling backend_exit() on backend {0}", self._backend)
 			self._backend.backend_exit()
 
 
@@ -949,9 +1146,11 @@ depot where the method is.
 	def product_insertObject(self, product):
 		product = forceObjectClass(product, Product)
 		product.setDefaults()  # pylint: disable=maybe-no-member
+		clearProductDependencyCache()
 
 	def product_updateObject(self, product):
 		product = forceObjectClass(product, Product)
+		clearProductDependencyCache()
 
 	def product_getHashes(self, attributes=[], **filter):
 		return [obj.toHash() for obj in self.product_getObjects(attributes, **filter)]
@@ -961,6 +1160,7 @@ depot where the method is.
 		return []
 
 	def product_deleteObjects(self, products):
+		clearProductDependencyCache()
 		productByIdAndVersion = collections.defaultdict(lambda: collections.defaultdict(list))
 		for product in forceObjectClassList(products, Product):
 			productByIdAndVersion[product.id][product.productVersion].append(product.packageVersion)
@@ -1052,6 +1252,7 @@ depot where the method is.
 	def productDependency_insertObject(self, productDependency):
 		productDependency = forceObjectClass(productDependency, ProductDependency)
 		productDependency.setDefaults()  # pylint: disable=maybe-no-member
+		clearProductDependencyCache()
 		if not productDependency.getRequiredAction() and not productDependency.getRequiredInstallationStatus():  # pylint: disable=maybe-no-member
 			raise BackendBadValueError(u"Either a required action or a required installation status must be given")
 		if self._options['additionalReferentialIntegrityChecks']:
@@ -1072,6 +1273,7 @@ depot where the method is.
 
 	def productDependency_updateObject(self, productDependency):
 		productDependency = forceObjectClass(productDependency, ProductDependency)
+		clearProductDependencyCache()
 
 	def productDependency_getHashes(self, attributes=[], **filter):
 		return [obj.toHash() for obj in self.productDependency_getObjects(attributes, **filter)]
@@ -1081,7 +1283,7 @@ depot where the method is.
 		return []
 
 	def productDependency_deleteObjects(self, productDependencies):
-		pass
+		clearProductDependencyCache()
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductOnDepots                                                                           -
@@ -1089,6 +1291,7 @@ depot where the method is.
 	def productOnDepot_insertObject(self, productOnDepot):
 		productOnDepot = forceObjectClass(productOnDepot, ProductOnDepot)
 		productOnDepot.setDefaults()  # pylint: disable=maybe-no-member
+		clearProductDependencyCache()
 
 		if self._options['additionalReferentialIntegrityChecks']:
 			if not self._context.product_getObjects(  # pylint: disable=maybe-no-member
@@ -1108,6 +1311,7 @@ depot where the method is.
 
 	def productOnDepot_updateObject(self, productOnDepot):
 		productOnDepot = forceObjectClass(productOnDepot, ProductOnDepot)
+		clearProductDependencyCache()
 
 		if self._options['additionalReferentialIntegrityChecks']:
 			if not self._context.product_getObjects(  # pylint: disable=maybe-no-member
@@ -1133,7 +1337,7 @@ depot where the method is.
 		return []
 
 	def productOnDepot_deleteObjects(self, productOnDepots):
-		pass
+		clearProductDependencyCache()
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductOnClients                                                                          -
@@ -1153,6 +1357,28 @@ depot where the method is.
 	def productOnClient_updateObject(self, productOnClient):
 		productOnClient = forceObjectClass(productOnClient, ProductOnClient)
 
+	def productOnClient_bulkInsertObjects(self, productOnClients):
+		"""
+		Inserts multiple productOnClients.
+
+		This is the same as calling `productOnClient_insertObject` for
+		every object, which is what this implementation does.
+		Backends should override this to write the objects in as few
+		operations as possible.
+		"""
+		for productOnClient in forceObjectClassList(productOnClients, ProductOnClient):
+			self.productOnClient_insertObject(productOnClient)
+
+	def productOnClient_bulkUpdateObjects(self, productOnClients):
+		"""
+		Updates multiple productOnClients.
+
+		This is the same as calling `productOnClient_updateObject` for
+		every object, which is what this implementation does.
+		"""
+		for productOnClient in forceObjectClassList(productOnClients, ProductOnClient):
+			self.productOnClient_updateObject(productOnClient)
+
 	def productOnClient_getHashes(self, attributes=[], **filter):
 		return [obj.toHash() for obj in self.productOnClient_getObjects(attributes, **filter)]
 
@@ -1433,6 +1659,28 @@ depot where the method is.
 	def auditSoftwareOnClient_updateObject(self, auditSoftwareOnClient):
 		auditSoftwareOnClient = forceObjectClass(auditSoftwareOnClient, AuditSoftwareOnClient)
 
+	def auditSoftwareOnClient_bulkInsertObjects(self, auditSoftwareOnClients):
+		"""
+		Inserts multiple auditSoftwareOnClients.
+
+		This is the same as calling `auditSoftwareOnClient_insertObject`
+		for every object, which is what this implementation does.
+		Backends should override this to write the objects in as few
+		operations as possible.
+		"""
+		for auditSoftwareOnClient in forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient):
+			self.auditSoftwareOnClient_insertObject(auditSoftwareOnClient)
+
+	def auditSoftwareOnClient_bulkUpdateObjects(self, auditSoftwareOnClients):
+		"""
+		Updates multiple auditSoftwareOnClients.
+
+		This is the same as calling `auditSoftwareOnClient_updateObject`
+		for every object, which is what this implementation does.
+		"""
+		for auditSoftwareOnClient in forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient):
+			self.auditSoftwareOnClient_updateObject(auditSoftwareOnClient)
+
 	def auditSoftwareOnClient_getHashes(self, attributes=[], **filter):
 		return [obj.toHash() for obj in self.auditSoftwareOnClient_getObjects(attributes, **filter)]
 
@@ -1544,7 +1792,7 @@ depot where the method is.
 			for c in OPSI_HARDWARE_CLASSES:
 				try:
 					if c['Class'].get('Type') == 'STRUCTURAL':
-						logger.debug(u"Found STRUCTURAL hardware class '%s'" % c['Class'].get('Opsi'))
+						logger.debug(u"Found STRUCTURAL hardware class '{0}'", c['Class'].get('Opsi'))
 						ccopy = pycopy.deepcopy(c)
 						if ccopy['Class'].has_key('Super'):
 							__inheritFromSuperClasses(OPSI_HARDWARE_CLASSES, ccopy)
@@ -1646,7 +1894,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		return u"<{0}(configDataBackend={1!r})>".format(self.__class__.__name__, self._backend)
 
 	def backend_searchIdents(self, filter):
-		logger.info(u"=== Starting search, filter: %s" % filter)
+		logger.info(u"=== Starting search, filter: {0}", filter)
 		try:
 			parsedFilter = ldapfilter.parseFilter(filter)
 		except Exception as e:
@@ -1680,7 +1928,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 					logger.debug(u"Trying foreignIdAttributes of result1: {0}", result1['foreignIdAttributes'])
 					for attr in result1['foreignIdAttributes']:
 						for i, identAttr in enumerate(result2['identAttributes']):
-							logger.debug2("%s == %s" % (attr, identAttr))
+							logger.debug2("{0} == {1}", attr, identAttr)
 							if attr == identAttr:
 								result2IdentIndex = i
 								for a, identAttr2 in enumerate(result1['identAttributes']):
@@ -1695,7 +1943,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 					logger.debug(u"Trying foreignIdAttributes of result2: {0}", result2['foreignIdAttributes'])
 					for attr in result2['foreignIdAttributes']:
 						for i, identAttr in enumerate(result1['identAttributes']):
-							logger.debug2("%s == %s" % (attr, identAttr))
+							logger.debug2("{0} == {1}", attr, identAttr)
 							if attr == identAttr:
 								result1IdentIndex = i
 								for a, identAttr2 in enumerate(result2['identAttributes']):
@@ -1761,22 +2009,22 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 			logger.debug(u"Level {0}, processing: {1!r}", level, f)
 
 			if isinstance(f, pureldap.LDAPFilter_equalityMatch):
-				logger.debug(u"Handle equality attribute '%s', value '%s'" % (f.attributeDesc.value, f.assertionValue.value))
+				logger.debug(u"Handle equality attribute '{0}', value '{1}'", f.attributeDesc.value, f.assertionValue.value)
 				if f.attributeDesc.value.lower() == 'objectclass':
 					objectClass = f.assertionValue.value
 				else:
 					objectFilter = {f.attributeDesc.value: f.assertionValue.value}
 
 			elif isinstance(f, pureldap.LDAPFilter_greaterOrEqual):
-				logger.debug(u"Handle greaterOrEqual attribute '%s', value '%s'" % (f.attributeDesc.value, f.assertionValue.value))
+				logger.debug(u"Handle greaterOrEqual attribute '{0}', value '{1}'", f.attributeDesc.value, f.assertionValue.value)
 				objectFilter = {f.attributeDesc.value: u'>=%s' % f.assertionValue.value}
 
 			elif isinstance(f, pureldap.LDAPFilter_lessOrEqual):
-				logger.debug(u"Handle lessOrEqual attribute '%s', value '%s'" % (f.attributeDesc.value, f.assertionValue.value))
+				logger.debug(u"Handle lessOrEqual attribute '{0}', value '{1}'", f.attributeDesc.value, f.assertionValue.value)
 				objectFilter = {f.attributeDesc.value: u'<=%s' % f.assertionValue.value}
 
 			elif isinstance(f, pureldap.LDAPFilter_substrings):
-				logger.debug(u"Handle substrings type %s: %s" % (f.type, repr(f.substrings)))
+				logger.debug(u"Handle substrings type {0}: {1}", f.type, repr(f.substrings))
 				if f.type.lower() == 'objectclass':
 					raise BackendBadValueError(u"Substring search not allowed for objectClass")
 				if isinstance(f.substrings[0], pureldap.LDAPFilter_substrings_initial):
@@ -1802,7 +2050,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 				for fChild in f.data:
 					(res, oc, of) = handleFilter(fChild, level+1)
-					logger.debug(u"Got return values: %s, %s, %s" % (res, oc, of))
+					logger.debug(u"Got return values: {0}, {1}, {2}", res, oc, of)
 					if oc:
 						objectClass = oc
 					if of:
@@ -1834,7 +2082,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 							objectFilterNew[str(key)] = value
 						objectFilter = objectFilterNew
 
-						logger.debug(u"Executing: this.%s_getIdents(returnType = 'list', %s)" % (getBackendMethodPrefix(oc), objectFilter))
+						logger.debug(u"Executing: this.{0}_getIdents(returnType = 'list', {1})", getBackendMethodPrefix(oc), objectFilter)
 						addProductOnClientDefaults = self._options.get('addProductOnClientDefaults', False)
 						addConfigStateDefaults = self._options.get('addConfigStateDefaults', False)
 						addProductPropertyStateDefaults = self._options.get('addProductPropertyStateDefaults', False)
@@ -1876,7 +2124,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 			return (result, objectClass, objectFilter)
 
 		result = [v[0] for v in handleFilter(parsedFilter)[0].get('identValues', [])]
-		logger.info(u"=== Search done, result: %s" % result)
+		logger.info(u"=== Search done, result: {0}", result)
 		return sorted(result)
 
 	def host_getIdents(self, returnType='unicode', **filter):
@@ -2023,7 +2271,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def host_createObjects(self, hosts):
 		forcedHosts = forceObjectClassList(hosts, Host)
 		for host in forcedHosts:
-			logger.info(u"Creating host '%s'" % host)
+			logger.info(u"Creating host '{0}'", host)
 			self._backend.host_insertObject(host)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -2033,11 +2281,11 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 	def host_updateObjects(self, hosts):
 		def updateOrInsert(host):
-			logger.info(u"Updating host '%s'" % host)
+			logger.info(u"Updating host '{0}'", host)
 			if self.host_getIdents(id=host.id):
 				self._backend.host_updateObject(host)
 			else:
-				logger.info(u"Host %s does not exist, creating" % host)
+				logger.info(u"Host {0} does not exist, creating", host)
 				self._backend.host_insertObject(host)
 
 		hostList = forceObjectClassList(hosts, Host)
@@ -2100,7 +2348,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 			softwareLicense.setBoundToHost(newId)
 			softwareLicenses.append(softwareLicense)
 
-		logger.info(u"Deleting client '%s'" % client)
+		logger.info(u"Deleting client '{0}'", client)
 		self._backend.host_deleteObjects([client])
 
 		client.setId(newId)
@@ -2189,7 +2437,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 				configState.values.append(newId)
 			configStates.append(configState)
 
-		logger.info(u"Deleting depot '%s'" % depot)
+		logger.info(u"Deleting depot '{0}'", depot)
 		self._backend.host_deleteObjects([depot])
 
 		depot.setId(newId)
@@ -2275,7 +2523,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def config_createObjects(self, configs):
 		forcedConfigs = forceObjectClassList(configs, Config)
 		for config in forcedConfigs:
-			logger.info(u"Creating config '%s'" % config)
+			logger.info(u"Creating config '{0}'", config)
 			self._backend.config_insertObject(config)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -2286,11 +2534,11 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def config_updateObjects(self, configs):
 		forcedConfigs = forceObjectClassList(configs, Config)
 		for config in forcedConfigs:
-			logger.info(u"Updating config %s" % config)
+			logger.info(u"Updating config {0}", config)
 			if self.config_getIdents(id=config.id):
 				self._backend.config_updateObject(config)
 			else:
-				logger.info(u"Config %s does not exist, creating" % config)
+				logger.info(u"Config {0} does not exist, creating", config)
 				self._backend.config_insertObject(config)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -2402,7 +2650,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for configState in forceObjectClassList(configStates, ConfigState):
-			logger.info(u"Creating configState '%s'" % configState)
+			logger.info(u"Creating configState '{0}'", configState)
 			self.configState_insertObject(configState)
 			if returnObjects:
 				result.extend(
@@ -2419,13 +2667,13 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for configState in forceObjectClassList(configStates, ConfigState):
-			logger.info(u"Updating configState %s" % configState)
+			logger.info(u"Updating configState {0}", configState)
 			if self.configState_getIdents(
 					configId=configState.configId,
 					objectId=configState.objectId):
 				self.configState_updateObject(configState)
 			else:
-				logger.info(u"ConfigState %s does not exist, creating" % configState)
+				logger.info(u"ConfigState {0} does not exist, creating", configState)
 				self.configState_insertObject(configState)
 
 			if returnObjects:
@@ -2534,7 +2782,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for product in forceObjectClassList(products, Product):
-			logger.info(u"Creating product %s" % product)
+			logger.info(u"Creating product {0}", product)
 			self._backend.product_insertObject(product)
 			if returnObjects:
 				result.extend(
@@ -2552,14 +2800,14 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for product in forceObjectClassList(products, Product):
-			logger.info(u"Updating product %s" % product)
+			logger.info(u"Updating product {0}", product)
 			if self.product_getIdents(
 					id=product.id,
 					productVersion=product.productVersion,
 					packageVersion=product.packageVersion):
 				self._backend.product_updateObject(product)
 			else:
-				logger.info(u"Product %s does not exist, creating" % product)
+				logger.info(u"Product {0} does not exist, creating", product)
 				self._backend.product_insertObject(product)
 
 			if returnObjects:
@@ -2677,11 +2925,11 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 			if changed:
 				if not newValues:
-					logger.debug(u"Properties changed: marking productPropertyState %s for deletion" % productPropertyState)
+					logger.debug(u"Properties changed: marking productPropertyState {0} for deletion", productPropertyState)
 					deleteProductPropertyStates.append(productPropertyState)
 				else:
 					productPropertyState.setValues(newValues)
-					logger.debug(u"Properties changed: marking productPropertyState %s for update" % productPropertyState)
+					logger.debug(u"Properties changed: marking productPropertyState {0} for update", productPropertyState)
 					updateProductPropertyStates.append(productPropertyState)
 
 		if deleteProductPropertyStates:
@@ -2694,7 +2942,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for productProperty in forceObjectClassList(productProperties, ProductProperty):
-			logger.info(u"Creating productProperty %s" % productProperty)
+			logger.info(u"Creating productProperty {0}", productProperty)
 			self._backend.productProperty_insertObject(productProperty)
 
 			if returnObjects:
@@ -2714,7 +2962,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for productProperty in forceObjectClassList(productProperties, ProductProperty):
-			logger.info(u"Creating productProperty %s" % productProperty)
+			logger.info(u"Creating productProperty {0}", productProperty)
 			if self.productProperty_getIdents(
 					productId=productProperty.productId,
 					productVersion=productProperty.productVersion,
@@ -2722,7 +2970,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 					propertyId=productProperty.propertyId):
 				self._backend.productProperty_updateObject(productProperty)
 			else:
-				logger.info(u"ProductProperty %s does not exist, creating" % productProperty)
+				logger.info(u"ProductProperty {0} does not exist, creating", productProperty)
 				self._backend.productProperty_insertObject(productProperty)
 
 			if returnObjects:
@@ -2779,7 +3027,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for productDependency in forceObjectClassList(productDependencies, ProductDependency):
-			logger.info(u"Creating productDependency %s" % productDependency)
+			logger.info(u"Creating productDependency {0}", productDependency)
 			self._backend.productDependency_insertObject(productDependency)
 
 			if returnObjects:
@@ -2800,7 +3048,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for productDependency in forceObjectClassList(productDependencies, ProductDependency):
-			logger.info(u"Updating productDependency %s" % productDependency)
+			logger.info(u"Updating productDependency {0}", productDependency)
 			if self.productDependency_getIdents(
 					productId=productDependency.productId,
 					productVersion=productDependency.productVersion,
@@ -2810,7 +3058,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 				self._backend.productDependency_updateObject(productDependency)
 			else:
-				logger.info(u"ProductDependency %s does not exist, creating" % productDependency)
+				logger.info(u"ProductDependency {0} does not exist, creating", productDependency)
 				self._backend.productDependency_insertObject(productDependency)
 
 			if returnObjects:
@@ -2868,7 +3116,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		if currentProductOnDepots:
 			currentProductOnDepot = currentProductOnDepots[0]
-			logger.info(u"Updating productOnDepot %s instead of creating a new one" % currentProductOnDepot)
+			logger.info(u"Updating productOnDepot {0} instead of creating a new one", currentProductOnDepot)
 			currentProductOnDepot.update(productOnDepot)
 			self._backend.productOnDepot_insertObject(currentProductOnDepot)
 		else:
@@ -2879,7 +3127,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for productOnDepot in forceObjectClassList(productOnDepots, ProductOnDepot):
-			logger.info(u"Creating productOnDepot %s" % productOnDepot.toHash())
+			logger.info(u"Creating productOnDepot {0}", productOnDepot.toHash())
 			self.productOnDepot_insertObject(productOnDepot)
 
 			if returnObjects:
@@ -2898,7 +3146,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		result = []
 		productOnDepots = forceObjectClassList(productOnDepots, ProductOnDepot)
 		for productOnDepot in productOnDepots:
-			logger.info(u"Updating productOnDepot '%s'" % productOnDepot)
+			logger.info(u"Updating productOnDepot '{0}'", productOnDepot)
 			if self.productOnDepot_getIdents(
 					productId=productOnDepot.productId,
 					productType=productOnDepot.productType,
@@ -2907,7 +3155,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 					depotId=productOnDepot.depotId):
 				self._backend.productOnDepot_updateObject(productOnDepot)
 			else:
-				logger.info(u"ProductOnDepot %s does not exist, creating" % productOnDepot)
+				logger.info(u"ProductOnDepot {0} does not exist, creating", productOnDepot)
 				self.productOnDepot_insertObject(productOnDepot)
 
 			if returnObjects:
@@ -2997,54 +3245,9 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 			except KeyError:
 				depotToClients[clientToDepot['depotId']] = [clientToDepot['clientId']]
 
-		productByProductIdAndVersion = collections.defaultdict(lambda: collections.defaultdict(dict))
-		for product in self._backend.product_getObjects(id=productIds):
-			productByProductIdAndVersion[product.id][product.productVersion][product.packageVersion] = product
-
-		additionalProductIds = []
-		productDependenciesByProductIdAndVersion = collections.defaultdict(lambda: collections.defaultdict(lambda: collections.defaultdict(list)))
-
-		def addDependencies(additionalProductIds, productDependency, productDependenciesByProductIdAndVersion):
-			productDependenciesByProductIdAndVersion[productDependency.productId][productDependency.productVersion][productDependency.packageVersion].append(productDependency)
-
-			if productDependency.requiredProductId not in productIds and productDependency.requiredProductId not in additionalProductIds:
-				additionalProductIds.append(productDependency.requiredProductId)
-				for productDependency in self._backend.productDependency_getObjects(productId=productDependency.requiredProductId):
-					addDependencies(additionalProductIds, productDependency, productDependenciesByProductIdAndVersion)
-
-		for productDependency in self._backend.productDependency_getObjects(productId=productIds):
-			addDependencies(additionalProductIds, productDependency, productDependenciesByProductIdAndVersion)
-
-		if additionalProductIds:
-			for product in self._backend.product_getObjects(id=additionalProductIds):
-				productByProductIdAndVersion[product.id][product.productVersion][product.packageVersion] = product
-
-			productIds = productIds.union(additionalProductIds)
-
 		productOnClients = []
 		for (depotId, clientIds) in depotToClients.items():
-			products = set()
-			productDependencies = set()
-
-			for productOnDepot in self._backend.productOnDepot_getObjects(depotId=depotId, productId=productIds):
-				product = productByProductIdAndVersion[productOnDepot.productId][productOnDepot.productVersion][productOnDepot.packageVersion]
-				if product is None:
-					raise BackendMissingDataError(u"Product '%s', productVersion '%s', packageVersion '%s' not found"
-						% (productOnDepot.productId, productOnDepot.productVersion, productOnDepot.packageVersion))
-				products.add(product)
-
-				def addDependencies(product, products, productDependencies, productByProductIdAndVersion, productDependenciesByProductIdAndVersion):
-					dependencies = productDependenciesByProductIdAndVersion[product.id][product.productVersion][product.packageVersion]
-					for dep in dependencies:
-						product = productByProductIdAndVersion[dep.productId][dep.productVersion][dep.packageVersion]
-						if product:
-							products.add(product)
-
-							if dep not in productDependencies:
-								productDependencies.add(dep)
-								addDependencies(product, products, productDependencies, productByProductIdAndVersion, productDependenciesByProductIdAndVersion)
-
-				addDependencies(product, products, productDependencies, productByProductIdAndVersion, productDependenciesByProductIdAndVersion)
+			(products, productDependencies) = self._getRequiredDepotProducts(depotId, productIds)
 
 			for clientId in clientIds:
 				try:
@@ -3062,14 +3265,169 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		return productOnClients
 
+	def _getRequiredDepotProducts(self, depotId, productIds):
+		"""
+		Get the products on a depot needed to process the given products.
+
+		These are the given products and all products they depend on, \
+directly or indirectly, in the versions installed on the depot.
+
+		:returns: The products and the dependencies of these products.
+		:returntype: (set, set)
+		"""
+		(productsById, dependenciesByProductId, missingProductIds) = self._getDepotProducts(depotId)
+
+		products = set()
+		productDependencies = set()
+		processedProductIds = set()
+		productIds = list(productIds)
+		while productIds:
+			productId = productIds.pop()
+			if productId in processedProductIds:
+				continue
+			processedProductIds.add(productId)
+
+			if productId in missingProductIds:
+				productOnDepot = missingProductIds[productId]
+				raise BackendMissingDataError(
+					u"Product '%s', productVersion '%s', packageVersion '%s' not found"
+					% (productOnDepot.productId, productOnDepot.productVersion, productOnDepot.packageVersion)
+				)
+
+			try:
+				products.add(productsById[productId])
+			except KeyError:
+				continue  # Not on the depot
+
+			for productDependency in dependenciesByProductId.get(productId, []):
+				productDependencies.add(productDependency)
+				productIds.append(productDependency.requiredProductId)
+
+		return (products, productDependencies)
+
+	def _getDepotProducts(self, depotId):
+		"""
+		Get the products on a depot and their dependencies.
+
+		The result is cached for the versions of the products on the \
+depot.
+
+		:returns: The products by their id, the lists of their \
+dependencies by product id and the productOnDepots for which no \
+product was found by product id.
+		:returntype: (dict, dict, dict)
+		"""
+		productOnDepots = self._backend.productOnDepot_getObjects(depotId=depotId)
+		cacheKey = (
+			depotId,
+			frozenset(
+				(productOnDepot.productId, productOnDepot.productVersion, productOnDepot.packageVersion)
+				for productOnDepot in productOnDepots
+			)
+		)
+
+		with _PRODUCT_CACHE_LOCK:
+			try:
+				(cachedAt, depotProducts) = _DEPOT_PRODUCT_CACHE[cacheKey]
+				if time.time() - cachedAt < _DEPOT_PRODUCT_CACHE_LIFETIME:
+					logger.debug(u"Using cached products of depot {0!r}", depotId)
+					return depotProducts
+			except KeyError:
+				pass
+
+		productOnDepotByProductId = dict(
+			(productOnDepot.productId, productOnDepot)
+			for productOnDepot in productOnDepots
+		)
+
+		def isOnDepot(productId, obj):
+			productOnDepot = productOnDepotByProductId[productId]
+			return (
+				obj.productVersion == productOnDepot.productVersion and
+				obj.packageVersion == productOnDepot.packageVersion
+			)
+
+		productsById = {}
+		dependenciesByProductId = collections.defaultdict(list)
+		if productOnDepotByProductId:
+			for product in self._backend.product_getObjects(id=productOnDepotByProductId.keys()):
+				if isOnDepot(product.id, product):
+					productsById[product.id] = product
+
+			for productDependency in self._backend.productDependency_getObjects(productId=productOnDepotByProductId.keys()):
+				if isOnDepot(productDependency.productId, productDependency):
+					dependenciesByProductId[productDependency.productId].append(productDependency)
+
+		missingProductIds = dict(
+			(productId, productOnDepot)
+			for (productId, productOnDepot) in productOnDepotByProductId.items()
+			if productId not in productsById
+		)
+
+		depotProducts = (productsById, dict(dependenciesByProductId), missingProductIds)
+		with _PRODUCT_CACHE_LOCK:
+			if len(_DEPOT_PRODUCT_CACHE) >= _PRODUCT_CACHE_SIZE:
+				_DEPOT_PRODUCT_CACHE.clear()
+			_DEPOT_PRODUCT_CACHE[cacheKey] = (time.time(), depotProducts)
+
+		return depotProducts
+
+	@staticmethod
+	def _getProductSequence(generateProductSequence, availableProducts, productDependencies):
+		"""
+		Get the order of the products created by `generateProductSequence`.
+
+		The order is cached for the given products and dependencies. \
+The key holds all attributes the ordering depends on so a cached \
+order never needs to expire.
+
+		:returntype: [productId, ...]
+		"""
+		cacheKey = (
+			generateProductSequence,
+			frozenset(
+				(product.id, product.productVersion, product.packageVersion, product.priority)
+				for product in availableProducts
+			),
+			frozenset(
+				(
+					dependency.productId, dependency.productVersion,
+					dependency.packageVersion, dependency.productAction,
+					dependency.requiredProductId, dependency.requiredProductVersion,
+					dependency.requiredPackageVersion, dependency.requiredAction,
+					dependency.requiredInstallationStatus, dependency.requirementType
+				)
+				for dependency in productDependencies
+			)
+		)
+
+		with _PRODUCT_CACHE_LOCK:
+			try:
+				return _PRODUCT_SEQUENCE_CACHE[cacheKey]
+			except KeyError:
+				pass
+
+		sortedList = generateProductSequence(availableProducts, productDependencies)
+
+		with _PRODUCT_CACHE_LOCK:
+			if len(_PRODUCT_SEQUENCE_CACHE) >= _PRODUCT_CACHE_SIZE:
+				_PRODUCT_SEQUENCE_CACHE.clear()
+			_PRODUCT_SEQUENCE_CACHE[cacheKey] = sortedList
+
+		return sortedList
+
 	def productOnClient_generateSequence(self, productOnClients):
 		configs = self._context.config_getObjects(id="product_sort_algorithm")  # pylint: disable=maybe-no-member
 		if configs and ("product_on_client" in configs[0].getDefaultValues() or "algorithm1" in configs[0].getDefaultValues()):
 			logger.info("Generating productOnClient sequence with algorithm 1")
-			generateProductOnClientSequence = OPSI.SharedAlgorithm.generateProductOnClientSequence_algorithm1
+			generateProductSequence = OPSI.SharedAlgorithm.generateProductSequence_algorithm1
 		else:
 			logger.info("Generating productOnClient sequence with algorithm 2")
-			generateProductOnClientSequence = OPSI.SharedAlgorithm.generateProductOnClientSequence_algorithm2
+			generateProductSequence = OPSI.SharedAlgorithm.generateProductSequence_algorithm2
+
+		def generateProductOnClientSequence(productOnClients, availableProducts, productDependencies):
+			sortedList = self._getProductSequence(generateProductSequence, availableProducts, productDependencies)
+			return OPSI.SharedAlgorithm.generateProductOnClientSequence(productOnClients, sortedList)
 
 		return self._productOnClient_processWithFunction(productOnClients, generateProductOnClientSequence)
 
@@ -3193,7 +3551,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 				for clientId in depotClientIds:
 					for pod in productOnDepots[depotId]:
 						if not pocByClientIdAndProductId[clientId].has_key(pod.productId):
-							logger.debug(u"      - creating default productOnClient for clientId '%s', productId '%s'" % (clientId, pod.productId))
+							logger.debug(u"      - creating default productOnClient for clientId '{0}', productId '{1}'", clientId, pod.productId)
 							poc = ProductOnClient(
 									productId=pod.productId,
 									productType=pod.productType,
@@ -3216,53 +3574,126 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 			logger.debug(u"   * generating productOnClient sequence")
 			productOnClients = self.productOnClient_generateSequence(productOnClients)
 
+		objectHashMatches = compileFilter(**filter)
 		return [productOnClient for productOnClient in productOnClients if
-				self._objectHashMatches(productOnClient.toHash(), **filter)]
+				objectHashMatches(productOnClient.toHash())]
 
 	def _productOnClientUpdateOrCreate(self, productOnClient, update=False):
-		nextProductOnClient = None
-		currentProductOnClients = self._backend.productOnClient_getObjects(
-			productId=productOnClient.productId,
-			clientId=productOnClient.clientId
-		)
-		if currentProductOnClients:
-			# If productOnClient exists
-			# (same productId, same clientId, different version)
-			# then update the existing instead of creating a new one
-			nextProductOnClient = currentProductOnClients[0].clone()
-			if update:
-				nextProductOnClient.update(productOnClient, updateWithNoneValues=False)
-			else:
-				logger.info(u"Updating productOnClient %s instead of creating a new one" % nextProductOnClient)
-				nextProductOnClient.update(productOnClient, updateWithNoneValues=True)
-		else:
-			nextProductOnClient = productOnClient.clone()
-
-		if nextProductOnClient.installationStatus:
-			if nextProductOnClient.installationStatus == 'installed':
-				# TODO: Check if product exists?
-				if not nextProductOnClient.productVersion or not nextProductOnClient.packageVersion:
-					clientToDepots = self.configState_getClientToDepotserver(clientIds=[nextProductOnClient.clientId])
-					if not clientToDepots:
-						raise BackendError(u"Cannot set productInstallationStatus 'installed' for product '%s' on client '%s': product/package version not set and depot for client not found" \
-									% (nextProductOnClient.productId, nextProductOnClient.clientId))
-
-					productOnDepots = self._backend.productOnDepot_getObjects(
-						depotId=clientToDepots[0]['depotId'],
-						productId=nextProductOnClient.productId
-					)
-					if not productOnDepots:
-						raise BackendError(u"Cannot set productInstallationStatus 'installed' for product '%s' on client '%s': product/package version not set and product not found on depot '%s'" \
-									% (nextProductOnClient.productId, nextProductOnClient.clientId, clientToDepots[0]['depotId']))
-					nextProductOnClient.setProductVersion(productOnDepots[0].productVersion)
-					nextProductOnClient.setPackageVersion(productOnDepots[0].packageVersion)
-			else:
-				nextProductOnClient.productVersion = None
-				nextProductOnClient.packageVersion = None
+		nextProductOnClient = self._prepareProductOnClientsForInsert([(productOnClient, update)])[0]
+		return self._backend.productOnClient_insertObject(nextProductOnClient)
 
-		nextProductOnClient.setModificationTime(timestamp())
+	def _prepareProductOnClientsForInsert(self, productOnClientsToWrite):
+		"""
+		Merges productOnClients with the existing ones and completes
+		their versions.
 
-		return self._backend.productOnClient_insertObject(nextProductOnClient)
+		The data required for this is read for all productOnClients at
+		once.
+
+		:param productOnClientsToWrite: Pairs of a productOnClient and \
+a flag if this is an update.
+		:returns: The productOnClients to insert into the backend.
+		:returntype: [ProductOnClient, ]
+		"""
+		if not productOnClientsToWrite:
+			return []
+
+		currentProductOnClients = {}
+		for productOnClient in self._backend.productOnClient_getObjects(
+				productId=list(set(poc.productId for (poc, _) in productOnClientsToWrite)),
+				clientId=list(set(poc.clientId for (poc, _) in productOnClientsToWrite))):
+
+			key = (productOnClient.productId, productOnClient.clientId)
+			if key not in currentProductOnClients:
+				currentProductOnClients[key] = productOnClient
+
+		nextProductOnClients = []
+		missingVersions = []
+		for (productOnClient, update) in productOnClientsToWrite:
+			key = (productOnClient.productId, productOnClient.clientId)
+			try:
+				# If productOnClient exists
+				# (same productId, same clientId, different version)
+				# then update the existing instead of creating a new one
+				nextProductOnClient = currentProductOnClients[key].clone()
+				if update:
+					nextProductOnClient.update(productOnClient, updateWithNoneValues=False)
+				else:
+					logger.info(u"Updating productOnClient {0} instead of creating a new one", nextProductOnClient)
+					nextProductOnClient.update(productOnClient, updateWithNoneValues=True)
+			except KeyError:
+				nextProductOnClient = productOnClient.clone()
+
+			if nextProductOnClient.installationStatus:
+				if nextProductOnClient.installationStatus == 'installed':
+					# TODO: Check if product exists?
+					if not nextProductOnClient.productVersion or not nextProductOnClient.packageVersion:
+						missingVersions.append(nextProductOnClient)
+				else:
+					nextProductOnClient.productVersion = None
+					nextProductOnClient.packageVersion = None
+
+			nextProductOnClient.setModificationTime(timestamp())
+
+			# Later changes of the same productOnClient build on this one.
+			currentProductOnClients[key] = nextProductOnClient
+			nextProductOnClients.append(nextProductOnClient)
+
+		if missingVersions:
+			clientToDepot = dict(
+				(clientToDepot['clientId'], clientToDepot['depotId']) for clientToDepot in
+				self.configState_getClientToDepotserver(clientIds=list(set(poc.clientId for poc in missingVersions)))
+			)
+
+			productOnDepots = {}
+			if clientToDepot:
+				for productOnDepot in self._backend.productOnDepot_getObjects(
+						depotId=list(set(clientToDepot.values())),
+						productId=list(set(poc.productId for poc in missingVersions))):
+
+					key = (productOnDepot.depotId, productOnDepot.productId)
+					if key not in productOnDepots:
+						productOnDepots[key] = productOnDepot
+
+			for productOnClient in missingVersions:
+				try:
+					depotId = clientToDepot[productOnClient.clientId]
+				except KeyError:
+					raise BackendError(u"Cannot set productInstallationStatus 'installed' for product '%s' on client '%s': product/package version not set and depot for client not found" \
+								% (productOnClient.productId, productOnClient.clientId))
+
+				try:
+					productOnDepot = productOnDepots[(depotId, productOnClient.productId)]
+				except KeyError:
+					raise BackendError(u"Cannot set productInstallationStatus 'installed' for product '%s' on client '%s': product/package version not set and product not found on depot '%s'" \
+								% (productOnClient.productId, productOnClient.clientId, depotId))
+				productOnClient.setProductVersion(productOnDepot.productVersion)
+				productOnClient.setPackageVersion(productOnDepot.packageVersion)
+
+		return nextProductOnClients
+
+	def _writeObjects(self, methodPrefix, action, objects):
+		"""
+		Passes `objects` to the bulk method of the backend.
+
+		Backends without a bulk method, i.e. remote backends of an older
+		version, get the objects one by one.
+
+		:param methodPrefix: The prefix of the backend methods, \
+i.e. `productOnClient`.
+		:param action: Either `insert` or `update`.
+		"""
+		if not objects:
+			return
+
+		try:
+			bulkMethod = getattr(self._backend, '{0}_bulk{1}Objects'.format(methodPrefix, action.capitalize()))
+		except AttributeError:
+			method = getattr(self._backend, '{0}_{1}Object'.format(methodPrefix, action))
+			for obj in objects:
+				method(obj)
+		else:
+			bulkMethod(objects)
 
 	def productOnClient_insertObject(self, productOnClient):
 		productOnClient = forceObjectClass(productOnClient, ProductOnClient)
@@ -3272,6 +3703,38 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		productOnClient = forceObjectClass(productOnClient, ProductOnClient)
 		return self._productOnClientUpdateOrCreate(productOnClient, update=True)
 
+	def productOnClient_bulkInsertObjects(self, productOnClients):
+		"""
+		Inserts multiple productOnClients.
+
+		The objects are prepared like in `productOnClient_insertObject` \
+before they are passed to the backend.
+		"""
+		productOnClients = forceObjectClassList(productOnClients, ProductOnClient)
+		self._writeObjects(
+			'productOnClient',
+			'insert',
+			self._prepareProductOnClientsForInsert(
+				[(productOnClient, False) for productOnClient in productOnClients]
+			)
+		)
+
+	def productOnClient_bulkUpdateObjects(self, productOnClients):
+		"""
+		Updates multiple productOnClients.
+
+		The objects are prepared like in `productOnClient_updateObject` \
+before they are passed to the backend.
+		"""
+		productOnClients = forceObjectClassList(productOnClients, ProductOnClient)
+		self._writeObjects(
+			'productOnClient',
+			'insert',
+			self._prepareProductOnClientsForInsert(
+				[(productOnClient, True) for productOnClient in productOnClients]
+			)
+		)
+
 	def productOnClient_createObjects(self, productOnClients):
 		returnObjects = self._options['returnObjectsOnUpdateAndCreate']
 		result = []
@@ -3281,10 +3744,18 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 			productOnClients = self.productOnClient_addDependencies(productOnClients)
 
 		for productOnClient in productOnClients:
-			logger.info(u"Creating productOnClient %s" % productOnClient)
-			self.productOnClient_insertObject(productOnClient)
+			logger.info(u"Creating productOnClient {0}", productOnClient)
 
-			if returnObjects:
+		self._writeObjects(
+			'productOnClient',
+			'insert',
+			self._prepareProductOnClientsForInsert(
+				[(productOnClient, False) for productOnClient in productOnClients]
+			)
+		)
+
+		if returnObjects:
+			for productOnClient in productOnClients:
 				result.extend(
 					self._backend.productOnClient_getObjects(
 						productId=productOnClient.productId,
@@ -3302,19 +3773,37 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		if self._options['addDependentProductOnClients']:
 			productOnClients = self.productOnClient_addDependencies(productOnClients)
 
+		existingIdents = set()
+		if productOnClients:
+			existingIdents.update(
+				self.productOnClient_getIdents(
+					returnType='tuple',
+					productId=list(set(poc.productId for poc in productOnClients)),
+					productType=list(set(poc.productType for poc in productOnClients)),
+					clientId=list(set(poc.clientId for poc in productOnClients))
+				)
+			)
+
+		productOnClientsToWrite = []
 		for productOnClient in productOnClients:
 			logger.info(u"Updating productOnClient {0!r}".format(productOnClient))
-			if self.productOnClient_getIdents(
-					productId=productOnClient.productId,
-					productType=productOnClient.productType,
-					clientId=productOnClient.clientId):
-				logger.info(u"ProductOnClient %s exists, updating" % productOnClient)
-				self.productOnClient_updateObject(productOnClient)
+			ident = productOnClient.getIdent(returnType='tuple')
+			if ident in existingIdents:
+				logger.info(u"ProductOnClient {0} exists, updating", productOnClient)
+				productOnClientsToWrite.append((productOnClient, True))
 			else:
-				logger.info(u"ProductOnClient %s does not exist, creating" % productOnClient)
-				self.productOnClient_insertObject(productOnClient)
+				logger.info(u"ProductOnClient {0} does not exist, creating", productOnClient)
+				productOnClientsToWrite.append((productOnClient, False))
+				existingIdents.add(ident)
+
+		self._writeObjects(
+			'productOnClient',
+			'insert',
+			self._prepareProductOnClientsForInsert(productOnClientsToWrite)
+		)
 
-			if returnObjects:
+		if returnObjects:
+			for productOnClient in productOnClients:
 				result.extend(
 					self._backend.productOnClient_getObjects(
 						productId=productOnClient.productId,
@@ -3393,7 +3882,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		returnObjects = self._options['returnObjectsOnUpdateAndCreate']
 		result = []
 		for productPropertyState in forceObjectClassList(productPropertyStates, ProductPropertyState):
-			logger.info(u"Updating productPropertyState %s" % productPropertyState)
+			logger.info(u"Updating productPropertyState {0}", productPropertyState)
 			self._backend.productPropertyState_insertObject(productPropertyState)
 
 			if returnObjects:
@@ -3412,7 +3901,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		result = []
 		productPropertyStates = forceObjectClassList(productPropertyStates, ProductPropertyState)
 		for productPropertyState in productPropertyStates:
-			logger.info(u"Updating productPropertyState '%s'" % productPropertyState)
+			logger.info(u"Updating productPropertyState '{0}'", productPropertyState)
 			if self.productPropertyState_getIdents(
 						productId=productPropertyState.productId,
 						objectId=productPropertyState.objectId,
@@ -3420,7 +3909,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 				self._backend.productPropertyState_updateObject(productPropertyState)
 			else:
-				logger.info(u"ProductPropertyState %s does not exist, creating" % productPropertyState)
+				logger.info(u"ProductPropertyState {0} does not exist, creating", productPropertyState)
 				self._backend.productPropertyState_insertObject(productPropertyState)
 
 			if returnObjects:
@@ -3461,7 +3950,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def group_createObjects(self, groups):
 		groups = forceObjectClassList(groups, Group)
 		for group in groups:
-			logger.info(u"Creating group '%s'" % group)
+			logger.info(u"Creating group '{0}'", group)
 			self._backend.group_insertObject(group)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -3472,11 +3961,11 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def group_updateObjects(self, groups):
 		groups = forceObjectClassList(groups, Group)
 		for group in groups:
-			logger.info(u"Updating group '%s'" % group)
+			logger.info(u"Updating group '{0}'", group)
 			if self.group_getIdents(id=group.id):
 				self._backend.group_updateObject(group)
 			else:
-				logger.info(u"Group %s does not exist, creating" % group)
+				logger.info(u"Group {0} does not exist, creating", group)
 				self._backend.group_insertObject(group)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -3510,7 +3999,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for objectToGroup in forceObjectClassList(objectToGroups, ObjectToGroup):
-			logger.info(u"Creating objectToGroup %s" % objectToGroup)
+			logger.info(u"Creating objectToGroup {0}", objectToGroup)
 			self._backend.objectToGroup_insertObject(objectToGroup)
 
 			if returnObjects:
@@ -3528,14 +4017,14 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		result = []
 		objectToGroups = forceObjectClassList(objectToGroups, ObjectToGroup)
 		for objectToGroup in objectToGroups:
-			logger.info(u"Updating objectToGroup %s" % objectToGroup)
+			logger.info(u"Updating objectToGroup {0}", objectToGroup)
 			if self.objectToGroup_getIdents(
 					groupType=objectToGroup.groupType,
 					groupId=objectToGroup.groupId,
 					objectId=objectToGroup.objectId):
 				self._backend.objectToGroup_updateObject(objectToGroup)
 			else:
-				logger.info(u"ObjectToGroup %s does not exist, creating" % objectToGroup)
+				logger.info(u"ObjectToGroup {0} does not exist, creating", objectToGroup)
 				self._backend.objectToGroup_insertObject(objectToGroup)
 
 			if returnObjects:
@@ -3577,7 +4066,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def licenseContract_createObjects(self, licenseContracts):
 		licenseContracts = forceObjectClassList(licenseContracts, LicenseContract)
 		for licenseContract in licenseContracts:
-			logger.info(u"Creating licenseContract %s" % licenseContract)
+			logger.info(u"Creating licenseContract {0}", licenseContract)
 			self._backend.licenseContract_insertObject(licenseContract)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -3588,11 +4077,11 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def licenseContract_updateObjects(self, licenseContracts):
 		licenseContracts = forceObjectClassList(licenseContracts, LicenseContract)
 		for licenseContract in licenseContracts:
-			logger.info(u"Updating licenseContract '%s'" % licenseContract)
+			logger.info(u"Updating licenseContract '{0}'", licenseContract)
 			if self.licenseContract_getIdents(id=licenseContract.id):
 				self._backend.licenseContract_updateObject(licenseContract)
 			else:
-				logger.info(u"LicenseContract %s does not exist, creating" % licenseContract)
+				logger.info(u"LicenseContract {0} does not exist, creating", licenseContract)
 				self._backend.licenseContract_insertObject(licenseContract)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -3619,7 +4108,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def softwareLicense_createObjects(self, softwareLicenses):
 		softwareLicenses = forceObjectClassList(softwareLicenses, SoftwareLicense)
 		for softwareLicense in softwareLicenses:
-			logger.info(u"Creating softwareLicense '%s'" % softwareLicense)
+			logger.info(u"Creating softwareLicense '{0}'", softwareLicense)
 			self._backend.softwareLicense_insertObject(softwareLicense)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -3630,11 +4119,11 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def softwareLicense_updateObjects(self, softwareLicenses):
 		softwareLicenses = forceObjectClassList(softwareLicenses, SoftwareLicense)
 		for softwareLicense in softwareLicenses:
-			logger.info(u"Updating softwareLicense '%s'" % softwareLicense)
+			logger.info(u"Updating softwareLicense '{0}'", softwareLicense)
 			if self.softwareLicense_getIdents(id=softwareLicense.id):
 				self._backend.softwareLicense_updateObject(softwareLicense)
 			else:
-				logger.info(u"ProducSoftwareLicenset %s does not exist, creating" % softwareLicense)
+				logger.info(u"ProducSoftwareLicenset {0} does not exist, creating", softwareLicense)
 				self._backend.softwareLicense_insertObject(softwareLicense)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -3676,7 +4165,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def licensePool_createObjects(self, licensePools):
 		licensePools = forceObjectClassList(licensePools, LicensePool)
 		for licensePool in licensePools:
-			logger.info(u"Creating licensePool '%s'" % licensePool)
+			logger.info(u"Creating licensePool '{0}'", licensePool)
 			self._backend.licensePool_insertObject(licensePool)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -3687,11 +4176,11 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	def licensePool_updateObjects(self, licensePools):
 		licensePools = forceObjectClassList(licensePools, LicensePool)
 		for licensePool in licensePools:
-			logger.info(u"Updating licensePool '%s'" % licensePool)
+			logger.info(u"Updating licensePool '{0}'", licensePool)
 			if self.licensePool_getIdents(id=licensePool.id):
 				self._backend.licensePool_updateObject(licensePool)
 			else:
-				logger.info(u"LicensePool %s does not exist, creating" % licensePool)
+				logger.info(u"LicensePool {0} does not exist, creating", licensePool)
 				self._backend.licensePool_insertObject(licensePool)
 
 		if self._options['returnObjectsOnUpdateAndCreate']:
@@ -3720,7 +4209,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for softwareLicenseToLicensePool in forceObjectClassList(softwareLicenseToLicensePools, SoftwareLicenseToLicensePool):
-			logger.info(u"Creating softwareLicenseToLicensePool %s" % softwareLicenseToLicensePool)
+			logger.info(u"Creating softwareLicenseToLicensePool {0}", softwareLicenseToLicensePool)
 			self._backend.softwareLicenseToLicensePool_insertObject(softwareLicenseToLicensePool)
 
 			if returnObjects:
@@ -3739,13 +4228,13 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		result = []
 		softwareLicenseToLicensePools = forceObjectClassList(softwareLicenseToLicensePools, SoftwareLicenseToLicensePool)
 		for softwareLicenseToLicensePool in softwareLicenseToLicensePools:
-			logger.info(u"Updating %s" % softwareLicenseToLicensePool)
+			logger.info(u"Updating {0}", softwareLicenseToLicensePool)
 			if self.softwareLicenseToLicensePool_getIdents(
 					softwareLicenseId=softwareLicenseToLicensePool.softwareLicenseId,
 					licensePoolId=softwareLicenseToLicensePool.licensePoolId):
 				self._backend.softwareLicenseToLicensePool_updateObject(softwareLicenseToLicensePool)
 			else:
-				logger.info(u"SoftwareLicenseToLicensePool %s does not exist, creating" % softwareLicenseToLicensePool)
+				logger.info(u"SoftwareLicenseToLicensePool {0} does not exist, creating", softwareLicenseToLicensePool)
 				self._backend.softwareLicenseToLicensePool_insertObject(softwareLicenseToLicensePool)
 
 			if returnObjects:
@@ -3784,7 +4273,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for licenseOnClient in forceObjectClassList(licenseOnClients, LicenseOnClient):
-			logger.info(u"Creating licenseOnClient %s" % licenseOnClient)
+			logger.info(u"Creating licenseOnClient {0}", licenseOnClient)
 			self._backend.licenseOnClient_insertObject(licenseOnClient)
 
 			if returnObjects:
@@ -3804,14 +4293,14 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		result = []
 		licenseOnClients = forceObjectClassList(licenseOnClients, LicenseOnClient)
 		for licenseOnClient in licenseOnClients:
-			logger.info(u"Updating licenseOnClient %s" % licenseOnClient)
+			logger.info(u"Updating licenseOnClient {0}", licenseOnClient)
 			if self.licenseOnClient_getIdents(
 					softwareLicenseId=licenseOnClient.softwareLicenseId,
 					licensePoolId=licenseOnClient.licensePoolId,
 					clientId=licenseOnClient.clientId):
 				self._backend.licenseOnClient_updateObject(licenseOnClient)
 			else:
-				logger.info(u"LicenseOnClient %s does not exist, creating" % licenseOnClient)
+				logger.info(u"LicenseOnClient {0} does not exist, creating", licenseOnClient)
 				self._backend.licenseOnClient_insertObject(licenseOnClient)
 
 			if returnObjects:
@@ -3886,16 +4375,16 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		licenseOnClient = None
 		licenseOnClients = self._backend.licenseOnClient_getObjects(licensePoolId=licensePoolId, clientId=clientId)
 		if licenseOnClients:
-			logger.info(u"Using already assigned license '%s' for client '%s', license pool '%s'" \
-					% (licenseOnClients[0].getSoftwareLicenseId(), clientId, licensePoolId))
+			logger.info(u"Using already assigned license '{0}' for client '{1}', license pool '{2}'",
+					licenseOnClients[0].getSoftwareLicenseId(), clientId, licensePoolId)
 			licenseOnClient = licenseOnClients[0]
 		else:
 			(softwareLicenseId, licenseKey) = self._getUsableSoftwareLicense(clientId, licensePoolId)
 			if not licenseKey:
 				logger.info(u"License available but no license key found")
 
-			logger.info(u"Using software license id '%s', license key '%s' for host '%s' and license pool '%s'" \
-						% (softwareLicenseId, licenseKey, clientId, licensePoolId))
+			logger.info(u"Using software license id '{0}', license key '{1}' for host '{2}' and license pool '{3}'",
+						softwareLicenseId, licenseKey, clientId, licensePoolId)
 
 			licenseOnClient = LicenseOnClient(
 				softwareLicenseId=softwareLicenseId,
@@ -3926,25 +4415,25 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		softwareLicensesBoundToHost = self._backend.softwareLicense_getObjects(id=softwareLicenseIds, boundToHost=clientId)
 		if softwareLicensesBoundToHost:
-			logger.info(u"Using license bound to host: %s" % softwareLicensesBoundToHost[0])
+			logger.info(u"Using license bound to host: {0}", softwareLicensesBoundToHost[0])
 			softwareLicenseId = softwareLicensesBoundToHost[0].getId()
 		else:
 			# Search an available license
 			for softwareLicense in self._backend.softwareLicense_getObjects(id=softwareLicenseIds, boundToHost=[None, '']):
-				logger.debug(u"Checking license '%s', maxInstallations %d" \
-					% (softwareLicense.getId(), softwareLicense.getMaxInstallations()))
+				logger.debug(u"Checking license '{0}', maxInstallations {1}",
+					softwareLicense.getId(), softwareLicense.getMaxInstallations())
 				if softwareLicense.getMaxInstallations() == 0:
 					# 0 = infinite
 					softwareLicenseId = softwareLicense.getId()
 					break
 				installations = len(self.licenseOnClient_getIdents(softwareLicenseId=softwareLicense.getId()))
-				logger.debug(u"Installations registered: %d" % installations)
+				logger.debug(u"Installations registered: {0}", installations)
 				if installations < softwareLicense.getMaxInstallations():
 					softwareLicenseId = softwareLicense.getId()
 					break
 
 			if softwareLicenseId:
-				logger.info(u"Found available license for pool '%s' and client '%s': %s" % (licensePoolId, clientId, softwareLicenseId))
+				logger.info(u"Found available license for pool '{0}' and client '{1}': {2}", licensePoolId, clientId, softwareLicenseId)
 
 		if not softwareLicenseId:
 			raise LicenseMissingError(u"No license available for pool '%s' and client '%s'" % (licensePoolId, clientId))
@@ -3955,14 +4444,14 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 				if softwareLicenseToLicensePool.getSoftwareLicenseId() == softwareLicenseId:
 					licenseKey = softwareLicenseToLicensePool.getLicenseKey()
 					break
-				logger.debug(u"Found license key: %s" % licenseKey)
+				logger.debug(u"Found license key: {0}", licenseKey)
 				licenseKeys.append(softwareLicenseToLicensePool.getLicenseKey())
 
 		if not licenseKey and licenseKeys:
 			licenseKey = random.choice(licenseKeys)
 			logger.info(u"Randomly choosing license key")
 
-		logger.debug(u"Using license '%s', license key: %s" % (softwareLicenseId, licenseKey))
+		logger.debug(u"Using license '{0}', license key: {1}", softwareLicenseId, licenseKey)
 		return (softwareLicenseId, licenseKey)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -3973,7 +4462,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for auditSoftware in forceObjectClassList(auditSoftwares, AuditSoftware):
-			logger.info(u"Creating auditSoftware %s" % auditSoftware)
+			logger.info(u"Creating auditSoftware {0}", auditSoftware)
 			self._backend.auditSoftware_insertObject(auditSoftware)
 
 			if returnObjects:
@@ -3995,7 +4484,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		result = []
 		auditSoftwares = forceObjectClassList(auditSoftwares, AuditSoftware)
 		for auditSoftware in auditSoftwares:
-			logger.info(u"Updating %s" % auditSoftware)
+			logger.info(u"Updating {0}", auditSoftware)
 			if self.auditSoftware_getIdents(
 					name=auditSoftware.name,
 					version=auditSoftware.version,
@@ -4005,7 +4494,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 				self._backend.auditSoftware_updateObject(auditSoftware)
 			else:
-				logger.info(u"AuditSoftware %s does not exist, creating" % auditSoftware)
+				logger.info(u"AuditSoftware {0} does not exist, creating", auditSoftware)
 				self._backend.auditSoftware_insertObject(auditSoftware)
 
 			if returnObjects:
@@ -4057,7 +4546,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for auditSoftwareToLicensePool in forceObjectClassList(auditSoftwareToLicensePools, AuditSoftwareToLicensePool):
-			logger.info(u"Creating %s" % auditSoftwareToLicensePool)
+			logger.info(u"Creating {0}", auditSoftwareToLicensePool)
 			self._backend.auditSoftwareToLicensePool_insertObject(auditSoftwareToLicensePool)
 
 			if returnObjects:
@@ -4079,7 +4568,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		result = []
 		auditSoftwareToLicensePools = forceObjectClassList(auditSoftwareToLicensePools, AuditSoftwareToLicensePool)
 		for auditSoftwareToLicensePool in auditSoftwareToLicensePools:
-			logger.info(u"Creating %s" % auditSoftwareToLicensePool)
+			logger.info(u"Creating {0}", auditSoftwareToLicensePool)
 			if self.auditSoftwareToLicensePool_getIdents(
 					name=auditSoftwareToLicensePool.name,
 					version=auditSoftwareToLicensePool.version,
@@ -4089,7 +4578,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 				self._backend.auditSoftwareToLicensePool_updateObject(auditSoftwareToLicensePool)
 			else:
-				logger.info(u"AuditSoftwareToLicensePool %s does not exist, creating" % auditSoftwareToLicensePool)
+				logger.info(u"AuditSoftwareToLicensePool {0} does not exist, creating", auditSoftwareToLicensePool)
 				self._backend.auditSoftwareToLicensePool_insertObject(auditSoftwareToLicensePool)
 
 			if returnObjects:
@@ -4143,11 +4632,14 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		returnObjects = self._options['returnObjectsOnUpdateAndCreate']
 
 		result = []
-		for auditSoftwareOnClient in forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient):
-			logger.info(u"Creating auditSoftwareOnClient %s" % auditSoftwareOnClient)
-			self._backend.auditSoftwareOnClient_insertObject(auditSoftwareOnClient)
+		auditSoftwareOnClients = forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient)
+		for auditSoftwareOnClient in auditSoftwareOnClients:
+			logger.info(u"Creating auditSoftwareOnClient {0}", auditSoftwareOnClient)
 
-			if returnObjects:
+		self._writeObjects('auditSoftwareOnClient', 'insert', auditSoftwareOnClients)
+
+		if returnObjects:
+			for auditSoftwareOnClient in auditSoftwareOnClients:
 				result.extend(
 					self._backend.auditSoftwareOnClient_getObjects(
 						name=auditSoftwareOnClient.name,
@@ -4166,21 +4658,31 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		auditSoftwareOnClients = forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient)
+
+		existingIdents = set()
+		if auditSoftwareOnClients:
+			existingIdents.update(
+				self.auditSoftwareOnClient_getIdents(
+					returnType='tuple',
+					clientId=list(set(asoc.clientId for asoc in auditSoftwareOnClients))
+				)
+			)
+
+		updates = []
+		inserts = []
 		for auditSoftwareOnClient in auditSoftwareOnClients:
-			logger.info(u"Updating auditSoftwareOnClient %s" % auditSoftwareOnClient)
-			if self.auditSoftwareOnClient_getIdents(
-					name=auditSoftwareOnClient.name,
-					version=auditSoftwareOnClient.version,
-					subVersion=auditSoftwareOnClient.subVersion,
-					language=auditSoftwareOnClient.language,
-					architecture=auditSoftwareOnClient.architecture,
-					clientId=auditSoftwareOnClient.clientId):
-				self._backend.auditSoftwareOnClient_updateObject(auditSoftwareOnClient)
+			logger.info(u"Updating auditSoftwareOnClient {0}", auditSoftwareOnClient)
+			if auditSoftwareOnClient.getIdent(returnType='tuple') in existingIdents:
+				updates.append(auditSoftwareOnClient)
 			else:
-				logger.info(u"AuditSoftwareOnClient %s does not exist, creating" % auditSoftwareOnClient)
-				self._backend.auditSoftwareOnClient_insertObject(auditSoftwareOnClient)
+				logger.info(u"AuditSoftwareOnClient {0} does not exist, creating", auditSoftwareOnClient)
+				inserts.append(auditSoftwareOnClient)
 
-			if returnObjects:
+		self._writeObjects('auditSoftwareOnClient', 'update', updates)
+		self._writeObjects('auditSoftwareOnClient', 'insert', inserts)
+
+		if returnObjects:
+			for auditSoftwareOnClient in auditSoftwareOnClients:
 				result.extend(
 					self._backend.auditSoftwareOnClient_getObjects(
 						name=auditSoftwareOnClient.name,
@@ -4237,13 +4739,13 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	def auditHardware_createObjects(self, auditHardwares):
 		for auditHardware in forceObjectClassList(auditHardwares, AuditHardware):
-			logger.info(u"Creating auditHardware %s" % auditHardware)
+			logger.info(u"Creating auditHardware {0}", auditHardware)
 			self.auditHardware_insertObject(auditHardware)
 		return []
 
 	def auditHardware_updateObjects(self, auditHardwares):
 		for auditHardware in forceObjectClassList(auditHardwares, AuditHardware):
-			logger.info(u"Updating auditHardware %s" % auditHardware)
+			logger.info(u"Updating auditHardware {0}", auditHardware)
 			# You can't update auditHardwares, because the ident contains all attributes
 			self.auditHardware_insertObject(auditHardware)
 		return []
@@ -4282,7 +4784,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 	def auditHardwareOnHost_createObjects(self, auditHardwareOnHosts):
 		for auditHardwareOnHost in forceObjectClassList(auditHardwareOnHosts, AuditHardwareOnHost):
-			logger.info(u"Creating auditHardwareOnHost %s" % auditHardwareOnHost)
+			logger.info(u"Creating auditHardwareOnHost {0}", auditHardwareOnHost)
 			self._backend.auditHardwareOnHost_insertObject(auditHardwareOnHost)
 
 		return []
@@ -4302,7 +4804,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 			if self.auditHardwareOnHost_getObjects(attributes=['hostId'], **filter):
 				self.auditHardwareOnHost_updateObject(auditHardwareOnHost)
 			else:
-				logger.info(u"AuditHardwareOnHost %s does not exist, creating" % auditHardwareOnHost)
+				logger.info(u"AuditHardwareOnHost {0} does not exist, creating", auditHardwareOnHost)
 				self._backend.auditHardwareOnHost_insertObject(auditHardwareOnHost)
 
 		return []
@@ -4356,7 +4858,7 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 
 		result = []
 		for bootConfiguration in forceObjectClassList(bootConfigurations, BootConfiguration):
-			logger.info(u"Creating bootConfiguration %s" % bootConfiguration)
+			logger.info(u"Creating bootConfiguration {0}", bootConfiguration)
 			self._backend.bootConfiguration_insertObject(bootConfiguration)
 
 			if returnObjects:
@@ -4375,11 +4877,11 @@ class ExtendedConfigDataBackend(ExtendedBackend):
 		result = []
 		bootConfigurations = forceObjectClassList(bootConfigurations, BootConfiguration)
 		for bootConfiguration in bootConfigurations:
-			logger.info(u"Updating bootConfiguration '%s'" % bootConfiguration)
+			logger.info(u"Updating bootConfiguration '{0}'", bootConfiguration)
 			if self.bootConfiguration_getIdents(name=bootConfiguration.name, clientId=bootConfiguration.clientId):
 				self._backend.bootConfiguration_updateObject(bootConfiguration)
 			else:
-				logger.info(u"BootConfiguration %s does not exist, creating" % bootConfiguration)
+				logger.info(u"BootConfiguration {0} does not exist, creating", bootConfiguration)
 				self._backend.bootConfiguration_insertObject(bootConfiguration)
 
 			if returnObjects:
@@ -4444,13 +4946,19 @@ class ModificationTrackingBackend(ExtendedBackend):
 		if '_' in methodName:
 			action = methodName.split('_', 1)[1]
 
-		if action in ('insertObject', 'updateObject', 'deleteObjects'):
+		if action in ('insertObject', 'updateObject', 'deleteObjects', 'bulkInsertObjects', 'bulkUpdateObjects'):
 			if action == 'insertObject':
 				self._fireEvent('objectInserted', kwargs.values()[0])
 			elif action == 'updateObject':
 				self._fireEvent('objectUpdated', kwargs.values()[0])
 			elif action == 'deleteObjects':
 				self._fireEvent('objectsDeleted', kwargs.values()[0])
+			elif action == 'bulkInsertObjects':
+				for obj in forceList(kwargs.values()[0]):
+					self._fireEvent('objectInserted', obj)
+			elif action == 'bulkUpdateObjects':
+				for obj in forceList(kwargs.values()[0]):
+					self._fireEvent('objectUpdated', obj)
 			self._fireEvent('backendModified')
 
 		return result
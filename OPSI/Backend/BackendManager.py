@@ -41,7 +41,7 @@ import types
 from OPSI.Backend.Backend import (Backend, BackendModificationListener,
 	ConfigDataBackend, ExtendedBackend, ExtendedConfigDataBackend,
 	ModificationTrackingBackend,
-	getArgAndCallString)
+	createInstanceMethod, getArgAndCallString, getPublicMethods)
 from OPSI.Backend.Depotserver import DepotserverBackend
 from OPSI.Backend.HostControl import HostControlBackend
 from OPSI.Backend.HostControlSafe import HostControlSafeBackend
@@ -66,6 +66,9 @@ __version__ = '4.0.6.39'
 
 logger = Logger()
 
+# Functions read from extension files, keyed by the path of the file.
+_EXTENSION_CACHE = {}
+
 try:
 	from OPSI.System.Posix import Distribution
 	DISTRIBUTOR = Distribution().distributor or 'unknown'
@@ -448,10 +451,7 @@ class BackendDispatcher(Backend):
 	def _createInstanceMethods(self):
 		logger.debug(u"BackendDispatcher is creating instance methods")
 		for Class in (ConfigDataBackend, ):  #  Also apply to ExtendedConfigDataBackend?
-			for methodName, functionRef in inspect.getmembers(Class, inspect.ismethod):
-				if methodName.startswith('_'):
-					# Not a public method
-					continue
+			for methodName, functionRef in getPublicMethods(Class):
 				logger.debug2(u"Found public %s method '%s'" % (Class.__name__, methodName))
 
 				if hasattr(self, methodName):
@@ -476,8 +476,10 @@ class BackendDispatcher(Backend):
 
 				argString, callString = getArgAndCallString(functionRef)
 
-				exec(u'def %s(self, %s): return self._dispatchMethod(%s, "%s", %s)' % (methodName, argString, methodBackends, methodName, callString))
-				setattr(self, methodName, new.instancemethod(eval(methodName), self, self.__class__))
+				createInstanceMethod(
+					self, methodName,
+					u'def %s(self, %s): return self._dispatchMethod(%s, "%s", %s)' % (methodName, argString, methodBackends, methodName, callString)
+				)
 
 	def _dispatchMethod(self, methodBackends, methodName, **kwargs):
 		logger.debug(u"Dispatching method {0!r} to backends: {1}", methodName, methodBackends)
@@ -567,20 +569,47 @@ class BackendExtender(ExtendedBackend):
 
 				for confFile in confFiles:
 					try:
-						logger.info(u"Reading config file '%s'" % confFile)
-						execfile(confFile)
+						functions = _getExtensionFunctions(confFile)
 					except Exception as execError:
 						logger.logException(execError)
 						raise Exception(u"Error reading file {0!r}: {1}".format(confFile, execError))
 
-					for key, val in locals().items():
-						if isinstance(val, types.FunctionType):   # TODO: find a better way
-							logger.debug2(u"Extending %s with instancemethod: '%s'" % (self._backend.__class__.__name__, key))
-							setattr(self, key, new.instancemethod(val, self, self.__class__))
+					for key, val in functions:
+						logger.debug2(u"Extending %s with instancemethod: '%s'" % (self._backend.__class__.__name__, key))
+						setattr(self, key, new.instancemethod(val, self, self.__class__))
 			except Exception as error:
 				raise BackendConfigurationError(u"Failed to read extensions from '%s': %s" % (self._extensionConfigDir, error))
 
 
+def _getExtensionFunctions(confFile):
+	"""
+	Get the functions defined in the extension file `confFile`.
+
+	The functions are read once and reused until modification time,
+	size or inode of the file change.
+
+	:returntype: [(str, function), ...]
+	"""
+	fileInfo = os.stat(confFile)
+	fileState = (fileInfo.st_mtime, fileInfo.st_size, fileInfo.st_ino)
+	try:
+		cachedState, functions = _EXTENSION_CACHE[confFile]
+		if cachedState == fileState:
+			return functions
+	except KeyError:
+		pass
+
+	logger.info(u"Reading config file '%s'" % confFile)
+	namespace = {}
+	execfile(confFile, globals(), namespace)
+	functions = [
+		(key, val) for key, val in namespace.items()
+		if isinstance(val, types.FunctionType)   # TODO: find a better way
+	]
+	_EXTENSION_CACHE[confFile] = (fileState, functions)
+	return functions
+
+
 class BackendAccessControl(object):
 
 	def __init__(self, backend, **kwargs):
@@ -708,25 +737,20 @@ class BackendAccessControl(object):
 	def _createInstanceMethods(self):
 		protectedMethods = set()
 		for Class in (ExtendedConfigDataBackend, ConfigDataBackend, DepotserverBackend, HostControlBackend, HostControlSafeBackend):
-			methodnames = (name for name, _ in inspect.getmembers(Class, inspect.ismethod) if not name.startswith('_'))
-			for methodName in methodnames:
+			for methodName, _ in getPublicMethods(Class):
 				protectedMethods.add(methodName)
 
-		for methodName, functionRef in inspect.getmembers(self._backend, inspect.ismethod):
-			if methodName.startswith('_'):
-				# Not a public method
-				continue
-
+		for methodName, functionRef in getPublicMethods(self._backend):
 			argString, callString = getArgAndCallString(functionRef)
 
 			if methodName in protectedMethods:
 				logger.debug2(u"Protecting %s method '%s'" % (Class.__name__, methodName))
-				exec(u'def %s(self, %s): return self._executeMethodProtected("%s", %s)' % (methodName, argString, methodName, callString))
+				source = u'def %s(self, %s): return self._executeMethodProtected("%s", %s)' % (methodName, argString, methodName, callString)
 			else:
 				logger.debug2(u"Not protecting %s method '%s'" % (Class.__name__, methodName))
-				exec(u'def %s(self, %s): return self._executeMethod("%s", %s)' % (methodName, argString, methodName, callString))
+				source = u'def %s(self, %s): return self._executeMethod("%s", %s)' % (methodName, argString, methodName, callString)
 
-			setattr(self, methodName, new.instancemethod(eval(methodName), self, self.__class__))
+			createInstanceMethod(self, methodName, source)
 
 	def _authenticateUser(self):
 		'''
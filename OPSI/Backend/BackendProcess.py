@@ -73,6 +73,7 @@ class OpsiBackendService(Service):
 		self._config = config
 
 		self._backendManager = None
+		self._backendInterface = None
 		self._socket = None
 		self._lastContact = time.time()
 		self._check = ResetableLoop(self.checkConnected)
@@ -161,6 +162,7 @@ class OpsiBackendService(Service):
 			postpath           = postpath,
 			context            = self._backend
 		)
+		self._backendInterface = self._backendManager.backend_getInterface()
 
 	def stopService(self):
 		self._check.stop()
@@ -182,7 +184,7 @@ class OpsiBackendService(Service):
 
 	def processQuery(self, query, gzip=False):
 		self.isRunning()
-		decoder = JsonRpcRequestProcessor(query, self._backendManager, gzip=gzip)
+		decoder = JsonRpcRequestProcessor(query, self._backendManager, self._backendInterface, gzip=gzip)
 		decoder.decodeQuery()
 		decoder.buildRpcs()
 		d = decoder.executeRpcs(False)
@@ -36,7 +36,8 @@ from OPSI.Backend.Backend import OPSI_GLOBAL_CONF, ConfigDataBackend
 from OPSI.Backend.JSONRPC import JSONRPCBackend
 from OPSI.Logger import Logger
 from OPSI.Object import OpsiClient, Host
-from OPSI.Types import forceBool, forceDict, forceHostId, forceObjectClass, forceUnicode
+from OPSI.Types import (forceBool, forceDict, forceHostId, forceObjectClass,
+	forceObjectClassList, forceUnicode)
 from OPSI.Types import BackendIOError, BackendBadValueError, BackendMissingDataError
 from OPSI.Util.File import DHCPDConfFile
 from OPSI.Util import getfqdn
@@ -162,22 +163,56 @@ class DHCPDBackend(ConfigDataBackend):
 		if self._reloadThread:
 			self._reloadThread.join(10)
 
+	def _forwardHostUpdate(self, host):
+		"""
+		Forwards the update of `host` to the depot responsible for it.
+
+		:returns: True if another depot is responsible for the host.
+		:rtype: bool
+		"""
+		if not self._dhcpdOnDepot:
+			return False
+
+		depotId = self._getResponsibleDepotId(host.id)  # pylint: disable=maybe-no-member
+		if depotId == self._depotId:
+			return False
+
+		logger.info(u"Not responsible for client '%s', forwarding request to depot '%s'" % (host.id, depotId))  # pylint: disable=maybe-no-member
+		self._getDepotConnection(depotId).dhcpd_updateHost(host.id)  # pylint: disable=maybe-no-member
+		return True
+
 	def _dhcpd_updateHost(self, host):
 		host = forceObjectClass(host, Host)
 
-		if self._dhcpdOnDepot:
-			depotId = self._getResponsibleDepotId(host.id)  # pylint: disable=maybe-no-member
-			if depotId != self._depotId:
-				logger.info(u"Not responsible for client '%s', forwarding request to depot '%s'" % (host.id, depotId))  # pylint: disable=maybe-no-member
-				return self._getDepotConnection(depotId).dhcpd_updateHost(host.id)  # pylint: disable=maybe-no-member
-		self.dhcpd_updateHost(host)
+		if not self._forwardHostUpdate(host):
+			self.dhcpd_updateHost(host)
 
-	def dhcpd_updateHost(self, host):
-		host = forceObjectClass(host, Host)
+	def _dhcpd_updateHosts(self, hosts):
+		errors = []
+		localHosts = []
+		for host in forceObjectClassList(hosts, Host):
+			try:
+				if not self._forwardHostUpdate(host):
+					localHosts.append(host)
+			except Exception as error:
+				errors.append(forceUnicode(error))
+
+		try:
+			self.dhcpd_updateHosts(localHosts)
+		except Exception as error:
+			errors.append(forceUnicode(error))
+
+		if errors:
+			raise Exception(u', '.join(errors))
 
+	def _getHostConfiguration(self, host):
+		"""
+		Returns the arguments for `DHCPDConfFile.addHost` of `host` \
+or None if the hardware address of the host is unknown.
+		"""
 		if not host.hardwareAddress:  # pylint: disable=maybe-no-member
 			logger.warning(u"Cannot update dhcpd configuration for client %s: hardware address unknown" % host)
-			return
+			return None
 
 		hostname = host.id.split('.')[0]  # pylint: disable=maybe-no-member
 
@@ -190,7 +225,7 @@ class DHCPDBackend(ConfigDataBackend):
 			except Exception as error:
 				logger.debug(u"Failed to get IP by hostname: {0}", error)
 				with self._reloadLock:
-					self._dhcpdConfFile.parse()
+					self._dhcpdConfFile.parseIfChanged()
 					currentHostParams = self._dhcpdConfFile.getHost(hostname)
 
 				if currentHostParams:
@@ -210,7 +245,8 @@ class DHCPDBackend(ConfigDataBackend):
 		if self._fixedAddressFormat == 'FQDN':
 			fixedAddress = host.id  # pylint: disable=maybe-no-member
 
-		parameters = forceDict(self._defaultClientParameters)
+		# A copy because addHost removes inherited parameters.
+		parameters = dict(self._defaultClientParameters)
 		if not self._dhcpdOnDepot:
 			try:
 				depot = self._context.host_getObjects(id=self._getResponsibleDepotId(host.id))[0]  # pylint: disable=maybe-no-member
@@ -219,55 +255,121 @@ class DHCPDBackend(ConfigDataBackend):
 			except Exception as error:
 				logger.error(u"Failed to get depot info: %s" % error)
 
-		self._reloadLock.acquire()
-		try:
-			self._dhcpdConfFile.parse()
-			currentHostParams = self._dhcpdConfFile.getHost(hostname)
-			if currentHostParams and (currentHostParams.get('hardware', ' ').split(' ')[1] == host.hardwareAddress) \
-				and (currentHostParams.get('fixed-address') == fixedAddress) \
-				and (currentHostParams.get('next-server') == parameters['next-server']):
+		return {
+			'hostname': hostname,
+			'hardwareAddress': host.hardwareAddress,  # pylint: disable=maybe-no-member
+			'ipAddress': ipAddress,
+			'fixedAddress': fixedAddress,
+			'parameters': parameters
+		}
 
-				logger.debug(u"DHCPD config of host '%s' unchanged, no need to update config file" % host)
-				self._reloadLock.release()
+	def _addHostsToConfFile(self, hostConfigurations):
+		"""
+		Adds the hosts to the dhcpd configuration and writes it once \
+if anything changed.
+		"""
+		changed = False
+		with self._reloadLock:
+			try:
+				self._dhcpdConfFile.parseIfChanged()
+			except Exception as error:
+				logger.error(error)
 				return
 
-			self._dhcpdConfFile.addHost(
-				hostname=hostname,
-				hardwareAddress=host.hardwareAddress,  # pylint: disable=maybe-no-member
-				ipAddress=ipAddress,
-				fixedAddress=fixedAddress,
-				parameters=parameters
-			)
-			self._dhcpdConfFile.generate()
-		except Exception as error:
-			logger.error(error)
-		self._reloadLock.release()
-		self._triggerReload()
+			for hostConfiguration in hostConfigurations:
+				try:
+					currentHostParams = self._dhcpdConfFile.getHost(hostConfiguration['hostname'])
+					if currentHostParams and (currentHostParams.get('hardware', ' ').split(' ')[1] == hostConfiguration['hardwareAddress']) \
+						and (currentHostParams.get('fixed-address') == hostConfiguration['fixedAddress']) \
+						and (currentHostParams.get('next-server') == hostConfiguration['parameters']['next-server']):
 
-	def _dhcpd_deleteHost(self, host):
+						logger.debug(u"DHCPD config of host '%s' unchanged, no need to update config file" % hostConfiguration['hostname'])
+						continue
+
+					self._dhcpdConfFile.addHost(**hostConfiguration)
+					changed = True
+				except Exception as error:
+					logger.error(error)
+
+			if changed:
+				try:
+					self._dhcpdConfFile.generate()
+				except Exception as error:
+					logger.error(error)
+
+		if changed:
+			self._triggerReload()
+
+	def dhcpd_updateHost(self, host):
 		host = forceObjectClass(host, Host)
+
+		hostConfiguration = self._getHostConfiguration(host)
+		if hostConfiguration:
+			self._addHostsToConfFile([hostConfiguration])
+
+	def dhcpd_updateHosts(self, hosts):
+		"""
+		Updates the dhcpd configuration of many hosts.
+
+		The configuration file is written and the dhcpd is reloaded \
+only once for all hosts.
+		"""
+		errors = []
+		hostConfigurations = []
+		for host in forceObjectClassList(hosts, Host):
+			try:
+				hostConfiguration = self._getHostConfiguration(host)
+			except Exception as error:
+				errors.append(forceUnicode(error))
+				continue
+
+			if hostConfiguration:
+				hostConfigurations.append(hostConfiguration)
+
+		if hostConfigurations:
+			self._addHostsToConfFile(hostConfigurations)
+
+		if errors:
+			raise Exception(u', '.join(errors))
+
+	def _dhcpd_deleteHosts(self, hosts):
+		hosts = forceObjectClassList(hosts, Host)
 		if self._dhcpdOnDepot:
 			for depot in self._context.host_getObjects(id=self._depotId):  # pylint: disable=maybe-no-member
 				if depot.id != self._depotId:
-					self._getDepotConnection(depot.id).dhcpd_deleteHost(host.id)  # pylint: disable=maybe-no-member
-		self.dhcpd_deleteHost(host)
+					for host in hosts:
+						self._getDepotConnection(depot.id).dhcpd_deleteHost(host.id)  # pylint: disable=maybe-no-member
+		self.dhcpd_deleteHosts(hosts)
 
 	def dhcpd_deleteHost(self, host):
-		host = forceObjectClass(host, Host)
+		self.dhcpd_deleteHosts([host])
 
-		self._reloadLock.acquire()
-		try:
-			self._dhcpdConfFile.parse()
-			if not self._dhcpdConfFile.getHost(host.id.split('.')[0]):  # pylint: disable=maybe-no-member
-				self._reloadLock.release()
-				return
-			self._dhcpdConfFile.deleteHost(host.id.split('.')[0])  # pylint: disable=maybe-no-member
-			self._dhcpdConfFile.generate()
-		except Exception as error:
-			logger.error(error)
+	def dhcpd_deleteHosts(self, hosts):
+		"""
+		Removes many hosts from the dhcpd configuration.
 
-		self._reloadLock.release()
-		self._triggerReload()
+		The configuration file is written and the dhcpd is reloaded \
+only once for all hosts.
+		"""
+		hosts = forceObjectClassList(hosts, Host)
+
+		changed = False
+		with self._reloadLock:
+			try:
+				self._dhcpdConfFile.parseIfChanged()
+				for host in hosts:
+					hostname = host.id.split('.')[0]  # pylint: disable=maybe-no-member
+					if self._dhcpdConfFile.getHost(hostname):
+						self._dhcpdConfFile.deleteHost(hostname)
+						changed = True
+
+				if changed:
+					self._dhcpdConfFile.generate()
+			except Exception as error:
+				logger.error(error)
+
+		if changed:
+			self._triggerReload()
 
 	def host_insertObject(self, host):
 		if not isinstance(host, OpsiClient):
@@ -293,18 +395,9 @@ class DHCPDBackend(ConfigDataBackend):
 	def host_deleteObjects(self, hosts):
 		logger.debug(u"host_deleteObjects %s" % hosts)
 
-		errors = []
-		for host in hosts:
-			if not isinstance(host, OpsiClient):
-				continue
-
-			try:
-				self._dhcpd_deleteHost(host)
-			except Exception as error:
-				errors.append(forceUnicode(error))
-
-		if errors:
-			raise Exception(u', '.join(errors))
+		clients = [host for host in hosts if isinstance(host, OpsiClient)]
+		if clients:
+			self._dhcpd_deleteHosts(clients)
 
 	def configState_insertObject(self, configState):
 		if configState.configId != 'clientconfig.depot.id':
@@ -321,9 +414,17 @@ class DHCPDBackend(ConfigDataBackend):
 		self._context.host_getObjects(id=configState.objectId)]  # pylint: disable=maybe-no-member
 
 	def configState_deleteObjects(self, configStates):
-		for configState in configStates:
-			if configState.configId != 'clientconfig.depot.id':
-				continue
+		clientIds = [configState.objectId for configState in configStates
+					if configState.configId == 'clientconfig.depot.id']
+		if not clientIds:
+			return
 
-			[self.host_updateObject(host) for host in
-			self._context.host_getObjects(id=configState.objectId)]  # pylint: disable=maybe-no-member
+		hosts = [
+			host for host in self._context.host_getObjects(id=clientIds)  # pylint: disable=maybe-no-member
+			if isinstance(host, OpsiClient) and (host.ipAddress or host.hardwareAddress)
+		]
+		logger.debug(u"Updating hosts %s" % hosts)
+		try:
+			self._dhcpd_updateHosts(hosts)
+		except Exception as exc:
+			logger.info(exc)
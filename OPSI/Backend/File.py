@@ -32,14 +32,18 @@ import os
 import pwd
 import re
 import shutil
+import threading
+from contextlib import contextmanager
 
-from OPSI.Backend.Backend import OPSI_GLOBAL_CONF, ConfigDataBackend
+from OPSI.Backend.Backend import (OPSI_GLOBAL_CONF, ConfigDataBackend,
+	compileFilter)
 from OPSI.Logger import Logger
 from OPSI.Types import BackendIOError
 from OPSI.Types import (forceBool, forceHostId, forceFilename, forceList,
 						forceObjectClass, forceObjectClassList, forceProductId,
 						forceUnicode, forceUnicodeList)
 from OPSI.Util import toJson, fromJson, getfqdn
+from OPSI.Util.Collections import LRUCache
 from OPSI.Util.File import IniFile, LockableFile
 from OPSI.Util.File.Opsi import OpsiConfFile, HostKeyFile, PackageControlFile
 from OPSI.Object import *  # needed for calls to "eval"
@@ -49,6 +53,262 @@ __version__ = '4.0.7.1'
 
 logger = Logger()
 
+# filename --> ((mtime, size, inode), parsed content)
+_PARSED_FILES = LRUCache(8192)
+_PARSED_FILES_LOCK = threading.Lock()
+
+
+def _getFileState(filename):
+	"""
+	Get the state of a file used to detect changes.
+
+	:returns: Modification time, size and inode of the file or `None` \
+if the file does not exist.
+	:rtype: tuple or None
+	"""
+	try:
+		stat = os.stat(filename)
+	except OSError:
+		return None
+
+	return (stat.st_mtime, stat.st_size, stat.st_ino)
+
+
+def _parseIniFile(filename, lines=None):
+	return IniFile(filename=filename, ignoreCase=False).parse(lines)
+
+
+def _parseHostKeyFile(filename, lines=None):
+	hostKeys = HostKeyFile(filename=filename)
+	hostKeys.parse(lines)
+	return hostKeys
+
+
+def _parsePackageControlFile(filename, lines=None):
+	packageControlFile = PackageControlFile(filename=filename)
+	packageControlFile.parse(lines)
+	return packageControlFile
+
+
+def _readParsedFile(filename, parse):
+	"""
+	Get the content of a file as returned by `parse(filename)`.
+
+	Parsed files are cached for the whole process until the \
+modification time, size or inode of the file changes.
+	The returned content is shared and must not be modified.
+	"""
+	state = _getFileState(filename)
+	if state is not None:
+		with _PARSED_FILES_LOCK:
+			try:
+				(cachedState, content) = _PARSED_FILES[filename]
+			except KeyError:
+				cachedState = None
+
+		if cachedState == state:
+			return content
+
+	content = parse(filename)
+	if state is not None:
+		with _PARSED_FILES_LOCK:
+			_PARSED_FILES[filename] = (state, content)
+
+	return content
+
+
+def _updateParsedFile(filename, parse, lines):
+	"""
+	Update the cached content of a file that has just been written.
+
+	:param lines: The lines that were written to the file.
+	"""
+	state = _getFileState(filename)
+	if state is None:
+		return
+
+	content = parse(filename, lines)
+	with _PARSED_FILES_LOCK:
+		_PARSED_FILES[filename] = (state, content)
+
+
+# directory --> _DirectoryIndex
+_DIRECTORY_INDEXES = {}
+_DIRECTORY_INDEXES_LOCK = threading.Lock()
+
+
+class _DirectoryIndex(object):
+	"""
+	The idents of the files in a directory.
+
+	`getIdent(entry)` returns the ident of a directory entry as dict \
+with at least the key `id` or `None` if the entry is ignored.
+	"""
+
+	def __init__(self, state, getIdent, idents):
+		self.state = state
+		self.getIdent = getIdent
+		self.idents = idents
+		self.entriesById = {}
+		for (entry, ident) in idents.iteritems():
+			if ident is not None:
+				self.entriesById.setdefault(ident['id'], []).append(entry)
+
+	def add(self, entry):
+		if entry in self.idents:
+			return
+
+		ident = self.idents[entry] = self.getIdent(entry)
+		if ident is not None:
+			self.entriesById.setdefault(ident['id'], []).append(entry)
+
+	def remove(self, entry):
+		ident = self.idents.pop(entry, None)
+		if ident is None:
+			return
+
+		entries = self.entriesById[ident['id']]
+		entries.remove(entry)
+		if not entries:
+			del self.entriesById[ident['id']]
+
+	def find(self, idFilter=None):
+		"""
+		Get the entries with an id matching `idFilter`.
+
+		Ids without wildcards or version conditions are looked up \
+directly instead of testing every entry.
+
+		:returns: Tuples of entry and ident.
+		:rtype: list
+		"""
+		with _DIRECTORY_INDEXES_LOCK:
+			if not idFilter:
+				ids = self.entriesById.keys()
+			else:
+				ids = _getExactFilterValues(idFilter)
+				if ids is None:
+					idMatches = compileFilter(id=idFilter)
+					ids = [id for id in self.entriesById if idMatches({'id': id})]
+
+			found = []
+			for id in set(ids):
+				for entry in self.entriesById.get(id, []):
+					found.append((entry, self.idents[entry]))
+
+		return sorted(found)
+
+
+def _getExactFilterValues(filterValue):
+	"""
+	Get the values matched by `filterValue`.
+
+	:returns: The values or `None` if the filter contains wildcards \
+or version conditions.
+	:rtype: list or None
+	"""
+	values = forceUnicodeList(filterValue)
+	for value in values:
+		if '*' in value or value.lstrip()[:1] in (u'<', u'>', u'='):
+			return None
+
+	return values
+
+
+def _getDirectoryIndex(directory, getIdent):
+	"""
+	Get the index of the files in `directory`.
+
+	The index is kept for the whole process and read again when the \
+modification time, size or inode of the directory changes. Idents of \
+entries that are already known are reused.
+
+	:rtype: _DirectoryIndex
+	"""
+	state = _getFileState(directory)
+	with _DIRECTORY_INDEXES_LOCK:
+		index = _DIRECTORY_INDEXES.get(directory)
+		if index is None or index.getIdent is not getIdent:
+			knownIdents = {}
+		elif index.state == state:
+			return index
+		else:
+			knownIdents = dict(index.idents)
+
+	idents = {}
+	for entry in os.listdir(directory):
+		try:
+			idents[entry] = knownIdents[entry]
+		except KeyError:
+			idents[entry] = getIdent(entry)
+
+	index = _DirectoryIndex(state, getIdent, idents)
+	with _DIRECTORY_INDEXES_LOCK:
+		_DIRECTORY_INDEXES[directory] = index
+
+	return index
+
+
+@contextmanager
+def _updatingDirectoryIndex(filename):
+	"""
+	Update the index of the directory of `filename` after the file has \
+been created or removed inside the `with` block.
+
+	If the directory has been changed by someone else before, the \
+index is read again on its next use instead.
+	"""
+	(directory, entry) = os.path.split(filename)
+	state = _getFileState(directory)
+
+	yield
+
+	with _DIRECTORY_INDEXES_LOCK:
+		index = _DIRECTORY_INDEXES.get(directory)
+		if index is None or index.state != state:
+			return
+
+		if os.path.exists(filename):
+			index.add(entry)
+		else:
+			index.remove(entry)
+		index.state = _getFileState(directory)
+
+
+def _getHostIdent(entry):
+	if not entry.lower().endswith('.ini'):
+		logger.debug2(u"Ignoring invalid host file '{0}'", entry)
+		return None
+
+	try:
+		return {'id': forceHostId(entry[:-4])}
+	except Exception:
+		logger.warning(u"Ignoring invalid host file '%s'" % (entry))
+		return None
+
+
+def _getProductIdent(entry):
+	entry = entry.lower()
+	if entry.endswith('.localboot'):
+		productType = 'LocalbootProduct'
+	elif entry.endswith('.netboot'):
+		productType = 'NetbootProduct'
+	else:
+		logger.debug2(u"Ignoring invalid product file '{0}'", entry)
+		return None
+
+	match = FileBackend.productFilenameRegex.search(entry)
+	if not match:
+		logger.warning(u"Ignoring invalid product file '%s'" % (entry))
+		return None
+
+	return {
+		'id': match.group(1),
+		'productVersion': match.group(2),
+		'packageVersion': match.group(3),
+		'type': productType
+	}
+
 
 class FileBackend(ConfigDataBackend):
 	# example match (ignore spaces):      exampleexam_e.-ex  _ 1234.12 - 1234.12  . local     boot
@@ -284,12 +544,12 @@ class FileBackend(ConfigDataBackend):
 			logger.warning(u"Failed to set rights for path '{0}': {1}".format(path, forceUnicode(error)))
 
 	def _mkdir(self, path):
-		logger.debug(u"Creating path: '%s'" % (path))
+		logger.debug(u"Creating path: '{0}'", path)
 		os.mkdir(path)
 		self._setRights(path)
 
 	def _touch(self, filename):
-		logger.debug(u"Creating file: '%s'" % (filename))
+		logger.debug(u"Creating file: '{0}'", filename)
 		if not os.path.exists(filename):
 			f = LockableFile(filename)
 			f.create()
@@ -300,17 +560,17 @@ class FileBackend(ConfigDataBackend):
 	@staticmethod
 	def __escape(string):
 		string = forceUnicode(string)
-		logger.debug2(u"Escaping string: '%s'" % (string))
+		logger.debug2(u"Escaping string: '{0}'", string)
 		return string.replace(u'\n', u'\\n').replace(u';', u'\\;').replace(u'#', u'\\#').replace(u'%', u'%%')
 
 	@staticmethod
 	def __unescape(string):
 		string = forceUnicode(string)
-		logger.debug2(u"Unescaping string: '%s'" % (string))
+		logger.debug2(u"Unescaping string: '{0}'", string)
 		return string.replace(u'\\n', u'\n').replace(u'\\;', u';').replace(u'\\#', u'#').replace(u'%%', u'%')
 
 	def _getConfigFile(self, objType, ident, fileType):
-		logger.debug(u"Getting config file for '%s', '%s', '%s'" % (objType, ident, fileType))
+		logger.debug(u"Getting config file for '{0}', '{1}', '{2}'", objType, ident, fileType)
 		filename = None
 
 		if fileType == 'key':
@@ -323,8 +583,9 @@ class FileBackend(ConfigDataBackend):
 				filename = os.path.join(self.__clientConfigDir, ident['id'] + u'.ini')
 			elif objType in ('OpsiDepotserver', 'OpsiConfigserver'):
 				filename = os.path.join(self.__depotConfigDir, ident['id'] + u'.ini')
-			elif objType == 'ConfigState':
-				if os.path.isfile(os.path.join(os.path.join(self.__depotConfigDir, ident['objectId'] + u'.ini'))):
+			elif objType in ('ConfigState', 'ProductPropertyState'):
+				depotIndex = _getDirectoryIndex(self.__depotConfigDir, _getHostIdent)
+				if ident['objectId'] in depotIndex.entriesById:
 					filename = os.path.join(self.__depotConfigDir, ident['objectId'] + u'.ini')
 				else:
 					filename = os.path.join(self.__clientConfigDir, ident['objectId'] + u'.ini')
@@ -332,11 +593,6 @@ class FileBackend(ConfigDataBackend):
 				filename = os.path.join(self.__depotConfigDir, ident['depotId'] + u'.ini')
 			elif objType == 'ProductOnClient':
 				filename = os.path.join(self.__clientConfigDir, ident['clientId'] + u'.ini')
-			elif objType == 'ProductPropertyState':
-				if os.path.isfile(os.path.join(os.path.join(self.__depotConfigDir, ident['objectId'] + u'.ini'))):
-					filename = os.path.join(self.__depotConfigDir, ident['objectId'] + u'.ini')
-				else:
-					filename = os.path.join(self.__clientConfigDir, ident['objectId'] + u'.ini')
 			elif objType in ('Group', 'HostGroup', 'ProductGroup'):
 				if objType == 'ProductGroup' or (objType == 'Group' and ident.get('type', '') == 'ProductGroup'):
 					filename = os.path.join(self.__productGroupsFile)
@@ -365,10 +621,15 @@ class FileBackend(ConfigDataBackend):
 					pId = ident['id']
 				else:
 					pId = ident['productId']
-				# instead of searching the whole dir, let's check the only possible files
-				if os.path.isfile(os.path.join(self.__productDir, pId + pVer + u'.localboot')):
+
+				productTypes = set()
+				for (_, productIdent) in _getDirectoryIndex(self.__productDir, _getProductIdent).find(pId):
+					if productIdent['productVersion'] == ident['productVersion'].lower() and productIdent['packageVersion'] == ident['packageVersion'].lower():
+						productTypes.add(productIdent['type'])
+
+				if 'LocalbootProduct' in productTypes:
 					filename = os.path.join(self.__productDir, pId + pVer + u'.localboot')
-				elif os.path.isfile(os.path.join(self.__productDir, pId + pVer + u'.netboot')):
+				elif 'NetbootProduct' in productTypes:
 					filename = os.path.join(self.__productDir, pId + pVer + u'.netboot')
 
 		elif fileType == 'sw':
@@ -392,47 +653,32 @@ class FileBackend(ConfigDataBackend):
 			else:
 				raise Exception(u"%s needs existing file '%s' ident '%s', fileType '%s'" % (objType, filename, ident, fileType))
 		else:
-			logger.debug2(u"Returning config file '%s'" % (filename))
+			logger.debug2(u"Returning config file '{0}'", filename)
 			return filename
 
 	def _getIdents(self, objType, **filter):
-		logger.debug(u"Getting idents for '%s' with filter '%s'" % (objType, filter))
+		logger.debug(u"Getting idents for '{0}' with filter '{1}'", objType, filter)
 		objIdents = []
 
 		if objType in ('Config', 'UnicodeConfig', 'BoolConfig'):
 			filename = self._getConfigFile(objType, {}, 'ini')
 			if os.path.isfile(filename):
-				iniFile = IniFile(filename=filename, ignoreCase=False)
-				cp = iniFile.parse()
+				cp = _readParsedFile(filename, _parseIniFile)
 				for section in cp.sections():
 					objIdents.append({'id': section})
 
 		elif objType in ('OpsiClient', 'ProductOnClient'):
-			if objType == 'OpsiClient' and filter.get('id'):
-				idFilter = {'id': filter['id']}
-			elif objType == 'ProductOnClient' and filter.get('clientId'):
-				idFilter = {'id': filter['clientId']}
+			if objType == 'OpsiClient':
+				idFilter = filter.get('id')
 			else:
-				idFilter = {}
-
-			for entry in os.listdir(self.__clientConfigDir):
-				if not entry.lower().endswith('.ini'):
-					logger.debug2(u"Ignoring invalid client file '%s'" % (entry))
-					continue
-
-				try:
-					hostId = forceHostId(entry[:-4])
-				except Exception:
-					logger.warning(u"Ignoring invalid client file '%s'" % (entry))
-					continue
-
-				if idFilter and not self._objectHashMatches({'id': hostId}, **idFilter):
-					continue
+				idFilter = filter.get('clientId')
 
+			index = _getDirectoryIndex(self.__clientConfigDir, _getHostIdent)
+			for (_, ident) in index.find(idFilter):
+				hostId = ident['id']
 				if objType == 'ProductOnClient':
 					filename = self._getConfigFile(objType, {'clientId': hostId}, 'ini')
-					iniFile = IniFile(filename=filename, ignoreCase=False)
-					cp = iniFile.parse()
+					cp = _readParsedFile(filename, _parseIniFile)
 
 					for section in cp.sections():
 						if section.endswith('-state'):
@@ -445,34 +691,20 @@ class FileBackend(ConfigDataBackend):
 					objIdents.append({'id': hostId})
 
 		elif objType in ('OpsiDepotserver', 'OpsiConfigserver', 'ProductOnDepot'):
-			if objType in ('OpsiDepotserver', 'OpsiConfigserver') and filter.get('id'):
-				idFilter = {'id': filter['id']}
-			elif objType == 'ProductOnDepot' and filter.get('depotId'):
-				idFilter = {'id': filter['depotId']}
+			if objType in ('OpsiDepotserver', 'OpsiConfigserver'):
+				idFilter = filter.get('id')
 			else:
-				idFilter = {}
-
-			for entry in os.listdir(self.__depotConfigDir):
-				if not entry.lower().endswith('.ini'):
-					logger.debug2(u"Ignoring invalid depot file '%s'" % (entry))
-					continue
-
-				try:
-					hostId = forceHostId(entry[:-4])
-				except Exception:
-					logger.warning(u"Ignoring invalid depot file '%s'" % (entry))
-					continue
-
-				if idFilter and not self._objectHashMatches({'id': hostId}, **idFilter):
-					continue
+				idFilter = filter.get('depotId')
 
+			index = _getDirectoryIndex(self.__depotConfigDir, _getHostIdent)
+			for (_, ident) in index.find(idFilter):
+				hostId = ident['id']
 				if objType == 'OpsiConfigserver' and hostId != self.__serverId:
 					continue
 
 				if objType == 'ProductOnDepot':
 					filename = self._getConfigFile(objType, {'depotId': hostId}, 'ini')
-					iniFile = IniFile(filename=filename, ignoreCase=False)
-					cp = iniFile.parse()
+					cp = _readParsedFile(filename, _parseIniFile)
 
 					for section in cp.sections():
 						if section.endswith('-state'):
@@ -487,43 +719,24 @@ class FileBackend(ConfigDataBackend):
 					objIdents.append({'id': hostId})
 
 		elif objType in ('Product', 'LocalbootProduct', 'NetbootProduct', 'ProductProperty', 'UnicodeProductProperty', 'BoolProductProperty', 'ProductDependency'):
-			if objType in ('Product', 'LocalbootProduct', 'NetbootProduct') and filter.get('id'):
-				idFilter = {'id': filter['id']}
-			elif objType in ('ProductProperty', 'UnicodeProductProperty', 'BoolProductProperty', 'ProductDependency') and filter.get('productId'):
-				idFilter = {'id': filter['productId']}
+			if objType in ('Product', 'LocalbootProduct', 'NetbootProduct'):
+				idFilter = filter.get('id')
 			else:
-				idFilter = {}
-
-			for entry in os.listdir(self.__productDir):
-				match = None
-
-				entry = entry.lower()
-				if entry.endswith('.localboot'):
-					if objType == 'NetbootProduct':
-						continue
-				elif entry.endswith('.netboot'):
-					if objType == 'LocalbootProduct':
-						continue
-				else:
-					logger.debug2(u"Ignoring invalid product file '%s'" % (entry))
-					continue
-
-				match = self.productFilenameRegex.search(entry)
-				if not match:
-					logger.warning(u"Ignoring invalid product file '%s'" % (entry))
-					continue
+				idFilter = filter.get('productId')
 
-				if idFilter and not self._objectHashMatches({'id': match.group(1)}, **idFilter):
+			index = _getDirectoryIndex(self.__productDir, _getProductIdent)
+			for (entry, ident) in index.find(idFilter):
+				if objType in ('LocalbootProduct', 'NetbootProduct') and objType != ident['type']:
 					continue
 
-				logger.debug2(u"Found match: id='%s', productVersion='%s', packageVersion='%s'" % (match.group(1), match.group(2), match.group(3)))
+				logger.debug2(u"Found match: id='{0}', productVersion='{1}', packageVersion='{2}'", ident['id'], ident['productVersion'], ident['packageVersion'])
 
 				if objType in ('Product', 'LocalbootProduct', 'NetbootProduct'):
-					objIdents.append({'id': match.group(1), 'productVersion': match.group(2), 'packageVersion': match.group(3)})
+					objIdents.append({'id': ident['id'], 'productVersion': ident['productVersion'], 'packageVersion': ident['packageVersion']})
 
 				elif objType in ('ProductProperty', 'UnicodeProductProperty', 'BoolProductProperty', 'ProductDependency'):
 					filename = os.path.join(self.__productDir, entry)
-					packageControlFile = PackageControlFile(filename=filename)
+					packageControlFile = _readParsedFile(filename, _parsePackageControlFile)
 					if objType == 'ProductDependency':
 						for productDependency in packageControlFile.getProductDependencies():
 							objIdents.append(productDependency.getIdent(returnType='dict'))
@@ -533,24 +746,12 @@ class FileBackend(ConfigDataBackend):
 
 		elif objType in ('ConfigState', 'ProductPropertyState'):
 			for path in (self.__depotConfigDir, self.__clientConfigDir):
-				for entry in os.listdir(path):
+				index = _getDirectoryIndex(path, _getHostIdent)
+				for (entry, ident) in index.find(filter.get('objectId')):
 					filename = os.path.join(path, entry)
+					objectId = ident['id']
 
-					if not entry.lower().endswith('.ini'):
-						logger.debug2(u"Ignoring invalid file '%s'" % (filename))
-						continue
-
-					try:
-						objectId = forceHostId(entry[:-4])
-					except Exception as e:
-						logger.warning(u"Ignoring invalid file '%s': %s" % filename, forceUnicode(e))
-						continue
-
-					if not self._objectHashMatches({'objectId': objectId}, **filter):
-						continue
-
-					iniFile = IniFile(filename=filename, ignoreCase=False)
-					cp = iniFile.parse()
+					cp = _readParsedFile(filename, _parseIniFile)
 
 					if objType == 'ConfigState' and cp.has_section('generalconfig'):
 						for option in cp.options('generalconfig'):
@@ -594,8 +795,7 @@ class FileBackend(ConfigDataBackend):
 
 			for p in passes:
 				groupType = p['groupType']
-				iniFile = IniFile(filename=p['filename'], ignoreCase=False)
-				cp = iniFile.parse()
+				cp = _readParsedFile(p['filename'], _parseIniFile)
 
 				for section in cp.sections():
 					if objType == 'ObjectToGroup':
@@ -606,7 +806,7 @@ class FileBackend(ConfigDataBackend):
 							try:
 								value = cp.get(section, option)
 								if not forceBool(value):
-									logger.debug(u"Skipping '%s' in section '%s' with False-value '%s'" % (option, section, value))
+									logger.debug(u"Skipping '{0}' in section '{1}' with False-value '{2}'", option, section, value)
 									continue
 								if groupType == 'HostGroup':
 									option = forceHostId(option)
@@ -642,6 +842,7 @@ class FileBackend(ConfigDataBackend):
 					idFilter = {'id': filter['clientId']}
 				elif objType == 'AuditHardwareOnHost' and filter.get('hostId'):
 					idFilter = {'id': filter['hostId']}
+				idFilterMatches = compileFilter(**idFilter)
 
 				for entry in os.listdir(self.__auditDir):
 					entry = entry.lower()
@@ -650,10 +851,10 @@ class FileBackend(ConfigDataBackend):
 					if entry in ('global.sw', 'global.hw'):
 						continue
 					elif not entry.endswith('.%s' % fileType):
-						logger.debug2(u"Ignoring invalid file '%s'" % (entry))
+						logger.debug2(u"Ignoring invalid file '{0}'", entry)
 
 					try:
-						if idFilter and not self._objectHashMatches({'id': forceHostId(entry[:-3])}, **idFilter):
+						if idFilter and not idFilterMatches({'id': forceHostId(entry[:-3])}):
 							continue
 					except Exception:
 						logger.warning(u"Ignoring invalid file '%s'" % (entry))
@@ -710,12 +911,12 @@ class FileBackend(ConfigDataBackend):
 			logger.debug2(u"Returning idents without filter.")
 			return objIdents
 
-		return [ident for ident in objIdents
-				if self._objectHashMatches(ident, **filter)]
+		objectHashMatches = compileFilter(**filter)
+		return [ident for ident in objIdents if objectHashMatches(ident)]
 
 	@staticmethod
 	def _adaptObjectHashAttributes(objHash, ident, attributes):
-		logger.debug2(u"Adapting objectHash with '%s', '%s', '%s'" % (objHash, ident, attributes))
+		logger.debug2(u"Adapting objectHash with '{0}', '{1}', '{2}'", objHash, ident, attributes)
 		if not attributes:
 			return objHash
 
@@ -746,15 +947,15 @@ class FileBackend(ConfigDataBackend):
 					break
 
 			if not match:
-				logger.debug(u"Object type '%s' does not match filter %s" % (objType, filter))
+				logger.debug(u"Object type '{0}' does not match filter {1}", objType, filter)
 				return []
 
 		if objType not in self._mappings:
 			raise Exception(u"Mapping not found for object type '%s'" % objType)
 
-		logger.debug2(u"Now reading '%s' with:" % (objType))
-		logger.debug2(u"   Attributes: '%s'" % (attributes))
-		logger.debug2(u"   Filter: '%s'" % (filter))
+		logger.debug2(u"Now reading '{0}' with:", objType)
+		logger.debug2(u"   Attributes: '{0}'", attributes)
+		logger.debug2(u"   Filter: '{0}'", filter)
 
 		mappings = {}
 		for mapping in self._mappings[objType]:
@@ -764,11 +965,12 @@ class FileBackend(ConfigDataBackend):
 
 				mappings[mapping['fileType']].append(mapping)
 
-		logger.debug2(u"Using mappings %s" % mappings)
+		logger.debug2(u"Using mappings {0}", mappings)
 
 		packageControlFileCache = {}
 		iniFileCache = {}
 		hostKeys = None
+		objectHashMatches = compileFilter(**filter)
 
 		objects = []
 		for ident in self._getIdents(objType, **filter):
@@ -782,8 +984,7 @@ class FileBackend(ConfigDataBackend):
 
 				if fileType == 'key':
 					if not hostKeys:
-						hostKeys = HostKeyFile(filename=filename)
-						hostKeys.parse()
+						hostKeys = _readParsedFile(filename, _parseHostKeyFile)
 
 					for m in mapping:
 						objHash[m['attribute']] = hostKeys.getOpsiHostKey(ident['id'])
@@ -792,10 +993,12 @@ class FileBackend(ConfigDataBackend):
 					try:
 						cp = iniFileCache[filename]
 					except KeyError:
-						iniFile = IniFile(filename=filename, ignoreCase=False)
-						cp = iniFileCache[filename] = iniFile.parse()
+						cp = iniFileCache[filename] = _readParsedFile(filename, _parseIniFile)
 
 					if cp.has_section('LocalbootProduct_product_states') or cp.has_section('NetbootProduct_product_states'):
+						# The cached content is shared and must not be changed.
+						iniFile = IniFile(filename=filename, ignoreCase=False)
+						cp = iniFileCache[filename] = iniFile.parse()
 						if cp.has_section('LocalbootProduct_product_states'):
 							if not cp.has_section('localboot_product_states'):
 								cp.add_section('localboot_product_states')
@@ -812,7 +1015,8 @@ class FileBackend(ConfigDataBackend):
 								cp.set('netboot_product_states', k, v)
 
 							cp.remove_section('NetbootProduct_product_states')
-						IniFile(filename=filename, ignoreCase=False).generate(cp)
+						iniFile.generate(cp)
+						_updateParsedFile(filename, _parseIniFile, iniFile.getLines())
 
 					for m in mapping:
 						attribute = m['attribute']
@@ -853,15 +1057,13 @@ class FileBackend(ConfigDataBackend):
 						elif objType == 'ProductOnClient' and attribute.lower() == 'actionrequest':
 							objHash[attribute] = 'none'
 
-					logger.debug2(u"Got object hash from ini file: %s" % objHash)
+					logger.debug2(u"Got object hash from ini file: {0}", objHash)
 
 				elif fileType == 'pro':
 					try:
 						packageControlFile = packageControlFileCache[filename]
 					except KeyError:
-						packageControlFileCache[filename] = PackageControlFile(filename=filename)
-						packageControlFileCache[filename].parse()
-						packageControlFile = packageControlFileCache[filename]
+						packageControlFile = packageControlFileCache[filename] = _readParsedFile(filename, _parsePackageControlFile)
 
 					if objType in ('Product', 'LocalbootProduct', 'NetbootProduct'):
 						objHash = packageControlFile.getProduct().toHash()
@@ -885,12 +1087,12 @@ class FileBackend(ConfigDataBackend):
 								break
 
 			Class = eval(objType)
-			if self._objectHashMatches(Class.fromHash(objHash).toHash(), **filter):
+			if objectHashMatches(Class.fromHash(objHash).toHash()):
 				objHash = self._adaptObjectHashAttributes(objHash, ident, attributes)
 				objects.append(Class.fromHash(objHash))
 
 		for obj in objects:
-			logger.debug2(u"Returning object: %s" % obj.getIdent())
+			logger.debug2(u"Returning object: {0}", obj.getIdent())
 
 		return objects
 
@@ -921,17 +1123,19 @@ class FileBackend(ConfigDataBackend):
 					hostKeys = HostKeyFile(filename=filename)
 					hostKeys.setOpsiHostKey(obj.getId(), obj.getOpsiHostKey())
 					hostKeys.generate()
+					_updateParsedFile(filename, _parseHostKeyFile, hostKeys.getLines())
 
 			elif fileType == 'ini':
 				iniFile = IniFile(filename=filename, ignoreCase=False)
 				if mode == 'create':
-					if objType == 'OpsiClient' and not iniFile.exists():
-						proto = os.path.join(self.__clientTemplateDir, os.path.basename(filename))
-						if not os.path.isfile(proto):
-							proto = self.__defaultClientTemplatePath
-						shutil.copyfile(proto, filename)
+					with _updatingDirectoryIndex(filename):
+						if objType == 'OpsiClient' and not iniFile.exists():
+							proto = os.path.join(self.__clientTemplateDir, os.path.basename(filename))
+							if not os.path.isfile(proto):
+								proto = self.__defaultClientTemplatePath
+							shutil.copyfile(proto, filename)
 
-					self._touch(filename)
+						self._touch(filename)
 
 				cp = iniFile.parse()
 
@@ -1017,10 +1221,12 @@ class FileBackend(ConfigDataBackend):
 
 				iniFile.setSectionSequence(['info', 'generalconfig', 'localboot_product_states', 'netboot_product_states'])
 				iniFile.generate(cp)
+				_updateParsedFile(filename, _parseIniFile, iniFile.getLines())
 
 			elif fileType == 'pro':
 				if not os.path.exists(filename):
-					self._touch(filename)
+					with _updatingDirectoryIndex(filename):
+						self._touch(filename)
 				packageControlFile = PackageControlFile(filename=filename)
 
 				if objType in ('Product', 'LocalbootProduct', 'NetbootProduct'):
@@ -1064,6 +1270,7 @@ class FileBackend(ConfigDataBackend):
 						packageControlFile.setProductProperties(currentObjects)
 
 				packageControlFile.generate()
+				_updateParsedFile(filename, _parsePackageControlFile, packageControlFile.getLines())
 
 	def _delete(self, objList):
 		if not objList:
@@ -1074,31 +1281,35 @@ class FileBackend(ConfigDataBackend):
 		objType = objList[0].getType()
 
 		if objType in ('OpsiClient', 'OpsiConfigserver', 'OpsiDepotserver'):
-			hostKeyFile = HostKeyFile(self._getConfigFile('', {}, 'key'))
+			hostKeyFilename = self._getConfigFile('', {}, 'key')
+			hostKeyFile = HostKeyFile(hostKeyFilename)
 			for obj in objList:
 				if obj.getId() == self.__serverId:
 					logger.warning(u"Cannot delete %s '%s', ignored." % (obj.getType(), obj.getId()))
 					continue
 
-				logger.debug(u"Deleting %s: '%s'" % (obj.getType(), obj.getIdent()))
+				logger.debug(u"Deleting {0}: '{1}'", obj.getType(), obj.getIdent())
 				hostKeyFile.deleteOpsiHostKey(obj.getId())
 
 				filename = self._getConfigFile(
 					obj.getType(), obj.getIdent(returnType='dict'), 'ini')
 				if os.path.isfile(filename):
-					os.unlink(filename)
+					with _updatingDirectoryIndex(filename):
+						os.unlink(filename)
 			hostKeyFile.generate()
+			_updateParsedFile(hostKeyFilename, _parseHostKeyFile, hostKeyFile.getLines())
 
 		elif objType in ('Config', 'UnicodeConfig', 'BoolConfig'):
 			filename = self._getConfigFile(objType, {}, 'ini')
 			iniFile = IniFile(filename=filename, ignoreCase=False)
 			cp = iniFile.parse()
 			for obj in objList:
-				logger.debug(u"Deleting %s: '%s'" % (obj.getType(), obj.getIdent()))
+				logger.debug(u"Deleting {0}: '{1}'", obj.getType(), obj.getIdent())
 				if cp.has_section(obj.getId()):
 					cp.remove_section(obj.getId())
-					logger.debug2(u"Removed section '%s'" % obj.getId())
+					logger.debug2(u"Removed section '{0}'", obj.getId())
 			iniFile.generate(cp)
+			_updateParsedFile(filename, _parseIniFile, iniFile.getLines())
 
 		elif objType == 'ConfigState':
 			filenames = set(self._getConfigFile(obj.getType(), obj.getIdent(returnType='dict'), 'ini') for obj in objList)
@@ -1110,21 +1321,23 @@ class FileBackend(ConfigDataBackend):
 					if not (obj.getObjectId() == os.path.basename(filename)[:-4]):
 						continue
 
-					logger.debug(u"Deleting %s: '%s'" % (obj.getType(), obj.getIdent()))
+					logger.debug(u"Deleting {0}: '{1}'", obj.getType(), obj.getIdent())
 					if cp.has_option('generalconfig', obj.getConfigId()):
 						cp.remove_option('generalconfig', obj.getConfigId())
-						logger.debug2(u"Removed option in generalconfig '%s'" % obj.getConfigId())
+						logger.debug2(u"Removed option in generalconfig '{0}'", obj.getConfigId())
 
 				iniFile.generate(cp)
+				_updateParsedFile(filename, _parseIniFile, iniFile.getLines())
 
 		elif objType in ('Product', 'LocalbootProduct', 'NetbootProduct'):
 			for obj in objList:
 				filename = self._getConfigFile(
 					obj.getType(), obj.getIdent(returnType='dict'), 'pro')
-				logger.debug(u"Deleting %s: '%s'" % (obj.getType(), obj.getIdent()))
+				logger.debug(u"Deleting {0}: '{1}'", obj.getType(), obj.getIdent())
 				if os.path.isfile(filename):
-					os.unlink(filename)
-					logger.debug2(u"Removed file '%s'" % filename)
+					with _updatingDirectoryIndex(filename):
+						os.unlink(filename)
+					logger.debug2(u"Removed file '{0}'", filename)
 
 		elif objType in ('ProductProperty', 'UnicodeProductProperty', 'BoolProductProperty', 'ProductDependency'):
 			filenames = set(self._getConfigFile(obj.getType(), obj.getIdent(returnType='dict'), 'pro') for obj in objList)
@@ -1145,7 +1358,7 @@ class FileBackend(ConfigDataBackend):
 							delete = True
 							break
 					if delete:
-						logger.debug(u"Deleting %s: '%s'" % (obj.getType(), obj.getIdent()))
+						logger.debug(u"Deleting {0}: '{1}'", obj.getType(), obj.getIdent())
 					else:
 						newList.append(oldItem)
 
@@ -1155,6 +1368,7 @@ class FileBackend(ConfigDataBackend):
 					packageControlFile.setProductProperties(newList)
 
 				packageControlFile.generate()
+				_updateParsedFile(filename, _parsePackageControlFile, packageControlFile.getLines())
 
 		elif objType in ('ProductOnDepot', 'ProductOnClient'):
 			filenames = set(self._getConfigFile(obj.getType(), obj.getIdent(returnType='dict'), 'ini') for obj in objList)
@@ -1164,16 +1378,17 @@ class FileBackend(ConfigDataBackend):
 				cp = iniFile.parse()
 
 				for obj in objList:
-					logger.debug(u"Deleting %s: '%s'" % (obj.getType(), obj.getIdent()))
+					logger.debug(u"Deleting {0}: '{1}'", obj.getType(), obj.getIdent())
 					if cp.has_section(obj.getProductId() + '-state'):
 						cp.remove_section(obj.getProductId() + '-state')
-						logger.debug2(u"Removed section '%s'" % obj.getProductId() + '-state')
+						logger.debug2(u"Removed section '{0}-state'", obj.getProductId())
 
 				iniFile.generate(cp)
+				_updateParsedFile(filename, _parseIniFile, iniFile.getLines())
 
 		elif objType == 'ProductPropertyState':
 			for obj in objList:
-				logger.debug(u"Deleting %s: '%s'" % (obj.getType(), obj.getIdent()))
+				logger.debug(u"Deleting {0}: '{1}'", obj.getType(), obj.getIdent())
 				filename = self._getConfigFile(
 					obj.getType(), obj.getIdent(returnType='dict'), 'ini')
 				iniFile = IniFile(filename=filename, ignoreCase=False)
@@ -1184,13 +1399,14 @@ class FileBackend(ConfigDataBackend):
 
 				if cp.has_option(section, option):
 					cp.remove_option(section, option)
-					logger.debug2(u"Removed option '%s' in section '%s'" % (option, section))
+					logger.debug2(u"Removed option '{0}' in section '{1}'", option, section)
 
 				if cp.has_section(section) and len(cp.options(section)) == 0:
 					cp.remove_section(section)
-					logger.debug2(u"Removed empty section '%s'" % section)
+					logger.debug2(u"Removed empty section '{0}'", section)
 
 				iniFile.generate(cp)
+				_updateParsedFile(filename, _parseIniFile, iniFile.getLines())
 
 		elif objType in ('Group', 'HostGroup', 'ProductGroup', 'ObjectToGroup'):
 			passes = [
@@ -1215,17 +1431,18 @@ class FileBackend(ConfigDataBackend):
 							continue
 						section = obj.getId()
 
-					logger.debug(u"Deleting %s: '%s'" % (obj.getType(), obj.getIdent()))
+					logger.debug(u"Deleting {0}: '{1}'", obj.getType(), obj.getIdent())
 					if obj.getType() == 'ObjectToGroup':
 						if cp.has_option(section, obj.getObjectId()):
 							cp.remove_option(section, obj.getObjectId())
-							logger.debug2(u"Removed option '%s' in section '%s'" % (obj.getObjectId(), section))
+							logger.debug2(u"Removed option '{0}' in section '{1}'", obj.getObjectId(), section)
 					else:
 						if cp.has_section(section):
 							cp.remove_section(section)
-							logger.debug2(u"Removed section '%s'" % section)
+							logger.debug2(u"Removed section '{0}'", section)
 
 				iniFile.generate(cp)
+				_updateParsedFile(p['filename'], _parseIniFile, iniFile.getLines())
 		else:
 			logger.warning(u"_delete(): unhandled objType: '%s' object: %s" % (objType, objList[0]))
 
@@ -1237,14 +1454,14 @@ class FileBackend(ConfigDataBackend):
 		host = forceObjectClass(host, Host)
 		ConfigDataBackend.host_insertObject(self, host)
 
-		logger.debug(u"Inserting host: '%s'" % host.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting host: '{0}'", host.getIdent())  # pylint: disable=maybe-no-member
 		self._write(host, mode='create')
 
 	def host_updateObject(self, host):
 		host = forceObjectClass(host, Host)
 		ConfigDataBackend.host_updateObject(self, host)
 
-		logger.debug(u"Updating host: '%s'" % host.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating host: '{0}'", host.getIdent())  # pylint: disable=maybe-no-member
 		self._write(host, mode='update')
 
 	def host_getObjects(self, attributes=[], **filter):
@@ -1279,14 +1496,14 @@ class FileBackend(ConfigDataBackend):
 		config = forceObjectClass(config, Config)
 		ConfigDataBackend.config_insertObject(self, config)
 
-		logger.debug(u"Inserting config: '%s'" % config.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting config: '{0}'", config.getIdent())  # pylint: disable=maybe-no-member
 		self._write(config, mode='create')
 
 	def config_updateObject(self, config):
 		config = forceObjectClass(config, Config)
 		ConfigDataBackend.config_updateObject(self, config)
 
-		logger.debug(u"Updating config: '%s'" % config.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating config: '{0}'", config.getIdent())  # pylint: disable=maybe-no-member
 		self._write(config, mode='update')
 
 	def config_getObjects(self, attributes=[], **filter):
@@ -1306,14 +1523,14 @@ class FileBackend(ConfigDataBackend):
 		configState = forceObjectClass(configState, ConfigState)
 		ConfigDataBackend.configState_insertObject(self, configState)
 
-		logger.debug(u"Inserting configState: '%s'" % configState.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting configState: '{0}'", configState.getIdent())  # pylint: disable=maybe-no-member
 		self._write(configState, mode='create')
 
 	def configState_updateObject(self, configState):
 		configState = forceObjectClass(configState, ConfigState)
 		ConfigDataBackend.configState_updateObject(self, configState)
 
-		logger.debug(u"Updating configState: '%s'" % configState.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating configState: '{0}'", configState.getIdent())  # pylint: disable=maybe-no-member
 		self._write(configState, mode='update')
 
 	def configState_getObjects(self, attributes=[], **filter):
@@ -1333,14 +1550,14 @@ class FileBackend(ConfigDataBackend):
 		product = forceObjectClass(product, Product)
 		ConfigDataBackend.product_insertObject(self, product)
 
-		logger.debug(u"Inserting product: '%s'" % product.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting product: '{0}'", product.getIdent())  # pylint: disable=maybe-no-member
 		self._write(product, mode='create')
 
 	def product_updateObject(self, product):
 		product = forceObjectClass(product, Product)
 		ConfigDataBackend.product_updateObject(self, product)
 
-		logger.debug(u"Updating product: '%s'" % product.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating product: '{0}'", product.getIdent())  # pylint: disable=maybe-no-member
 		self._write(product, mode='update')
 
 	def product_getObjects(self, attributes=[], **filter):
@@ -1363,14 +1580,14 @@ class FileBackend(ConfigDataBackend):
 		productProperty = forceObjectClass(productProperty, ProductProperty)
 		ConfigDataBackend.productProperty_insertObject(self, productProperty)
 
-		logger.debug(u"Inserting productProperty: '%s'" % productProperty.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting productProperty: '{0}'", productProperty.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productProperty, mode='create')
 
 	def productProperty_updateObject(self, productProperty):
 		productProperty = forceObjectClass(productProperty, ProductProperty)
 		ConfigDataBackend.productProperty_updateObject(self, productProperty)
 
-		logger.debug(u"Updating productProperty: '%s'" % productProperty.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating productProperty: '{0}'", productProperty.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productProperty, mode='update')
 
 	def productProperty_getObjects(self, attributes=[], **filter):
@@ -1390,14 +1607,14 @@ class FileBackend(ConfigDataBackend):
 		productDependency = forceObjectClass(productDependency, ProductDependency)
 		ConfigDataBackend.productDependency_insertObject(self, productDependency)
 
-		logger.debug(u"Inserting productDependency: '%s'" % productDependency.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting productDependency: '{0}'", productDependency.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productDependency, mode='create')
 
 	def productDependency_updateObject(self, productDependency):
 		productDependency = forceObjectClass(productDependency, ProductDependency)
 		ConfigDataBackend.productDependency_updateObject(self, productDependency)
 
-		logger.debug(u"Updating productDependency: '%s'" % productDependency.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating productDependency: '{0}'", productDependency.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productDependency, mode='update')
 
 	def productDependency_getObjects(self, attributes=[], **filter):
@@ -1417,14 +1634,14 @@ class FileBackend(ConfigDataBackend):
 		productOnDepot = forceObjectClass(productOnDepot, ProductOnDepot)
 		ConfigDataBackend.productOnDepot_insertObject(self, productOnDepot)
 
-		logger.debug(u"Inserting productOnDepot: '%s'" % productOnDepot.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting productOnDepot: '{0}'", productOnDepot.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productOnDepot, mode='create')
 
 	def productOnDepot_updateObject(self, productOnDepot):
 		productOnDepot = forceObjectClass(productOnDepot, ProductOnDepot)
 		ConfigDataBackend.productOnDepot_updateObject(self, productOnDepot)
 
-		logger.debug(u"Updating productOnDepot: '%s'" % productOnDepot.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating productOnDepot: '{0}'", productOnDepot.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productOnDepot, mode='update')
 
 	def productOnDepot_getObjects(self, attributes=[], **filter):
@@ -1444,14 +1661,14 @@ class FileBackend(ConfigDataBackend):
 		productOnClient = forceObjectClass(productOnClient, ProductOnClient)
 		ConfigDataBackend.productOnClient_insertObject(self, productOnClient)
 
-		logger.debug(u"Inserting productOnClient: '%s'" % productOnClient.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting productOnClient: '{0}'", productOnClient.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productOnClient, mode='create')
 
 	def productOnClient_updateObject(self, productOnClient):
 		productOnClient = forceObjectClass(productOnClient, ProductOnClient)
 		ConfigDataBackend.productOnClient_updateObject(self, productOnClient)
 
-		logger.debug(u"Updating productOnClient: '%s'" % productOnClient.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating productOnClient: '{0}'", productOnClient.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productOnClient, mode='update')
 
 	def productOnClient_getObjects(self, attributes=[], **filter):
@@ -1471,14 +1688,14 @@ class FileBackend(ConfigDataBackend):
 		productPropertyState = forceObjectClass(productPropertyState, ProductPropertyState)
 		ConfigDataBackend.productPropertyState_insertObject(self, productPropertyState)
 
-		logger.debug(u"Inserting productPropertyState: '%s'" % productPropertyState.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting productPropertyState: '{0}'", productPropertyState.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productPropertyState, mode='create')
 
 	def productPropertyState_updateObject(self, productPropertyState):
 		productPropertyState = forceObjectClass(productPropertyState, ProductPropertyState)
 		ConfigDataBackend.productPropertyState_updateObject(self, productPropertyState)
 
-		logger.debug(u"Updating productPropertyState: '%s'" % productPropertyState.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating productPropertyState: '{0}'", productPropertyState.getIdent())  # pylint: disable=maybe-no-member
 		self._write(productPropertyState, mode='update')
 
 	def productPropertyState_getObjects(self, attributes=[], **filter):
@@ -1498,14 +1715,14 @@ class FileBackend(ConfigDataBackend):
 		group = forceObjectClass(group, Group)
 		ConfigDataBackend.group_insertObject(self, group)
 
-		logger.debug(u"Inserting group: '%s'" % group.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting group: '{0}'", group.getIdent())  # pylint: disable=maybe-no-member
 		self._write(group, mode='create')
 
 	def group_updateObject(self, group):
 		group = forceObjectClass(group, Group)
 		ConfigDataBackend.group_updateObject(self, group)
 
-		logger.debug(u"Updating group: '%s'" % group.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating group: '{0}'", group.getIdent())  # pylint: disable=maybe-no-member
 		self._write(group, mode='update')
 
 	def group_getObjects(self, attributes=[], **filter):
@@ -1525,14 +1742,14 @@ class FileBackend(ConfigDataBackend):
 		objectToGroup = forceObjectClass(objectToGroup, ObjectToGroup)
 		ConfigDataBackend.objectToGroup_insertObject(self, objectToGroup)
 
-		logger.debug(u"Inserting objectToGroup: '%s'" % objectToGroup.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting objectToGroup: '{0}'", objectToGroup.getIdent())  # pylint: disable=maybe-no-member
 		self._write(objectToGroup, mode='create')
 
 	def objectToGroup_updateObject(self, objectToGroup):
 		objectToGroup = forceObjectClass(objectToGroup, ObjectToGroup)
 		ConfigDataBackend.objectToGroup_updateObject(self, objectToGroup)
 
-		logger.debug(u"Updating objectToGroup: '%s'" % objectToGroup.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating objectToGroup: '{0}'", objectToGroup.getIdent())  # pylint: disable=maybe-no-member
 		self._write(objectToGroup, mode='update')
 
 	def objectToGroup_getObjects(self, attributes=[], **filter):
@@ -1552,7 +1769,7 @@ class FileBackend(ConfigDataBackend):
 		auditSoftware = forceObjectClass(auditSoftware, AuditSoftware)
 		ConfigDataBackend.auditSoftware_insertObject(self, auditSoftware)
 
-		logger.debug(u"Inserting auditSoftware: '%s'" % auditSoftware.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting auditSoftware: '{0}'", auditSoftware.getIdent())  # pylint: disable=maybe-no-member
 		filename = self._getConfigFile('AuditSoftware', {}, 'sw')
 
 		if not os.path.exists(filename):
@@ -1587,14 +1804,14 @@ class FileBackend(ConfigDataBackend):
 			if matches:
 				removeSection = section
 				newNum = num
-				logger.debug(u"Found auditSoftware section '%s' to replace" % removeSection)
+				logger.debug(u"Found auditSoftware section '{0}' to replace", removeSection)
 				break
 
 		section = u'software_%d' % newNum
 		if removeSection:
 			ini.remove_section(removeSection)
 		else:
-			logger.debug(u"Inserting new auditSoftware section '%s'" % section)
+			logger.debug(u"Inserting new auditSoftware section '{0}'", section)
 
 		ini.add_section(section)
 		for (attribute, value) in auditSoftware.items():
@@ -1607,7 +1824,7 @@ class FileBackend(ConfigDataBackend):
 		auditSoftware = forceObjectClass(auditSoftware, AuditSoftware)
 		ConfigDataBackend.auditSoftware_updateObject(self, auditSoftware)
 
-		logger.debug(u"Updating auditSoftware: '%s'" % auditSoftware.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating auditSoftware: '{0}'", auditSoftware.getIdent())  # pylint: disable=maybe-no-member
 		filename = self._getConfigFile('AuditSoftware', {}, 'sw')
 		iniFile = IniFile(filename=filename)
 		ini = iniFile.parse()
@@ -1648,6 +1865,7 @@ class FileBackend(ConfigDataBackend):
 					if len(value) == 1 and value[0].find('*') == -1:
 						fastFilter[attribute] = value[0]
 
+		objectHashMatches = compileFilter(**filter)
 		result = []
 		for section in ini.sections():
 			objHash = {
@@ -1671,7 +1889,7 @@ class FileBackend(ConfigDataBackend):
 					objHash[key] = value
 				except Exception:
 					pass
-			if not fastFiltered and self._objectHashMatches(objHash, **filter):
+			if not fastFiltered and objectHashMatches(objHash):
 				# TODO: adaptObjHash?
 				result.append(AuditSoftware.fromHash(objHash))
 
@@ -1713,7 +1931,7 @@ class FileBackend(ConfigDataBackend):
 		auditSoftwareOnClient = forceObjectClass(auditSoftwareOnClient, AuditSoftwareOnClient)
 		ConfigDataBackend.auditSoftwareOnClient_insertObject(self, auditSoftwareOnClient)
 
-		logger.debug(u"Inserting auditSoftwareOnClient: '%s'" % auditSoftwareOnClient.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting auditSoftwareOnClient: '{0}'", auditSoftwareOnClient.getIdent())  # pylint: disable=maybe-no-member
 		filename = self._getConfigFile('AuditSoftwareOnClient', {"clientId": auditSoftwareOnClient.clientId}, 'sw')  # pylint: disable=maybe-no-member
 
 		if not os.path.exists(filename):
@@ -1747,14 +1965,14 @@ class FileBackend(ConfigDataBackend):
 			if matches:
 				removeSection = section
 				newNum = num
-				logger.debug(u"Found auditSoftwareOnClient section '%s' to replace" % removeSection)
+				logger.debug(u"Found auditSoftwareOnClient section '{0}' to replace", removeSection)
 				break
 
 		section = u'software_%d' % newNum
 		if removeSection:
 			ini.remove_section(removeSection)
 		else:
-			logger.debug(u"Inserting new auditSoftwareOnClient section '%s'" % section)
+			logger.debug(u"Inserting new auditSoftwareOnClient section '{0}'", section)
 
 		ini.add_section(section)
 		for (attribute, value) in auditSoftwareOnClient.items():
@@ -1767,7 +1985,7 @@ class FileBackend(ConfigDataBackend):
 		auditSoftwareOnClient = forceObjectClass(auditSoftwareOnClient, AuditSoftwareOnClient)
 		ConfigDataBackend.auditSoftwareOnClient_updateObject(self, auditSoftwareOnClient)
 
-		logger.debug(u"Updating auditSoftwareOnClient: '%s'" % auditSoftwareOnClient.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating auditSoftwareOnClient: '{0}'", auditSoftwareOnClient.getIdent())  # pylint: disable=maybe-no-member
 		filename = self._getConfigFile('AuditSoftwareOnClient', {"clientId": auditSoftwareOnClient.clientId}, 'sw')  # pylint: disable=maybe-no-member
 		iniFile = IniFile(filename=filename)
 		ini = iniFile.parse()
@@ -1798,6 +2016,7 @@ class FileBackend(ConfigDataBackend):
 			if ident['clientId'] not in filenames:
 				filenames[ident['clientId']] = self._getConfigFile('AuditSoftwareOnClient', ident, 'sw')
 
+		objectHashMatches = compileFilter(**filter)
 		result = []
 		for (clientId, filename) in filenames.items():
 			if not os.path.exists(filename):
@@ -1827,7 +2046,7 @@ class FileBackend(ConfigDataBackend):
 					except Exception:
 						pass
 
-				if self._objectHashMatches(objHash, **filter):
+				if objectHashMatches(objHash):
 					result.append(AuditSoftwareOnClient.fromHash(objHash))
 
 		return result
@@ -1872,14 +2091,14 @@ class FileBackend(ConfigDataBackend):
 		auditHardware = forceObjectClass(auditHardware, AuditHardware)
 		ConfigDataBackend.auditHardware_insertObject(self, auditHardware)
 
-		logger.debug(u"Inserting auditHardware: '%s'" % auditHardware.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Inserting auditHardware: '{0}'", auditHardware.getIdent())  # pylint: disable=maybe-no-member
 		self.__doAuditHardwareObj(auditHardware, mode='insert')
 
 	def auditHardware_updateObject(self, auditHardware):
 		auditHardware = forceObjectClass(auditHardware, AuditHardware)
 		ConfigDataBackend.auditHardware_updateObject(self, auditHardware)
 
-		logger.debug(u"Updating auditHardware: '%s'" % auditHardware.getIdent())  # pylint: disable=maybe-no-member
+		logger.debug(u"Updating auditHardware: '{0}'", auditHardware.getIdent())  # pylint: disable=maybe-no-member
 		self.__doAuditHardwareObj(auditHardware, mode='update')
 
 	def auditHardware_getObjects(self, attributes=[], **filter):
@@ -1890,6 +2109,7 @@ class FileBackend(ConfigDataBackend):
 		if not os.path.exists(filename):
 			return []
 
+		objectHashMatches = compileFilter(**filter)
 		result = []
 		iniFile = IniFile(filename=filename)
 		ini = iniFile.parse()
@@ -1902,7 +2122,7 @@ class FileBackend(ConfigDataBackend):
 					objHash[str(option)] = self.__unescape(ini.get(section, option))
 
 			auditHardware = AuditHardware.fromHash(objHash)
-			if self._objectHashMatches(auditHardware.toHash(), **filter):
+			if objectHashMatches(auditHardware.toHash()):
 				result.append(auditHardware)
 
 		return result
@@ -1920,14 +2140,14 @@ class FileBackend(ConfigDataBackend):
 		auditHardwareOnHost = forceObjectClass(auditHardwareOnHost, AuditHardwareOnHost)
 		ConfigDataBackend.auditHardwareOnHost_insertObject(self, auditHardwareOnHost)
 
-		logger.debug(u"Inserting auditHardwareOnHost: '%s'" % auditHardwareOnHost.getIdent())
+		logger.debug(u"Inserting auditHardwareOnHost: '{0}'", auditHardwareOnHost.getIdent())
 		self.__doAuditHardwareObj(auditHardwareOnHost, mode='insert')
 
 	def auditHardwareOnHost_updateObject(self, auditHardwareOnHost):
 		auditHardwareOnHost = forceObjectClass(auditHardwareOnHost, AuditHardwareOnHost)
 		ConfigDataBackend.auditHardwareOnHost_updateObject(self, auditHardwareOnHost)
 
-		logger.debug(u"Updating auditHardwareOnHost: '%s'" % auditHardwareOnHost.getIdent())
+		logger.debug(u"Updating auditHardwareOnHost: '{0}'", auditHardwareOnHost.getIdent())
 		self.__doAuditHardwareObj(auditHardwareOnHost, mode='update')
 
 	def auditHardwareOnHost_getObjects(self, attributes=[], **filter):
@@ -1939,6 +2159,7 @@ class FileBackend(ConfigDataBackend):
 			if ident['hostId'] not in filenames:
 				filenames[ident['hostId']] = self._getConfigFile('AuditHardwareOnHost', ident, 'hw')
 
+		objectHashMatches = compileFilter(**filter)
 		result = []
 		for (hostId, filename) in filenames.items():
 			if not os.path.exists(filename):
@@ -1957,7 +2178,7 @@ class FileBackend(ConfigDataBackend):
 						objHash[str(option)] = self.__unescape(ini.get(section, option))
 
 				auditHardwareOnHost = AuditHardwareOnHost.fromHash(objHash)
-				if self._objectHashMatches(auditHardwareOnHost.toHash(), **filter):
+				if objectHashMatches(auditHardwareOnHost.toHash()):
 					result.append(auditHardwareOnHost)
 
 		return result
@@ -2008,7 +2229,7 @@ class FileBackend(ConfigDataBackend):
 					matches = False
 					break
 			if matches:
-				logger.debug(u"Found matching section '%s' in audit file '%s' for object %s" % (section, filename, objHash))
+				logger.debug(u"Found matching section '{0}' in audit file '{1}' for object {2}", section, filename, objHash)
 				sectionFound = section
 				break
 
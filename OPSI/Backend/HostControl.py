@@ -30,10 +30,11 @@ This backend can be used to control hosts.
 
 import base64
 import socket
+import ssl
 import struct
 import time
 
-from contextlib import closing
+from Queue import Queue
 
 try:
 	from httplib import HTTPSConnection
@@ -42,19 +43,448 @@ except ImportError:
 	from http.client import HTTPSConnection
 
 from OPSI.Logger import Logger, LOG_DEBUG
-from OPSI.Types import BackendMissingDataError
-from OPSI.Types import (forceBool, forceHostId, forceHostIdList, forceInt,
-						forceIpAddress, forceList, forceUnicode,
+from OPSI.Types import BackendMissingDataError, OpsiTimeoutError
+from OPSI.Types import (forceBool, forceDict, forceFloat, forceHardwareAddress,
+						forceHostId, forceHostIdList, forceInt, forceIpAddress,
+						forceList, forceNetworkAddress, forceUnicode,
 						forceUnicodeList)
 from OPSI.Backend.Backend import ExtendedBackend
 from OPSI.Util import fromJson, toJson
-from OPSI.Util.Thread import KillableThread
-from OPSI.Util.HTTP import closingConnection, non_blocking_connect_https
+from OPSI.Util.Thread import KillableThread, ThreadPool
+from OPSI.Util.HTTP import closingConnection
 
 __version__ = '4.0.7.2'
 
 logger = Logger()
 
+WAKE_ON_LAN_PORT = 12287
+# Seconds every socket operation may take if no timeout is given, so
+# that an unresponsive opsiclientd does not block a worker forever.
+SOCKET_TIMEOUT_WITHOUT_DEADLINE = 120
+
+
+def _getDeadline(timeout):
+	if timeout > 0:
+		return time.time() + timeout
+
+	return None
+
+
+def _getRemainingTime(deadline):
+	"""
+	Get the seconds left until `deadline`.
+
+	:raises OpsiTimeoutError: If the deadline has passed.
+	:returns: The remaining time or `SOCKET_TIMEOUT_WITHOUT_DEADLINE` \
+if there is no deadline.
+	"""
+	if deadline is None:
+		return SOCKET_TIMEOUT_WITHOUT_DEADLINE
+
+	remaining = deadline - time.time()
+	if remaining <= 0:
+		raise OpsiTimeoutError(u"Deadline has passed")
+
+	return remaining
+
+
+def _connectOpsiclientd(address, port, deadline):
+	"""
+	Open a HTTPS connection to opsiclientd.
+
+	Failed connection attempts are repeated until `deadline`. \
+The connection, the TLS handshake and every later operation on the \
+socket are limited by the time left until then.
+
+	:param deadline: Time as returned by `time.time()` or `None` \
+to give up after the first failed attempt. Without a deadline every \
+operation is limited to `SOCKET_TIMEOUT_WITHOUT_DEADLINE` seconds.
+	:rtype: HTTPSConnection
+	"""
+	while True:
+		timeout = _getRemainingTime(deadline)
+		try:
+			sock = socket.create_connection((address, port), timeout)
+			break
+		except socket.timeout:
+			raise
+		except socket.error as error:
+			logger.debug(u"Failed to connect to '{0}:{1}': {2}", address, port, error)
+			if deadline is None or time.time() + 0.5 >= deadline:
+				raise
+			time.sleep(0.5)
+
+	try:
+		sock = ssl.wrap_socket(sock, cert_reqs=ssl.CERT_NONE)
+	except Exception:
+		sock.close()
+		raise
+
+	connection = HTTPSConnection(host=address, port=port, timeout=timeout)
+	connection.sock = sock
+	return connection
+
+
+def callOpsiclientd(address, port, username, password, method, params=[], timeout=15):
+	"""
+	Call `method` of the opsiclientd at `address`.
+
+	:param timeout: Seconds until the call has to be finished. \
+Values below 1 disable the timeout of the whole call, but every \
+socket operation still gives up after \
+`SOCKET_TIMEOUT_WITHOUT_DEADLINE` seconds.
+	:raises OpsiTimeoutError: If the call did not finish in time.
+	:returns: Tuple of the result and the error returned by opsiclientd.
+	"""
+	started = time.time()
+	deadline = _getDeadline(timeout)
+	query = toJson(
+		{
+			'id': 1,
+			'method': method,
+			'params': params
+		}
+	).encode('utf-8')
+
+	try:
+		connection = _connectOpsiclientd(address, port, deadline)
+		with closingConnection(connection) as connection:
+			connection.putrequest('POST', '/opsiclientd')
+			connection.putheader('content-type', 'application/json')
+			connection.putheader('content-length', str(len(query)))
+			auth = u'{0}:{1}'.format(username, password)
+			connection.putheader('Authorization', 'Basic ' + base64.encodestring(auth.encode('latin-1')).strip())
+			connection.sock.settimeout(_getRemainingTime(deadline))
+			connection.endheaders()
+			connection.send(query)
+
+			connection.sock.settimeout(_getRemainingTime(deadline))
+			response = connection.getresponse()
+			response = response.read()
+	except (socket.timeout, OpsiTimeoutError):
+		raise OpsiTimeoutError(u"timed out after %0.2f seconds" % (time.time() - started))
+	except ssl.SSLError as error:
+		# Timeouts of SSL sockets are no socket.timeout on Python 2.
+		if 'timed out' not in str(error):
+			raise
+		raise OpsiTimeoutError(u"timed out after %0.2f seconds" % (time.time() - started))
+
+	response = fromJson(unicode(response, 'utf-8'))
+	if response and isinstance(response, dict):
+		return (response.get('result'), response.get('error'))
+
+	return (None, u"Bad response from client: %s" % forceUnicode(response))
+
+
+def isOpsiclientdReachable(address, port, timeout=3):
+	"""
+	Check if a connection to the opsiclientd at `address` can be made.
+
+	:param timeout: Seconds to wait for the connection. Values below 1 \
+wait up to `SOCKET_TIMEOUT_WITHOUT_DEADLINE` seconds.
+	:rtype: bool
+	"""
+	logger.info(u"Trying connection to '%s:%d'" % (address, port))
+	try:
+		connection = _connectOpsiclientd(address, port, _getDeadline(timeout))
+	except Exception as error:
+		logger.logException(error, LOG_DEBUG)
+		logger.debug(error)
+		return False
+
+	connection.close()
+	return True
+
+
+def runConcurrently(function, jobs, maxConnections):
+	"""
+	Call `function` for many hosts at the same time.
+
+	At most `maxConnections` calls are running at once and results are \
+returned as soon as they are available.
+
+	:param jobs: Tuples of a host id and the arguments for `function`.
+	:returns: Generator of tuples of the host id, a success flag and \
+the return value of `function` or the exception it raised.
+	"""
+	jobs = list(jobs)
+	if not jobs:
+		return
+
+	results = Queue()
+	pool = ThreadPool(size=min(maxConnections, len(jobs)))
+	try:
+		for (hostId, args) in jobs:
+			def jobDone(success, result, error, hostId=hostId):
+				results.put((hostId, success, result if success else error))
+
+			pool.addJob(function, jobDone, *args)
+
+		for _ in jobs:
+			yield results.get()
+	finally:
+		pool.stop()
+
+
+def iterOpsiclientdRpc(hostControlBackend, hostIds, method, params=[], timeout=None):
+	"""
+	Call `method` of opsiclientd on every host in `hostIds`.
+
+	Up to `maxConnections` of `hostControlBackend` calls run at the \
+same time.
+
+	:returns: Generator of tuples of the host id and a dict with the \
+keys `result` and `error` in the order the calls finish.
+	"""
+	if not hostIds:
+		raise BackendMissingDataError(u"No matching host ids found")
+	hostIds = forceHostIdList(hostIds)
+	method = forceUnicode(method)
+	params = forceList(params)
+	if not timeout:
+		timeout = hostControlBackend._hostRpcTimeout
+	timeout = forceInt(timeout)
+
+	jobs = []
+	for host in hostControlBackend._context.host_getObjects(id=hostIds):  # pylint: disable=maybe-no-member
+		try:
+			address = hostControlBackend._getHostAddress(host)
+		except Exception as e:
+			yield (host.id, {"result": None, "error": forceUnicode(e)})
+			continue
+
+		jobs.append((
+			host.id,
+			(address, hostControlBackend._opsiclientdPort, u'', host.opsiHostKey, method, params, timeout)
+		))
+
+	for (hostId, success, result) in runConcurrently(callOpsiclientd, jobs, hostControlBackend._maxConnections):
+		if success:
+			(result, error) = result
+		else:
+			(result, error) = (None, forceUnicode(result))
+
+		if error:
+			logger.error(u"Rpc to host %s failed, error: %s" % (hostId, error))
+		else:
+			logger.info(u"Rpc to host %s successful, result: %s" % (hostId, result))
+
+		yield (hostId, {"result": result, "error": error})
+
+
+def iterReachable(hostControlBackend, hostIds, timeout=None):
+	"""
+	Check if opsiclientd on every host in `hostIds` can be reached.
+
+	:returns: Generator of tuples of the host id and a bool in the \
+order the checks finish.
+	"""
+	if not hostIds:
+		raise BackendMissingDataError(u"No matching host ids found")
+	hostIds = forceHostIdList(hostIds)
+	if not timeout:
+		timeout = hostControlBackend._hostReachableTimeout
+	timeout = forceInt(timeout)
+
+	jobs = []
+	for host in hostControlBackend._context.host_getObjects(id=hostIds):  # pylint: disable=maybe-no-member
+		try:
+			address = hostControlBackend._getHostAddress(host)
+		except Exception as e:
+			logger.debug("Problem found: '%s'" % e)
+			yield (host.id, False)
+			continue
+
+		jobs.append((host.id, (address, hostControlBackend._opsiclientdPort, timeout)))
+
+	for (hostId, success, result) in runConcurrently(isOpsiclientdReachable, jobs, hostControlBackend._maxConnections):
+		yield (hostId, success and result)
+
+
+def createMagicPacket(hardwareAddress):
+	"""
+	Create the Wake-on-LAN packet for a network card.
+
+	:param hardwareAddress: The MAC address of the network card.
+	:rtype: str
+	"""
+	hardwareAddress = forceHardwareAddress(hardwareAddress)
+	if not hardwareAddress:
+		raise ValueError(u"No hardware address given")
+
+	mac = ''.join(chr(int(part, 16)) for part in hardwareAddress.split(u':'))
+	return '\xff' * 6 + mac * 16
+
+
+def _ipAddressToInt(address):
+	return struct.unpack('>I', socket.inet_aton(address))[0]
+
+
+def _intToIpAddress(number):
+	return forceUnicode(socket.inet_ntoa(struct.pack('>I', number)))
+
+
+def compileBroadcastAddresses(broadcastAddresses):
+	"""
+	Create a function returning the broadcast addresses for a host.
+
+	`broadcastAddresses` is either a list of addresses used for every \
+host or a dict mapping networks in slash notation to lists of \
+broadcast addresses. An empty list stands for the broadcast address of \
+the network itself. A host uses the addresses of the smallest network \
+containing its IP address. Hosts without an IP address only match \
+the network `0.0.0.0/0`.
+
+	:returns: Function taking the IP address of a host and returning \
+a list of broadcast addresses.
+	"""
+	if not isinstance(broadcastAddresses, dict):
+		addresses = forceUnicodeList(broadcastAddresses)
+		return lambda ipAddress: addresses
+
+	networks = []
+	for (networkAddress, addresses) in broadcastAddresses.items():
+		(network, netmask) = forceNetworkAddress(networkAddress).split(u'/')
+		if u'.' in netmask:
+			while netmask.count(u'.') < 3:
+				netmask += u'.0'
+			mask = _ipAddressToInt(netmask)
+		else:
+			mask = (0xffffffff << (32 - forceInt(netmask))) & 0xffffffff
+
+		network = _ipAddressToInt(network) & mask
+		addresses = forceUnicodeList(addresses or [])
+		if not addresses:
+			addresses = [_intToIpAddress(network | (~mask & 0xffffffff))]
+
+		networks.append((mask, network, addresses))
+
+	# The most specific network is tested first.
+	networks.sort(reverse=True)
+
+	def getBroadcastAddresses(ipAddress):
+		ip = _ipAddressToInt(ipAddress) if ipAddress else None
+		for (mask, network, addresses) in networks:
+			if ip is None:
+				if not mask:
+					return addresses
+			elif ip & mask == network:
+				return addresses
+
+		return []
+
+	return getBroadcastAddresses
+
+
+def sendWakeOnLanPackets(packets, port=WAKE_ON_LAN_PORT, rate=0, waves=1, waveInterval=1):
+	"""
+	Send Wake-on-LAN packets to broadcast addresses.
+
+	One socket is opened per broadcast address and used for all of \
+its packets.
+
+	:param packets: Tuples of a host id, the packet of the host and \
+the broadcast addresses to send it to.
+	:param rate: The maximum number of packets sent per second. \
+Values below or equal to 0 disable the limit.
+	:param waves: How often every packet is sent.
+	:param waveInterval: Seconds between the start of two waves.
+	:returns: The error of every host or `None` if at least one of \
+its packets has been sent.
+	:rtype: dict
+	"""
+	packets = list(packets)
+	interval = 1.0 / rate if rate > 0 else 0
+	sockets = {}
+	sent = set()
+	errors = {}
+
+	try:
+		nextSend = time.time()
+		for wave in range(max(waves, 1)):
+			if wave:
+				delay = waveStarted + waveInterval - time.time()
+				if delay > 0:
+					time.sleep(delay)
+			waveStarted = time.time()
+
+			for (hostId, packet, addresses) in packets:
+				if not addresses:
+					errors[hostId] = u"No broadcast address found for host '%s'" % hostId
+					continue
+
+				for address in addresses:
+					if interval:
+						delay = nextSend - time.time()
+						if delay > 0:
+							time.sleep(delay)
+						nextSend = max(nextSend, time.time()) + interval
+
+					try:
+						try:
+							sock = sockets[address]
+						except KeyError:
+							sock = sockets[address] = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+							sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, True)
+
+						logger.debug(u"Sending Wake-on-LAN packet of {0} to network broadcast {1}", hostId, address)
+						sock.sendto(packet, (address, port))
+						sent.add(hostId)
+					except Exception as error:
+						logger.logException(error, LOG_DEBUG)
+						errors[hostId] = forceUnicode(error)
+	finally:
+		for sock in sockets.values():
+			sock.close()
+
+	return dict(
+		(hostId, None if hostId in sent else errors[hostId])
+		for (hostId, _, _) in packets
+	)
+
+
+def wakeOnLan(hostControlBackend, hostIds):
+	"""
+	Switch on hosts with Wake-on-LAN.
+
+	Broadcast addresses, rate and waves are taken from the \
+configuration of `hostControlBackend`.
+
+	:returns: Dict with the keys `result` and `error` for every host.
+	"""
+	hosts = hostControlBackend._context.host_getObjects(attributes=['hardwareAddress', 'ipAddress'], id=hostIds)  # pylint: disable=maybe-no-member
+	getBroadcastAddresses = compileBroadcastAddresses(hostControlBackend._broadcastAddresses)
+
+	result = {}
+	packets = []
+	for host in hosts:
+		try:
+			if not host.hardwareAddress:
+				raise BackendMissingDataError(u"Failed to get hardware address for host '%s'" % host.id)
+
+			packets.append((
+				host.id,
+				createMagicPacket(host.hardwareAddress),
+				getBroadcastAddresses(host.ipAddress)
+			))
+		except Exception as e:
+			logger.logException(e, LOG_DEBUG)
+			result[host.id] = {"result": None, "error": forceUnicode(e)}
+
+	errors = sendWakeOnLanPackets(
+		packets,
+		rate=hostControlBackend._wakeOnLanRate,
+		waves=hostControlBackend._wakeOnLanWaves,
+		waveInterval=hostControlBackend._wakeOnLanWaveInterval
+	)
+	for (hostId, error) in errors.items():
+		if error:
+			result[hostId] = {"result": None, "error": error}
+		else:
+			result[hostId] = {"result": "sent", "error": None}
+
+	return result
+
 
 class RpcThread(KillableThread):
 	def __init__(self, hostControlBackend, hostId, address, username, password, method, params=[]):
@@ -73,43 +503,16 @@ class RpcThread(KillableThread):
 
 	def run(self):
 		self.started = time.time()
-		timeout = self.hostControlBackend._hostRpcTimeout
-		if timeout < 0:
-			timeout = 0
-
 		try:
-			query = toJson(
-				{
-					'id': 1,
-					'method': self.method,
-					'params': self.params
-				}
-			).encode('utf-8')
-
-			connection = HTTPSConnection(
-				host=self.address,
-				port=self.hostControlBackend._opsiclientdPort,
-				timeout=timeout
+			(self.result, self.error) = callOpsiclientd(
+				self.address,
+				self.hostControlBackend._opsiclientdPort,
+				self.username,
+				self.password,
+				self.method,
+				self.params,
+				self.hostControlBackend._hostRpcTimeout
 			)
-			with closingConnection(connection) as connection:
-				non_blocking_connect_https(connection, timeout)
-				connection.putrequest('POST', '/opsiclientd')
-				connection.putheader('content-type', 'application/json')
-				connection.putheader('content-length', str(len(query)))
-				auth = u'{0}:{1}'.format(self.username, self.password)
-				connection.putheader('Authorization', 'Basic ' + base64.encodestring(auth.encode('latin-1')).strip())
-				connection.endheaders()
-				connection.send(query)
-
-				response = connection.getresponse()
-				response = response.read()
-				response = fromJson(unicode(response, 'utf-8'))
-
-				if response and isinstance(response, dict):
-					self.error = response.get('error')
-					self.result = response.get('result')
-				else:
-					self.error = u"Bad response from client: %s" % forceUnicode(response)
 		except Exception as e:
 			self.error = forceUnicode(e)
 		finally:
@@ -128,24 +531,11 @@ class ConnectionThread(KillableThread):
 
 	def run(self):
 		self.started = time.time()
-		timeout = self.hostControlBackend._hostReachableTimeout
-		if timeout < 0:
-			timeout = 0
-
-		logger.info(u"Trying connection to '%s:%d'" % (self.address, self.hostControlBackend._opsiclientdPort))
-		try:
-			conn = HTTPSConnection(
-				host=self.address,
-				port=self.hostControlBackend._opsiclientdPort,
-				timeout=timeout
-			)
-			with closingConnection(conn) as conn:
-				non_blocking_connect_https(conn, self.hostControlBackend._hostReachableTimeout)
-				if conn:
-					self.result = True
-		except Exception as e:
-			logger.logException(e, LOG_DEBUG)
-			logger.debug(e)
+		self.result = isOpsiclientdReachable(
+			self.address,
+			self.hostControlBackend._opsiclientdPort,
+			self.hostControlBackend._hostReachableTimeout
+		)
 		self.ended = time.time()
 
 
@@ -162,6 +552,9 @@ class HostControlBackend(ExtendedBackend):
 		self._resolveHostAddress = False
 		self._maxConnections = 50
 		self._broadcastAddresses = ["255.255.255.255"]
+		self._wakeOnLanRate = 0
+		self._wakeOnLanWaves = 1
+		self._wakeOnLanWaveInterval = 1.0
 
 		self._parseArguments(kwargs)
 
@@ -189,7 +582,16 @@ class HostControlBackend(ExtendedBackend):
 			elif option == 'maxconnections':
 				self._maxConnections = forceInt(value)
 			elif option == 'broadcastaddresses':
-				self._broadcastAddresses = forceUnicodeList(value)
+				if isinstance(value, dict):
+					self._broadcastAddresses = forceDict(value)
+				else:
+					self._broadcastAddresses = forceUnicodeList(value)
+			elif option == 'wakeonlanrate':
+				self._wakeOnLanRate = forceFloat(value)
+			elif option == 'wakeonlanwaves':
+				self._wakeOnLanWaves = forceInt(value)
+			elif option == 'wakeonlanwaveinterval':
+				self._wakeOnLanWaveInterval = forceFloat(value)
 
 	def _getHostAddress(self, host):
 		address = None
@@ -210,104 +612,11 @@ class HostControlBackend(ExtendedBackend):
 		return address
 
 	def _opsiclientdRpc(self, hostIds, method, params=[], timeout=None):
-		if not hostIds:
-			raise BackendMissingDataError(u"No matching host ids found")
-		hostIds = forceHostIdList(hostIds)
-		method = forceUnicode(method)
-		params = forceList(params)
-		if not timeout:
-			timeout = self._hostRpcTimeout
-		timeout = forceInt(timeout)
-
-		result = {}
-		rpcts = []
-		for host in self._context.host_getObjects(id=hostIds):  # pylint: disable=maybe-no-member
-			try:
-				address = self._getHostAddress(host)
-				rpcts.append(
-					RpcThread(
-						hostControlBackend=self,
-						hostId=host.id,
-						address=address,
-						username=u'',
-						password=host.opsiHostKey,
-						method=method,
-						params=params
-					)
-				)
-			except Exception as e:
-				result[host.id] = {"result": None, "error": forceUnicode(e)}
-
-		runningThreads = 0
-		while rpcts:
-			newRpcts = []
-			for rpct in rpcts:
-				if rpct.ended:
-					if rpct.error:
-						logger.error(u"Rpc to host %s failed, error: %s" % (rpct.hostId, rpct.error))
-						result[rpct.hostId] = {"result": None, "error": rpct.error}
-					else:
-						logger.info(u"Rpc to host %s successful, result: %s" % (rpct.hostId, rpct.result))
-						result[rpct.hostId] = {"result": rpct.result, "error": None}
-					runningThreads -= 1
-					continue
-
-				if not rpct.started:
-					if runningThreads < self._maxConnections:
-						logger.debug(u"Starting rpc to host %s" % rpct.hostId)
-						rpct.start()
-						runningThreads += 1
-				else:
-					timeRunning = time.time() - rpct.started
-					if timeRunning >= timeout + 5:
-						# thread still alive 5 seconds after timeout => kill
-						logger.error(u"Rpc to host %s (address: %s) timed out after %0.2f seconds, terminating" % (rpct.hostId, rpct.address, timeRunning))
-						result[rpct.hostId] = {"result": None, "error": u"timed out after %0.2f seconds" % timeRunning}
-						if not rpct.ended:
-							try:
-								rpct.terminate()
-							except Exception as e:
-								logger.error(u"Failed to terminate rpc thread: %s" % e)
-						runningThreads -= 1
-						continue
-				newRpcts.append(rpct)
-			rpcts = newRpcts
-			time.sleep(0.1)
-
-		return result
+		return dict(iterOpsiclientdRpc(self, hostIds, method, params, timeout))
 
 	def hostControl_start(self, hostIds=[]):
 		''' Switches on remote computers using WOL. '''
-		hosts = self._context.host_getObjects(attributes=['hardwareAddress'], id=hostIds)  # pylint: disable=maybe-no-member
-		result = {}
-		for host in hosts:
-			try:
-				if not host.hardwareAddress:
-					raise BackendMissingDataError(u"Failed to get hardware address for host '%s'" % host.id)
-
-				mac = host.hardwareAddress.replace(':', '')
-
-				# Pad the synchronization stream.
-				data = ''.join(['FFFFFFFFFFFF', mac * 16])
-				send_data = ''
-
-				# Split up the hex values and pack.
-				for i in range(0, len(data), 2):
-					send_data = ''.join([
-						send_data,
-						struct.pack('B', int(data[i: i + 2], 16))])
-
-				for broadcastAddress in self._broadcastAddresses:
-					logger.debug(u"Sending data to network broadcast %s [%s]" % (broadcastAddress, data))
-					# Broadcast it to the LAN.
-					with closing(socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)) as sock:
-						sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, True)
-						sock.sendto(send_data, (broadcastAddress, 12287))
-				result[host.id] = {"result": "sent", "error": None}
-			except Exception as e:
-				logger.logException(e, LOG_DEBUG)
-				result[host.id] = {"result": None, "error": forceUnicode(e)}
-		return result
+		return wakeOnLan(self, hostIds)
 
 	def hostControl_shutdown(self, hostIds=[]):
 		if not hostIds:
@@ -345,61 +654,7 @@ class HostControlBackend(ExtendedBackend):
 
 	def hostControl_reachable(self, hostIds=[], timeout=None):
 		hostIds = self._context.host_getIdents(id=hostIds, returnType='unicode')  # pylint: disable=maybe-no-member
-		if not hostIds:
-			raise BackendMissingDataError(u"No matching host ids found")
-		hostIds = forceHostIdList(hostIds)
-
-		if not timeout:
-			timeout = self._hostReachableTimeout
-		timeout = forceInt(timeout)
-
-		result = {}
-		threads = []
-		for host in self._context.host_getObjects(id=hostIds):  # pylint: disable=maybe-no-member
-			try:
-				address = self._getHostAddress(host)
-				threads.append(
-					ConnectionThread(
-						hostControlBackend=self,
-						hostId=host.id,
-						address=address
-					)
-				)
-			except Exception as e:
-				logger.debug("Problem found: '%s'" % e)
-				result[host.id] = False
-
-		runningThreads = 0
-		while threads:
-			newThreads = []
-			for thread in threads:
-				if thread.ended:
-					result[thread.hostId] = thread.result
-					runningThreads -= 1
-					continue
-
-				if not thread.started:
-					if runningThreads < self._maxConnections:
-						logger.debug(u"Trying to check host reachable %s" % thread.hostId)
-						thread.start()
-						runningThreads += 1
-				else:
-					timeRunning = time.time() - thread.started
-					if timeRunning >= timeout + 5:
-						# thread still alive 5 seconds after timeout => kill
-						logger.error(u"Reachable check to host %s address %s timed out after %0.2f  seconds, terminating" % (thread.hostId, thread.address, timeRunning))
-						result[thread.hostId] = False
-						if not thread.ended:
-							try:
-								thread.terminate()
-							except Exception as e:
-								logger.error(u"Failed to terminate reachable thread: %s" % e)
-						runningThreads -= 1
-						continue
-				newThreads.append(thread)
-			threads = newThreads
-			time.sleep(0.1)
-		return result
+		return dict(iterReachable(self, hostIds, timeout))
 
 	def hostControl_execute(self, command, hostIds=[], waitForEnding=True, captureStderr=True, encoding=None, timeout=300):
 		command = forceUnicode(command)
@@ -26,17 +26,13 @@ HostControl Backend: Safe edition
 """
 
 import socket
-import time
-import struct
 
-from contextlib import closing
-
-from OPSI.Logger import LOG_DEBUG, Logger
+from OPSI.Logger import Logger
 from OPSI.Types import BackendMissingDataError
-from OPSI.Types import (forceBool, forceHostIdList, forceInt, forceList,
+from OPSI.Types import (forceBool, forceDict, forceFloat, forceInt,
 	forceUnicode, forceUnicodeList)
 from OPSI.Backend.Backend import ExtendedBackend
-from OPSI.Backend.HostControl import RpcThread, ConnectionThread
+from OPSI.Backend.HostControl import iterOpsiclientdRpc, iterReachable, wakeOnLan
 
 __version__ = '4.0.7.2'
 
@@ -60,6 +56,9 @@ class HostControlSafeBackend(ExtendedBackend):
 		self._resolveHostAddress = False
 		self._maxConnections = 50
 		self._broadcastAddresses = ["255.255.255.255"]
+		self._wakeOnLanRate = 0
+		self._wakeOnLanWaves = 1
+		self._wakeOnLanWaveInterval = 1.0
 
 		# Parse arguments
 		for (option, value) in kwargs.items():
@@ -73,7 +72,16 @@ class HostControlSafeBackend(ExtendedBackend):
 			elif option == 'maxconnections':
 				self._maxConnections = forceInt(value)
 			elif option == 'broadcastaddresses':
-				self._broadcastAddresses = forceUnicodeList(value)
+				if isinstance(value, dict):
+					self._broadcastAddresses = forceDict(value)
+				else:
+					self._broadcastAddresses = forceUnicodeList(value)
+			elif option == 'wakeonlanrate':
+				self._wakeOnLanRate = forceFloat(value)
+			elif option == 'wakeonlanwaves':
+				self._wakeOnLanWaves = forceInt(value)
+			elif option == 'wakeonlanwaveinterval':
+				self._wakeOnLanWaveInterval = forceFloat(value)
 
 		if (self._maxConnections < 1):
 			self._maxConnections = 1
@@ -107,103 +115,13 @@ class HostControlSafeBackend(ExtendedBackend):
 		return address
 
 	def _opsiclientdRpc(self, hostIds, method, params=[], timeout=None):
-		if not hostIds:
-			raise BackendMissingDataError(u"No matching host ids found")
-		hostIds = forceHostIdList(hostIds)
-		method  = forceUnicode(method)
-		params  = forceList(params)
-		if not timeout:
-			timeout = self._hostRpcTimeout
-		timeout = forceInt(timeout)
-
-		result = {}
-		rpcts = []
-		for host in self._context.host_getObjects(id=hostIds):  # pylint: disable=maybe-no-member
-			try:
-				address = self._getHostAddress(host)
-				rpcts.append(
-					RpcThread(
-						hostControlBackend = self,
-						hostId   = host.id,
-						address  = address,
-						username = u'',
-						password = host.opsiHostKey,
-						method   = method,
-						params   = params))
-			except Exception as e:
-				result[host.id] = {"result": None, "error": forceUnicode(e)}
-
-		runningThreads = 0
-		while rpcts:
-			newRpcts = []
-			for rpct in rpcts:
-				if rpct.ended:
-					if rpct.error:
-						logger.error(u"Rpc to host %s failed, error: %s" % (rpct.hostId, rpct.error))
-						result[rpct.hostId] = {"result": None, "error": rpct.error}
-					else:
-						logger.info(u"Rpc to host %s successful, result: %s" % (rpct.hostId, rpct.result))
-						result[rpct.hostId] = {"result": rpct.result, "error": None}
-					runningThreads -= 1
-					continue
-				if not rpct.started:
-					if (runningThreads < self._maxConnections):
-						logger.debug(u"Starting rpc to host %s" % rpct.hostId)
-						rpct.start()
-						runningThreads += 1
-				else:
-					timeRunning = time.time() - rpct.started
-					if (timeRunning >= timeout + 5):
-						# thread still alive 5 seconds after timeout => kill
-						logger.error(u"Rpc to host %s (address: %s) timed out after %0.2f seconds, terminating" % (rpct.hostId, rpct.address, timeRunning))
-						result[rpct.hostId] = {"result": None, "error": u"timed out after %0.2f seconds" % timeRunning}
-						if not rpct.ended:
-							try:
-								rpct.terminate()
-							except Exception as e:
-								logger.error(u"Failed to terminate rpc thread: %s" % e)
-						runningThreads -= 1
-						continue
-				newRpcts.append(rpct)
-			rpcts = newRpcts
-			time.sleep(0.1)
-
-		return result
+		return dict(iterOpsiclientdRpc(self, hostIds, method, params, timeout))
 
 	def hostControlSafe_start(self, hostIds=[]):
 		''' Switches on remote computers using WOL. '''
 		if not hostIds:
 			raise BackendMissingDataError(u"No matching host ids found")
-		hosts = self._context.host_getObjects(attributes=['hardwareAddress'], id=hostIds)  # pylint: disable=maybe-no-member
-		result = {}
-		for host in hosts:
-			try:
-				if not host.hardwareAddress:
-					raise BackendMissingDataError(u"Failed to get hardware address for host '%s'" % host.id)
-
-				mac = host.hardwareAddress.replace(':', '')
-
-				# Pad the synchronization stream.
-				data = ''.join(['FFFFFFFFFFFF', mac * 16])
-				send_data = ''
-
-				# Split up the hex values and pack.
-				for i in range(0, len(data), 2):
-					send_data = ''.join([
-						send_data,
-						struct.pack('B', int(data[i: i + 2], 16)) ])
-
-				for broadcastAddress in self._broadcastAddresses:
-					logger.debug(u"Sending data to network broadcast %s [%s]" % (broadcastAddress, data))
-					# Broadcast it to the LAN.
-					with closing(socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)) as sock:
-						sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, True)
-						sock.sendto(send_data, (broadcastAddress, 12287))
-				result[host.id] = {"result": "sent", "error": None}
-			except Exception as e:
-				logger.logException(e, LOG_DEBUG)
-				result[host.id] = {"result": None, "error": forceUnicode(e)}
-		return result
+		return wakeOnLan(self, hostIds)
 
 	def hostControlSafe_shutdown(self, hostIds=[]):
 		if not hostIds:
@@ -253,55 +171,7 @@ class HostControlSafeBackend(ExtendedBackend):
 		if not hostIds:
 			raise BackendMissingDataError(u"No matching host ids found")
 		hostIds = self._context.host_getIdents(id=hostIds, returnType='unicode')  # pylint: disable=maybe-no-member
-		hostIds = forceHostIdList(hostIds)
-		if not timeout:
-			timeout = self._hostReachableTimeout
-		timeout = forceInt(timeout)
-
-		result = {}
-		threads = []
-		for host in self._context.host_getObjects(id=hostIds):  # pylint: disable=maybe-no-member
-			try:
-				address = self._getHostAddress(host)
-				threads.append(
-					ConnectionThread(
-						hostControlBackend=self,
-						hostId=host.id,
-						address=address))
-			except Exception as e:
-				logger.debug("Problem found: '%s'" % e)
-				result[host.id] = False
-
-		runningThreads = 0
-		while threads:
-			newThreads = []
-			for thread in threads:
-				if thread.ended:
-					result[thread.hostId] = thread.result
-					runningThreads -= 1
-					continue
-				if not thread.started:
-					if (runningThreads < self._maxConnections):
-						logger.debug(u"Trying to check host reachable %s" % thread.hostId)
-						thread.start()
-						runningThreads += 1
-				else:
-					timeRunning = time.time() - thread.started
-					if (timeRunning >= timeout +5):
-						# thread still alive 5 seconds after timeout => kill
-						logger.error(u"Reachable check to host %s address %s timed out after %0.2f  seconds, terminating" % (thread.hostId, thread.address, timeRunning))
-						result[thread.hostId] = False
-						if not thread.ended:
-							try:
-								thread.terminate()
-							except Exception as e:
-								logger.error(u"Failed to terminate reachable thread: %s" % e)
-						runningThreads -= 1
-						continue
-				newThreads.append(thread)
-			threads = newThreads
-			time.sleep(0.1)
-		return result
+		return dict(iterReachable(self, hostIds, timeout))
 
 	def hostControlSafe_execute(self, command, hostIds=[], waitForEnding=True, captureStderr=True, encoding=None, timeout=300):
 		if not hostIds:
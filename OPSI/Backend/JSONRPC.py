@@ -36,6 +36,7 @@ import new
 import socket
 import time
 import threading
+from collections import OrderedDict
 from hashlib import md5
 from Queue import Queue, Empty
 from twisted.conch.ssh import keys
@@ -46,7 +47,7 @@ from OPSI.Types import (forceBool, forceFilename, forceFloat, forceInt,
 						forceList, forceUnicode)
 from OPSI.Types import (OpsiAuthenticationError, OpsiServiceVerificationError,
 						OpsiTimeoutError)
-from OPSI.Backend.Backend import Backend, DeferredCall
+from OPSI.Backend.Backend import Backend, DeferredCall, createInstanceMethod
 from OPSI.Util import serialize, deserialize
 from OPSI.Util.HTTP import urlsplit, getSharedConnectionPool, deflateEncode, deflateDecode, gzipDecode
 
@@ -151,60 +152,125 @@ class JSONRPCThread(JSONRPC, threading.Thread):
 		self.process()
 
 
-class RpcQueue(threading.Thread):
-	def __init__(self, jsonrpcBackend, size, poll=0.01):
-		threading.Thread.__init__(self)
+class RpcQueue(object):
+	"""
+	Executes queued JSON-RPCs in batches.
+
+	Every worker waits for a JSON-RPC and collects further JSON-RPCs
+	until `size` are collected or `poll` seconds have passed since the
+	first one arrived. The collected JSON-RPCs are sent in one request
+	in the order they were added.
+
+	Multiple workers send their requests concurrently, so the server
+	may execute the batches of different workers in any order. Use a
+	single worker, that is a connectionPoolSize of 1 for the
+	JSONRPCBackend, if asynchronous calls depend on each other.
+	"""
+
+	_STOP = object()
+
+	def __init__(self, jsonrpcBackend, size, poll=0.01, workers=1):
 		self.jsonrpcBackend = jsonrpcBackend
-		self.size = size
-		self.queue = Queue(size)
-		self.poll = poll
+		self.size = max(forceInt(size), 1)
+		self.poll = forceFloat(poll)
+		self.workers = max(forceInt(workers), 1)
+		self.queue = Queue(self.size * self.workers)
 		self.stopped = False
-		self.jsonrpcs = {}
-		self.idle = threading.Event()
+		self._threads = []
 
 	def add(self, jsonrpc):
-		logger.debug(u'Adding jsonrpc %s to queue (current queue size: %d)' % (jsonrpc, self.queue.qsize()))
+		logger.debug(u'Adding jsonrpc {0} to queue (current queue size: {1})', jsonrpc, self.queue.qsize())
 		self.queue.put(jsonrpc, block=True)
-		logger.debug2(u'Added jsonrpc %s to queue' % jsonrpc)
+		logger.debug2(u'Added jsonrpc {0} to queue', jsonrpc)
+
+	def start(self):
+		self.stopped = False
+		for number in range(self.workers):
+			thread = threading.Thread(target=self.run, name=u'RpcQueue-%d' % number)
+			thread.daemon = True
+			thread.start()
+			self._threads.append(thread)
 
 	def stop(self):
+		"""
+		Stop the workers after all queued JSON-RPCs are executed.
+		"""
+		if self.stopped:
+			return
+
 		self.stopped = True
+		for _ in self._threads:
+			self.queue.put(self._STOP, block=True)
 
-	def run(self):
-		logger.debug(u"RpcQueue started")
-		self.idle.set()
-		while not self.stopped or not self.queue.empty():
-			self.idle.wait()
-			jsonrpcs = []
-			while not self.queue.empty():
-				self.idle.clear()
-				try:
+	def join(self, timeout=None):
+		if timeout is not None:
+			endTime = time.time() + timeout
+
+		for thread in self._threads:
+			if timeout is None:
+				thread.join()
+			else:
+				thread.join(max(endTime - time.time(), 0))
+
+	def is_alive(self):
+		return any(thread.is_alive() for thread in self._threads)
+
+	isAlive = is_alive
+
+	def _collect(self):
+		"""
+		Wait for the next batch of JSON-RPCs.
+
+		:returns: The collected JSON-RPCs and if the worker should stop.
+		:rtype: (list, bool)
+		"""
+		jsonrpc = self.queue.get(block=True)
+		if jsonrpc is self._STOP:
+			return [], True
+
+		jsonrpcs = [jsonrpc]
+		windowEnd = time.time() + self.poll
+		while len(jsonrpcs) < self.size:
+			try:
+				remaining = windowEnd - time.time()
+				if remaining > 0:
+					jsonrpc = self.queue.get(block=True, timeout=remaining)
+				else:
 					jsonrpc = self.queue.get(block=False)
-					if jsonrpc:
-						logger.debug(u'Got jsonrpc %s from queue' % jsonrpc)
-						jsonrpcs.append(jsonrpc)
-						if len(jsonrpcs) >= self.size:
-							break
-				except Empty:
-					break
+			except Empty:
+				break
+
+			if jsonrpc is self._STOP:
+				return jsonrpcs, True
+
+			jsonrpcs.append(jsonrpc)
+
+		return jsonrpcs, False
+
+	def run(self):
+		logger.debug(u"RpcQueue worker started")
+		stop = False
+		while not stop:
+			jsonrpcs, stop = self._collect()
 			if jsonrpcs:
 				self.process(jsonrpcs=jsonrpcs)
-			time.sleep(self.poll)
-		logger.debug(u"RpcQueue stopped (empty: %s, stopped: %s)" % (self.queue.empty(), self.stopped))
+		logger.debug(u"RpcQueue worker stopped (empty: {0}, stopped: {1})", self.queue.empty(), self.stopped)
 
 	def process(self, jsonrpcs):
-		self.jsonrpcs = {}
+		jsonrpcsByBaseUrl = {}
 		for jsonrpc in forceList(jsonrpcs):
-			self.jsonrpcs[jsonrpc.id] = jsonrpc
-		if not self.jsonrpcs:
-			return
-		logger.info("Executing bunched jsonrpcs: %s" % self.jsonrpcs)
+			jsonrpcsByBaseUrl.setdefault(jsonrpc.baseUrl, OrderedDict())[jsonrpc.id] = jsonrpc
+
+		for baseUrl, jsonrpcsById in jsonrpcsByBaseUrl.items():
+			self._processBatch(baseUrl, jsonrpcsById)
+
+	def _processBatch(self, baseUrl, jsonrpcs):
+		logger.info(u"Executing bunched jsonrpcs: {0}", jsonrpcs)
 		isExit = False
 		try:
 			retry = False
-			baseUrl = None
 			rpc = []
-			for jsonrpc in self.jsonrpcs.values():
+			for jsonrpc in jsonrpcs.values():
 				if jsonrpc.method in ('backend_exit', 'exit'):
 					isExit = True
 				else:
@@ -213,16 +279,12 @@ class RpcQueue(threading.Thread):
 				if jsonrpc.retry:
 					retry = True
 
-				if not baseUrl:
-					baseUrl = jsonrpc.baseUrl
-				elif baseUrl != jsonrpc.baseUrl:
-					raise Exception(u"Can't execute jsonrpcs with different base urls at once: (%s != %s)" % (baseUrl, jsonrpc.baseUrl))
 				rpc.append(jsonrpc.getRpc())
 			rpc = json.dumps(rpc)
-			logger.debug2(u"jsonrpc: %s" % rpc)
+			logger.debug2(u"jsonrpc: {0}", rpc)
 
 			response = self.jsonrpcBackend._request(baseUrl=baseUrl, data=rpc, retry=retry)
-			logger.debug(u"Got response from host %s" % self.jsonrpcBackend._host)
+			logger.debug(u"Got response from host {0}", self.jsonrpcBackend._host)
 			try:
 				response = forceList(json.loads(response))
 			except Exception as error:
@@ -235,25 +297,28 @@ class RpcQueue(threading.Thread):
 					raise Exception(u"Failed to get id from: %s (%s): %s" % (resp, response, error))
 
 				try:
-					jsonrpc = self.jsonrpcs[id]
+					jsonrpc = jsonrpcs.pop(id)
 				except Exception as error:
 					raise Exception(u"Failed to get jsonrpc with id %s: %s" % (id, error))
 
 				try:
 					jsonrpc.processResult(resp)
 				except Exception as error:
+					jsonrpc.error = error
 					raise Exception(u"Failed to process response %s with jsonrpc %s: %s" % (resp, jsonrpc, error))
+				finally:
+					jsonrpc._gotResult()
+
+			if jsonrpcs:
+				raise Exception(u"No response for jsonrpcs with ids {0}".format(sorted(jsonrpcs.keys())))
 		except Exception as error:
 			if not isExit:
 				logger.logException(error)
 
-			for jsonrpc in self.jsonrpcs.values():
+			for jsonrpc in jsonrpcs.values():
 				jsonrpc.error = error
 				jsonrpc._gotResult()
 
-		self.jsonrpcs = {}
-		self.idle.set()
-
 
 class JSONRPCBackend(Backend):
 
@@ -277,6 +342,7 @@ class JSONRPCBackend(Backend):
 		self._socketTimeout = None
 		self._connectTimeout = 30
 		self._connectionPoolSize = 1
+		self._keepAlive = False
 		self._legacyOpsi = False
 		self._interface = None
 		self._rpcId = 0
@@ -312,6 +378,8 @@ class JSONRPCBackend(Backend):
 				self._connectTimeout = forceInt(value)
 			elif option == 'connectionpoolsize' and value is not None:
 				self._connectionPoolSize = forceInt(value)
+			elif option == 'keepalive':
+				self._keepAlive = forceBool(value)
 			elif option in ('timeout', 'sockettimeout') and value is not None:
 				self._socketTimeout = forceInt(value)
 			elif option == 'retry':
@@ -347,6 +415,7 @@ class JSONRPCBackend(Backend):
 			retryTime=self._retryTime,
 			maxsize=self._connectionPoolSize,
 			block=True,
+			reuseConnection=self._keepAlive,
 			verifyServerCert=self._verifyServerCert,
 			serverCertFile=self._serverCertFile,
 			caCertFile=self._caCertFile,
@@ -363,10 +432,14 @@ class JSONRPCBackend(Backend):
 
 	def startRpcQueue(self):
 		if not self._rpcQueue or not self._rpcQueue.is_alive():
+			# One worker per connection lets every connection of the
+			# pool carry a batch at the same time. Calls of different
+			# workers are not executed in order.
 			self._rpcQueue = RpcQueue(
 				jsonrpcBackend=self,
 				size=self._rpcQueueSize,
-				poll=self._rpcQueuePollingTime
+				poll=self._rpcQueuePollingTime,
+				workers=self._connectionPoolSize
 			)
 			self._rpcQueue.start()
 
@@ -655,10 +728,10 @@ class JSONRPCBackend(Backend):
 				# This would result in not overwriting Backend methods like log_read, log_write, ...
 				# if getattr(self, methodName, None) is None:
 				if not licenseManagementModule and "license" in methodName:
-					exec(u'def %s(self, %s): return' % (methodName, argString))
+					source = u'def %s(self, %s): return' % (methodName, argString)
 				else:
-					exec(u'def %s(self, %s): return self._jsonRPC("%s", [%s])' % (methodName, argString, methodName, callString))
-				setattr(self, methodName, new.instancemethod(eval(methodName), self, self.__class__))
+					source = u'def %s(self, %s): return self._jsonRPC("%s", [%s])' % (methodName, argString, methodName, callString)
+				createInstanceMethod(self, methodName, source)
 			except Exception as error:
 				logger.critical(u"Failed to create instance method '%s': %s" % (method, error))
 
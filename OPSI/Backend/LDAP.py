@@ -51,7 +51,7 @@ from OPSI.Types import (BackendBadValueError, BackendIOError,
 	BackendMissingDataError, BackendReferentialIntegrityError)
 from OPSI.Types import forceBool, forceList, forceObjectClassList, forceUnicode
 from OPSI.Object import *
-from OPSI.Backend.Backend import ConfigDataBackend
+from OPSI.Backend.Backend import ConfigDataBackend, compileFilter
 from OPSI import System
 
 logger = Logger()
@@ -1419,6 +1419,7 @@ class LDAPBackend(ConfigDataBackend):
 			del groupFilter['groupId']
 
 		ldapFilter = self._objectFilterToLDAPFilter(groupFilter)
+		objectHashMatches = compileFilter(**filter)
 		search = LDAPObjectSearch(self._ldap, self._groupsContainerDn, filter=ldapFilter)
 		for ldapObject in search.getObjects():
 			ldapObject.readFromDirectory(self._ldap)
@@ -1432,7 +1433,7 @@ class LDAPBackend(ConfigDataBackend):
 				raise Exception(u"Unhandled GroupType %s" % groupType)
 			for objectId in ldapObject.getAttribute('opsiMemberObjectId', default=[], valuesAsList=True):
 				otg = ObjectToGroup(objectId=objectId, groupType=groupType, groupId=groupId)
-				if self._objectHashMatches(otg.toHash(), **filter):
+				if objectHashMatches(otg.toHash()):
 					objectToGroups.append(ObjectToGroup(objectId=objectId, groupType=groupType, groupId=groupId))
 		return objectToGroups
 
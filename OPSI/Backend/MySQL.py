@@ -101,6 +101,8 @@ class MySQL(SQL):
 	ESCAPED_BACKSLASH = "\\\\"
 	ESCAPED_APOSTROPHE = "\\\'"
 	ESCAPED_ASTERISK = "\\*"
+	ON_DUPLICATE_KEY_UPDATE_SUPPORTED = True
+	MAX_ROWS_PER_STATEMENT = 500
 	doCommit = True
 
 	def __init__(self, **kwargs):
@@ -230,13 +232,13 @@ class MySQL(SQL):
 		finally:
 			self._transactionLock.release()
 
-	def getSet(self, query):
+	def getSet(self, query, params=None):
 		logger.debug2(u"getSet: {0}", query)
 		(conn, cursor) = self.connect()
 
 		try:
 			try:
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 			except Exception as e:
 				logger.debug(u"Execute error: %s" % e)
 				if e[0] != 2006:
@@ -245,7 +247,7 @@ class MySQL(SQL):
 
 				self._createConnectionPool()
 				(conn, cursor) = self.connect()
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 
 			valueSet = cursor.fetchall()
 		finally:
@@ -253,7 +255,7 @@ class MySQL(SQL):
 
 		return valueSet or []
 
-	def getRows(self, query):
+	def getRows(self, query, params=None):
 		logger.debug2(u"getRows: {0}", query)
 		onlyAllowSelect(query)
 
@@ -261,7 +263,7 @@ class MySQL(SQL):
 		valueSet = []
 		try:
 			try:
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 			except Exception as e:
 				logger.debug(u"Execute error: %s" % e)
 				if e[0] != 2006:
@@ -269,7 +271,7 @@ class MySQL(SQL):
 					raise
 				self._createConnectionPool()
 				(conn, cursor) = self.connect(cursorType=MySQLdb.cursors.Cursor)
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 
 			valueSet = cursor.fetchall()
 			if not valueSet:
@@ -280,7 +282,7 @@ class MySQL(SQL):
 
 		return valueSet
 
-	def getRow(self, query, conn=None, cursor=None):
+	def getRow(self, query, conn=None, cursor=None, params=None):
 		logger.debug2(u"getRow: {0}", query)
 		closeConnection = True
 		if conn and cursor:
@@ -291,7 +293,7 @@ class MySQL(SQL):
 		row = {}
 		try:
 			try:
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 			except Exception as e:
 				logger.debug(u"Execute error: {0!r}", e)
 				if e[0] != 2006:
@@ -299,7 +301,7 @@ class MySQL(SQL):
 					raise
 				self._createConnectionPool()
 				(conn, cursor) = self.connect()
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 			row = cursor.fetchone()
 			if not row:
 				logger.debug(u"No result for query {0!r}", query)
@@ -320,28 +322,12 @@ class MySQL(SQL):
 			(conn, cursor) = self.connect()
 		result = -1
 		try:
-			colNames = []
-			values = []
-			for (key, value) in valueHash.items():
-				colNames.append(u"`{0}`".format(key))
-				if value is None:
-					values.append(u"NULL")
-				elif isinstance(value, bool):
-					if value:
-						values.append(u"1")
-					else:
-						values.append(u"0")
-				elif isinstance(value, (float, long, int)):
-					values.append(u"{0}".format(value))
-				elif isinstance(value, str):
-					values.append(u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value.decode("utf-8")))))
-				else:
-					values.append(u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value))))
-
-			query = u'INSERT INTO `{0}` ({1}) VALUES ({2});'.format(table, ', '.join(colNames), ', '.join(values))
-			logger.debug2(u"insert: {0}", query)
+			columns = tuple(valueHash.keys())
+			params = [self.toParameter(valueHash[column]) for column in columns]
+			query = self.createInsertStatement(table, columns)
+			logger.debug2(u"insert: {0} with parameters {1!r}", query, params)
 			try:
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 			except Exception as e:
 				logger.debug(u"Execute error: {0!r}", e)
 				if e[0] != 2006:
@@ -349,44 +335,94 @@ class MySQL(SQL):
 					raise
 				self._createConnectionPool()
 				(conn, cursor) = self.connect()
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 			result = cursor.lastrowid
 		finally:
 			if closeConnection:
 				self.close(conn, cursor)
 		return result
 
-	def update(self, table, where, valueHash, updateWhereNone=False):
+	def insertMany(self, table, valueHashes, updateOnDuplicateKey=False):
+		"""
+		Inserts multiple rows with multi-row INSERT statements.
+
+		:param updateOnDuplicateKey: If `True` rows with an existing \
+primary key are updated instead.
+		"""
+		(conn, cursor) = self.connect()
+		try:
+			for (columns, rows) in self.groupByColumns(valueHashes):
+				for start in xrange(0, len(rows), self.MAX_ROWS_PER_STATEMENT):
+					batch = rows[start:start + self.MAX_ROWS_PER_STATEMENT]
+					query = self.createInsertStatement(table, columns, len(batch))
+					if updateOnDuplicateKey:
+						query = u'{0} ON DUPLICATE KEY UPDATE {1};'.format(
+							query[:-1],
+							u', '.join(u'`{0}` = VALUES(`{0}`)'.format(column) for column in columns)
+						)
+
+					params = [param for row in batch for param in row]
+					logger.debug2(u"insertMany: inserting {0} rows into {1}", len(batch), table)
+					try:
+						self.execute(query, conn, cursor, params)
+					except Exception as e:
+						logger.debug(u"Execute error: {0!r}", e)
+						if e[0] != 2006:
+							# 2006: MySQL server has gone away
+							raise
+						self._createConnectionPool()
+						(conn, cursor) = self.connect()
+						self.execute(query, conn, cursor, params)
+		finally:
+			self.close(conn, cursor)
+
+	def updateMany(self, table, where, rows, updateWhereNone=False):
+		"""
+		Updates multiple rows using a single connection.
+		"""
+		(conn, cursor) = self.connect()
+		try:
+			for (valueHash, whereParams) in rows:
+				columns = tuple(
+					key for (key, value) in valueHash.items()
+					if value is not None or updateWhereNone
+				)
+				params = [self.toParameter(valueHash[column]) for column in columns]
+				params.extend(whereParams or [])
+
+				query = self.createUpdateStatement(table, columns, where)
+				try:
+					self.execute(query, conn, cursor, params)
+				except Exception as e:
+					logger.debug(u"Execute error: {0!r}", e)
+					if e[0] != 2006:
+						# 2006: MySQL server has gone away
+						raise
+					self._createConnectionPool()
+					(conn, cursor) = self.connect()
+					self.execute(query, conn, cursor, params)
+		finally:
+			self.close(conn, cursor)
+
+	def update(self, table, where, valueHash, updateWhereNone=False, whereParams=None):
 		(conn, cursor) = self.connect()
 		result = 0
 		try:
 			if not valueHash:
 				raise BackendBadValueError(u"No values given")
-			query = []
-			for (key, value) in valueHash.items():
-				if value is None:
-					if not updateWhereNone:
-						continue
-
-					value = u"NULL"
-				elif isinstance(value, bool):
-					if value:
-						value = u"1"
-					else:
-						value = u"0"
-				elif isinstance(value, (float, long, int)):
-					value = u"%s" % value
-				elif isinstance(value, str):
-					value = u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value.decode("utf-8"))))
-				else:
-					value = u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value)))
 
-				query.append(u"`{0}` = {1}".format(key, value))
+			columns = tuple(
+				key for (key, value) in valueHash.items()
+				if value is not None or updateWhereNone
+			)
+			params = [self.toParameter(valueHash[column]) for column in columns]
+			if whereParams:
+				params.extend(whereParams)
 
-			query = u"UPDATE `{0}` SET {1} WHERE {2};".format(table, ', '.join(query), where)
-			logger.debug2(u"update: {0}", query)
+			query = self.createUpdateStatement(table, columns, where)
+			logger.debug2(u"update: {0} with parameters {1!r}", query, params)
 			try:
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 			except Exception as e:
 				logger.debug(u"Execute error: {0!r}", e)
 				if e[0] != 2006:
@@ -394,13 +430,13 @@ class MySQL(SQL):
 					raise
 				self._createConnectionPool()
 				(conn, cursor) = self.connect()
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, params)
 			result = cursor.rowcount
 		finally:
 			self.close(conn, cursor)
 		return result
 
-	def delete(self, table, where, conn=None, cursor=None):
+	def delete(self, table, where, conn=None, cursor=None, whereParams=None):
 		if conn and cursor:
 			logger.debug(u"TRANSACTION: conn and cursor given, so we should not close the connection.")
 			closeConnection = False
@@ -411,9 +447,9 @@ class MySQL(SQL):
 		result = 0
 		try:
 			query = u"DELETE FROM `%s` WHERE %s;" % (table, where)
-			logger.debug2(u"delete: {0}", query)
+			logger.debug2(u"delete: {0} with parameters {1!r}", query, whereParams)
 			try:
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, whereParams)
 			except Exception as e:
 				logger.debug(u"Execute error: {0}", e)
 				if e[0] != 2006:
@@ -422,7 +458,7 @@ class MySQL(SQL):
 
 				self._createConnectionPool()
 				conn, cursor = self.connect()
-				self.execute(query, conn, cursor)
+				self.execute(query, conn, cursor, whereParams)
 
 			result = cursor.rowcount
 		finally:
@@ -431,7 +467,7 @@ class MySQL(SQL):
 
 		return result
 
-	def execute(self, query, conn=None, cursor=None):
+	def execute(self, query, conn=None, cursor=None, params=None):
 		if conn and cursor:
 			needClose = False
 		else:
@@ -441,8 +477,12 @@ class MySQL(SQL):
 		res = None
 		try:
 			query = forceUnicode(query)
-			logger.debug2(u"SQL query: {0}", query)
-			res = cursor.execute(query)
+			if params:
+				logger.debug2(u"SQL query: {0} with parameters {1!r}", query, params)
+				res = cursor.execute(query, params)
+			else:
+				logger.debug2(u"SQL query: {0}", query)
+				res = cursor.execute(query)
 			if self.doCommit:
 				conn.commit()
 		finally:
@@ -589,9 +629,9 @@ class MySQLBackend(SQLBackend):
 		del data['possibleValues']
 		del data['defaultValues']
 
-		where = self._uniqueCondition(productProperty)
-		if self._sql.getRow('select * from `PRODUCT_PROPERTY` where %s' % where):
-			self._sql.update('PRODUCT_PROPERTY', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(productProperty)
+		if self._sql.getRow('select * from `PRODUCT_PROPERTY` where %s' % where, params=params):
+			self._sql.update('PRODUCT_PROPERTY', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('PRODUCT_PROPERTY', data)
 
@@ -609,7 +649,7 @@ class MySQLBackend(SQLBackend):
 					conn.begin()
 					logger.debug2(u'Start Transaction: delete from ppv %d' % myRetryTransactionCounter)
 
-					self._sql.delete('PRODUCT_PROPERTY_VALUE', where, conn, cursor)
+					self._sql.delete('PRODUCT_PROPERTY_VALUE', where, conn, cursor, whereParams=params)
 					conn.commit()
 					myTransactionSuccess = True
 				except Exception as e:
@@ -636,35 +676,20 @@ class MySQLBackend(SQLBackend):
 		(conn, cursor) = self._sql.connect()
 		for value in possibleValues:
 			try:
-				# transform arguments for sql
-				# from uniqueCondition
-				if value in defaultValues:
-					myPPVdefault = u"`isDefault` = 1"
-				else:
-					myPPVdefault = u"`isDefault` = 0"
-
-				if isinstance(value, bool):
-					if value:
-						myPPVvalue = u"`value` = 1"
-					else:
-						myPPVvalue = u"`value` = 0"
-				elif isinstance(value, (float, long, int)):
-					myPPVvalue = u"`value` = %s" % (value)
-				else:
-					myPPVvalue = u"`value` = '%s'" % (self._sql.escapeApostrophe(self._sql.escapeBackslash(value)))
 				myPPVselect = (
 					u"select * from PRODUCT_PROPERTY_VALUE where "
-					u"`propertyId` = '{0}' AND `productId` = '{1}' AND "
-					u"`productVersion` = '{2}' AND "
-					u"`packageVersion` = '{3}' AND {4} AND {5}".format(
-						data['propertyId'],
-						data['productId'],
-						str(data['productVersion']),
-						str(data['packageVersion']),
-						myPPVvalue,
-						myPPVdefault
-					)
+					u"`propertyId` = %s AND `productId` = %s AND "
+					u"`productVersion` = %s AND "
+					u"`packageVersion` = %s AND `value` = %s AND `isDefault` = %s"
 				)
+				myPPVparams = [
+					data['propertyId'],
+					data['productId'],
+					str(data['productVersion']),
+					str(data['packageVersion']),
+					self._sql.toParameter(value),
+					self._sql.toParameter(value in defaultValues)
+				]
 				myTransactionSuccess = False
 				myMaxRetryTransaction = 10
 				myRetryTransactionCounter = 0
@@ -676,7 +701,7 @@ class MySQLBackend(SQLBackend):
 						self._sql.doCommit = False
 						conn.begin()
 						logger.debug2(u'Start Transaction: insert to ppv %d' % myRetryTransactionCounter)
-						if not self._sql.getRow(myPPVselect , conn, cursor):
+						if not self._sql.getRow(myPPVselect, conn, cursor, params=myPPVparams):
 							# self._sql.doCommit = True
 							logger.debug2(u'doCommit set to true')
 							self._sql.insert('PRODUCT_PROPERTY_VALUE', {
@@ -717,7 +742,7 @@ class MySQLBackend(SQLBackend):
 			self._requiresEnabledSQLBackendModule()
 			ConfigDataBackend.productProperty_updateObject(self, productProperty)
 			data = self._objectToDatabaseHash(productProperty)
-			where = self._uniqueCondition(productProperty)
+			where, params = self._uniqueParameterizedCondition(productProperty)
 			possibleValues = data['possibleValues']
 			defaultValues = data['defaultValues']
 			if possibleValues is None:
@@ -726,10 +751,10 @@ class MySQLBackend(SQLBackend):
 				defaultValues = []
 			del data['possibleValues']
 			del data['defaultValues']
-			self._sql.update('PRODUCT_PROPERTY', where, data)
+			self._sql.update('PRODUCT_PROPERTY', where, data, whereParams=params)
 
 			if possibleValues is not None:
-				self._sql.delete('PRODUCT_PROPERTY_VALUE', where)
+				self._sql.delete('PRODUCT_PROPERTY_VALUE', where, whereParams=params)
 
 			for value in possibleValues:
 				try:
@@ -737,16 +762,17 @@ class MySQLBackend(SQLBackend):
 					logger.debug2(u'doCommit set to false')
 					valuesExist = self._sql.getRow(
 						u"select * from PRODUCT_PROPERTY_VALUE where "
-						u"`propertyId` = '{0}' AND `productId` = '{1}' AND "
-						u"`productVersion` = '{2}' AND `packageVersion` = '{3}' "
-						u"AND `value` = '{4}' AND `isDefault` = {5}".format(
+						u"`propertyId` = %s AND `productId` = %s AND "
+						u"`productVersion` = %s AND `packageVersion` = %s "
+						u"AND `value` = %s AND `isDefault` = %s",
+						params=[
 							data['propertyId'],
 							data['productId'],
 							str(data['productVersion']),
 							str(data['packageVersion']),
-							value,
-							str(value in defaultValues)
-						)
+							self._sql.toParameter(value),
+							self._sql.toParameter(value in defaultValues)
+						]
 					)
 					if not valuesExist:
 						self._sql.doCommit = True
@@ -28,11 +28,16 @@ The replicator allows replication from one backend into another.
 :license: GNU Affero General Public License version 3
 """
 
+import threading
+from Queue import Queue, Full
+
+import OPSI.Object
 from OPSI.Backend.Backend import ExtendedConfigDataBackend
 from OPSI.Logger import LOG_DEBUG, Logger
 from OPSI.Object import *
-from OPSI.Types import forceBool, forceHostId, forceList
+from OPSI.Types import forceBool, forceHostId, forceInt, forceList, forceUnicode
 from OPSI.Util.Message import ProgressSubject
+from OPSI.Util.Thread import ThreadPool
 
 
 __version__ = '4.0.6.48'
@@ -65,7 +70,49 @@ class BackendReplicator(object):
 		'AuditSoftwareToLicensePool'
 	]
 
-	def __init__(self, readBackend, writeBackend, newServerId=None, oldServerId=None, cleanupFirst=True):
+	# Classes of the same stage do not reference each other and are
+	# replicated at the same time if more than one worker is used.
+	OBJECT_CLASS_STAGES = [
+		[
+			'Host', 'Product', 'Config', 'Group', 'LicenseContract',
+			'AuditHardware', 'AuditSoftware'
+		],
+		[
+			'LicensePool', 'SoftwareLicense', 'ProductDependency',
+			'ProductProperty', 'ProductOnDepot', 'ProductOnClient',
+			'ConfigState', 'ObjectToGroup', 'AuditHardwareOnHost',
+			'AuditSoftwareOnClient'
+		],
+		[
+			'ProductPropertyState', 'SoftwareLicenseToLicensePool',
+			'AuditSoftwareToLicensePool'
+		],
+		['LicenseOnClient'],
+	]
+
+	# Objects of these classes are read in batches of hosts.
+	# The value is the attribute holding the host id.
+	HOST_BATCH_ATTRIBUTES = {
+		'ProductOnClient': 'clientId',
+		'ProductPropertyState': 'objectId',
+		'ConfigState': 'objectId',
+		'AuditHardwareOnHost': 'hostId',
+		'AuditSoftwareOnClient': 'clientId',
+		'LicenseOnClient': 'clientId',
+	}
+	HOST_BATCH_SIZE = 50
+
+	# Number of modified objects read with one request.
+	MODIFICATION_BATCH_SIZE = 100
+
+	def __init__(self, readBackend, writeBackend, newServerId=None, oldServerId=None, cleanupFirst=True, workers=1):
+		"""
+		Create a replicator.
+
+		:param workers: The number of object classes to replicate at \
+the same time. Using more than one worker requires backends that \
+can be used from multiple threads, i.e. MySQL.
+		"""
 		self.__readBackend = readBackend
 		self.__writeBackend = writeBackend
 
@@ -76,6 +123,9 @@ class BackendReplicator(object):
 		self.__oldServerId = None
 
 		self.__cleanupFirst = forceBool(cleanupFirst)
+		self.__workers = max(forceInt(workers), 1)
+		self.__configServer = None
+		self.__depotServers = []
 		self.__strict = False
 		self.__serverIds = []
 		self.__depotIds = []
@@ -201,140 +251,33 @@ class BackendReplicator(object):
 				'AuditSoftwareToLicensePool'
 			])
 
-			configServer = None
-			depotServers = []
+			objectClasses = []
 			for objClass in self.OBJECT_CLASSES:
 				if not audit and objClass in auditClasses:
 					continue
 				if not license and objClass in licenseClasses:
 					continue
-
-				subClasses = [None]
-				if objClass == 'Host':
-					subClasses = ['OpsiConfigserver', 'OpsiDepotserver', 'OpsiClient']
-
-				methodPrefix = eval("%s.backendMethodPrefix" % objClass)
-
-				self.__overallProgressSubject.setMessage(u"Replicating %s" % objClass)
-				self.__currentProgressSubject.setTitle(u"Replicating %s" % objClass)
-				for subClass in subClasses:
-					filter = {}
-					if subClass == 'OpsiConfigserver':
-						filter = {'type': subClass, 'id': serverIds}
-					elif subClass == 'OpsiDepotserver':
-						filter = {'type': subClass, 'id': depotIds}
-					elif subClass == 'OpsiClient':
-						filter = {'type': subClass, 'id': clientIds}
-					elif objClass == 'Group':
-						filter = {'type': subClass, 'id': groupIds}
-					elif objClass == 'Product':
-						filter = {'type': subClass, 'id': productIds}
-					elif objClass == 'ProductOnClient':
-						filter = {
-							'productType': productTypes,
-							'productId': productIds,
-							'clientId': clientIds
-						}
-					elif objClass == 'ProductOnDepot':
-						filter = {
-							'productType': productTypes,
-							'productId': productIds,
-							'depotId': depotIds
-						}
-					elif objClass == 'ProductDependency':
-						filter = {'productId': productIds}
-					elif objClass == 'ProductProperty':
-						filter = {'productId': productIds}
-					elif objClass == 'ProductPropertyState':
-						filter = {
-							'productId': productIds,
-							'objectId': forceList(hostIds)
-						}
-					elif objClass == 'ConfigState':
-						filter = {'objectId': forceList(hostIds)}
-					elif objClass == 'ObjectToGroup':
-						if productIds and hostIds:
-							objectIds = productIds + forceList(hostIds)
-						else:
-							objectIds = []
-
-						filter = {'objectId': objectIds}
-					elif objClass == 'LicenseOnClient':
-						filter = {'clientId': clientIds}
-
-					logger.notice("Replicating class '%s', filter: %s" % (objClass, filter))
-					if not subClass:
-						subClass = objClass
-					Class = eval(subClass)
-
-					self.__currentProgressSubject.reset()
-					self.__currentProgressSubject.setMessage(u"Reading objects")
-					self.__currentProgressSubject.setEnd(1)
-					objs = []
-
-					if objClass == 'ProductOnDepot' and productOnDepots:
-						objs = productOnDepots
-					else:
-						meth = '%s_getObjects' % Class.backendMethodPrefix
-						meth = getattr(rb, meth)
-						objs = meth(**filter)
-
-					self.__currentProgressSubject.addToState(1)
-					if objClass == 'Group':
-						# Sort groups
-						sortedObjs = []
-						groupIds = []
-						while True:
-							notAddedObjs = []
-							for obj in objs:
-								if not obj.getParentGroupId() or obj.getParentGroupId() in groupIds:
-									if not obj.getParentGroupId():
-										logger.debug(u"Adding group '%s' without parent group set" % obj)
-									else:
-										logger.debug(u"Adding group '%s' with parent group '%s' already added" % (obj, obj.getParentGroupId()))
-									sortedObjs.append(obj)
-									groupIds.append(obj.getId())
-								else:
-									logger.debug(u"Cannot add group '%s' parent group '%s' not added yet" % (obj, obj.getParentGroupId()))
-									notAddedObjs.append(obj)
-							if not notAddedObjs:
-								break
-							if len(notAddedObjs) == len(objs):
-								for obj in notAddedObjs:
-									logger.error(u"Failed to add group: %s" % obj)
-								break
-							objs = notAddedObjs
-						objs = sortedObjs
-
-					self.__currentProgressSubject.reset()
-					self.__currentProgressSubject.setMessage(u"Writing objects")
-					if subClass == 'OpsiConfigserver' and objs:
-						configServer = objs[0]
-						depotServers.extend(objs)
-					if subClass == 'OpsiDepotserver':
-						depotServers.extend(objs)
-
-					if self.__strict:
-						self.__currentProgressSubject.setEnd(1)
-						meth = '%s_createObjects' % Class.backendMethodPrefix
-						meth = getattr(wb, meth)
-						meth(objs)
-						self.__currentProgressSubject.addToState(1)
-					else:
-						self.__currentProgressSubject.setEnd(len(objs))
-						meth = '%s_insertObject' % Class.backendMethodPrefix
-						meth = getattr(wb, meth)
-
-						for obj in objs:
-							try:
-								meth(obj)
-							except Exception as e:
-								logger.logException(e, LOG_DEBUG)
-								logger.error(u"Failed to replicate object %s: %s" % (obj, e))
-							self.__currentProgressSubject.addToState(1)
-					self.__currentProgressSubject.setState(len(objs))
-
-				self.__overallProgressSubject.addToState(1)
+				objectClasses.append(objClass)
+
+			selection = {
+				'serverIds': serverIds,
+				'depotIds': depotIds,
+				'clientIds': clientIds,
+				'groupIds': groupIds,
+				'productIds': productIds,
+				'productTypes': productTypes,
+				'hostIds': forceList(hostIds),
+				'productOnDepots': productOnDepots,
+			}
+
+			self.__configServer = None
+			self.__depotServers = []
+			self._replicateObjectClasses(
+				objectClasses,
+				lambda objClass: self._replicateObjectClass(objClass, rb, wb, selection)
+			)
+			configServer = self.__configServer
+			depotServers = self.__depotServers
 
 			if self.__newServerId:
 				self.__currentProgressSubject.reset()
@@ -376,6 +319,440 @@ class BackendReplicator(object):
 		finally:
 			wb.backend_setOptions({'additionalReferentialIntegrityChecks': aric})
 
+	def replicateModifications(self, modificationTracker, since=0):
+		"""
+		Replicate the objects modified after a previous replication.
+
+		Instead of copying every object only the objects recorded by \
+`modificationTracker` are replicated. The current state of every \
+modified object is read from the read backend and written to the \
+write backend. Objects that no longer exist are deleted from the \
+write backend. The write backend is never cleaned up first.
+
+		:param modificationTracker: A tracker recording the modifications \
+of the read backend, i.e. a `SQLBackendObjectModificationTracker`.
+		:param since: The id of the last modification that has already \
+been replicated. With 0 every recorded modification is replicated.
+		:returns: The id of the last replicated modification. Pass this \
+as `since` to the next call.
+		:returntype: int
+		"""
+		since = forceInt(since)
+		modifications = modificationTracker.getModifications(afterId=since)
+		if not modifications:
+			logger.info(u"No modifications after {0} to replicate", since)
+			return since
+
+		# Only the last modification of an object is relevant.
+		lastModifications = {}
+		lastModificationId = since
+		for modification in modifications:
+			key = (modification['objectClass'], modification['ident'])
+			modificationId = forceInt(modification['id'])
+			lastModifications[key] = (modificationId, modification['command'])
+			lastModificationId = max(lastModificationId, modificationId)
+
+		# The objects are mapped to the id of their last modification
+		# to replicate them in the order they were modified.
+		changes = {}
+		for (key, (modificationId, command)) in lastModifications.items():
+			objClass = self._getReplicatedObjectClass(key[0])
+			if not objClass:
+				logger.warning(u"Not replicating modified object of unknown class {0!r}", key[0])
+				continue
+
+			classChanges = changes.setdefault(objClass, {'update': {}, 'delete': {}})
+			if command == 'delete':
+				classChanges['delete'][key] = modificationId
+			else:
+				classChanges['update'][key] = modificationId
+
+		logger.notice(
+			u"Replicating {0} modified objects up to modification {1}",
+			len(lastModifications), lastModificationId
+		)
+
+		rb = self._extendedReadBackend
+		wb = self.__writeBackend
+		aric = wb.backend_getOptions().get('additionalReferentialIntegrityChecks', True)
+		if self.__strict:
+			wb = self._extendedWriteBackend
+		else:
+			wb.backend_setOptions({'additionalReferentialIntegrityChecks': False})
+
+		try:
+			objectClasses = [objClass for objClass in self.OBJECT_CLASSES if objClass in changes]
+			self.__overallProgressSubject.reset()
+			self.__overallProgressSubject.setEnd(len(objectClasses) + 1)
+
+			def updateObjectClass(objClass):
+				self.__overallProgressSubject.setMessage(u"Replicating %s" % objClass)
+				updated = changes[objClass]['update']
+				for keys in self._splitIntoBatches(sorted(updated, key=updated.get), self.MODIFICATION_BATCH_SIZE):
+					objs = self._getModifiedObjects(rb, keys)
+					self._writeObjects(
+						getattr(OPSI.Object, objClass), wb,
+						[objs[key] for key in keys if key in objs]
+					)
+
+					# Objects removed after their last modification
+					# was recorded are deleted as well.
+					for key in keys:
+						if key not in objs:
+							changes[objClass]['delete'][key] = updated[key]
+
+			self._replicateObjectClasses(objectClasses, updateObjectClass)
+
+			# Referencing objects are deleted first.
+			self.__overallProgressSubject.setMessage(u"Deleting objects")
+			for objClass in reversed(objectClasses):
+				for keys in self._splitIntoBatches(changes[objClass]['delete'], self.MODIFICATION_BATCH_SIZE):
+					objs = self._getModifiedObjects(wb, keys).values()
+					if objs:
+						logger.info(u"Deleting {0} objects of class {1}", len(objs), objClass)
+						Class = getattr(OPSI.Object, objClass)
+						getattr(wb, '%s_deleteObjects' % Class.backendMethodPrefix)(objs)
+			self.__overallProgressSubject.addToState(1)
+		finally:
+			wb.backend_setOptions({'additionalReferentialIntegrityChecks': aric})
+
+		return lastModificationId
+
+	def _replicateObjectClasses(self, objectClasses, replicateObjectClass):
+		"""
+		Call `replicateObjectClass` for each of the given object classes.
+
+		With a single worker the classes are processed in the given \
+order. Otherwise the classes of each stage in `OBJECT_CLASS_STAGES` \
+are processed at the same time.
+		"""
+		def replicate(objClass):
+			replicateObjectClass(objClass)
+			self.__overallProgressSubject.addToState(1)
+
+		if self.__workers < 2:
+			for objClass in objectClasses:
+				replicate(objClass)
+			return
+
+		pool = ThreadPool(size=self.__workers)
+		try:
+			for stage in self.OBJECT_CLASS_STAGES:
+				stageClasses = [objClass for objClass in stage if objClass in objectClasses]
+				if not stageClasses:
+					continue
+
+				lock = threading.Lock()
+				finished = threading.Event()
+				pending = [len(stageClasses)]
+				errors = []
+
+				def jobDone(success, result, error):
+					with lock:
+						if not success:
+							errors.append(error)
+						pending[0] -= 1
+						if not pending[0]:
+							finished.set()
+
+				for objClass in stageClasses:
+					pool.addJob(replicate, jobDone, objClass)
+				finished.wait()
+
+				if errors:
+					for error in errors[1:]:
+						logger.error(forceUnicode(error))
+					raise errors[0]
+		finally:
+			pool.stop()
+
+	def _replicateObjectClass(self, objClass, readBackend, writeBackend, selection):
+		subClasses = [None]
+		if objClass == 'Host':
+			subClasses = ['OpsiConfigserver', 'OpsiDepotserver', 'OpsiClient']
+
+		self.__overallProgressSubject.setMessage(u"Replicating %s" % objClass)
+		self.__currentProgressSubject.setTitle(u"Replicating %s" % objClass)
+		for subClass in subClasses:
+			filter = self._getObjectFilter(objClass, subClass, selection)
+			logger.notice("Replicating class '%s', filter: %s" % (objClass, filter))
+			if not subClass:
+				subClass = objClass
+			Class = getattr(OPSI.Object, subClass)
+
+			self.__currentProgressSubject.reset()
+			self.__currentProgressSubject.setMessage(u"Replicating objects")
+			for objs in self._readObjects(objClass, Class, readBackend, filter, selection):
+				if objClass == 'Group':
+					objs = self._sortGroups(objs)
+
+				if subClass == 'OpsiConfigserver' and objs:
+					self.__configServer = objs[0]
+					self.__depotServers.extend(objs)
+				if subClass == 'OpsiDepotserver':
+					self.__depotServers.extend(objs)
+
+				self._writeObjects(Class, writeBackend, objs)
+
+	@staticmethod
+	def _getObjectFilter(objClass, subClass, selection):
+		serverIds = selection['serverIds']
+		depotIds = selection['depotIds']
+		clientIds = selection['clientIds']
+		productIds = selection['productIds']
+		productTypes = selection['productTypes']
+		hostIds = selection['hostIds']
+
+		filter = {}
+		if subClass == 'OpsiConfigserver':
+			filter = {'type': subClass, 'id': serverIds}
+		elif subClass == 'OpsiDepotserver':
+			filter = {'type': subClass, 'id': depotIds}
+		elif subClass == 'OpsiClient':
+			filter = {'type': subClass, 'id': clientIds}
+		elif objClass == 'Group':
+			filter = {'type': subClass, 'id': selection['groupIds']}
+		elif objClass == 'Product':
+			filter = {'type': subClass, 'id': productIds}
+		elif objClass == 'ProductOnClient':
+			filter = {
+				'productType': productTypes,
+				'productId': productIds,
+				'clientId': clientIds
+			}
+		elif objClass == 'ProductOnDepot':
+			filter = {
+				'productType': productTypes,
+				'productId': productIds,
+				'depotId': depotIds
+			}
+		elif objClass == 'ProductDependency':
+			filter = {'productId': productIds}
+		elif objClass == 'ProductProperty':
+			filter = {'productId': productIds}
+		elif objClass == 'ProductPropertyState':
+			filter = {
+				'productId': productIds,
+				'objectId': hostIds
+			}
+		elif objClass == 'ConfigState':
+			filter = {'objectId': hostIds}
+		elif objClass == 'ObjectToGroup':
+			if productIds and hostIds:
+				objectIds = productIds + hostIds
+			else:
+				objectIds = []
+
+			filter = {'objectId': objectIds}
+		elif objClass == 'LicenseOnClient':
+			filter = {'clientId': clientIds}
+
+		return filter
+
+	def _readObjects(self, objClass, Class, readBackend, filter, selection):
+		"""
+		Read the objects to replicate.
+
+		Objects of classes in `HOST_BATCH_ATTRIBUTES` are read in \
+batches of hosts. With more than one worker the next batch is read \
+in a background thread while the current batch is written.
+
+		:returns: Generator of lists of objects.
+		"""
+		meth = getattr(readBackend, '%s_getObjects' % Class.backendMethodPrefix)
+
+		if objClass == 'ProductOnDepot' and selection['productOnDepots']:
+			return iter([selection['productOnDepots']])
+
+		attribute = self.HOST_BATCH_ATTRIBUTES.get(objClass)
+		if not attribute:
+			return iter([meth(**filter)])
+
+		hostIds = filter.get(attribute)
+		if not hostIds:
+			hostIds = readBackend.host_getIdents(returnType='unicode')
+
+		def readBatches():
+			for batch in self._splitIntoBatches(hostIds, self.HOST_BATCH_SIZE):
+				batchFilter = dict(filter)
+				batchFilter[attribute] = batch
+				yield meth(**batchFilter)
+
+		if self.__workers < 2:
+			return readBatches()
+
+		return self._prefetch(readBatches())
+
+	@staticmethod
+	def _prefetch(iterable):
+		"""
+		Iterate over `iterable` while the next item is created in a \
+background thread.
+		"""
+		queue = Queue(maxsize=1)
+		stopped = threading.Event()
+		finished = object()
+
+		def put(item):
+			while not stopped.is_set():
+				try:
+					queue.put(item, timeout=0.1)
+					return True
+				except Full:
+					pass
+			return False
+
+		def produce():
+			try:
+				for item in iterable:
+					if not put((item, None)):
+						return
+			except Exception as error:
+				logger.logException(error, LOG_DEBUG)
+				put((None, error))
+				return
+			put((finished, None))
+
+		thread = threading.Thread(target=produce, name=u'ReplicatorPrefetch')
+		thread.daemon = True
+		thread.start()
+		try:
+			while True:
+				(item, error) = queue.get()
+				if error is not None:
+					raise error
+				if item is finished:
+					break
+				yield item
+		finally:
+			stopped.set()
+
+	@staticmethod
+	def _splitIntoBatches(items, size):
+		items = list(items)
+		for index in range(0, len(items), size):
+			yield items[index:index + size]
+
+	@staticmethod
+	def _sortGroups(objs):
+		sortedObjs = []
+		groupIds = []
+		while True:
+			notAddedObjs = []
+			for obj in objs:
+				if not obj.getParentGroupId() or obj.getParentGroupId() in groupIds:
+					if not obj.getParentGroupId():
+						logger.debug(u"Adding group '%s' without parent group set" % obj)
+					else:
+						logger.debug(u"Adding group '%s' with parent group '%s' already added" % (obj, obj.getParentGroupId()))
+					sortedObjs.append(obj)
+					groupIds.append(obj.getId())
+				else:
+					logger.debug(u"Cannot add group '%s' parent group '%s' not added yet" % (obj, obj.getParentGroupId()))
+					notAddedObjs.append(obj)
+			if not notAddedObjs:
+				break
+			if len(notAddedObjs) == len(objs):
+				for obj in notAddedObjs:
+					logger.error(u"Failed to add group: %s" % obj)
+				break
+			objs = notAddedObjs
+		return sortedObjs
+
+	def _writeObjects(self, Class, writeBackend, objs):
+		self.__currentProgressSubject.setEnd(self.__currentProgressSubject.getEnd() + len(objs))
+		if self.__strict:
+			meth = getattr(writeBackend, '%s_createObjects' % Class.backendMethodPrefix)
+			meth(objs)
+			self.__currentProgressSubject.addToState(len(objs))
+		else:
+			meth = getattr(writeBackend, '%s_insertObject' % Class.backendMethodPrefix)
+			for obj in objs:
+				try:
+					meth(obj)
+				except Exception as e:
+					logger.logException(e, LOG_DEBUG)
+					logger.error(u"Failed to replicate object %s: %s" % (obj, e))
+				self.__currentProgressSubject.addToState(1)
+
+	def _getReplicatedObjectClass(self, className):
+		"""
+		Get the entry of `OBJECT_CLASSES` the class belongs to.
+
+		:returns: The name of the replicated class or `None`.
+		"""
+		try:
+			Class = getattr(OPSI.Object, className)
+		except AttributeError:
+			return None
+
+		for baseClass in Class.__mro__:
+			if baseClass.__name__ in self.OBJECT_CLASSES:
+				return baseClass.__name__
+
+		return None
+
+	@classmethod
+	def _getModifiedObjects(cls, backend, keys):
+		"""
+		Get the objects for tuples of class name and ident.
+
+		:returns: The found objects keyed by their tuple.
+		"""
+		identsByClass = {}
+		for (className, ident) in keys:
+			identsByClass.setdefault(className, []).append(ident)
+
+		objects = {}
+		for (className, idents) in identsByClass.items():
+			Class = getattr(OPSI.Object, className)
+			for obj in cls._getObjectsByIdent(backend, Class, idents):
+				objects[(className, obj.getIdent())] = obj
+
+		return objects
+
+	@staticmethod
+	def _getObjectsByIdent(backend, Class, idents):
+		"""
+		Get the objects of exactly `Class` with one of the given idents.
+
+		The idents start with the values of the mandatory attributes \
+of the class. The attribute with the most distinct values is used to \
+filter the objects in the backend.
+		"""
+		idents = set(idents)
+		identAttributes = getIdentAttributes(Class)
+		# The idents of hardware also contain the hardware attributes.
+		fixedLength = not issubclass(Class, (AuditHardware, AuditHardwareOnHost))
+
+		filter = {}
+		for (index, attribute) in enumerate(identAttributes):
+			values = set()
+			for ident in idents:
+				parts = ident.split(Class.identSeparator)
+				if fixedLength and len(parts) != len(identAttributes):
+					# A value contains the separator.
+					values = None
+					break
+				if len(parts) <= index or not parts[index]:
+					values = None
+					break
+				values.add(parts[index])
+
+			if values and (not filter or len(values) >= len(filter.values()[0])):
+				filter = {attribute: list(values)}
+
+		# Some backends only accept single values for some attributes.
+		for (attribute, values) in filter.items():
+			if len(values) == 1:
+				filter[attribute] = values[0]
+
+		meth = getattr(backend, '%s_getObjects' % Class.backendMethodPrefix)
+		return [
+			obj for obj in meth(**filter)
+			if obj.__class__ is Class and obj.getIdent() in idents
+		]
+
 	@classmethod
 	def _getNumberOfObjectClassesToProcess(cls, audit=True, license=True):
 		auditClasses = set([
@@ -40,9 +40,9 @@ from hashlib import md5
 from twisted.conch.ssh import keys
 
 from OPSI.Logger import Logger
-from OPSI.Types import (forceBool, forceUnicodeLower, forceOpsiTimestamp,
+from OPSI.Types import (forceBool, forceInt, forceUnicodeLower, forceOpsiTimestamp,
 	forceList, forceUnicode, forceUnicodeList, forceDict, forceObjectClassList)
-from OPSI.Types import (BackendConfigurationError,
+from OPSI.Types import (BackendBadValueError, BackendConfigurationError,
 	BackendReferentialIntegrityError, BackendModuleDisabledError)
 from OPSI.Object import (AuditHardware, AuditHardwareOnHost, AuditSoftware,
 	AuditSoftwareOnClient, AuditSoftwareToLicensePool, BootConfiguration,
@@ -57,6 +57,18 @@ from OPSI.Util import timestamp
 
 logger = Logger()
 
+# Statement templates shared between all backends of this process.
+# They only depend on the structure of a query and the placeholder in use.
+_STATEMENT_CACHE = {}
+_STATEMENT_CACHE_SIZE = 2048
+
+
+def _cacheStatement(key, statement):
+	if len(_STATEMENT_CACHE) >= _STATEMENT_CACHE_SIZE:
+		_STATEMENT_CACHE.clear()
+
+	_STATEMENT_CACHE[key] = statement
+
 
 @contextmanager
 def timeQuery(query):
@@ -82,6 +94,11 @@ class SQL(object):
 	ESCAPED_UNDERSCORE = "\\_"
 	ESCAPED_PERCENT = "\\%"
 	ESCAPED_ASTERISK = "\\*"
+	PARAMETER_PLACEHOLDER = u"%s"
+	ON_DUPLICATE_KEY_UPDATE_SUPPORTED = False
+	# Whether comparing strings ignores their case (as MySQL does with
+	# its default collation).
+	CASE_INSENSITIVE_COMPARISON = True
 	doCommit = True
 
 	def __init__(self, **kwargs):
@@ -93,25 +110,52 @@ class SQL(object):
 	def close(self, conn, cursor):
 		pass
 
-	def getSet(self, query):
+	def getSet(self, query, params=None):
 		return []
 
-	def getRow(self, query):
+	def getRow(self, query, params=None):
 		return {}
 
 	def insert(self, table, valueHash):
 		return -1
 
-	def update(self, table, where, valueHash, updateWhereNone=False):
+	def update(self, table, where, valueHash, updateWhereNone=False, whereParams=None):
 		return 0
 
-	def delete(self, table, where):
+	def insertMany(self, table, valueHashes, updateOnDuplicateKey=False):
+		"""
+		Inserts multiple rows into `table`.
+
+		This implementation inserts row by row.
+		Subclasses should insert the rows in as few statements as possible.
+
+		:param updateOnDuplicateKey: If `True` rows with an existing primary key are updated instead. Requires `ON_DUPLICATE_KEY_UPDATE_SUPPORTED`.
+		"""
+		if updateOnDuplicateKey and not self.ON_DUPLICATE_KEY_UPDATE_SUPPORTED:
+			raise BackendBadValueError(u"Updating on duplicate keys is not supported")
+
+		for valueHash in valueHashes:
+			self.insert(table, valueHash)
+
+	def updateMany(self, table, where, rows, updateWhereNone=False):
+		"""
+		Updates multiple rows of `table` matching the same condition.
+
+		This implementation updates row by row.
+
+		:param where: The condition with placeholders.
+		:param rows: Pairs of the values to set and the parameters for the condition.
+		"""
+		for valueHash, whereParams in rows:
+			self.update(table, where, valueHash, updateWhereNone=updateWhereNone, whereParams=whereParams)
+
+	def delete(self, table, where, whereParams=None):
 		return 0
 
 	def getTables(self):
 		return {}
 
-	def execute(self, query, conn=None, cursor=None):
+	def execute(self, query, conn=None, cursor=None, params=None):
 		return None
 
 	def query(self, query, conn=None, cursor=None):
@@ -135,6 +179,128 @@ class SQL(object):
 	def escapeAsterisk(self, string):
 		return string.replace('*', self.ESCAPED_ASTERISK)
 
+	@staticmethod
+	def toParameter(value):
+		"""
+		Converts `value` to a value that can be passed as query parameter.
+		"""
+		if isinstance(value, bool):
+			return int(value)
+		elif isinstance(value, str):
+			return value.decode('utf-8')
+
+		return value
+
+	def createInsertStatement(self, table, columns, rowCount=1):
+		"""
+		Creates an INSERT statement with a placeholder for each column.
+
+		Statements are cached by table, columns and number of rows.
+
+		:type columns: tuple
+		:param rowCount: The number of rows to insert with the statement.
+		:returntype: unicode
+		"""
+		cacheKey = (self.PARAMETER_PLACEHOLDER, 'insert', table, columns, rowCount)
+		try:
+			return _STATEMENT_CACHE[cacheKey]
+		except KeyError:
+			row = u'({0})'.format(u', '.join([self.PARAMETER_PLACEHOLDER] * len(columns)))
+			query = u'INSERT INTO `{0}` ({1}) VALUES {2};'.format(
+				table,
+				u', '.join(u'`{0}`'.format(column) for column in columns),
+				u', '.join([row] * rowCount)
+			)
+			_cacheStatement(cacheKey, query)
+			return query
+
+	def createUpdateStatement(self, table, columns, where):
+		"""
+		Creates an UPDATE statement with a placeholder for each column.
+
+		The SET part is cached by table and columns.
+
+		:type columns: tuple
+		:param where: The condition to use. Placeholders are allowed.
+		:returntype: unicode
+		"""
+		try:
+			assignments = _STATEMENT_CACHE[(self.PARAMETER_PLACEHOLDER, 'update', table, columns)]
+		except KeyError:
+			assignments = u', '.join(
+				u'`{0}` = {1}'.format(column, self.PARAMETER_PLACEHOLDER)
+				for column in columns
+			)
+			_cacheStatement((self.PARAMETER_PLACEHOLDER, 'update', table, columns), assignments)
+
+		return u"UPDATE `{0}` SET {1} WHERE {2};".format(table, assignments, where)
+
+	def groupByColumns(self, valueHashes, updateWhereNone=True):
+		"""
+		Groups the values of `valueHashes` by the columns they set.
+
+		:param updateWhereNone: If `False` columns with a value of `None` are left out.
+		:returns: Pairs of the columns and a list with the parameters of every row setting these columns.
+		:returntype: [(tuple, [list, ...]), ...]
+		"""
+		groups = {}
+		order = []
+		for valueHash in valueHashes:
+			columns = tuple(sorted(
+				key for (key, value) in valueHash.items()
+				if value is not None or updateWhereNone
+			))
+			try:
+				rows = groups[columns]
+			except KeyError:
+				rows = groups[columns] = []
+				order.append(columns)
+
+			rows.append([self.toParameter(valueHash[column]) for column in columns])
+
+		return [(columns, groups[columns]) for columns in order]
+
+	def toLiteral(self, value):
+		"""
+		Returns the escaped SQL literal for a parameter value.
+		"""
+		value = self.toParameter(value)
+		if value is None:
+			return u"NULL"
+		elif isinstance(value, (float, long, int)):
+			return forceUnicode(value)
+
+		return u"'{0}'".format(self.escapeApostrophe(self.escapeBackslash(value)))
+
+	def renderQuery(self, query, params=None):
+		"""
+		Replaces the placeholders in `query` with the escaped literals
+		of `params`.
+
+		This is meant for cases where a complete statement is required,
+		i.e. for logging or backwards compatibility.
+		Always prefer passing parameters to the database.
+
+		:returntype: unicode
+		"""
+		if not params:
+			return query
+
+		parts = query.split(self.PARAMETER_PLACEHOLDER)
+		if len(parts) != len(params) + 1:
+			raise ValueError(
+				u"Query {0!r} does not match the {1} given parameters".format(
+					query, len(params)
+				)
+			)
+
+		rendered = [parts[0]]
+		for param, part in zip(params, parts[1:]):
+			rendered.append(self.toLiteral(param))
+			rendered.append(part)
+
+		return u''.join(rendered)
+
 
 class SQLBackendObjectModificationTracker(BackendModificationListener):
 	def __init__(self, **kwargs):
@@ -177,21 +343,35 @@ class SQLBackendObjectModificationTracker(BackendModificationListener):
 			'date': timestamp()
 		}
 		if self._lastModificationOnly:
-			objectClass = data['objectClass']
-			ident = self._sql.escapeApostrophe(self._sql.escapeBackslash(data['ident']))
-			self._sql.delete('OBJECT_MODIFICATION_TRACKER', "`objectClass` = '%s' AND `ident` = '%s'" % (objectClass, ident))
+			self._sql.delete(
+				'OBJECT_MODIFICATION_TRACKER',
+				u"`objectClass` = {0} AND `ident` = {0}".format(self._sql.PARAMETER_PLACEHOLDER),
+				whereParams=[data['objectClass'], data['ident']]
+			)
 		start = time.time()
 		self._sql.insert('OBJECT_MODIFICATION_TRACKER', data)
-		logger.debug(u"Took %0.2f seconds to track modification of objectClass %s, ident %s" % ((time.time() - start), data['objectClass'], data['ident']))
+		logger.debug(u"Took {0:0.2f} seconds to track modification of objectClass {1}, ident {2}", (time.time() - start), data['objectClass'], data['ident'])
 
-	def getModifications(self, sinceDate=0):
-		return self._sql.getSet("SELECT * FROM `OBJECT_MODIFICATION_TRACKER` WHERE `date` > '%s'" % forceOpsiTimestamp(sinceDate))
+	def getModifications(self, sinceDate=0, afterId=0):
+		"""
+		Get the tracked modifications ordered by their id.
+
+		:param sinceDate: Only return modifications after this date.
+		:param afterId: Only return modifications with a higher id. \
+Ids are increasing and unlike dates never equal for two modifications.
+		"""
+		return self._sql.getSet(
+			u"SELECT * FROM `OBJECT_MODIFICATION_TRACKER` WHERE `date` > {0} AND `id` > {0} ORDER BY `id`".format(self._sql.PARAMETER_PLACEHOLDER),
+			[forceOpsiTimestamp(sinceDate), forceInt(afterId)]
+		)
 
 	def clearModifications(self, objectClass=None, sinceDate=0):
-		where = "`date` > '%s'" % forceOpsiTimestamp(sinceDate)
+		where = u"`date` > {0}".format(self._sql.PARAMETER_PLACEHOLDER)
+		params = [forceOpsiTimestamp(sinceDate)]
 		if objectClass:
-			where = ''.join((where, 'AND `objectClass` = "{0}"'.format(objectClass)))
-		self._sql.execute("DELETE FROM `OBJECT_MODIFICATION_TRACKER` WHERE %s" % where)
+			where = u' AND '.join((where, u"`objectClass` = {0}".format(self._sql.PARAMETER_PLACEHOLDER)))
+			params.append(objectClass)
+		self._sql.delete('OBJECT_MODIFICATION_TRACKER', where, whereParams=params)
 
 	def objectInserted(self, backend, obj):
 		self._trackModification('insert', obj)
@@ -206,6 +386,8 @@ class SQLBackendObjectModificationTracker(BackendModificationListener):
 class SQLBackend(ConfigDataBackend):
 
 	_OPERATOR_IN_CONDITION_PATTERN = re.compile('^\s*([>=<]+)\s*(\d\.?\d*)')
+	# SQLite allows at most 999 parameters per statement.
+	_MAX_KEYS_PER_QUERY = 500
 
 	def __init__(self, **kwargs):
 		self._name = 'sql'
@@ -239,8 +421,25 @@ class SQLBackend(ConfigDataBackend):
 	def _filterToSql(self, filter={}):
 		"""
 		Creates a SQL condition out of the given filter.
+
+		The values are included as escaped literals.
+		Use :py:meth:`_filterToParameterizedSql` to get a condition with
+		placeholders instead.
 		"""
-		condition = []
+		return self._sql.renderQuery(*self._filterToParameterizedSql(filter))
+
+	def _filterToParameterizedSql(self, filter={}):
+		"""
+		Creates a SQL condition with placeholders out of the given filter.
+
+		The condition is cached per filter shape, that is the keys of
+		the filter together with the kind of comparison for each value.
+
+		:returns: The condition and the parameters to use with it.
+		:returntype: (unicode, list)
+		"""
+		shape = []
+		params = []
 		for key, values in filter.items():
 			if values is None:
 				continue
@@ -248,54 +447,205 @@ class SQLBackend(ConfigDataBackend):
 			if not values:
 				continue
 
-			tmp = []
+			operators = []
 			for value in values:
 				if isinstance(value, bool):
-					if value:
-						tmp.append(u"`{0}` = 1".format(key))
-					else:
-						tmp.append(u"`{0}` = 0".format(key))
+					operators.append(u'=')
+					params.append(int(value))
 				elif isinstance(value, (float, long, int)):
-					tmp.append(u"`{0}` = {1}".format(key, value))
+					operators.append(u'=')
+					params.append(value)
 				elif value is None:
-					tmp.append(u"`{0}` is NULL".format(key))
+					operators.append(None)
 				else:
-					value = value.replace(self._sql.ESCAPED_ASTERISK, u'\uffff')
-					value = self._sql.escapeApostrophe(self._sql.escapeBackslash(value))
+					value = forceUnicode(value).replace(self._sql.ESCAPED_ASTERISK, u'\uffff')
 					match = self._OPERATOR_IN_CONDITION_PATTERN.search(value)
 					if match:
-						operator = match.group(1)
-						value = match.group(2)
-						value = value.replace(u'\uffff', self._sql.ESCAPED_ASTERISK)
-						tmp.append(u"`%s` %s %s" % (key, operator, forceUnicode(value)))
-					else:
-						if '*' in value:
-							operator = 'LIKE'
-							value = self._sql.escapeUnderscore(self._sql.escapePercent(value)).replace('*', '%')
+						operators.append(match.group(1))
+						number = match.group(2)
+						if u'.' in number:
+							params.append(float(number))
 						else:
-							operator = '='
+							params.append(int(number))
+					elif u'*' in value:
+						operators.append(u'LIKE')
+						value = self._sql.escapeUnderscore(self._sql.escapePercent(self._sql.escapeBackslash(value)))
+						params.append(value.replace(u'*', u'%').replace(u'\uffff', u'*'))
+					else:
+						operators.append(u'=')
+						params.append(value.replace(u'\uffff', u'*'))
+
+			shape.append((key, tuple(operators)))
 
-						value = value.replace(u'\uffff', self._sql.ESCAPED_ASTERISK)
-						tmp.append(u"`{0}` {1} '{2}'".format(key, operator, forceUnicode(value)))
-			condition.append(u' or '.join(tmp))
+		shape = tuple(shape)
+		cacheKey = (self._sql.PARAMETER_PLACEHOLDER, 'condition', shape)
+		try:
+			return (_STATEMENT_CACHE[cacheKey], params)
+		except KeyError:
+			condition = []
+			for key, operators in shape:
+				tmp = []
+				for operator in operators:
+					if operator is None:
+						tmp.append(u"`{0}` is NULL".format(key))
+					else:
+						tmp.append(u"`{0}` {1} {2}".format(key, operator, self._sql.PARAMETER_PLACEHOLDER))
+				condition.append(u' or '.join(tmp))
 
-		return u' and '.join([u'({0})'.format(c) for c in condition])
+			condition = u' and '.join([u'({0})'.format(c) for c in condition])
+			_cacheStatement(cacheKey, condition)
+			return (condition, params)
 
 	def _createQuery(self, table, attributes=[], filter={}):
-		select = u','.join(
-			[u'`{0}`'.format(attribute) for attribute in attributes]
-		)
+		"""
+		Creates a SELECT statement with the filter values included
+		as escaped literals.
+
+		Use :py:meth:`_createParameterizedQuery` to get a statement with
+		placeholders instead.
+		"""
+		return self._sql.renderQuery(*self._createParameterizedQuery(table, attributes, filter))
+
+	def _createParameterizedQuery(self, table, attributes=[], filter={}):
+		"""
+		Creates a SELECT statement with placeholders.
+
+		:returns: The query and the parameters to use with it.
+		:returntype: (unicode, list)
+		"""
+		where, params = self._filterToParameterizedSql(filter)
+
+		cacheKey = (self._sql.PARAMETER_PLACEHOLDER, 'select', table, tuple(attributes), where)
+		try:
+			query = _STATEMENT_CACHE[cacheKey]
+		except KeyError:
+			select = u','.join(
+				[u'`{0}`'.format(attribute) for attribute in attributes]
+			)
+
+			if not select:
+				select = u'*'
+
+			if where:
+				query = u'select %s from `%s` where %s' % (select, table, where)
+			else:
+				query = u'select %s from `%s`' % (select, table)
+			_cacheStatement(cacheKey, query)
+
+		logger.debug(u"Created query: {0} with parameters {1!r}", query, params)
+		return (query, params)
+
+	def _getRowsByKey(self, table, keyColumn, keys):
+		"""
+		Reads all rows of `table` where `keyColumn` is one of `keys`.
+
+		This replaces running one query per key with queries using
+		``IN (...)`` that each cover up to `_MAX_KEYS_PER_QUERY` keys.
+
+		:returns: The rows grouped by the value of `keyColumn`.
+		:returntype: dict
+		"""
+		rowsByKey = {}
+		keys = list(set(keys))
+		for start in xrange(0, len(keys), self._MAX_KEYS_PER_QUERY):
+			batch = keys[start:start + self._MAX_KEYS_PER_QUERY]
+
+			cacheKey = (self._sql.PARAMETER_PLACEHOLDER, 'in', table, keyColumn, len(batch))
+			try:
+				query = _STATEMENT_CACHE[cacheKey]
+			except KeyError:
+				query = u"select * from `{0}` where `{1}` in ({2})".format(
+					table,
+					keyColumn,
+					u', '.join([self._sql.PARAMETER_PLACEHOLDER] * len(batch))
+				)
+				_cacheStatement(cacheKey, query)
+
+			for row in self._sql.getSet(query, batch):
+				rowsByKey.setdefault(row[keyColumn], []).append(row)
+
+		return rowsByKey
+
+	def _insertOrUpdateRows(self, table, rows, identColumns, identIsPrimaryKey=False):
+		"""
+		Inserts `rows` into `table`. Rows that already exist are updated.
 
-		if not select:
-			select = u'*'
+		A row exists if a row with the same values in `identColumns` is
+		present. Existing rows are looked up in batches using the first
+		of `identColumns` instead of one query per row.
 
-		where = self._filterToSql(filter)
-		if where:
-			query = u'select %s from `%s` where %s' % (select, table, where)
+		:param identIsPrimaryKey: `True` if `identColumns` are the \
+primary key of `table`. This allows inserting and updating in one \
+statement if the database supports it.
+		"""
+		if not rows:
+			return
+
+		if identIsPrimaryKey and self._sql.ON_DUPLICATE_KEY_UPDATE_SUPPORTED:
+			self._sql.insertMany(table, rows, updateOnDuplicateKey=True)
+			return
+
+		if self._sql.CASE_INSENSITIVE_COMPARISON:
+			def normalize(value):
+				if isinstance(value, basestring):
+					return value.lower()
+				return value
 		else:
-			query = u'select %s from `%s`' % (select, table)
-		logger.debug(u"Created query: {0}", query)
-		return query
+			def normalize(value):
+				return value
+
+		def getIdent(row):
+			return tuple(normalize(row[column]) for column in identColumns)
+
+		keyColumn = identColumns[0]
+		existingIdents = set()
+		for existingRows in self._getRowsByKey(table, keyColumn, [row[keyColumn] for row in rows]).itervalues():
+			existingIdents.update(getIdent(row) for row in existingRows)
+
+		newRows = []
+		updatesByCondition = {}
+		for row in rows:
+			ident = getIdent(row)
+			if ident not in existingIdents:
+				newRows.append(row)
+				existingIdents.add(ident)
+				continue
+
+			columns = tuple(column for column in identColumns if row[column] is not None)
+			try:
+				updates = updatesByCondition[columns]
+			except KeyError:
+				updates = updatesByCondition[columns] = []
+			updates.append((row, [row[column] for column in columns]))
+
+		if newRows:
+			self._sql.insertMany(table, newRows)
+
+		for columns, updates in updatesByCondition.items():
+			where = u' and '.join(
+				u'`{0}` = {1}'.format(column, self._sql.PARAMETER_PLACEHOLDER)
+				for column in columns
+			)
+			self._sql.updateMany(table, where, updates, updateWhereNone=True)
+
+	def _updateObjectRows(self, table, objects):
+		"""
+		Updates the rows of `objects` in `table`.
+
+		This is the same as updating every object on its own but
+		objects with the same unique condition are updated together.
+		"""
+		updatesByCondition = {}
+		for obj in objects:
+			where, params = self._uniqueParameterizedCondition(obj)
+			try:
+				updates = updatesByCondition[where]
+			except KeyError:
+				updates = updatesByCondition[where] = []
+			updates.append((self._objectToDatabaseHash(obj), params))
+
+		for where, updates in updatesByCondition.items():
+			self._sql.updateMany(table, where, updates)
 
 	def _adjustAttributes(self, objectClass, attributes, filter):
 		if attributes:
@@ -406,34 +756,44 @@ class SQLBackend(ConfigDataBackend):
 		To achieve this the constructor of the object is inspected.
 		Objects must have an attribute named like the parameter.
 
+		The values are included as escaped literals.
+		Use :py:meth:`_uniqueParameterizedCondition` to get a condition
+		with placeholders instead.
+
 		:param object: The object to create an condition for.
 		:returntype: str
 		"""
+		return self._sql.renderQuery(*self._uniqueParameterizedCondition(object))
+
+	def _uniqueParameterizedCondition(self, object):
+		"""
+		Creates an unique condition with placeholders to identify an object.
+
+		:param object: The object to create an condition for.
+		:returns: The condition and the parameters to use with it.
+		:returntype: (unicode, list)
+		"""
 		condition = []
+		params = []
 		args = mandatoryConstructorArgs(object.__class__)
 		for arg in args:
 			value = getattr(object, arg)
 			if value is None:
 				continue
 			arg = self._objectAttributeToDatabaseAttribute(object.__class__, arg)
-			if isinstance(value, bool):
-				if value:
-					condition.append(u"`{0}` = 1".format(arg))
-				else:
-					condition.append(u"`{0}` = 0".format(arg))
-			elif isinstance(value, (float, long, int)):
-				condition.append(u"`{0}` = {1}".format(arg, value))
-			else:
-				condition.append(u"`{0}` = '{1}'".format(arg, self._sql.escapeApostrophe(self._sql.escapeBackslash(value))))
+			condition.append(u"`{0}` = {1}".format(arg, self._sql.PARAMETER_PLACEHOLDER))
+			params.append(self._sql.toParameter(value))
 
 		if isinstance(object, HostGroup) or isinstance(object, ProductGroup):
-			condition.append(u"`type` = '{0}'".format(object.getType()))
+			condition.append(u"`type` = {0}".format(self._sql.PARAMETER_PLACEHOLDER))
+			params.append(object.getType())
 
-		return ' and '.join(condition)
+		return (u' and '.join(condition), params)
 
 	def _objectExists(self, table, object):
-		query = 'select * from `%s` where %s' % (table, self._uniqueCondition(object))
-		return bool(self._sql.getRow(query))
+		where, params = self._uniqueParameterizedCondition(object)
+		query = u'select * from `%s` where %s' % (table, where)
+		return bool(self._sql.getRow(query, params=params))
 
 	def backend_exit(self):
 		pass
@@ -447,7 +807,7 @@ class SQLBackend(ConfigDataBackend):
 			done = True
 			for i in self._sql.getTables().keys():
 				try:
-					logger.debug(u'DROP TABLE `%s`;' % i)
+					logger.debug(u'DROP TABLE `{0}`;', i)
 					self._sql.execute(u'DROP TABLE `%s`;' % i)
 				except Exception as error:
 					logger.error(error)
@@ -875,7 +1235,7 @@ class SQLBackend(ConfigDataBackend):
 
 		# Hardware audit tables
 		for (hwClass, values) in self._auditHardwareConfig.items():
-			logger.debug(u"Processing hardware class '%s'" % hwClass)
+			logger.debug(u"Processing hardware class '{0}'", hwClass)
 			hardwareDeviceTableName = u'HARDWARE_DEVICE_{0}'.format(hwClass)
 			hardwareConfigTableName = u'HARDWARE_CONFIG_{0}'.format(hwClass)
 
@@ -916,7 +1276,7 @@ class SQLBackend(ConfigDataBackend):
 			hardwareDeviceValuesProcessed = 0
 			hardwareConfigValuesProcessed = 0
 			for (value, valueInfo) in values.items():
-				logger.debug(u"  Processing value '%s'" % value)
+				logger.debug(u"  Processing value '{0}'", value)
 				if valueInfo['Scope'] == 'g':
 					if hardwareDeviceTableExists:
 						if value in tables[hardwareDeviceTableName]:
@@ -1028,28 +1388,28 @@ class SQLBackend(ConfigDataBackend):
 	def host_insertObject(self, host):
 		ConfigDataBackend.host_insertObject(self, host)
 		data = self._objectToDatabaseHash(host)
-		where = self._uniqueCondition(host)
-		if self._sql.getRow('select * from `HOST` where {0}'.format(where)):
-			self._sql.update('HOST', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(host)
+		if self._sql.getRow('select * from `HOST` where {0}'.format(where), params=params):
+			self._sql.update('HOST', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('HOST', data)
 
 	def host_updateObject(self, host):
 		ConfigDataBackend.host_updateObject(self, host)
 		data = self._objectToDatabaseHash(host)
-		where = self._uniqueCondition(host)
-		self._sql.update('HOST', where, data)
+		where, params = self._uniqueParameterizedCondition(host)
+		self._sql.update('HOST', where, data, whereParams=params)
 
 	def host_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.host_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting hosts, filter: %s" % filter)
+		logger.info(u"Getting hosts, filter: {0}", filter)
 		hosts = []
 		type = forceList(filter.get('type', []))
 		if 'OpsiDepotserver' in type and not 'OpsiConfigserver' in type:
 			type.append('OpsiConfigserver')
 			filter['type'] = type
 		(attributes, filter) = self._adjustAttributes(Host, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('HOST', attributes, filter)):
+		for res in self._sql.getSet(*self._createParameterizedQuery('HOST', attributes, filter)):
 			self._adjustResult(Host, res)
 			hosts.append(Host.fromHash(res))
 		return hosts
@@ -1059,8 +1419,8 @@ class SQLBackend(ConfigDataBackend):
 
 		for host in forceObjectClassList(hosts, Host):
 			logger.info(u"Deleting host {0}".format(host))
-			where = self._uniqueCondition(host)
-			self._sql.delete('HOST', where)
+			where, params = self._uniqueParameterizedCondition(host)
+			self._sql.delete('HOST', where, whereParams=params)
 
 			auditHardwareOnDeletedHost = self.auditHardwareOnHost_getObjects(objectId=host.id)
 			if auditHardwareOnDeletedHost:
@@ -1085,13 +1445,13 @@ class SQLBackend(ConfigDataBackend):
 		del data['possibleValues']
 		del data['defaultValues']
 
-		where = self._uniqueCondition(config)
-		if self._sql.getRow('select * from `CONFIG` where %s' % where):
-			self._sql.update('CONFIG', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(config)
+		if self._sql.getRow('select * from `CONFIG` where %s' % where, params=params):
+			self._sql.update('CONFIG', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('CONFIG', data)
 
-		self._sql.delete('CONFIG_VALUE', where)
+		self._sql.delete('CONFIG_VALUE', where, whereParams=params)
 		for value in possibleValues:
 			self._sql.insert('CONFIG_VALUE', {
 				'configId': data['configId'],
@@ -1103,7 +1463,7 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.config_updateObject(self, config)
 		data = self._objectToDatabaseHash(config)
-		where = self._uniqueCondition(config)
+		where, params = self._uniqueParameterizedCondition(config)
 		possibleValues = data['possibleValues']
 		defaultValues = data['defaultValues']
 		if possibleValues is None:
@@ -1113,8 +1473,8 @@ class SQLBackend(ConfigDataBackend):
 		del data['possibleValues']
 		del data['defaultValues']
 
-		self._sql.update('CONFIG', where, data)
-		self._sql.delete('CONFIG_VALUE', where)
+		self._sql.update('CONFIG', where, data, whereParams=params)
+		self._sql.delete('CONFIG_VALUE', where, whereParams=params)
 		[self._sql.insert('CONFIG_VALUE', {
 			'configId': data['configId'],
 			'value': value,
@@ -1125,7 +1485,7 @@ class SQLBackend(ConfigDataBackend):
 	def config_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.config_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting configs, filter: %s" % filter)
+		logger.info(u"Getting configs, filter: {0}", filter)
 		configs = []
 		(attributes, filter) = self._adjustAttributes(Config, attributes, filter)
 
@@ -1134,7 +1494,7 @@ class SQLBackend(ConfigDataBackend):
 				configIds = filter.get('configId')
 				filter['configId'] = [res['configId'] for res in
 					self._sql.getSet(
-						self._createQuery(
+						*self._createParameterizedQuery(
 							'CONFIG_VALUE',
 							('configId', ),
 							{'configId': configIds, 'value': filter['defaultValues'], 'isDefault': True}
@@ -1152,7 +1512,7 @@ class SQLBackend(ConfigDataBackend):
 				configIds = filter.get('configId')
 				filter['configId'] = [res['configId'] for res in
 					self._sql.getSet(
-						self._createQuery(
+						*self._createParameterizedQuery(
 							'CONFIG_VALUE',
 							('configId', ),
 							{'configId': configIds, 'value': filter['possibleValues']}
@@ -1165,14 +1525,21 @@ class SQLBackend(ConfigDataBackend):
 
 			del filter['possibleValues']
 		attrs = [attr for attr in attributes if attr not in ('defaultValues', 'possibleValues')]
-		for res in self._sql.getSet(self._createQuery('CONFIG', attrs, filter)):
+		results = self._sql.getSet(*self._createParameterizedQuery('CONFIG', attrs, filter))
+
+		valuesByConfigId = {}
+		if results and (not attributes or 'possibleValues' in attributes or 'defaultValues' in attributes):
+			valuesByConfigId = self._getRowsByKey(
+				'CONFIG_VALUE', 'configId', [res['configId'] for res in results]
+			)
+
+		for res in results:
 			res['possibleValues'] = []
 			res['defaultValues'] = []
-			if not attributes or 'possibleValues' in attributes or 'defaultValues' in attributes:
-				for res2 in self._sql.getSet(u"select * from CONFIG_VALUE where `configId` = '%s'" % res['configId']):
-					res['possibleValues'].append(res2['value'])
-					if res2['isDefault']:
-						res['defaultValues'].append(res2['value'])
+			for res2 in valuesByConfigId.get(res['configId'], []):
+				res['possibleValues'].append(res2['value'])
+				if res2['isDefault']:
+					res['defaultValues'].append(res2['value'])
 			self._adjustResult(Config, res)
 			configs.append(Config.fromHash(res))
 		return configs
@@ -1181,10 +1548,10 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.config_deleteObjects(self, configs)
 		for config in forceObjectClassList(configs, Config):
-			logger.info(u"Deleting config %s" % config)
-			where = self._uniqueCondition(config)
-			self._sql.delete('CONFIG_VALUE', where)
-			self._sql.delete('CONFIG', where)
+			logger.info(u"Deleting config {0}", config)
+			where, params = self._uniqueParameterizedCondition(config)
+			self._sql.delete('CONFIG_VALUE', where, whereParams=params)
+			self._sql.delete('CONFIG', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ConfigStates
@@ -1195,9 +1562,9 @@ class SQLBackend(ConfigDataBackend):
 		data = self._objectToDatabaseHash(configState)
 		data['values'] = json.dumps(data['values'])
 
-		where = self._uniqueCondition(configState)
-		if self._sql.getRow('select * from `CONFIG_STATE` where %s' % where):
-			self._sql.update('CONFIG_STATE', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(configState)
+		if self._sql.getRow('select * from `CONFIG_STATE` where %s' % where, params=params):
+			self._sql.update('CONFIG_STATE', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('CONFIG_STATE', data)
 
@@ -1205,17 +1572,17 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.configState_updateObject(self, configState)
 		data = self._objectToDatabaseHash(configState)
-		where = self._uniqueCondition(configState)
+		where, params = self._uniqueParameterizedCondition(configState)
 		data['values'] = json.dumps(data['values'])
-		self._sql.update('CONFIG_STATE', where, data)
+		self._sql.update('CONFIG_STATE', where, data, whereParams=params)
 
 	def configState_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.configState_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting configStates, filter: %s" % filter)
+		logger.info(u"Getting configStates, filter: {0}", filter)
 		configStates = []
 		(attributes, filter) = self._adjustAttributes(ConfigState, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('CONFIG_STATE', attributes, filter)):
+		for res in self._sql.getSet(*self._createParameterizedQuery('CONFIG_STATE', attributes, filter)):
 			if 'values' in res:
 				res['values'] = json.loads(res['values'])
 			configStates.append(ConfigState.fromHash(res))
@@ -1225,9 +1592,9 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.configState_deleteObjects(self, configStates)
 		for configState in forceObjectClassList(configStates, ConfigState):
-			logger.info("Deleting configState %s" % configState)
-			where = self._uniqueCondition(configState)
-			self._sql.delete('CONFIG_STATE', where)
+			logger.info("Deleting configState {0}", configState)
+			where, params = self._uniqueParameterizedCondition(configState)
+			self._sql.delete('CONFIG_STATE', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   Products
@@ -1264,13 +1631,13 @@ class SQLBackend(ConfigDataBackend):
 		del data['windowsSoftwareIds']
 		del data['productClassIds']
 
-		where = self._uniqueCondition(product)
-		if self._sql.getRow('select * from `PRODUCT` where %s' % where):
-			self._sql.update('PRODUCT', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(product)
+		if self._sql.getRow('select * from `PRODUCT` where %s' % where, params=params):
+			self._sql.update('PRODUCT', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('PRODUCT', data)
 
-		self._sql.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', "`productId` = '%s'" % data['productId'])
+		self._sql.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', u"`productId` = {0}".format(self._sql.PARAMETER_PLACEHOLDER), whereParams=[data['productId']])
 
 		[self._sql.insert('WINDOWS_SOFTWARE_ID_TO_PRODUCT',
 			{
@@ -1283,12 +1650,12 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.product_updateObject(self, product)
 		data = self._objectToDatabaseHash(product)
-		where = self._uniqueCondition(product)
+		where, params = self._uniqueParameterizedCondition(product)
 		windowsSoftwareIds = data['windowsSoftwareIds']
 		del data['windowsSoftwareIds']
 		del data['productClassIds']
-		self._sql.update('PRODUCT', where, data)
-		self._sql.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', "`productId` = '%s'" % data['productId'])
+		self._sql.update('PRODUCT', where, data, whereParams=params)
+		self._sql.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', u"`productId` = {0}".format(self._sql.PARAMETER_PLACEHOLDER), whereParams=[data['productId']])
 		if windowsSoftwareIds:
 			[self._sql.insert('WINDOWS_SOFTWARE_ID_TO_PRODUCT',
 				{
@@ -1300,17 +1667,23 @@ class SQLBackend(ConfigDataBackend):
 	def product_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.product_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting products, filter: %s" % filter)
+		logger.info(u"Getting products, filter: {0}", filter)
 		products = []
 		(attributes, filter) = self._adjustAttributes(Product, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('PRODUCT', attributes, filter)):
-			res['windowsSoftwareIds'] = []
+		results = self._sql.getSet(*self._createParameterizedQuery('PRODUCT', attributes, filter))
+
+		windowsSoftwareIdsByProductId = {}
+		if results and (not attributes or 'windowsSoftwareIds' in attributes):
+			windowsSoftwareIdsByProductId = self._getRowsByKey(
+				'WINDOWS_SOFTWARE_ID_TO_PRODUCT', 'productId', [res['productId'] for res in results]
+			)
+
+		for res in results:
+			res['windowsSoftwareIds'] = [
+				res2['windowsSoftwareId'] for res2 in
+				windowsSoftwareIdsByProductId.get(res['productId'], [])
+			]
 			res['productClassIds'] = []
-			if not attributes or 'windowsSoftwareIds' in attributes:
-				for res2 in self._sql.getSet(u"select * from WINDOWS_SOFTWARE_ID_TO_PRODUCT where `productId` = '%s'" % res['productId']):
-					res['windowsSoftwareIds'].append(res2['windowsSoftwareId'])
-			if not attributes or 'productClassIds' in attributes:
-				pass
 			self._adjustResult(Product, res)
 			products.append(Product.fromHash(res))
 		return products
@@ -1319,10 +1692,10 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.product_deleteObjects(self, products)
 		for product in forceObjectClassList(products, Product):
-			logger.info("Deleting product %s" % product)
-			where = self._uniqueCondition(product)
-			self._sql.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', "`productId` = '%s'" % product.getId())
-			self._sql.delete('PRODUCT', where)
+			logger.info("Deleting product {0}", product)
+			where, params = self._uniqueParameterizedCondition(product)
+			self._sql.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', u"`productId` = {0}".format(self._sql.PARAMETER_PLACEHOLDER), whereParams=[product.getId()])
+			self._sql.delete('PRODUCT', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductProperties
@@ -1340,14 +1713,14 @@ class SQLBackend(ConfigDataBackend):
 		del data['possibleValues']
 		del data['defaultValues']
 
-		where = self._uniqueCondition(productProperty)
-		if self._sql.getRow('select * from `PRODUCT_PROPERTY` where %s' % where):
-			self._sql.update('PRODUCT_PROPERTY', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(productProperty)
+		if self._sql.getRow('select * from `PRODUCT_PROPERTY` where %s' % where, params=params):
+			self._sql.update('PRODUCT_PROPERTY', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('PRODUCT_PROPERTY', data)
 
 		if possibleValues is not None:
-			self._sql.delete('PRODUCT_PROPERTY_VALUE', where)
+			self._sql.delete('PRODUCT_PROPERTY_VALUE', where, whereParams=params)
 
 		[self._sql.insert('PRODUCT_PROPERTY_VALUE',
 			{
@@ -1364,7 +1737,7 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productProperty_updateObject(self, productProperty)
 		data = self._objectToDatabaseHash(productProperty)
-		where = self._uniqueCondition(productProperty)
+		where, params = self._uniqueParameterizedCondition(productProperty)
 		possibleValues = data['possibleValues']
 		defaultValues = data['defaultValues']
 		if possibleValues is None:
@@ -1373,10 +1746,10 @@ class SQLBackend(ConfigDataBackend):
 			defaultValues = []
 		del data['possibleValues']
 		del data['defaultValues']
-		self._sql.update('PRODUCT_PROPERTY', where, data)
+		self._sql.update('PRODUCT_PROPERTY', where, data, whereParams=params)
 
 		if possibleValues is not None:
-			self._sql.delete('PRODUCT_PROPERTY_VALUE', where)
+			self._sql.delete('PRODUCT_PROPERTY_VALUE', where, whereParams=params)
 
 		[self._sql.insert('PRODUCT_PROPERTY_VALUE',
 			{
@@ -1392,27 +1765,37 @@ class SQLBackend(ConfigDataBackend):
 	def productProperty_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productProperty_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting product properties, filter: %s" % filter)
+		logger.info(u"Getting product properties, filter: {0}", filter)
 		productProperties = []
 		(attributes, filter) = self._adjustAttributes(ProductProperty, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('PRODUCT_PROPERTY', attributes, filter)):
+		results = self._sql.getSet(*self._createParameterizedQuery('PRODUCT_PROPERTY', attributes, filter))
+
+		def getIdent(result):
+			return (
+				result['propertyId'],
+				result['productId'],
+				result['productVersion'],
+				result['packageVersion']
+			)
+
+		valuesByProperty = {}
+		if results and (not attributes or 'possibleValues' in attributes or 'defaultValues' in attributes):
+			# The values are read by product and assigned to their
+			# properties afterwards.
+			valuesByProductId = self._getRowsByKey(
+				'PRODUCT_PROPERTY_VALUE', 'productId', [res['productId'] for res in results]
+			)
+			for values in valuesByProductId.itervalues():
+				for res2 in values:
+					valuesByProperty.setdefault(getIdent(res2), []).append(res2)
+
+		for res in results:
 			res['possibleValues'] = []
 			res['defaultValues'] = []
-			if not attributes or 'possibleValues' in attributes or 'defaultValues' in attributes:
-				for res2 in self._sql.getSet(
-					u"select * from PRODUCT_PROPERTY_VALUE where "
-					u"`propertyId` = '{0}' AND `productId` = '{1}' AND "
-					u"`productVersion` = '{2}' AND "
-					u"`packageVersion` = '{3}'".format(
-						res['propertyId'],
-						res['productId'],
-						res['productVersion'],
-						res['packageVersion']
-					)):
-
-					res['possibleValues'].append(res2['value'])
-					if res2['isDefault']:
-						res['defaultValues'].append(res2['value'])
+			for res2 in valuesByProperty.get(getIdent(res), []):
+				res['possibleValues'].append(res2['value'])
+				if res2['isDefault']:
+					res['defaultValues'].append(res2['value'])
 
 			productProperties.append(ProductProperty.fromHash(res))
 
@@ -1422,10 +1805,10 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productProperty_deleteObjects(self, productProperties)
 		for productProperty in forceObjectClassList(productProperties, ProductProperty):
-			logger.info("Deleting product property %s" % productProperty)
-			where = self._uniqueCondition(productProperty)
-			self._sql.delete('PRODUCT_PROPERTY_VALUE', where)
-			self._sql.delete('PRODUCT_PROPERTY', where)
+			logger.info("Deleting product property {0}", productProperty)
+			where, params = self._uniqueParameterizedCondition(productProperty)
+			self._sql.delete('PRODUCT_PROPERTY_VALUE', where, whereParams=params)
+			self._sql.delete('PRODUCT_PROPERTY', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductDependencies
@@ -1435,9 +1818,9 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.productDependency_insertObject(self, productDependency)
 		data = self._objectToDatabaseHash(productDependency)
 
-		where = self._uniqueCondition(productDependency)
-		if self._sql.getRow('select * from `PRODUCT_DEPENDENCY` where %s' % where):
-			self._sql.update('PRODUCT_DEPENDENCY', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(productDependency)
+		if self._sql.getRow('select * from `PRODUCT_DEPENDENCY` where %s' % where, params=params):
+			self._sql.update('PRODUCT_DEPENDENCY', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('PRODUCT_DEPENDENCY', data)
 
@@ -1445,24 +1828,24 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productDependency_updateObject(self, productDependency)
 		data = self._objectToDatabaseHash(productDependency)
-		where = self._uniqueCondition(productDependency)
+		where, params = self._uniqueParameterizedCondition(productDependency)
 
-		self._sql.update('PRODUCT_DEPENDENCY', where, data)
+		self._sql.update('PRODUCT_DEPENDENCY', where, data, whereParams=params)
 
 	def productDependency_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productDependency_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting product dependencies, filter: %s" % filter)
+		logger.info(u"Getting product dependencies, filter: {0}", filter)
 		(attributes, filter) = self._adjustAttributes(ProductDependency, attributes, filter)
-		return [ProductDependency.fromHash(res) for res in self._sql.getSet(self._createQuery('PRODUCT_DEPENDENCY', attributes, filter))]
+		return [ProductDependency.fromHash(res) for res in self._sql.getSet(*self._createParameterizedQuery('PRODUCT_DEPENDENCY', attributes, filter))]
 
 	def productDependency_deleteObjects(self, productDependencies):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productDependency_deleteObjects(self, productDependencies)
 		for productDependency in forceObjectClassList(productDependencies, ProductDependency):
-			logger.info("Deleting product dependency %s" % productDependency)
-			where = self._uniqueCondition(productDependency)
-			self._sql.delete('PRODUCT_DEPENDENCY', where)
+			logger.info("Deleting product dependency {0}", productDependency)
+			where, params = self._uniqueParameterizedCondition(productDependency)
+			self._sql.delete('PRODUCT_DEPENDENCY', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductOnDepots
@@ -1476,9 +1859,9 @@ class SQLBackend(ConfigDataBackend):
 		productOnDepotClone.productVersion = None
 		productOnDepotClone.packageVersion = None
 		productOnDepotClone.productType = None
-		where = self._uniqueCondition(productOnDepotClone)
-		if self._sql.getRow('select * from `PRODUCT_ON_DEPOT` where %s' % where):
-			self._sql.update('PRODUCT_ON_DEPOT', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(productOnDepotClone)
+		if self._sql.getRow('select * from `PRODUCT_ON_DEPOT` where %s' % where, params=params):
+			self._sql.update('PRODUCT_ON_DEPOT', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('PRODUCT_ON_DEPOT', data)
 
@@ -1486,23 +1869,23 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productOnDepot_updateObject(self, productOnDepot)
 		data = self._objectToDatabaseHash(productOnDepot)
-		where = self._uniqueCondition(productOnDepot)
-		self._sql.update('PRODUCT_ON_DEPOT', where, data)
+		where, params = self._uniqueParameterizedCondition(productOnDepot)
+		self._sql.update('PRODUCT_ON_DEPOT', where, data, whereParams=params)
 
 	def productOnDepot_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productOnDepot_getObjects(self, attributes=[], **filter)
 		(attributes, filter) = self._adjustAttributes(ProductOnDepot, attributes, filter)
 		return [ProductOnDepot.fromHash(res) for res in
-				self._sql.getSet(self._createQuery('PRODUCT_ON_DEPOT', attributes, filter))]
+				self._sql.getSet(*self._createParameterizedQuery('PRODUCT_ON_DEPOT', attributes, filter))]
 
 	def productOnDepot_deleteObjects(self, productOnDepots):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productOnDepot_deleteObjects(self, productOnDepots)
 		for productOnDepot in forceObjectClassList(productOnDepots, ProductOnDepot):
-			logger.info(u"Deleting productOnDepot %s" % productOnDepot)
-			where = self._uniqueCondition(productOnDepot)
-			self._sql.delete('PRODUCT_ON_DEPOT', where)
+			logger.info(u"Deleting productOnDepot {0}", productOnDepot)
+			where, params = self._uniqueParameterizedCondition(productOnDepot)
+			self._sql.delete('PRODUCT_ON_DEPOT', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductOnClients
@@ -1516,10 +1899,10 @@ class SQLBackend(ConfigDataBackend):
 		productOnClientClone.productVersion = None
 		productOnClientClone.packageVersion = None
 		productOnClientClone.productType = None
-		where = self._uniqueCondition(productOnClientClone)
+		where, params = self._uniqueParameterizedCondition(productOnClientClone)
 
-		if self._sql.getRow('select * from `PRODUCT_ON_CLIENT` where %s' % where):
-			self._sql.update('PRODUCT_ON_CLIENT', where, data, updateWhereNone=True)
+		if self._sql.getRow('select * from `PRODUCT_ON_CLIENT` where %s' % where, params=params):
+			self._sql.update('PRODUCT_ON_CLIENT', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('PRODUCT_ON_CLIENT', data)
 
@@ -1527,24 +1910,41 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productOnClient_updateObject(self, productOnClient)
 		data = self._objectToDatabaseHash(productOnClient)
-		where = self._uniqueCondition(productOnClient)
-		self._sql.update('PRODUCT_ON_CLIENT', where, data)
+		where, params = self._uniqueParameterizedCondition(productOnClient)
+		self._sql.update('PRODUCT_ON_CLIENT', where, data, whereParams=params)
+
+	def productOnClient_bulkInsertObjects(self, productOnClients):
+		self._requiresEnabledSQLBackendModule()
+		rows = []
+		for productOnClient in forceObjectClassList(productOnClients, ProductOnClient):
+			ConfigDataBackend.productOnClient_insertObject(self, productOnClient)
+			rows.append(self._objectToDatabaseHash(productOnClient))
+
+		self._insertOrUpdateRows('PRODUCT_ON_CLIENT', rows, ('productId', 'clientId'), identIsPrimaryKey=True)
+
+	def productOnClient_bulkUpdateObjects(self, productOnClients):
+		self._requiresEnabledSQLBackendModule()
+		productOnClients = forceObjectClassList(productOnClients, ProductOnClient)
+		for productOnClient in productOnClients:
+			ConfigDataBackend.productOnClient_updateObject(self, productOnClient)
+
+		self._updateObjectRows('PRODUCT_ON_CLIENT', productOnClients)
 
 	def productOnClient_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productOnClient_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting productOnClients, filter: %s" % filter)
+		logger.info(u"Getting productOnClients, filter: {0}", filter)
 		(attributes, filter) = self._adjustAttributes(ProductOnClient, attributes, filter)
-		return [ProductOnClient.fromHash(res) for res in
-				self._sql.getSet(self._createQuery('PRODUCT_ON_CLIENT', attributes, filter))]
+		return [ProductOnClient.fromTrustedHash(res) for res in
+				self._sql.getSet(*self._createParameterizedQuery('PRODUCT_ON_CLIENT', attributes, filter))]
 
 	def productOnClient_deleteObjects(self, productOnClients):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productOnClient_deleteObjects(self, productOnClients)
 		for productOnClient in forceObjectClassList(productOnClients, ProductOnClient):
-			logger.info(u"Deleting productOnClient %s" % productOnClient)
-			where = self._uniqueCondition(productOnClient)
-			self._sql.delete('PRODUCT_ON_CLIENT', where)
+			logger.info(u"Deleting productOnClient {0}", productOnClient)
+			where, params = self._uniqueParameterizedCondition(productOnClient)
+			self._sql.delete('PRODUCT_ON_CLIENT', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductPropertyStates
@@ -1552,14 +1952,14 @@ class SQLBackend(ConfigDataBackend):
 	def productPropertyState_insertObject(self, productPropertyState):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productPropertyState_insertObject(self, productPropertyState)
-		if not self._sql.getSet(self._createQuery('HOST', ['hostId'], {"hostId": productPropertyState.objectId})):
+		if not self._sql.getSet(*self._createParameterizedQuery('HOST', ['hostId'], {"hostId": productPropertyState.objectId})):
 			raise BackendReferentialIntegrityError(u"Object '%s' does not exist" % productPropertyState.objectId)
 		data = self._objectToDatabaseHash(productPropertyState)
 		data['values'] = json.dumps(data['values'])
 
-		where = self._uniqueCondition(productPropertyState)
-		if self._sql.getRow('select * from `PRODUCT_PROPERTY_STATE` where %s' % where):
-			self._sql.update('PRODUCT_PROPERTY_STATE', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(productPropertyState)
+		if self._sql.getRow('select * from `PRODUCT_PROPERTY_STATE` where %s' % where, params=params):
+			self._sql.update('PRODUCT_PROPERTY_STATE', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('PRODUCT_PROPERTY_STATE', data)
 
@@ -1567,17 +1967,17 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productPropertyState_updateObject(self, productPropertyState)
 		data = self._objectToDatabaseHash(productPropertyState)
-		where = self._uniqueCondition(productPropertyState)
+		where, params = self._uniqueParameterizedCondition(productPropertyState)
 		data['values'] = json.dumps(data['values'])
-		self._sql.update('PRODUCT_PROPERTY_STATE', where, data)
+		self._sql.update('PRODUCT_PROPERTY_STATE', where, data, whereParams=params)
 
 	def productPropertyState_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productPropertyState_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting productPropertyStates, filter: %s" % filter)
+		logger.info(u"Getting productPropertyStates, filter: {0}", filter)
 		productPropertyStates = []
 		(attributes, filter) = self._adjustAttributes(ProductPropertyState, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('PRODUCT_PROPERTY_STATE', attributes, filter)):
+		for res in self._sql.getSet(*self._createParameterizedQuery('PRODUCT_PROPERTY_STATE', attributes, filter)):
 			try:
 				res['values'] = json.loads(res['values'])
 			except KeyError:
@@ -1589,9 +1989,9 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.productPropertyState_deleteObjects(self, productPropertyStates)
 		for productPropertyState in forceObjectClassList(productPropertyStates, ProductPropertyState):
-			logger.info(u"Deleting productPropertyState %s" % productPropertyState)
-			where = self._uniqueCondition(productPropertyState)
-			self._sql.delete('PRODUCT_PROPERTY_STATE', where)
+			logger.info(u"Deleting productPropertyState {0}", productPropertyState)
+			where, params = self._uniqueParameterizedCondition(productPropertyState)
+			self._sql.delete('PRODUCT_PROPERTY_STATE', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   Groups
@@ -1601,9 +2001,9 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.group_insertObject(self, group)
 		data = self._objectToDatabaseHash(group)
 
-		where = self._uniqueCondition(group)
-		if self._sql.getRow('select * from `GROUP` where %s' % where):
-			self._sql.update('GROUP', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(group)
+		if self._sql.getRow('select * from `GROUP` where %s' % where, params=params):
+			self._sql.update('GROUP', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('GROUP', data)
 
@@ -1611,16 +2011,16 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.group_updateObject(self, group)
 		data = self._objectToDatabaseHash(group)
-		where = self._uniqueCondition(group)
-		self._sql.update('GROUP', where, data)
+		where, params = self._uniqueParameterizedCondition(group)
+		self._sql.update('GROUP', where, data, whereParams=params)
 
 	def group_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.group_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting groups, filter: %s" % filter)
+		logger.info(u"Getting groups, filter: {0}", filter)
 		groups = []
 		(attributes, filter) = self._adjustAttributes(Group, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('GROUP', attributes, filter)):
+		for res in self._sql.getSet(*self._createParameterizedQuery('GROUP', attributes, filter)):
 			self._adjustResult(Group, res)
 			groups.append(Group.fromHash(res))
 		return groups
@@ -1629,9 +2029,9 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.group_deleteObjects(self, groups)
 		for group in forceObjectClassList(groups, Group):
-			logger.info(u"Deleting group %s" % group)
-			where = self._uniqueCondition(group)
-			self._sql.delete('GROUP', where)
+			logger.info(u"Deleting group {0}", group)
+			where, params = self._uniqueParameterizedCondition(group)
+			self._sql.delete('GROUP', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ObjectToGroups
@@ -1641,9 +2041,9 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.objectToGroup_insertObject(self, objectToGroup)
 		data = self._objectToDatabaseHash(objectToGroup)
 
-		where = self._uniqueCondition(objectToGroup)
-		if self._sql.getRow('select * from `OBJECT_TO_GROUP` where %s' % where):
-			self._sql.update('OBJECT_TO_GROUP', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(objectToGroup)
+		if self._sql.getRow('select * from `OBJECT_TO_GROUP` where %s' % where, params=params):
+			self._sql.update('OBJECT_TO_GROUP', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('OBJECT_TO_GROUP', data)
 
@@ -1651,24 +2051,24 @@ class SQLBackend(ConfigDataBackend):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.objectToGroup_updateObject(self, objectToGroup)
 		data = self._objectToDatabaseHash(objectToGroup)
-		where = self._uniqueCondition(objectToGroup)
-		self._sql.update('OBJECT_TO_GROUP', where, data)
+		where, params = self._uniqueParameterizedCondition(objectToGroup)
+		self._sql.update('OBJECT_TO_GROUP', where, data, whereParams=params)
 
 	def objectToGroup_getObjects(self, attributes=[], **filter):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.objectToGroup_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting objectToGroups, filter: %s" % filter)
+		logger.info(u"Getting objectToGroups, filter: {0}", filter)
 		(attributes, filter) = self._adjustAttributes(ObjectToGroup, attributes, filter)
 		return [ObjectToGroup.fromHash(res) for res in
-				self._sql.getSet(self._createQuery('OBJECT_TO_GROUP', attributes, filter))]
+				self._sql.getSet(*self._createParameterizedQuery('OBJECT_TO_GROUP', attributes, filter))]
 
 	def objectToGroup_deleteObjects(self, objectToGroups):
 		self._requiresEnabledSQLBackendModule()
 		ConfigDataBackend.objectToGroup_deleteObjects(self, objectToGroups)
 		for objectToGroup in forceObjectClassList(objectToGroups, ObjectToGroup):
-			logger.info(u"Deleting objectToGroup %s" % objectToGroup)
-			where = self._uniqueCondition(objectToGroup)
-			self._sql.delete('OBJECT_TO_GROUP', where)
+			logger.info(u"Deleting objectToGroup {0}", objectToGroup)
+			where, params = self._uniqueParameterizedCondition(objectToGroup)
+			self._sql.delete('OBJECT_TO_GROUP', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   LicenseContracts
@@ -1681,9 +2081,9 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.licenseContract_insertObject(self, licenseContract)
 		data = self._objectToDatabaseHash(licenseContract)
 
-		where = self._uniqueCondition(licenseContract)
-		if self._sql.getRow('select * from `LICENSE_CONTRACT` where %s' % where):
-			self._sql.update('LICENSE_CONTRACT', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(licenseContract)
+		if self._sql.getRow('select * from `LICENSE_CONTRACT` where %s' % where, params=params):
+			self._sql.update('LICENSE_CONTRACT', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('LICENSE_CONTRACT', data)
 
@@ -1694,8 +2094,8 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.licenseContract_updateObject(self, licenseContract)
 		data = self._objectToDatabaseHash(licenseContract)
-		where = self._uniqueCondition(licenseContract)
-		self._sql.update('LICENSE_CONTRACT', where, data)
+		where, params = self._uniqueParameterizedCondition(licenseContract)
+		self._sql.update('LICENSE_CONTRACT', where, data, whereParams=params)
 
 	def licenseContract_getObjects(self, attributes=[], **filter):
 		if not self._licenseManagementModule:
@@ -1703,10 +2103,10 @@ class SQLBackend(ConfigDataBackend):
 			return []
 
 		ConfigDataBackend.licenseContract_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting licenseContracts, filter: %s" % filter)
+		logger.info(u"Getting licenseContracts, filter: {0}", filter)
 		licenseContracts = []
 		(attributes, filter) = self._adjustAttributes(LicenseContract, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('LICENSE_CONTRACT', attributes, filter)):
+		for res in self._sql.getSet(*self._createParameterizedQuery('LICENSE_CONTRACT', attributes, filter)):
 			self._adjustResult(LicenseContract, res)
 			licenseContracts.append(LicenseContract.fromHash(res))
 		return licenseContracts
@@ -1718,9 +2118,9 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.licenseContract_deleteObjects(self, licenseContracts)
 		for licenseContract in forceObjectClassList(licenseContracts, LicenseContract):
-			logger.info(u"Deleting licenseContract %s" % licenseContract)
-			where = self._uniqueCondition(licenseContract)
-			self._sql.delete('LICENSE_CONTRACT', where)
+			logger.info(u"Deleting licenseContract {0}", licenseContract)
+			where, params = self._uniqueParameterizedCondition(licenseContract)
+			self._sql.delete('LICENSE_CONTRACT', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   SoftwareLicenses
@@ -1733,9 +2133,9 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.softwareLicense_insertObject(self, softwareLicense)
 		data = self._objectToDatabaseHash(softwareLicense)
 
-		where = self._uniqueCondition(softwareLicense)
-		if self._sql.getRow('select * from `SOFTWARE_LICENSE` where %s' % where):
-			self._sql.update('SOFTWARE_LICENSE', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(softwareLicense)
+		if self._sql.getRow('select * from `SOFTWARE_LICENSE` where %s' % where, params=params):
+			self._sql.update('SOFTWARE_LICENSE', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('SOFTWARE_LICENSE', data)
 
@@ -1746,8 +2146,8 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.softwareLicense_updateObject(self, softwareLicense)
 		data = self._objectToDatabaseHash(softwareLicense)
-		where = self._uniqueCondition(softwareLicense)
-		self._sql.update('SOFTWARE_LICENSE', where, data)
+		where, params = self._uniqueParameterizedCondition(softwareLicense)
+		self._sql.update('SOFTWARE_LICENSE', where, data, whereParams=params)
 
 	def softwareLicense_getObjects(self, attributes=[], **filter):
 		if not self._licenseManagementModule:
@@ -1755,10 +2155,10 @@ class SQLBackend(ConfigDataBackend):
 			return []
 
 		ConfigDataBackend.softwareLicense_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting softwareLicenses, filter: %s" % filter)
+		logger.info(u"Getting softwareLicenses, filter: {0}", filter)
 		softwareLicenses = []
 		(attributes, filter) = self._adjustAttributes(SoftwareLicense, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('SOFTWARE_LICENSE', attributes, filter)):
+		for res in self._sql.getSet(*self._createParameterizedQuery('SOFTWARE_LICENSE', attributes, filter)):
 			self._adjustResult(SoftwareLicense, res)
 			softwareLicenses.append(SoftwareLicense.fromHash(res))
 		return softwareLicenses
@@ -1770,9 +2170,9 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.softwareLicense_deleteObjects(self, softwareLicenses)
 		for softwareLicense in forceObjectClassList(softwareLicenses, SoftwareLicense):
-			logger.info(u"Deleting softwareLicense %s" % softwareLicense)
-			where = self._uniqueCondition(softwareLicense)
-			self._sql.delete('SOFTWARE_LICENSE', where)
+			logger.info(u"Deleting softwareLicense {0}", softwareLicense)
+			where, params = self._uniqueParameterizedCondition(softwareLicense)
+			self._sql.delete('SOFTWARE_LICENSE', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   LicensePools
@@ -1813,13 +2213,13 @@ class SQLBackend(ConfigDataBackend):
 		productIds = data['productIds']
 		del data['productIds']
 
-		where = self._uniqueCondition(licensePool)
-		if self._sql.getRow('select * from `LICENSE_POOL` where %s' % where):
-			self._sql.update('LICENSE_POOL', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(licensePool)
+		if self._sql.getRow('select * from `LICENSE_POOL` where %s' % where, params=params):
+			self._sql.update('LICENSE_POOL', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('LICENSE_POOL', data)
 
-		self._sql.delete('PRODUCT_ID_TO_LICENSE_POOL', "`licensePoolId` = '%s'" % data['licensePoolId'])
+		self._sql.delete('PRODUCT_ID_TO_LICENSE_POOL', u"`licensePoolId` = {0}".format(self._sql.PARAMETER_PLACEHOLDER), whereParams=[data['licensePoolId']])
 
 		[self._sql.insert('PRODUCT_ID_TO_LICENSE_POOL',
 			{
@@ -1835,11 +2235,11 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.licensePool_updateObject(self, licensePool)
 		data = self._objectToDatabaseHash(licensePool)
-		where = self._uniqueCondition(licensePool)
+		where, params = self._uniqueParameterizedCondition(licensePool)
 		productIds = data['productIds']
 		del data['productIds']
-		self._sql.update('LICENSE_POOL', where, data)
-		self._sql.delete('PRODUCT_ID_TO_LICENSE_POOL', "`licensePoolId` = '%s'" % data['licensePoolId'])
+		self._sql.update('LICENSE_POOL', where, data, whereParams=params)
+		self._sql.delete('PRODUCT_ID_TO_LICENSE_POOL', u"`licensePoolId` = {0}".format(self._sql.PARAMETER_PLACEHOLDER), whereParams=[data['licensePoolId']])
 
 		[self._sql.insert('PRODUCT_ID_TO_LICENSE_POOL',
 			{
@@ -1854,7 +2254,7 @@ class SQLBackend(ConfigDataBackend):
 			return []
 
 		ConfigDataBackend.licensePool_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting licensePools, filter: %s" % filter)
+		logger.info(u"Getting licensePools, filter: {0}", filter)
 		licensePools = []
 		(attributes, filter) = self._adjustAttributes(LicensePool, attributes, filter)
 
@@ -1862,18 +2262,26 @@ class SQLBackend(ConfigDataBackend):
 			if filter['productIds']:
 				licensePoolIds = filter.get('licensePoolId')
 				filter['licensePoolId'] = []
-				for res in self._sql.getSet(self._createQuery('PRODUCT_ID_TO_LICENSE_POOL', ['licensePoolId'], {'licensePoolId': licensePoolIds, 'productId': filter['productIds']})):
+				for res in self._sql.getSet(*self._createParameterizedQuery('PRODUCT_ID_TO_LICENSE_POOL', ['licensePoolId'], {'licensePoolId': licensePoolIds, 'productId': filter['productIds']})):
 					filter['licensePoolId'].append(res['licensePoolId'])
 				if not filter['licensePoolId']:
 					return []
 			del filter['productIds']
 
 		attrs = [attr for attr in attributes if attr != 'productIds']
-		for res in self._sql.getSet(self._createQuery('LICENSE_POOL', attrs, filter)):
-			res['productIds'] = []
-			if not attributes or 'productIds' in attributes:
-				for res2 in self._sql.getSet(u"select * from PRODUCT_ID_TO_LICENSE_POOL where `licensePoolId` = '%s'" % res['licensePoolId']):
-					res['productIds'].append(res2['productId'])
+		results = self._sql.getSet(*self._createParameterizedQuery('LICENSE_POOL', attrs, filter))
+
+		productIdsByLicensePoolId = {}
+		if results and (not attributes or 'productIds' in attributes):
+			productIdsByLicensePoolId = self._getRowsByKey(
+				'PRODUCT_ID_TO_LICENSE_POOL', 'licensePoolId', [res['licensePoolId'] for res in results]
+			)
+
+		for res in results:
+			res['productIds'] = [
+				res2['productId'] for res2 in
+				productIdsByLicensePoolId.get(res['licensePoolId'], [])
+			]
 			self._adjustResult(LicensePool, res)
 			licensePools.append(LicensePool.fromHash(res))
 		return licensePools
@@ -1885,10 +2293,10 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.licensePool_deleteObjects(self, licensePools)
 		for licensePool in forceObjectClassList(licensePools, LicensePool):
-			logger.info(u"Deleting licensePool %s" % licensePool)
-			where = self._uniqueCondition(licensePool)
-			self._sql.delete('PRODUCT_ID_TO_LICENSE_POOL', "`licensePoolId` = '%s'" % licensePool.id)
-			self._sql.delete('LICENSE_POOL', where)
+			logger.info(u"Deleting licensePool {0}", licensePool)
+			where, params = self._uniqueParameterizedCondition(licensePool)
+			self._sql.delete('PRODUCT_ID_TO_LICENSE_POOL', u"`licensePoolId` = {0}".format(self._sql.PARAMETER_PLACEHOLDER), whereParams=[licensePool.id])
+			self._sql.delete('LICENSE_POOL', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   SoftwareLicenseToLicensePools
@@ -1901,9 +2309,9 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.softwareLicenseToLicensePool_insertObject(self, softwareLicenseToLicensePool)
 		data = self._objectToDatabaseHash(softwareLicenseToLicensePool)
 
-		where = self._uniqueCondition(softwareLicenseToLicensePool)
-		if self._sql.getRow('select * from `SOFTWARE_LICENSE_TO_LICENSE_POOL` where %s' % where):
-			self._sql.update('SOFTWARE_LICENSE_TO_LICENSE_POOL', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(softwareLicenseToLicensePool)
+		if self._sql.getRow('select * from `SOFTWARE_LICENSE_TO_LICENSE_POOL` where %s' % where, params=params):
+			self._sql.update('SOFTWARE_LICENSE_TO_LICENSE_POOL', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('SOFTWARE_LICENSE_TO_LICENSE_POOL', data)
 
@@ -1914,8 +2322,8 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.softwareLicenseToLicensePool_updateObject(self, softwareLicenseToLicensePool)
 		data = self._objectToDatabaseHash(softwareLicenseToLicensePool)
-		where = self._uniqueCondition(softwareLicenseToLicensePool)
-		self._sql.update('SOFTWARE_LICENSE_TO_LICENSE_POOL', where, data)
+		where, params = self._uniqueParameterizedCondition(softwareLicenseToLicensePool)
+		self._sql.update('SOFTWARE_LICENSE_TO_LICENSE_POOL', where, data, whereParams=params)
 
 	def softwareLicenseToLicensePool_getObjects(self, attributes=[], **filter):
 		if not self._licenseManagementModule:
@@ -1923,11 +2331,11 @@ class SQLBackend(ConfigDataBackend):
 			return []
 
 		ConfigDataBackend.softwareLicenseToLicensePool_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting softwareLicenseToLicensePool, filter: %s" % filter)
+		logger.info(u"Getting softwareLicenseToLicensePool, filter: {0}", filter)
 		(attributes, filter) = self._adjustAttributes(SoftwareLicenseToLicensePool, attributes, filter)
 		return [SoftwareLicenseToLicensePool.fromHash(res) for res in
 				self._sql.getSet(
-					self._createQuery(
+					*self._createParameterizedQuery(
 						'SOFTWARE_LICENSE_TO_LICENSE_POOL', attributes, filter
 					)
 				)
@@ -1940,9 +2348,9 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.softwareLicenseToLicensePool_deleteObjects(self, softwareLicenseToLicensePools)
 		for softwareLicenseToLicensePool in forceObjectClassList(softwareLicenseToLicensePools, SoftwareLicenseToLicensePool):
-			logger.info(u"Deleting softwareLicenseToLicensePool %s" % softwareLicenseToLicensePool)
-			where = self._uniqueCondition(softwareLicenseToLicensePool)
-			self._sql.delete('SOFTWARE_LICENSE_TO_LICENSE_POOL', where)
+			logger.info(u"Deleting softwareLicenseToLicensePool {0}", softwareLicenseToLicensePool)
+			where, params = self._uniqueParameterizedCondition(softwareLicenseToLicensePool)
+			self._sql.delete('SOFTWARE_LICENSE_TO_LICENSE_POOL', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   LicenseOnClients
@@ -1955,9 +2363,9 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.licenseOnClient_insertObject(self, licenseOnClient)
 		data = self._objectToDatabaseHash(licenseOnClient)
 
-		where = self._uniqueCondition(licenseOnClient)
-		if self._sql.getRow('select * from `LICENSE_ON_CLIENT` where %s' % where):
-			self._sql.update('LICENSE_ON_CLIENT', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(licenseOnClient)
+		if self._sql.getRow('select * from `LICENSE_ON_CLIENT` where %s' % where, params=params):
+			self._sql.update('LICENSE_ON_CLIENT', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('LICENSE_ON_CLIENT', data)
 
@@ -1968,8 +2376,8 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.licenseOnClient_updateObject(self, licenseOnClient)
 		data = self._objectToDatabaseHash(licenseOnClient)
-		where = self._uniqueCondition(licenseOnClient)
-		self._sql.update('LICENSE_ON_CLIENT', where, data)
+		where, params = self._uniqueParameterizedCondition(licenseOnClient)
+		self._sql.update('LICENSE_ON_CLIENT', where, data, whereParams=params)
 
 	def licenseOnClient_getObjects(self, attributes=[], **filter):
 		if not self._licenseManagementModule:
@@ -1977,11 +2385,11 @@ class SQLBackend(ConfigDataBackend):
 			return []
 
 		ConfigDataBackend.licenseOnClient_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting licenseOnClient, filter: %s" % filter)
+		logger.info(u"Getting licenseOnClient, filter: {0}", filter)
 		(attributes, filter) = self._adjustAttributes(LicenseOnClient, attributes, filter)
 		return [LicenseOnClient.fromHash(res) for res in
 				self._sql.getSet(
-					self._createQuery('LICENSE_ON_CLIENT', attributes, filter)
+					*self._createParameterizedQuery('LICENSE_ON_CLIENT', attributes, filter)
 				)
 		]
 
@@ -1992,9 +2400,9 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.licenseOnClient_deleteObjects(self, licenseOnClients)
 		for licenseOnClient in forceObjectClassList(licenseOnClients, LicenseOnClient):
-			logger.info(u"Deleting licenseOnClient %s" % licenseOnClient)
-			where = self._uniqueCondition(licenseOnClient)
-			self._sql.delete('LICENSE_ON_CLIENT', where)
+			logger.info(u"Deleting licenseOnClient {0}", licenseOnClient)
+			where, params = self._uniqueParameterizedCondition(licenseOnClient)
+			self._sql.delete('LICENSE_ON_CLIENT', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditSoftwares
@@ -2003,25 +2411,25 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.auditSoftware_insertObject(self, auditSoftware)
 		data = self._objectToDatabaseHash(auditSoftware)
 
-		where = self._uniqueCondition(auditSoftware)
-		if self._sql.getRow('select * from `SOFTWARE` where %s' % where):
-			self._sql.update('SOFTWARE', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(auditSoftware)
+		if self._sql.getRow('select * from `SOFTWARE` where %s' % where, params=params):
+			self._sql.update('SOFTWARE', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('SOFTWARE', data)
 
 	def auditSoftware_updateObject(self, auditSoftware):
 		ConfigDataBackend.auditSoftware_updateObject(self, auditSoftware)
 		data = self._objectToDatabaseHash(auditSoftware)
-		where = self._uniqueCondition(auditSoftware)
-		self._sql.update('SOFTWARE', where, data)
+		where, params = self._uniqueParameterizedCondition(auditSoftware)
+		self._sql.update('SOFTWARE', where, data, whereParams=params)
 
 	def auditSoftware_getHashes(self, attributes=[], **filter):
 		(attributes, filter) = self._adjustAttributes(AuditSoftware, attributes, filter)
-		return self._sql.getSet(self._createQuery('SOFTWARE', attributes, filter))
+		return self._sql.getSet(*self._createParameterizedQuery('SOFTWARE', attributes, filter))
 
 	def auditSoftware_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.auditSoftware_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting auditSoftware, filter: %s" % filter)
+		logger.info(u"Getting auditSoftware, filter: {0}", filter)
 		return [AuditSoftware.fromHash(h) for h in
 			self.auditSoftware_getHashes(attributes, **filter)
 		]
@@ -2029,9 +2437,9 @@ class SQLBackend(ConfigDataBackend):
 	def auditSoftware_deleteObjects(self, auditSoftwares):
 		ConfigDataBackend.auditSoftware_deleteObjects(self, auditSoftwares)
 		for auditSoftware in forceObjectClassList(auditSoftwares, AuditSoftware):
-			logger.info(u"Deleting auditSoftware %s" % auditSoftware)
-			where = self._uniqueCondition(auditSoftware)
-			self._sql.delete('SOFTWARE', where)
+			logger.info(u"Deleting auditSoftware {0}", auditSoftware)
+			where, params = self._uniqueParameterizedCondition(auditSoftware)
+			self._sql.delete('SOFTWARE', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditSoftwareToLicensePools
@@ -2040,34 +2448,34 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.auditSoftwareToLicensePool_insertObject(self, auditSoftwareToLicensePool)
 		data = self._objectToDatabaseHash(auditSoftwareToLicensePool)
 
-		where = self._uniqueCondition(auditSoftwareToLicensePool)
-		if self._sql.getRow('select * from `AUDIT_SOFTWARE_TO_LICENSE_POOL` where %s' % where):
-			self._sql.update('AUDIT_SOFTWARE_TO_LICENSE_POOL', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(auditSoftwareToLicensePool)
+		if self._sql.getRow('select * from `AUDIT_SOFTWARE_TO_LICENSE_POOL` where %s' % where, params=params):
+			self._sql.update('AUDIT_SOFTWARE_TO_LICENSE_POOL', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('AUDIT_SOFTWARE_TO_LICENSE_POOL', data)
 
 	def auditSoftwareToLicensePool_updateObject(self, auditSoftwareToLicensePool):
 		ConfigDataBackend.auditSoftwareToLicensePool_updateObject(self, auditSoftwareToLicensePool)
 		data = self._objectToDatabaseHash(auditSoftwareToLicensePool)
-		where = self._uniqueCondition(auditSoftwareToLicensePool)
-		self._sql.update('AUDIT_SOFTWARE_TO_LICENSE_POOL', where, data)
+		where, params = self._uniqueParameterizedCondition(auditSoftwareToLicensePool)
+		self._sql.update('AUDIT_SOFTWARE_TO_LICENSE_POOL', where, data, whereParams=params)
 
 	def auditSoftwareToLicensePool_getHashes(self, attributes=[], **filter):
 		(attributes, filter) = self._adjustAttributes(AuditSoftwareToLicensePool, attributes, filter)
-		return self._sql.getSet(self._createQuery('AUDIT_SOFTWARE_TO_LICENSE_POOL', attributes, filter))
+		return self._sql.getSet(*self._createParameterizedQuery('AUDIT_SOFTWARE_TO_LICENSE_POOL', attributes, filter))
 
 	def auditSoftwareToLicensePool_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.auditSoftwareToLicensePool_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting auditSoftwareToLicensePool, filter: %s" % filter)
+		logger.info(u"Getting auditSoftwareToLicensePool, filter: {0}", filter)
 		return [AuditSoftwareToLicensePool.fromHash(h) for h in
 				self.auditSoftwareToLicensePool_getHashes(attributes, **filter)]
 
 	def auditSoftwareToLicensePool_deleteObjects(self, auditSoftwareToLicensePools):
 		ConfigDataBackend.auditSoftwareToLicensePool_deleteObjects(self, auditSoftwareToLicensePools)
 		for auditSoftwareToLicensePool in forceObjectClassList(auditSoftwareToLicensePools, AuditSoftwareToLicensePool):
-			logger.info(u"Deleting auditSoftware %s" % auditSoftwareToLicensePool)
-			where = self._uniqueCondition(auditSoftwareToLicensePool)
-			self._sql.delete('AUDIT_SOFTWARE_TO_LICENSE_POOL', where)
+			logger.info(u"Deleting auditSoftware {0}", auditSoftwareToLicensePool)
+			where, params = self._uniqueParameterizedCondition(auditSoftwareToLicensePool)
+			self._sql.delete('AUDIT_SOFTWARE_TO_LICENSE_POOL', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditSoftwareOnClients
@@ -2076,53 +2484,80 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.auditSoftwareOnClient_insertObject(self, auditSoftwareOnClient)
 		data = self._objectToDatabaseHash(auditSoftwareOnClient)
 
-		where = self._uniqueCondition(auditSoftwareOnClient)
-		if self._sql.getRow('select * from `SOFTWARE_CONFIG` where %s' % where):
-			self._sql.update('SOFTWARE_CONFIG', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(auditSoftwareOnClient)
+		if self._sql.getRow('select * from `SOFTWARE_CONFIG` where %s' % where, params=params):
+			self._sql.update('SOFTWARE_CONFIG', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('SOFTWARE_CONFIG', data)
 
 	def auditSoftwareOnClient_updateObject(self, auditSoftwareOnClient):
 		ConfigDataBackend.auditSoftwareOnClient_updateObject(self, auditSoftwareOnClient)
 		data = self._objectToDatabaseHash(auditSoftwareOnClient)
-		where = self._uniqueCondition(auditSoftwareOnClient)
-		self._sql.update('SOFTWARE_CONFIG', where, data)
+		where, params = self._uniqueParameterizedCondition(auditSoftwareOnClient)
+		self._sql.update('SOFTWARE_CONFIG', where, data, whereParams=params)
+
+	def auditSoftwareOnClient_bulkInsertObjects(self, auditSoftwareOnClients):
+		rows = []
+		for auditSoftwareOnClient in forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient):
+			ConfigDataBackend.auditSoftwareOnClient_insertObject(self, auditSoftwareOnClient)
+			rows.append(self._objectToDatabaseHash(auditSoftwareOnClient))
+
+		self._insertOrUpdateRows(
+			'SOFTWARE_CONFIG',
+			rows,
+			('clientId', 'name', 'version', 'subVersion', 'language', 'architecture')
+		)
+
+	def auditSoftwareOnClient_bulkUpdateObjects(self, auditSoftwareOnClients):
+		auditSoftwareOnClients = forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient)
+		for auditSoftwareOnClient in auditSoftwareOnClients:
+			ConfigDataBackend.auditSoftwareOnClient_updateObject(self, auditSoftwareOnClient)
+
+		self._updateObjectRows('SOFTWARE_CONFIG', auditSoftwareOnClients)
 
 	def auditSoftwareOnClient_getHashes(self, attributes=[], **filter):
 		(attributes, filter) = self._adjustAttributes(AuditSoftwareOnClient, attributes, filter)
-		return self._sql.getSet(self._createQuery('SOFTWARE_CONFIG', attributes, filter))
+		return self._sql.getSet(*self._createParameterizedQuery('SOFTWARE_CONFIG', attributes, filter))
 
 	def auditSoftwareOnClient_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.auditSoftwareOnClient_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting auditSoftwareOnClient, filter: %s" % filter)
-		return [AuditSoftwareOnClient.fromHash(h) for h in
+		logger.info(u"Getting auditSoftwareOnClient, filter: {0}", filter)
+		return [AuditSoftwareOnClient.fromTrustedHash(h) for h in
 				self.auditSoftwareOnClient_getHashes(attributes, **filter)]
 
 	def auditSoftwareOnClient_deleteObjects(self, auditSoftwareOnClients):
 		ConfigDataBackend.auditSoftwareOnClient_deleteObjects(self, auditSoftwareOnClients)
 		for auditSoftwareOnClient in forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient):
-			logger.info(u"Deleting auditSoftwareOnClient %s" % auditSoftwareOnClient)
-			where = self._uniqueCondition(auditSoftwareOnClient)
-			self._sql.delete('SOFTWARE_CONFIG', where)
+			logger.info(u"Deleting auditSoftwareOnClient {0}", auditSoftwareOnClient)
+			where, params = self._uniqueParameterizedCondition(auditSoftwareOnClient)
+			self._sql.delete('SOFTWARE_CONFIG', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditHardwares
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	def _uniqueAuditHardwareCondition(self, auditHardware):
+		"""
+		Creates an unique condition with placeholders to identify an \
+auditHardware.
+
+		:returns: The condition and the parameters to use with it.
+		:returntype: (unicode, list)
+		"""
 		if hasattr(auditHardware, 'toHash'):
 			auditHardware = auditHardware.toHash()
 
-		condition = []
+		filter = {}
 		for (attribute, value) in auditHardware.items():
 			if attribute in ('hardwareClass', 'type'):
 				continue
 			if value is None or value == [None]:
-				condition.append(u"`{0}` is NULL".format(attribute))
-			elif isinstance(value, (float, long, int, bool)):
-				condition.append(u"`{0}` = {1}".format(attribute, value))
+				filter[attribute] = [None]
+			elif isinstance(value, unicode):
+				filter[attribute] = self._sql.escapeAsterisk(value)
 			else:
-				condition.append(u"`{0}` = '{1}'".format(attribute, self._sql.escapeApostrophe(self._sql.escapeBackslash(value))))
-		return u' and '.join(condition)
+				filter[attribute] = value
+
+		return self._filterToParameterizedSql(filter)
 
 	def _getHardwareIds(self, auditHardware):
 		try:
@@ -2136,15 +2571,15 @@ class SQLBackend(ConfigDataBackend):
 			elif isinstance(value, unicode):
 				auditHardware[attribute] = self._sql.escapeAsterisk(value)
 
-		logger.debug(u"Getting hardware ids, filter %s" % auditHardware)
+		logger.debug(u"Getting hardware ids, filter {0}", auditHardware)
 		hardwareIds = self._auditHardware_search(returnHardwareIds=True, attributes=[], **auditHardware)
-		logger.debug(u"Found hardware ids: %s" % hardwareIds)
+		logger.debug(u"Found hardware ids: {0}", hardwareIds)
 		return hardwareIds
 
 	def auditHardware_insertObject(self, auditHardware):
 		ConfigDataBackend.auditHardware_insertObject(self, auditHardware)
 
-		logger.info(u"Inserting auditHardware: %s" % auditHardware)
+		logger.info(u"Inserting auditHardware: {0}", auditHardware)
 		hardwareHash = auditHardware.toHash()
 		filter = {}
 		for attribute, value in hardwareHash.items():
@@ -2167,7 +2602,7 @@ class SQLBackend(ConfigDataBackend):
 	def auditHardware_updateObject(self, auditHardware):
 		ConfigDataBackend.auditHardware_updateObject(self, auditHardware)
 
-		logger.info(u"Updating auditHardware: %s" % auditHardware)
+		logger.info(u"Updating auditHardware: {0}", auditHardware)
 		filter = {}
 		for (attribute, value) in auditHardware.toHash().items():
 			if value is None:
@@ -2179,7 +2614,7 @@ class SQLBackend(ConfigDataBackend):
 	def auditHardware_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.auditHardware_getObjects(self, attributes=[], **filter)
 
-		logger.info(u"Getting auditHardwares, filter: %s" % filter)
+		logger.info(u"Getting auditHardwares, filter: {0}", filter)
 		return [AuditHardware.fromHash(h) for h in
 				self.auditHardware_getHashes(attributes, **filter)]
 
@@ -2224,7 +2659,7 @@ class SQLBackend(ConfigDataBackend):
 			for (attribute, value) in filter.iteritems():
 				valueInfo = self._auditHardwareConfig[hardwareClass].get(attribute)
 				if not valueInfo:
-					logger.debug(u"Skipping hardwareClass '%s', because of missing info for attribute '%s'" % (hardwareClass, attribute))
+					logger.debug(u"Skipping hardwareClass '{0}', because of missing info for attribute '{1}'", hardwareClass, attribute)
 					break
 
 				try:
@@ -2240,9 +2675,9 @@ class SQLBackend(ConfigDataBackend):
 				if not classFilter and filter:
 					continue
 
-				logger.debug(u"Getting auditHardwares, hardwareClass '%s', filter: %s" % (hardwareClass, classFilter))
-				query = self._createQuery(u'HARDWARE_DEVICE_' + hardwareClass, attributes, classFilter)
-				for res in self._sql.getSet(query):
+				logger.debug(u"Getting auditHardwares, hardwareClass '{0}', filter: {1}", hardwareClass, classFilter)
+				query, params = self._createParameterizedQuery(u'HARDWARE_DEVICE_' + hardwareClass, attributes, classFilter)
+				for res in self._sql.getSet(query, params):
 					if returnHardwareIds:
 						results.append(res['hardware_id'])
 						continue
@@ -2270,15 +2705,17 @@ class SQLBackend(ConfigDataBackend):
 	def auditHardware_deleteObjects(self, auditHardwares):
 		ConfigDataBackend.auditHardware_deleteObjects(self, auditHardwares)
 		for auditHardware in forceObjectClassList(auditHardwares, AuditHardware):
-			logger.info(u"Deleting auditHardware: %s" % auditHardware)
-
-			where = self._uniqueAuditHardwareCondition(auditHardware)
-			[self._sql.delete(
-				u'HARDWARE_CONFIG_{0}'.format(auditHardware.getHardwareClass()),
-				u'`hardware_id` = {0}'.format(hardware_id)
-			) for hardware_id in self._getHardwareIds(auditHardware)]
+			logger.info(u"Deleting auditHardware: {0}", auditHardware)
+
+			where, params = self._uniqueAuditHardwareCondition(auditHardware)
+			for hardware_id in self._getHardwareIds(auditHardware):
+				self._sql.delete(
+					u'HARDWARE_CONFIG_{0}'.format(auditHardware.getHardwareClass()),
+					u'`hardware_id` = {0}'.format(self._sql.PARAMETER_PLACEHOLDER),
+					whereParams=[hardware_id]
+				)
 
-			self._sql.delete(u'HARDWARE_DEVICE_{0}'.format(auditHardware.getHardwareClass()), where)
+			self._sql.delete(u'HARDWARE_DEVICE_{0}'.format(auditHardware.getHardwareClass()), where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditHardwareOnHosts
@@ -2314,6 +2751,13 @@ class SQLBackend(ConfigDataBackend):
 		return (auditHardware, auditHardwareOnHostNew)
 
 	def _uniqueAuditHardwareOnHostCondition(self, auditHardwareOnHost):
+		"""
+		Creates an unique condition with placeholders to identify an \
+auditHardwareOnHost.
+
+		:returns: The condition and the parameters to use with it.
+		:returntype: (unicode, list)
+		"""
 		(auditHardware, auditHardwareOnHost) = self._extractAuditHardwareHash(auditHardwareOnHost)
 
 		del auditHardwareOnHost['hardwareClass']
@@ -2327,23 +2771,25 @@ class SQLBackend(ConfigDataBackend):
 			else:
 				filter[attribute] = value
 
-		where = self._filterToSql(filter)
+		(where, params) = self._filterToParameterizedSql(filter)
+
+		hardwareIds = self._getHardwareIds(auditHardware)
+		if not hardwareIds:
+			raise BackendReferentialIntegrityError(u"Hardware device %s not found" % auditHardware)
 
 		hwIdswhere = u' or '.join(
-			[
-				u'`hardware_id` = {0}'.format(hardwareId) for hardwareId in \
-				self._getHardwareIds(auditHardware)
-			]
+			[u'`hardware_id` = {0}'.format(self._sql.PARAMETER_PLACEHOLDER)] * len(hardwareIds)
 		)
+		params.extend(hardwareIds)
 
-		if not hwIdswhere:
-			raise BackendReferentialIntegrityError(u"Hardware device %s not found" % auditHardware)
-
-		return ' and '.join(
-			(
-				where,
-				hwIdswhere.join((u'(', u')'))
-			)
+		return (
+			u' and '.join(
+				(
+					where,
+					hwIdswhere.join((u'(', u')'))
+				)
+			),
+			params
 		)
 
 	def _auditHardwareOnHostObjectToDatabaseHash(self, auditHardwareOnHost):
@@ -2371,15 +2817,15 @@ class SQLBackend(ConfigDataBackend):
 
 		table = u'HARDWARE_CONFIG_{0}'.format(auditHardwareOnHost.getHardwareClass())
 
-		where = self._uniqueAuditHardwareOnHostCondition(auditHardwareOnHost)
-		if not self._sql.getRow('select * from `%s` where %s' % (table, where)):
+		where, params = self._uniqueAuditHardwareOnHostCondition(auditHardwareOnHost)
+		if not self._sql.getRow('select * from `%s` where %s' % (table, where), params=params):
 			data = self._auditHardwareOnHostObjectToDatabaseHash(auditHardwareOnHost)
 			self._sql.insert(table, data)
 
 	def auditHardwareOnHost_updateObject(self, auditHardwareOnHost):
 		ConfigDataBackend.auditHardwareOnHost_updateObject(self, auditHardwareOnHost)
 
-		logger.info(u"Updating auditHardwareOnHost: %s" % auditHardwareOnHost)
+		logger.info(u"Updating auditHardwareOnHost: {0}", auditHardwareOnHost)
 		data = auditHardwareOnHost.toHash()
 		update = {}
 		for (attribute, value) in data.items():
@@ -2389,8 +2835,8 @@ class SQLBackend(ConfigDataBackend):
 				del data[attribute]
 
 		if update:
-			where = self._uniqueAuditHardwareOnHostCondition(data)
-			self._sql.update('HARDWARE_CONFIG_%s' % auditHardwareOnHost.hardwareClass, where, update)
+			where, params = self._uniqueAuditHardwareOnHostCondition(data)
+			self._sql.update('HARDWARE_CONFIG_%s' % auditHardwareOnHost.hardwareClass, where, update, whereParams=params)
 
 	def auditHardwareOnHost_getHashes(self, attributes=[], **filter):
 		hashes = []
@@ -2426,7 +2872,7 @@ class SQLBackend(ConfigDataBackend):
 				if attribute not in ('hostId', 'state', 'firstseen', 'lastseen'):
 					valueInfo = self._auditHardwareConfig[hardwareClass].get(attribute)
 					if not valueInfo:
-						logger.debug(u"Skipping hardwareClass '%s', because of missing info for attribute '%s'" % (hardwareClass, attribute))
+						logger.debug(u"Skipping hardwareClass '{0}', because of missing info for attribute '{1}'", hardwareClass, attribute)
 						skipHardwareClass = True
 						break
 
@@ -2457,10 +2903,12 @@ class SQLBackend(ConfigDataBackend):
 			if attributes and 'hardware_id' not in attributes:
 				attributes.append('hardware_id')
 
-			logger.debug(u"Getting auditHardwareOnHosts, hardwareClass '%s', hardwareIds: %s, filter: %s" % (hardwareClass, hardwareIds, classFilter))
-			for res in self._sql.getSet(self._createQuery(u'HARDWARE_CONFIG_{0}'.format(hardwareClass), attributes, classFilter)):
-				data = self._sql.getSet(u'SELECT * from `HARDWARE_DEVICE_%s` where `hardware_id` = %s' \
-								% (hardwareClass, res['hardware_id']))
+			logger.debug(u"Getting auditHardwareOnHosts, hardwareClass '{0}', hardwareIds: {1}, filter: {2}", hardwareClass, hardwareIds, classFilter)
+			for res in self._sql.getSet(*self._createParameterizedQuery(u'HARDWARE_CONFIG_{0}'.format(hardwareClass), attributes, classFilter)):
+				data = self._sql.getSet(
+					u'SELECT * from `HARDWARE_DEVICE_{0}` where `hardware_id` = {1}'.format(hardwareClass, self._sql.PARAMETER_PLACEHOLDER),
+					[res['hardware_id']]
+				)
 
 				if not data:
 					logger.error(u"Hardware device of class '%s' with hardware_id '%s' not found" % (hardwareClass, res['hardware_id']))
@@ -2485,15 +2933,15 @@ class SQLBackend(ConfigDataBackend):
 	def auditHardwareOnHost_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.auditHardwareOnHost_getObjects(self, attributes=[], **filter)
 
-		logger.info(u"Getting auditHardwareOnHosts, filter: %s" % filter)
+		logger.info(u"Getting auditHardwareOnHosts, filter: {0}", filter)
 		return [AuditHardwareOnHost.fromHash(h) for h in self.auditHardwareOnHost_getHashes(attributes, **filter)]
 
 	def auditHardwareOnHost_deleteObjects(self, auditHardwareOnHosts):
 		ConfigDataBackend.auditHardwareOnHost_deleteObjects(self, auditHardwareOnHosts)
 		for auditHardwareOnHost in forceObjectClassList(auditHardwareOnHosts, AuditHardwareOnHost):
-			logger.info(u"Deleting auditHardwareOnHost: %s" % auditHardwareOnHost)
-			where = self._uniqueAuditHardwareOnHostCondition(auditHardwareOnHost)
-			self._sql.delete(u'HARDWARE_CONFIG_{0}'.format(auditHardwareOnHost.getHardwareClass()), where)
+			logger.info(u"Deleting auditHardwareOnHost: {0}", auditHardwareOnHost)
+			where, params = self._uniqueAuditHardwareOnHostCondition(auditHardwareOnHost)
+			self._sql.delete(u'HARDWARE_CONFIG_{0}'.format(auditHardwareOnHost.getHardwareClass()), where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   BootConfigurations
@@ -2502,24 +2950,24 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.bootConfiguration_insertObject(self, bootConfiguration)
 		data = self._objectToDatabaseHash(bootConfiguration)
 
-		where = self._uniqueCondition(bootConfiguration)
-		if self._sql.getRow('select * from `BOOT_CONFIGURATION` where %s' % where):
-			self._sql.update('BOOT_CONFIGURATION', where, data, updateWhereNone=True)
+		where, params = self._uniqueParameterizedCondition(bootConfiguration)
+		if self._sql.getRow('select * from `BOOT_CONFIGURATION` where %s' % where, params=params):
+			self._sql.update('BOOT_CONFIGURATION', where, data, updateWhereNone=True, whereParams=params)
 		else:
 			self._sql.insert('BOOT_CONFIGURATION', data)
 
 	def bootConfiguration_updateObject(self, bootConfiguration):
 		ConfigDataBackend.bootConfiguration_updateObject(self, bootConfiguration)
 		data = self._objectToDatabaseHash(bootConfiguration)
-		where = self._uniqueCondition(bootConfiguration)
-		self._sql.update('BOOT_CONFIGURATION', where, data)
+		where, params = self._uniqueParameterizedCondition(bootConfiguration)
+		self._sql.update('BOOT_CONFIGURATION', where, data, whereParams=params)
 
 	def bootConfiguration_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.bootConfiguration_getObjects(self, attributes=[], **filter)
-		logger.info(u"Getting bootConfigurations, filter: %s" % filter)
+		logger.info(u"Getting bootConfigurations, filter: {0}", filter)
 		bootConfigurations = []
 		(attributes, filter) = self._adjustAttributes(BootConfiguration, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('BOOT_CONFIGURATION', attributes, filter)):
+		for res in self._sql.getSet(*self._createParameterizedQuery('BOOT_CONFIGURATION', attributes, filter)):
 			self._adjustResult(BootConfiguration, res)
 			bootConfigurations.append(BootConfiguration.fromHash(res))
 		return bootConfigurations
@@ -2527,9 +2975,9 @@ class SQLBackend(ConfigDataBackend):
 	def bootConfiguration_deleteObjects(self, bootConfigurations):
 		ConfigDataBackend.bootConfiguration_deleteObjects(self, bootConfigurations)
 		for bootConfiguration in forceObjectClassList(bootConfigurations, BootConfiguration):
-			logger.info(u"Deleting bootConfiguration %s" % bootConfiguration)
-			where = self._uniqueCondition(bootConfiguration)
-			self._sql.delete('BOOT_CONFIGURATION', where)
+			logger.info(u"Deleting bootConfiguration {0}", bootConfiguration)
+			where, params = self._uniqueParameterizedCondition(bootConfiguration)
+			self._sql.delete('BOOT_CONFIGURATION', where, whereParams=params)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   Extension for direct connect to db
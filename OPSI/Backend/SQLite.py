@@ -47,6 +47,8 @@ class SQLite(SQL):
 	ESCAPED_BACKSLASH = "\\"
 	ESCAPED_APOSTROPHE = "''"
 	ESCAPED_ASTERISK = "**"
+	PARAMETER_PLACEHOLDER = u"?"
+	CASE_INSENSITIVE_COMPARISON = False
 
 	def __init__(self, **kwargs):
 		self._database = ":memory:"
@@ -99,12 +101,12 @@ class SQLite(SQL):
 	def close(self, conn, cursor):
 		pass
 
-	def getSet(self, query):
+	def getSet(self, query, params=None):
 		logger.debug2(u"getSet: %s" % query)
 		(conn, cursor) = self.connect()
 		valueSet = []
 		try:
-			self.execute(query, conn, cursor)
+			self.execute(query, conn, cursor, params)
 			valueSet = cursor.fetchall()
 			if not valueSet:
 				logger.debug(u"No result for query '%s'" % query)
@@ -113,12 +115,12 @@ class SQLite(SQL):
 			self.close(conn, cursor)
 		return valueSet
 
-	def getRow(self, query):
+	def getRow(self, query, params=None):
 		logger.debug2(u"getRow: %s" % query)
 		(conn, cursor) = self.connect()
 		row = {}
 		try:
-			self.execute(query, conn, cursor)
+			self.execute(query, conn, cursor, params)
 			try:
 				row = cursor.next()
 			except Exception:
@@ -137,81 +139,100 @@ class SQLite(SQL):
 		(conn, cursor) = self.connect()
 		result = -1
 		try:
-			colNames = []
-			values = []
-			for (key, value) in valueHash.items():
-				colNames.append(u"`{0}`".format(key))
-				if value is None:
-					values.append(u"NULL")
-				elif isinstance(value, bool):
-					if value:
-						values.append(u"1")
-					else:
-						values.append(u"0")
-				elif isinstance(value, (float, long, int)):
-					values.append(u"{0}".format(value))
-				elif isinstance(value, str):
-					values.append(u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value.decode("utf-8")))))
-				else:
-					values.append(u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value))))
-
-			query = u'INSERT INTO `{table}` ({columns}) VALUES ({values});'.format(columns=', '.join(colNames), values=', '.join(values), table=table)
-			logger.debug2(u"insert: %s" % query)
-
-			self.execute(query, conn, cursor)
+			columns = tuple(valueHash.keys())
+			params = [self.toParameter(valueHash[column]) for column in columns]
+			query = self.createInsertStatement(table, columns)
+			logger.debug2(u"insert: %s with parameters %r" % (query, params))
+
+			self.execute(query, conn, cursor, params)
 			result = conn.last_insert_rowid()
 		finally:
 			self.close(conn, cursor)
 
 		return result
 
-	def update(self, table, where, valueHash, updateWhereNone=False):
+	def insertMany(self, table, valueHashes, updateOnDuplicateKey=False):
+		"""
+		Inserts multiple rows inside one transaction.
+		"""
+		if updateOnDuplicateKey:
+			raise BackendBadValueError(u"Updating on duplicate keys is not supported")
+
+		(conn, cursor) = self.connect()
+		try:
+			with conn:
+				for (columns, rows) in self.groupByColumns(valueHashes):
+					query = self.createInsertStatement(table, columns)
+					logger.debug2(u"insertMany: %s with %d rows" % (query, len(rows)))
+					cursor.executemany(query, rows)
+		finally:
+			self.close(conn, cursor)
+
+	def updateMany(self, table, where, rows, updateWhereNone=False):
+		"""
+		Updates multiple rows inside one transaction.
+		"""
+		# Consecutive rows setting the same columns share a statement.
+		# This keeps the order of the updates.
+		groups = []
+		for (valueHash, whereParams) in rows:
+			columns = tuple(
+				key for (key, value) in valueHash.items()
+				if value is not None or updateWhereNone
+			)
+			params = [self.toParameter(valueHash[column]) for column in columns]
+			params.extend(whereParams or [])
+			if groups and groups[-1][0] == columns:
+				groups[-1][1].append(params)
+			else:
+				groups.append((columns, [params]))
+
+		(conn, cursor) = self.connect()
+		try:
+			with conn:
+				for (columns, params) in groups:
+					query = self.createUpdateStatement(table, columns, where)
+					logger.debug2(u"updateMany: %s with %d rows" % (query, len(params)))
+					cursor.executemany(query, params)
+		finally:
+			self.close(conn, cursor)
+
+	def update(self, table, where, valueHash, updateWhereNone=False, whereParams=None):
 		(conn, cursor) = self.connect()
 		result = 0
 		try:
 			if not valueHash:
 				raise BackendBadValueError(u"No values given")
 
-			values = []
-			for (key, value) in valueHash.items():
-				if value is None and not updateWhereNone:
-					continue
-
-				if value is None:
-					values.append(u"`{0}` = NULL".format(key))
-				elif isinstance(value, bool):
-					if value:
-						values.append(u"`{0}` = 1".format(key))
-					else:
-						values.append(u"`{0}` = 0".format(key))
-				elif isinstance(value, (float, long, int)):
-					values.append(u"`{0}` = {1}".format(key, value))
-				elif isinstance(value, str):
-					values.append(u"`{0}` = \'{1}\'".format(key, self.escapeApostrophe(self.escapeBackslash(value.decode("utf-8")))))
-				else:
-					values.append(u"`{0}` = \'{1}\'".format(key, self.escapeApostrophe(self.escapeBackslash(value))))
-
-			query = u"UPDATE `{table}` SET {values} WHERE {condition};".format(table=table, values=', '.join(values), condition=where)
-			logger.debug2(u"update: %s" % query)
-			self.execute(query, conn, cursor)
+			columns = tuple(
+				key for (key, value) in valueHash.items()
+				if value is not None or updateWhereNone
+			)
+			params = [self.toParameter(valueHash[column]) for column in columns]
+			if whereParams:
+				params.extend(whereParams)
+
+			query = self.createUpdateStatement(table, columns, where)
+			logger.debug2(u"update: %s with parameters %r" % (query, params))
+			self.execute(query, conn, cursor, params)
 			result = conn.changes()
 		finally:
 			self.close(conn, cursor)
 		return result
 
-	def delete(self, table, where):
+	def delete(self, table, where, whereParams=None):
 		(conn, cursor) = self.connect()
 		result = 0
 		try:
 			query = u"DELETE FROM `%s` WHERE %s;" % (table, where)
-			logger.debug2(u"delete: %s" % query)
-			self.execute(query, conn, cursor)
+			logger.debug2(u"delete: %s with parameters %r" % (query, whereParams))
+			self.execute(query, conn, cursor, whereParams)
 			result = conn.changes()
 		finally:
 			self.close(conn, cursor)
 		return result
 
-	def execute(self, query, conn=None, cursor=None):
+	def execute(self, query, conn=None, cursor=None, params=None):
 		res = None
 		needClose = False
 		if not conn or not cursor:
@@ -220,7 +241,10 @@ class SQLite(SQL):
 
 		try:
 			logger.debug2(u"SQL query: %s" % forceUnicode(query))
-			res = cursor.execute(query)
+			if params:
+				res = cursor.execute(query, params)
+			else:
+				res = cursor.execute(query)
 		finally:
 			if needClose:
 				self.close(conn, cursor)
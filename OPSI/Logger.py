@@ -25,7 +25,7 @@ opsi python library - Logger
 :license: GNU Affero General Public License version 3
 """
 
-import codecs
+import atexit
 import locale
 import os
 import sys
@@ -40,6 +40,12 @@ except ImportError:
 	# Python 3
 	import _thread as thread
 
+try:
+	import Queue as queue
+except ImportError:
+	# Python 3
+	import queue
+
 if os.name == 'nt':
 	# Windows imports for file locking
 	import win32con
@@ -191,6 +197,244 @@ def forceUnicode(var):
 	return unicode(var)
 
 
+def _lockFile(logFile):
+	"""
+	Lock the opened `logFile` exclusively.
+
+	Gives up after two seconds.
+
+	:returns: True if the file could be locked.
+	"""
+	timeout = 0
+	while timeout < 2000:
+		try:
+			if os.name == 'nt':
+				hfile = win32file._get_osfhandle(logFile.fileno())
+				win32file.LockFileEx(hfile, win32con.LOCKFILE_EXCLUSIVE_LOCK, 0, -0x7fff0000, pywintypes.OVERLAPPED())
+			elif os.name == 'posix':
+				# Flags for exclusive, non-blocking lock
+				fcntl.flock(logFile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+		except (IOError, EnvironmentError):
+			timeout += 100
+			time.sleep(0.1)
+		else:
+			return True
+
+	return False
+
+
+def _unlockFile(logFile):
+	if os.name == 'nt':
+		hfile = win32file._get_osfhandle(logFile.fileno())
+		win32file.UnlockFileEx(hfile, 0, -0x7fff0000, pywintypes.OVERLAPPED())
+	elif os.name == 'posix':
+		fcntl.flock(logFile.fileno(), fcntl.LOCK_UN)
+
+
+class _LogFileWriter(object):
+	"""
+	Writes log messages to files from a background thread.
+
+	Messages are collected in a bounded queue. The thread writes them \
+in batches if `bufferSize` characters are waiting or at least every \
+`flushInterval` seconds. Every file stays open until more than \
+`maxOpenFiles` files are in use. The remaining messages are written \
+when the interpreter exits.
+	"""
+
+	_FLUSH = object()
+	_STOP = object()
+
+	def __init__(self, maxQueueSize=10000, bufferSize=65536,
+				flushInterval=0.5, maxOpenFiles=64):
+		self.maxQueueSize = maxQueueSize
+		self.bufferSize = bufferSize
+		self.flushInterval = flushInterval
+		self.maxOpenFiles = maxOpenFiles
+		self._closed = False
+		self._reset()
+		atexit.register(self.close)
+
+	def _reset(self):
+		# Threads and locks of the parent do not exist after a fork.
+		self._pid = os.getpid()
+		# Guards the open files and the thread.
+		self._lock = threading.Lock()
+		# Writes of this process are done one at a time.
+		self._writeLock = threading.Lock()
+		self._queue = queue.Queue(self.maxQueueSize)
+		self._files = {}
+		self._lastUse = {}
+		self._useCounter = 0
+		self._thread = None
+
+	def write(self, logFile, message):
+		"""
+		Queue `message` to be appended to the file `logFile`.
+
+		The file is created right away if it does not exist.
+		"""
+		if self._pid != os.getpid():
+			self._reset()
+
+		if self._closed:
+			self._writeFile(logFile, [message])
+			return
+
+		if logFile not in self._files and not os.path.exists(logFile):
+			open(logFile, 'ab').close()
+
+		if self._thread is None:
+			with self._lock:
+				if self._thread is None:
+					self._thread = threading.Thread(target=self._run, name=u'LogFileWriter')
+					self._thread.daemon = True
+					self._thread.start()
+
+		try:
+			self._queue.put((logFile, message), True, 5)
+		except queue.Full:
+			self._writeFile(logFile, [message])
+
+	def flush(self):
+		"""
+		Wait until all queued messages are written.
+		"""
+		if self._closed or self._thread is None or self._pid != os.getpid():
+			return
+
+		flushed = threading.Event()
+		try:
+			self._queue.put((self._FLUSH, flushed), True, 5)
+		except queue.Full:
+			return
+		flushed.wait(10)
+
+	def close(self):
+		"""
+		Write all queued messages and close the files.
+
+		Messages logged afterwards are written directly.
+		"""
+		self._closed = True
+		if self._thread is not None and self._pid == os.getpid():
+			try:
+				self._queue.put((self._STOP, None), True, 5)
+			except queue.Full:
+				pass
+			self._thread.join(10)
+
+		with self._writeLock, self._lock:
+			for logFile in self._files.values():
+				try:
+					logFile.close()
+				except Exception:
+					pass
+
+			self._files = {}
+			self._lastUse = {}
+
+	def _run(self):
+		buffers = {}
+		bufferedSize = 0
+		lastFlush = time.time()
+		while True:
+			try:
+				logFile, message = self._queue.get(True, self.flushInterval)
+			except queue.Empty:
+				logFile = message = None
+
+			if logFile is self._FLUSH or logFile is self._STOP:
+				self._writeBuffers(buffers)
+				bufferedSize = 0
+				lastFlush = time.time()
+				if logFile is self._STOP:
+					return
+
+				message.set()
+				continue
+			elif logFile is not None:
+				try:
+					buffers[logFile].append(message)
+				except KeyError:
+					buffers[logFile] = [message]
+				bufferedSize += len(message)
+
+			if bufferedSize >= self.bufferSize or time.time() - lastFlush >= self.flushInterval:
+				self._writeBuffers(buffers)
+				bufferedSize = 0
+				lastFlush = time.time()
+
+	def _writeBuffers(self, buffers):
+		for logFile, messages in buffers.items():
+			self._writeFile(logFile, messages)
+		buffers.clear()
+
+	def _writeFile(self, logFile, messages):
+		data = u''.join(messages).encode('utf-8', 'replace')
+		with self._writeLock:
+			try:
+				with self._lock:
+					lf = self._getFile(logFile)
+
+				# Like before, messages are dropped if the file stays
+				# locked by another process.
+				if _lockFile(lf):
+					try:
+						lf.write(data)
+						lf.flush()
+					finally:
+						_unlockFile(lf)
+			except Exception:
+				# Like before, messages that cannot be written get lost.
+				with self._lock:
+					self._closeFile(logFile)
+
+	def _getFile(self, logFile):
+		"""
+		Get the open file for the path `logFile`.
+
+		The file is opened again if it was removed or replaced, \
+e.g. by logrotate.
+		"""
+		self._useCounter += 1
+		self._lastUse[logFile] = self._useCounter
+
+		try:
+			lf = self._files[logFile]
+		except KeyError:
+			lf = None
+		else:
+			try:
+				if os.fstat(lf.fileno()).st_ino != os.stat(logFile).st_ino:
+					self._closeFile(logFile)
+					lf = None
+			except (OSError, ValueError):
+				self._closeFile(logFile)
+				lf = None
+
+		if lf is None:
+			if len(self._files) >= self.maxOpenFiles:
+				leastUsed = min(self._files, key=self._lastUse.get)
+				self._closeFile(leastUsed)
+
+			lf = self._files[logFile] = open(logFile, 'ab')
+			self._lastUse[logFile] = self._useCounter
+
+		return lf
+
+	def _closeFile(self, logFile):
+		lf = self._files.pop(logFile, None)
+		if lf is not None:
+			try:
+				lf.close()
+			except Exception:
+				pass
+
+
+_LOG_FILE_WRITER = _LogFileWriter()
+
+
 class LoggerSubject:
 	def __init__(self):
 		self._observers = []
@@ -265,6 +509,8 @@ class LoggerImplementation:
 		self.__consoleLevel = LOG_NONE
 		self.__fileLevel = LOG_NONE
 		self.__messageSubjectLevel = LOG_NONE
+		# The highest level any output accepts.
+		self.__effectiveLevel = LOG_NONE
 		self.__fileColor = False
 		self.__consoleColor = False
 		self.__logFile = logFile
@@ -389,6 +635,7 @@ class LoggerImplementation:
 		level = self._sanitizeLogLevel(level)
 
 		self.__syslogLevel = level
+		self._updateEffectiveLevel()
 		if syslog is not None:
 			if self.__syslogLevel != LOG_NONE:
 				# Set ident string for syslog
@@ -405,11 +652,30 @@ class LoggerImplementation:
 
 	def setMessageSubjectLevel(self, level=LOG_NONE):
 		self.__messageSubjectLevel = self._sanitizeLogLevel(level)
+		self._updateEffectiveLevel()
 
 	def setConsoleLevel(self, level=LOG_NONE):
 		''' Maximum level of messages to print to stderr
 		Set LOG_NONE to disable output to stderr (default)'''
 		self.__consoleLevel = self._sanitizeLogLevel(level)
+		self._updateEffectiveLevel()
+
+	def _updateEffectiveLevel(self):
+		self.__effectiveLevel = max(
+			self.__messageSubjectLevel,
+			self.__consoleLevel,
+			self.__fileLevel,
+			self.__syslogLevel
+		)
+
+	def isEnabledFor(self, level):
+		'''
+		Check if messages with `level` are logged anywhere.
+
+		Use this to avoid preparing values for a log message that \
+would be thrown away.
+		'''
+		return level <= self.__effectiveLevel or bool(self.univentionLogger_priv)
 
 	@staticmethod
 	def _sanitizeLogLevel(level):
@@ -486,6 +752,11 @@ will disable logging to a file.
 		''' Maximum level of messages to appear in logfile
 		Set LOG_NONE to disable output to logfile (default)'''
 		self.__fileLevel = self._sanitizeLogLevel(level)
+		self._updateEffectiveLevel()
+
+	def flush(self):
+		''' Wait until all messages are written to the log files. '''
+		_LOG_FILE_WRITER.flush()
 
 	def exit(self, object=None):
 		if object:
@@ -559,12 +830,7 @@ False suppresses exceptions.
 			tempMessage = tempMessage.replace(u'%N', linenumber)
 			return tempMessage
 
-		if (level > self.__messageSubjectLevel and
-			level > self.__consoleLevel and
-			level > self.__fileLevel and
-			level > self.__syslogLevel and
-			not self.univentionLogger_priv):
-
+		if level > self.__effectiveLevel and not self.univentionLogger_priv:
 			return
 
 		try:
@@ -574,14 +840,15 @@ False suppresses exceptions.
 				else:
 					message = unicode(message, 'utf-8', 'replace')
 
-			try:
-				message = message.format(*formatArgs, **formatKwargs)
-			except KeyError as e:
-				if 'Missing format for key ' not in str(e).lower():
-					raise e
-			except ValueError as e:
-				if 'invalid conversion specification' not in str(e).lower():
-					raise e
+			if formatArgs or formatKwargs:
+				try:
+					message = message.format(*formatArgs, **formatKwargs)
+				except KeyError as e:
+					if 'Missing format for key ' not in str(e).lower():
+						raise e
+				except ValueError as e:
+					if 'invalid conversion specification' not in str(e).lower():
+						raise e
 
 			componentname = self.__componentName
 			datetime = unicode(time.strftime(u"%b %d %H:%M:%S", time.localtime()), 'utf-8', 'replace')
@@ -679,42 +946,12 @@ False suppresses exceptions.
 						for string in self.__confidentialStrings:
 							m = m.replace(string, u'*** confidential ***')
 
-					try:
-						lf = codecs.open(logFile, 'a+', 'utf-8', 'replace')
-					except Exception as err:
-						lf = None
-
-					if lf:
-						timeout = 0
-						locked = False
-						while not locked and timeout < 2000:
-							# While not timed out and not locked
-							try:
-								# Try to lock file
-								if os.name == 'nt':
-									hfile = win32file._get_osfhandle(lf.fileno())
-									win32file.LockFileEx(hfile, win32con.LOCKFILE_EXCLUSIVE_LOCK, 0, -0x7fff0000, pywintypes.OVERLAPPED())
-									# win32file.LockFileEx(hfile, flags, 0, -0x10000, __overlapped)
-								elif os.name == 'posix':
-									# Flags for exclusive, non-blocking lock
-									fcntl.flock(lf.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-							except IOError as err:
-								# Locking failed
-								# increase timeout counter, sleep 100 millis
-								timeout += 100
-								time.sleep(0.1)
-							else:
-								# File successfully locked
-								locked = True
-
-						if locked:
-							if self.__fileColor:
-								m = u"%s%s%s" % (color, m, COLOR_NORMAL)
-							m += u'\n'
-							if os.name == 'nt':
-								m = m.replace(u'\n', u'\r\n')
-							lf.write(m)
-							lf.close()
+					if self.__fileColor:
+						m = u"%s%s%s" % (color, m, COLOR_NORMAL)
+					m += u'\n'
+					if os.name == 'nt':
+						m = m.replace(u'\n', u'\r\n')
+					_LOG_FILE_WRITER.write(logFile, m)
 
 			if syslog is not None and level <= self.__syslogLevel:
 				# Log to syslog
@@ -801,23 +1038,28 @@ False suppresses exceptions.
 
 	def confidential(self, message, *args, **kwargs):
 		''' Log a confidential message. '''
-		self.log(LOG_CONFIDENTIAL, message, formatArgs=args, formatKwargs=kwargs)
+		if LOG_CONFIDENTIAL <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_CONFIDENTIAL, message, formatArgs=args, formatKwargs=kwargs)
 
 	def debug3(self, message, *args, **kwargs):
 		''' Log a debug message. '''
-		self.debug2(message, *args, **kwargs)
+		if LOG_DEBUG2 <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_DEBUG2, message, formatArgs=args, formatKwargs=kwargs)
 
 	def debug2(self, message, *args, **kwargs):
 		''' Log a debug message. '''
-		self.log(LOG_DEBUG2, message, formatArgs=args, formatKwargs=kwargs)
+		if LOG_DEBUG2 <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_DEBUG2, message, formatArgs=args, formatKwargs=kwargs)
 
 	def debug(self, message, *args, **kwargs):
 		''' Log a debug message. '''
-		self.log(LOG_DEBUG, message, formatArgs=args, formatKwargs=kwargs)
+		if LOG_DEBUG <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_DEBUG, message, formatArgs=args, formatKwargs=kwargs)
 
 	def info(self, message, *args, **kwargs):
 		''' Log a info message. '''
-		self.log(LOG_INFO, message, formatArgs=args, formatKwargs=kwargs)
+		if LOG_INFO <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_INFO, message, formatArgs=args, formatKwargs=kwargs)
 
 	def msg(self, message, *args, **kwargs):
 		''' Log a info message. '''
@@ -825,15 +1067,18 @@ False suppresses exceptions.
 
 	def notice(self, message, *args, **kwargs):
 		''' Log a notice message. '''
-		self.log(LOG_NOTICE, message, formatArgs=args, formatKwargs=kwargs)
+		if LOG_NOTICE <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_NOTICE, message, formatArgs=args, formatKwargs=kwargs)
 
 	def warning(self, message, *args, **kwargs):
 		''' Log a warning message. '''
-		self.log(LOG_WARNING, message, formatArgs=args, formatKwargs=kwargs)
+		if LOG_WARNING <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_WARNING, message, formatArgs=args, formatKwargs=kwargs)
 
 	def error(self, message, *args, **kwargs):
 		''' Log a error message. '''
-		self.log(LOG_ERROR, message, formatArgs=args, formatKwargs=kwargs)
+		if LOG_ERROR <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_ERROR, message, formatArgs=args, formatKwargs=kwargs)
 
 	def err(self, message):
 		''' Log a error message. '''
@@ -841,11 +1086,13 @@ False suppresses exceptions.
 
 	def critical(self, message, *args, **kwargs):
 		''' Log a critical message. '''
-		self.log(LOG_CRITICAL, message, formatArgs=args, formatKwargs=kwargs)
+		if LOG_CRITICAL <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_CRITICAL, message, formatArgs=args, formatKwargs=kwargs)
 
 	def essential(self, message, *args, **kwargs):
 		''' Log a essential message. '''
-		self.log(LOG_ESSENTIAL, message, formatArgs=args, formatKwargs=kwargs)
+		if LOG_ESSENTIAL <= self.__effectiveLevel or self.univentionLogger_priv:
+			self.log(LOG_ESSENTIAL, message, formatArgs=args, formatKwargs=kwargs)
 
 	def comment(self, message, *args, **kwargs):
 		''' Log a comment message. '''
@@ -869,16 +1116,9 @@ file or syslog.
 			# Create and remember instance
 			Logger.__instance = LoggerImplementation()
 
-		# Store instance reference as the only member in the handle
-		self.__dict__['_Logger__instance'] = Logger.__instance
-
-	def __getattr__(self, attr):
-		""" Delegate access to implementation """
-		return getattr(self.__instance, attr)
-
-	def __setattr__(self, attr, value):
-		""" Delegate access to implementation """
-		return setattr(self.__instance, attr, value)
+		# All handles share the state of the instance. Attributes are
+		# accessed directly instead of delegating every access.
+		self.__dict__ = Logger.__instance.__dict__
 
 
 class VirtFile(object):
@@ -52,6 +52,8 @@ __version__ = '4.0.6.44'
 
 logger = Logger()
 _MANDATORY_CONSTRUCTOR_ARGS_CACHE = {}
+_OBJECT_CLASSES = {}
+_CONSTRUCTOR_PLANS = {}
 
 
 def mandatoryConstructorArgs(Class):
@@ -173,7 +175,129 @@ def objectsDiffer(obj1, obj2, excludeAttributes=None):
 	return False
 
 
+def getObjectClass(typeName):
+	"""
+	Get the class of objects of type `typeName`.
+
+	:raises NameError: If there is no such class.
+	"""
+	try:
+		return _OBJECT_CLASSES[typeName]
+	except KeyError:
+		pass
+
+	Class = globals().get(typeName)
+	if not (isinstance(Class, type) and issubclass(Class, BaseObject)):
+		raise NameError(u"Unknown object type {0!r}".format(typeName))
+
+	_OBJECT_CLASSES[typeName] = Class
+	return Class
+
+
+def _getConstructorPlan(Class):
+	try:
+		return _CONSTRUCTOR_PLANS[Class]
+	except KeyError:
+		plan = _CONSTRUCTOR_PLANS[Class] = _ConstructorPlan(Class)
+		return plan
+
+
+class _ConstructorPlan(object):
+	"""
+	The information needed to create objects of a class from a hash.
+
+	It is created once per class instead of inspecting the constructor
+	for every object.
+	"""
+
+	def __init__(self, Class):
+		self.Class = Class
+		try:
+			code = Class.__init__.func_code
+		except AttributeError:  # No constructor of its own
+			self.arguments = ()
+			self.mandatoryArguments = []
+		else:
+			self.arguments = code.co_varnames[1:code.co_argcount]
+			self.mandatoryArguments = mandatoryConstructorArgs(Class)
+		self.defaults = None
+		self.mutableDefaults = ()
+
+	def create(self, hash):
+		"""
+		Create an object with the validating constructor.
+		"""
+		decodeIdent(self.Class, hash)
+		kwargs = {}
+		for argument in self.arguments:
+			if argument in hash:
+				kwargs[argument] = hash[argument]
+
+		try:
+			return self.Class(**kwargs)
+		except TypeError as error:
+			if '__init__() takes at least' in forceUnicode(error):
+				missingArgs = [arg for arg in self.mandatoryArguments if arg not in kwargs]
+				if missingArgs:
+					raise TypeError("Missing required argument(s): {0}".format(', '.join(repr(a) for a in missingArgs)))
+
+			raise error
+
+	def createTrusted(self, hash):
+		"""
+		Create an object without running the setters of the constructor.
+
+		The values of `hash` are used as they are. Only byte strings \
+are decoded.
+		"""
+		decodeIdent(self.Class, hash)
+		if self.defaults is None:
+			try:
+				mandatory = dict((arg, hash[arg]) for arg in self.mandatoryArguments)
+			except KeyError:
+				return self.create(hash)
+
+			# The attributes of an object created with only the
+			# mandatory arguments are the defaults of all others.
+			defaults = self.Class(**mandatory)._getAttributes()
+			self.mutableDefaults = tuple(
+				key for (key, value) in defaults.items()
+				if isinstance(value, (list, dict, set))
+			)
+			self.defaults = defaults
+
+		for argument in self.mandatoryArguments:
+			if hash.get(argument) is None:
+				return self.create(hash)
+
+		attributes = self.defaults.copy()
+		for key in self.mutableDefaults:
+			attributes[key] = type(attributes[key])(attributes[key])
+
+		for argument in self.arguments:
+			try:
+				value = hash[argument]
+			except KeyError:
+				continue
+
+			if value is None:
+				continue
+			elif isinstance(value, str):
+				value = value.decode('utf-8')
+
+			attributes[argument] = value
+
+		obj = self.Class.__new__(self.Class)
+		obj._setAttributes(attributes)
+		return obj
+
+
 class BaseObject(object):
+	# Classes of which many objects are kept in memory use __slots__.
+	# They list the names of their attributes in `_attributeSlots`.
+	__slots__ = ()
+	_attributeSlots = None
+
 	subClasses = {}
 	identSeparator = u';'
 	foreignIdAttributes = []
@@ -223,9 +347,10 @@ class BaseObject(object):
 			keepAttributes.add(attribute)
 		keepAttributes.add('type')
 
-		for attribute in self.__dict__.keys():
-			if attribute not in keepAttributes:
-				self.__dict__[attribute] = None
+		self._setAttributes(dict.fromkeys(
+			attribute for attribute in self._getAttributes()
+			if attribute not in keepAttributes
+		))
 
 	def update(self, updateObject, updateWithNoneValues=True):
 		if not issubclass(updateObject.__class__, self.__class__):
@@ -243,7 +368,7 @@ class BaseObject(object):
 				if value is None:
 					del hash[key]
 
-		self.__dict__.update(hash)
+		self._setAttributes(hash)
 
 	def getType(self):
 		return unicode(self.__class__.__name__)
@@ -252,10 +377,65 @@ class BaseObject(object):
 		self._isGeneratedDefault = forceBool(flag)
 
 	def isGeneratedDefault(self):
-		return self._isGeneratedDefault
+		return getattr(self, '_isGeneratedDefault', False)
+
+	@classmethod
+	def fromTrustedHash(cls, hash):
+		"""
+		Create an object from a hash read from storage.
+
+		Unlike `fromHash` the values are not validated. They must \
+already be in the form the setters would create. Backends use this \
+for data they have written themselves.
+
+		If `hash` has no type an object of this class is created.
+		"""
+		try:
+			Class = getObjectClass(hash['type'])
+		except KeyError:
+			Class = cls
+
+		return _getConstructorPlan(Class).createTrusted(hash)
+
+	def _getAttributes(self):
+		"""
+		Get the attributes of the object as a new dict.
+		"""
+		if self._attributeSlots is None:
+			return dict(self.__dict__)
+
+		attributes = {}
+		for attribute in self._attributeSlots:
+			try:
+				attributes[attribute] = getattr(self, attribute)
+			except AttributeError:
+				pass
+
+		try:
+			attributes['_isGeneratedDefault'] = self._isGeneratedDefault
+		except AttributeError:
+			pass
+
+		return attributes
+
+	def _setAttributes(self, attributes):
+		"""
+		Set the attributes of the object from the dict `attributes`.
+		"""
+		if self._attributeSlots is None:
+			self.__dict__.update(attributes)
+		else:
+			for (attribute, value) in attributes.iteritems():
+				setattr(self, attribute, value)
+
+	def __getstate__(self):
+		return self._getAttributes()
+
+	def __setstate__(self, state):
+		self._setAttributes(state)
 
 	def toHash(self):
-		hash = dict(self.__dict__)
+		hash = self._getAttributes()
 		hash['type'] = self.getType()
 		return hash
 
@@ -303,26 +483,7 @@ class Entity(BaseObject):
 		except KeyError:
 			hash['type'] = 'Entity'
 
-		Class = eval(hash['type'])
-		kwargs = {}
-		decodeIdent(Class, hash)
-		for varname in Class.__init__.func_code.co_varnames[1:]:
-			if varname in hash:
-				kwargs[varname] = hash[varname]
-
-		try:
-			return Class(**kwargs)
-		except TypeError as error:
-			if '__init__() takes at least' in forceUnicode(error):
-				try:
-					args = mandatoryConstructorArgs(Class)
-					missingArgs = [arg for arg in args if arg not in kwargs]
-					if missingArgs:
-						raise TypeError("Missing required argument(s): {0}".format(', '.join(repr(a) for a in missingArgs)))
-				except NameError:
-					pass
-
-			raise error
+		return _getConstructorPlan(getObjectClass(hash['type'])).create(hash)
 
 	def clone(self, identOnly=False):
 		hash = {}
@@ -351,6 +512,7 @@ BaseObject.subClasses['Entity'] = Entity
 
 
 class Relationship(BaseObject):
+	__slots__ = ()
 	subClasses = {}
 
 	def setDefaults(self):
@@ -363,26 +525,7 @@ class Relationship(BaseObject):
 		except KeyError:
 			hash['type'] = 'Relationship'
 
-		Class = eval(hash['type'])
-		kwargs = {}
-		decodeIdent(Class, hash)
-		for varname in Class.__init__.func_code.co_varnames[1:]:
-			if varname in hash:
-				kwargs[varname] = hash[varname]
-
-		try:
-			return Class(**kwargs)
-		except TypeError as error:
-			if '__init__() takes at least' in forceUnicode(error):
-				try:
-					args = mandatoryConstructorArgs(Class)
-					missingArgs = [arg for arg in args if arg not in kwargs]
-					if missingArgs:
-						raise TypeError("Missing required argument(s): {0}".format(', '.join(repr(a) for a in missingArgs)))
-				except NameError:
-					pass
-
-			raise error
+		return _getConstructorPlan(getObjectClass(hash['type'])).create(hash)
 
 	def clone(self, identOnly=False):
 		hash = {}
@@ -991,6 +1134,8 @@ Config.subClasses['BoolConfig'] = BoolConfig
 
 
 class ConfigState(Relationship):
+	_attributeSlots = ('configId', 'objectId', 'values')
+	__slots__ = _attributeSlots + ('_isGeneratedDefault', )
 	subClasses = {}
 	backendMethodPrefix = 'configState'
 
@@ -1769,6 +1914,13 @@ Relationship.subClasses['ProductOnDepot'] = ProductOnDepot
 
 
 class ProductOnClient(Relationship):
+	_attributeSlots = (
+		'productId', 'productType', 'clientId', 'targetConfiguration',
+		'installationStatus', 'actionRequest', 'lastAction',
+		'actionProgress', 'actionResult', 'productVersion',
+		'packageVersion', 'modificationTime', 'actionSequence'
+	)
+	__slots__ = _attributeSlots + ('_isGeneratedDefault', )
 	subClasses = {}
 	backendMethodPrefix = 'productOnClient'
 
@@ -2845,6 +2997,12 @@ Entity.subClasses['AuditSoftware'] = AuditSoftware
 
 
 class AuditSoftwareOnClient(Relationship):
+	_attributeSlots = (
+		'name', 'version', 'subVersion', 'language', 'architecture',
+		'clientId', 'uninstallString', 'binaryName', 'firstseen',
+		'lastseen', 'state', 'usageFrequency', 'lastUsed', 'licenseKey'
+	)
+	__slots__ = _attributeSlots + ('_isGeneratedDefault', )
 	subClasses = {}
 	backendMethodPrefix = 'auditSoftwareOnClient'
 
@@ -3129,6 +3287,11 @@ class AuditHardware(Entity):
 			initHash[key] = value
 		return AuditHardware(**initHash)
 
+	@classmethod
+	def fromTrustedHash(cls, hash):
+		# The attributes depend on the hardware class.
+		return AuditHardware.fromHash(hash)
+
 	@staticmethod
 	def fromJson(jsonString):
 		return fromJson(jsonString, 'AuditHardware')
@@ -3173,7 +3336,49 @@ class AuditHardware(Entity):
 Entity.subClasses['AuditHardware'] = AuditHardware
 
 
+class _HardwareAttributeLayout(object):
+	"""
+	The names of the hardware attributes of `AuditHardwareOnHost` objects.
+
+	Objects with the same attributes share one layout and only keep a \
+list of their values.
+	"""
+	__slots__ = ('names', 'indexes', '_extensions')
+
+	def __init__(self, names):
+		self.names = names
+		self.indexes = dict((name, index) for (index, name) in enumerate(names))
+		self._extensions = {}
+
+	def extend(self, name):
+		"""
+		Get the layout with the additional attribute `name`.
+		"""
+		try:
+			return self._extensions[name]
+		except KeyError:
+			layout = self._extensions[name] = getHardwareAttributeLayout(self.names + (name, ))
+			return layout
+
+
+_HARDWARE_ATTRIBUTE_LAYOUTS = {}
+
+
+def getHardwareAttributeLayout(names):
+	"""
+	Get the shared layout for the tuple of attribute names `names`.
+	"""
+	try:
+		return _HARDWARE_ATTRIBUTE_LAYOUTS[names]
+	except KeyError:
+		layout = _HARDWARE_ATTRIBUTE_LAYOUTS[names] = _HardwareAttributeLayout(names)
+		return layout
+
+
 class AuditHardwareOnHost(Relationship):
+	_attributeSlots = ('hostId', 'hardwareClass', 'firstseen', 'lastseen', 'state')
+	__slots__ = _attributeSlots + ('_isGeneratedDefault', '_hardwareLayout', '_hardwareValues')
+	_fixedAttributes = frozenset(__slots__)
 	subClasses = {}
 	backendMethodPrefix = 'auditHardwareOnHost'
 	hardwareAttributes = {}
@@ -3233,7 +3438,9 @@ class AuditHardwareOnHost(Relationship):
 				if isinstance(value, str):
 					kwargs[attribute] = forceUnicode(value).strip()
 
-		self.__dict__.update(kwargs)
+		names = tuple(sorted(kwargs))
+		self._hardwareLayout = getHardwareAttributeLayout(names)
+		self._hardwareValues = [kwargs[name] for name in names]
 		if firstseen is not None:
 			self.setFirstseen(firstseen)
 		if lastseen is not None:
@@ -3275,6 +3482,42 @@ class AuditHardwareOnHost(Relationship):
 				hardwareAttributes[hwClass][value['Opsi']] = value["Type"]
 		AuditHardwareOnHost.hardwareAttributes = hardwareAttributes
 
+	def __getattr__(self, name):
+		# Only called for names that are neither slots nor class attributes.
+		if name.startswith('_'):
+			raise AttributeError(name)
+
+		try:
+			return self._hardwareValues[self._hardwareLayout.indexes[name]]
+		except KeyError:
+			raise AttributeError(name)
+
+	def __setattr__(self, name, value):
+		if name in self._fixedAttributes:
+			object.__setattr__(self, name, value)
+			return
+
+		try:
+			layout = self._hardwareLayout
+		except AttributeError:
+			layout = self._hardwareLayout = getHardwareAttributeLayout(())
+			self._hardwareValues = []
+
+		try:
+			self._hardwareValues[layout.indexes[name]] = value
+		except KeyError:
+			self._hardwareLayout = layout.extend(name)
+			self._hardwareValues.append(value)
+
+	def _getAttributes(self):
+		attributes = Relationship._getAttributes(self)
+		try:
+			attributes.update(zip(self._hardwareLayout.names, self._hardwareValues))
+		except AttributeError:
+			pass
+
+		return attributes
+
 	def setDefaults(self):
 		Relationship.setDefaults(self)
 		if self.firstseen is None:
@@ -3354,6 +3597,11 @@ class AuditHardwareOnHost(Relationship):
 			initHash[key] = value
 		return AuditHardwareOnHost(**initHash)
 
+	@classmethod
+	def fromTrustedHash(cls, hash):
+		# The attributes depend on the hardware class.
+		return AuditHardwareOnHost.fromHash(hash)
+
 	@staticmethod
 	def fromJson(jsonString):
 		return fromJson(jsonString, 'AuditHardwareOnHost')
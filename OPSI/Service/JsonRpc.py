@@ -37,6 +37,7 @@ http://www.jsonrpc.org/specification
 import sys
 import time
 import traceback
+import weakref
 import zlib
 
 from twisted.internet.defer import maybeDeferred, DeferredList
@@ -48,11 +49,85 @@ from OPSI.Types import forceUnicode, forceList, OpsiRpcError, OpsiBadRpcError
 
 logger = Logger()
 
+_DISPATCH_TABLES = weakref.WeakKeyDictionary()
+
+
+class MethodDispatchTable(object):
+	"""
+	Maps the names of the methods of an interface to the bound methods
+	of the instance they are called on.
+
+	Methods are looked up on first use and kept for further calls.
+	"""
+
+	def __init__(self, instance, interface):
+		self.instance = instance
+		self.interface = interface
+		self._methodInterfaces = dict((m['name'], m) for m in interface)
+		self._methods = {}
+
+	def getMethod(self, methodName):
+		"""
+		Get the method to call and its parameter information.
+
+		:raises OpsiRpcError: If `methodName` is not part of the interface.
+		:returns: The bound method, if the method accepts keyword \
+arguments and the amount of parameters before the keyword arguments.
+		:returntype: (callable, bool, int)
+		"""
+		try:
+			return self._methods[methodName]
+		except KeyError:
+			pass
+
+		try:
+			methodInterface = self._methodInterfaces[methodName]
+		except KeyError:
+			raise OpsiRpcError(u"Method '%s' is not valid" % methodName)
+
+		parameterCount = 0
+		if methodInterface['keywords']:
+			if methodInterface['args']:
+				parameterCount += len(methodInterface['args'])
+			if methodInterface['varargs']:
+				parameterCount += len(methodInterface['varargs'])
+
+		method = (
+			getattr(self.instance, methodName),
+			bool(methodInterface['keywords']),
+			parameterCount
+		)
+		self._methods[methodName] = method
+		return method
+
+
+def getDispatchTable(instance, interface):
+	"""
+	Get the dispatch table for calling the methods of `interface` on
+	`instance`.
+
+	The table is created once per instance and reused as long as the
+	same interface is used.
+
+	:returntype: MethodDispatchTable
+	"""
+	try:
+		dispatchTable = _DISPATCH_TABLES.get(instance)
+	except TypeError:  # Instance does not support weak references
+		return MethodDispatchTable(instance, interface)
+
+	if dispatchTable is None or dispatchTable.interface is not interface:
+		dispatchTable = MethodDispatchTable(instance, interface)
+		_DISPATCH_TABLES[instance] = dispatchTable
+
+	return dispatchTable
+
 
 class JsonRpc(object):
-	def __init__(self, instance, interface, rpc):
+	def __init__(self, instance, interface, rpc, dispatchTable=None):
 		self._instance = instance
 		self._interface = interface
+		self._dispatchTable = dispatchTable
 		self.started = None
 		self.ended = None
 		self.type = rpc.get('type')
@@ -95,32 +170,21 @@ class JsonRpc(object):
 		self.started = time.time()
 
 		try:
-			methodInterface = None
-			for m in self._interface:
-				if self.getMethodName() == m['name']:
-					methodInterface = m
-					break
+			methodName = self.getMethodName()
+			dispatchTable = self._dispatchTable
+			if dispatchTable is None:
+				dispatchTable = getDispatchTable(self._instance, self._interface)
 
-			if not methodInterface:
-				raise OpsiRpcError(u"Method '%s' is not valid" % self.getMethodName())
+			method, acceptsKeywords, parameterCount = dispatchTable.getMethod(methodName)
 
 			keywords = {}
-			if methodInterface['keywords']:
-				parameterCount = 0
-				if methodInterface['args']:
-					parameterCount += len(methodInterface['args'])
-				if methodInterface['varargs']:
-					parameterCount += len(methodInterface['varargs'])
-
-				if len(params) >= parameterCount:
-					kwargs = params.pop(-1)
-					if not isinstance(kwargs, dict):
-						raise Exception(u"kwargs param is not a dict: %s" % params[-1])
-
-					for (key, value) in kwargs.items():
-						keywords[str(key)] = deserialize(value)
+			if acceptsKeywords and len(params) >= parameterCount:
+				kwargs = params.pop(-1)
+				if not isinstance(kwargs, dict):
+					raise Exception(u"kwargs param is not a dict: %s" % params[-1])
 
-				del parameterCount
+				for (key, value) in kwargs.items():
+					keywords[str(key)] = deserialize(value)
 
 			params = deserialize(params)
 
@@ -131,13 +195,12 @@ class JsonRpc(object):
 			if len(pString) > 200:
 				pString = u'{0}...'.format(pString[:200])
 
-			logger.notice(u"-----> Executing: %s(%s)" % (self.getMethodName(), pString))
+			logger.notice(u"-----> Executing: %s(%s)" % (methodName, pString))
 
-			instance = self._instance
 			if keywords:
-				self.result = eval("instance.%s(*params, **keywords)" % self.getMethodName())
+				self.result = method(*params, **keywords)
 			else:
-				self.result = eval("instance.%s(*params)" % self.getMethodName())
+				self.result = method(*params)
 
 			logger.info(u'Got result')
 			logger.debug2("RPC ID {0}: {1!r}", self.tid, self.result)
@@ -208,6 +271,7 @@ class JsonRpc(object):
 		state = self.__dict__
 		state['_instance'] = None
 		state['_interface'] = None
+		state['_dispatchTable'] = None
 		return state
 
 
@@ -251,12 +315,14 @@ class JsonRpcRequestProcessor(object):
 		except Exception as error:
 			raise OpsiBadRpcError(u"Failed to decode rpc: {0}".format(error))
 
+		dispatchTable = getDispatchTable(self.callInstance, self.callInterface)
 		for rpc in forceList(rpcs):
 			self.rpcs.append(
 				JsonRpc(
 					instance=self.callInstance,
 					interface=self.callInterface,
-					rpc=rpc
+					rpc=rpc,
+					dispatchTable=dispatchTable
 				)
 			)
 
@@ -43,9 +43,9 @@ from OPSI.web2 import responsecode, http_headers, http, stream
 from OPSI.Logger import Logger, LOG_ERROR, LOG_INFO
 from OPSI.Types import (forceUnicode, forceList, OpsiBadRpcError,
 						OpsiAuthenticationError)
-from OPSI.Util import objectToHtml, toJson, fromJson, serialize
-from OPSI.Util.HTTP import deflateEncode, deflateDecode, gzipEncode, gzipDecode
-from OPSI.Service.JsonRpc import JsonRpc
+from OPSI.Util import objectToHtml, toJson, fromJson, serialize, iterJson
+from OPSI.Util.HTTP import deflateDecode, deflateEncodeStream, gzipDecode, gzipEncodeStream
+from OPSI.Service.JsonRpc import JsonRpc, getDispatchTable
 
 logger = Logger()
 
@@ -521,6 +521,34 @@ class WorkerOpsi:
 		return self._generateResponse(result)
 
 
+class ChunkStream(stream.SimpleStream):
+	"""
+	A stream returning the byte strings of an iterator.
+
+	The data is created only when the stream is read.
+	"""
+
+	def __init__(self, chunks):
+		self._chunks = iter(chunks)
+
+	def read(self):
+		if self._chunks is None:
+			return None
+
+		for chunk in self._chunks:
+			if chunk:
+				return chunk
+
+		self._chunks = None
+		return None
+
+	def close(self):
+		self._chunks = None
+
+	def split(self, point):
+		return stream.fallbackSplit(self, point)
+
+
 class WorkerOpsiJsonRpc(WorkerOpsi):
 
 	RFC_CONFORM_HEADERS = os.path.exists('/etc/opsi/opsi.header.fix.enable')
@@ -552,8 +580,9 @@ class WorkerOpsiJsonRpc(WorkerOpsi):
 		except Exception as e:
 			raise OpsiBadRpcError(u"Failed to decode rpc: %s" % e)
 
+		dispatchTable = getDispatchTable(self._callInstance, self._callInterface)
 		for rpc in forceList(rpcs):
-			rpc = JsonRpc(instance=self._callInstance, interface=self._callInterface, rpc=rpc)
+			rpc = JsonRpc(instance=self._callInstance, interface=self._callInterface, rpc=rpc, dispatchTable=dispatchTable)
 			self._rpcs.append(rpc)
 
 		return result
@@ -601,7 +630,7 @@ class WorkerOpsiJsonRpc(WorkerOpsi):
 		except Exception as error:
 			logger.error(u"Failed to get accepted mime types from header: %s" % error)
 
-		response = [serialize(rpc.getResponse()) for rpc in self._rpcs]
+		response = [rpc.getResponse() for rpc in self._rpcs]
 
 		if len(response) == 1:
 			response = response[0]
@@ -621,25 +650,50 @@ class WorkerOpsiJsonRpc(WorkerOpsi):
 				result.headers.setHeader('content-encoding', [encoding])
 				result.headers.setHeader('content-type', http_headers.MimeType("gzip-application", "json", {"charset": "utf-8"}))
 				logger.debug(u"Sending deflated data (backwards compatible - with content-encoding {0!r})".format(encoding))
-				result.stream = stream.IByteStream(deflateEncode(toJson(response).encode('utf-8')))
+				result.stream = ChunkStream(deflateEncodeStream(self._encodeResponse(response)))
 			else:
 				logger.debug(u"Sending plain data")
-				result.stream = stream.IByteStream(toJson(response).encode('utf-8'))
+				result.stream = ChunkStream(self._encodeResponse(response))
 		elif encoding == "deflate":
 			result.headers.setHeader('content-encoding', [encoding])
 
 			logger.debug(u"Sending deflated data")
-			result.stream = stream.IByteStream(deflateEncode(toJson(response).encode('utf-8')))
+			result.stream = ChunkStream(deflateEncodeStream(self._encodeResponse(response)))
 		elif encoding == "gzip":
 			result.headers.setHeader('content-encoding', [encoding])
 
 			logger.debug(u"Sending gzip compressed data")
-			result.stream = stream.IByteStream(gzipEncode(toJson(response).encode('utf-8')))
+			result.stream = ChunkStream(gzipEncodeStream(self._encodeResponse(response)))
 		else:
-			result.stream = stream.IByteStream(toJson(response).encode('utf-8'))
+			result.stream = ChunkStream(self._encodeResponse(response))
 
 		return result
 
+	@staticmethod
+	def _encodeResponse(response):
+		"""
+		Encode `response` to JSON in chunks of UTF-8.
+
+		The first chunk is encoded right away so that errors, e.g. \
+results that can not be serialized, are raised before the response \
+is sent and an error response can be returned instead. The \
+remaining chunks are encoded while the response is sent.
+		"""
+		chunks = iterJson(response)
+		firstChunk = next(chunks, u'')
+
+		def encode():
+			yield firstChunk.encode('utf-8')
+			try:
+				for chunk in chunks:
+					yield chunk.encode('utf-8')
+			except Exception as error:
+				logger.logException(error)
+				logger.error(u"Failed to encode response, the response is incomplete: {0}", error)
+				raise
+
+		return encode()
+
 	def _renderError(self, failure):
 		result = http.Response()
 		result.headers.setHeader('content-type', http_headers.MimeType("text", "html", {"charset": "utf-8"}))
@@ -128,3 +128,70 @@ class OrderedDict(dict, DictMixin):
 	def __ne__(self, other):
 		return not self == other
 
+
+class LRUCache(object):
+	"""
+	A mapping holding at most `maxSize` entries.
+
+	If a new entry is added to a full cache the least recently used \
+entry is removed.
+	"""
+
+	def __init__(self, maxSize=1024):
+		if maxSize < 1:
+			raise ValueError(u"maxSize must be at least 1")
+
+		self.maxSize = maxSize
+		self.clear()
+
+	def clear(self):
+		# key --> [previous link, next link, key, value]
+		self._links = {}
+		# The sentinel of a circular doubly linked list. The first
+		# link after it is the least recently used one.
+		self._root = root = []
+		root[:] = [root, root, None, None]
+
+	def __getitem__(self, key):
+		link = self._links[key]
+		previousLink, nextLink, _, value = link
+		previousLink[1] = nextLink
+		nextLink[0] = previousLink
+
+		root = self._root
+		last = root[0]
+		last[1] = root[0] = link
+		link[0] = last
+		link[1] = root
+		return value
+
+	def __setitem__(self, key, value):
+		try:
+			self[key]
+			self._links[key][3] = value
+			return
+		except KeyError:
+			pass
+
+		root = self._root
+		if len(self._links) >= self.maxSize:
+			oldest = root[1]
+			root[1] = oldest[1]
+			oldest[1][0] = root
+			del self._links[oldest[2]]
+
+		last = root[0]
+		link = [last, root, key, value]
+		last[1] = root[0] = self._links[key] = link
+
+	def __contains__(self, key):
+		return key in self._links
+
+	def __len__(self):
+		return len(self._links)
+
+	def get(self, key, default=None):
+		try:
+			return self[key]
+		except KeyError:
+			return default
@@ -35,8 +35,12 @@ This include functionality for using Tar-Files and their compression.
 import locale
 import os
 import re
+import shutil
 import subprocess
+import tarfile
+import threading
 import time
+from contextlib import closing
 
 if os.name == 'posix':
 	import fcntl
@@ -45,7 +49,8 @@ if os.name == 'posix':
 import OPSI.Util.File.Opsi
 from OPSI.Logger import Logger
 from OPSI import System
-from OPSI.Types import forceBool, forceFilename, forceUnicodeList, forceUnicodeLower
+from OPSI.Types import (forceBool, forceFilename, forceUnicode,
+	forceUnicodeList, forceUnicodeLower)
 from OPSI.Util import compareVersions
 
 __version__ = "4.0.6.1"
@@ -92,13 +97,37 @@ class BaseArchive(object):
 	def getFilename(self):
 		return self._filename
 
-	def _extract(self, command, fileCount):
+	def _extract(self, command, fileCount, inputFile=None, workingDirectory=None):
+		"""
+		Run the extracting `command`.
+
+		:param inputFile: A file object that is read and fed to the \
+standard input of `command`.
+		:param workingDirectory: The directory to run `command` in.
+		"""
 		try:
 			logger.info(u"Executing: %s" % command)
 			proc = subprocess.Popen(command,
-				shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+				shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+				stdin=subprocess.PIPE if inputFile is not None else None,
+				cwd=workingDirectory
 			)
 
+			if inputFile is not None:
+				def feedInput():
+					try:
+						shutil.copyfileobj(inputFile, proc.stdin, 1024 * 1024)
+					except (IOError, OSError) as error:
+						# The exit code of the command tells what went wrong.
+						logger.debug(u"Stopped feeding input: %s" % error)
+					finally:
+						inputFile.close()
+						proc.stdin.close()
+
+				feeder = threading.Thread(target=feedInput)
+				feeder.daemon = True
+				feeder.start()
+
 			encoding = proc.stdout.encoding
 			if not encoding:
 				encoding = locale.getpreferredencoding()
@@ -136,6 +165,9 @@ class BaseArchive(object):
 					time.sleep(0.001)
 				ret = proc.poll()
 
+			if inputFile is not None:
+				feeder.join()
+
 			logger.info(u"Exit code: %s" % ret)
 
 			if ret != 0:
@@ -149,26 +181,36 @@ class BaseArchive(object):
 			logger.logException(e)
 			raise
 
-	def _create(self, fileList, baseDir, command):
-		curDir = os.path.abspath(os.getcwd())
+	def _create(self, fileList, baseDir, command, outputFile=None):
+		"""
+		Run `command` in `baseDir` and feed it the names from `fileList`.
+
+		:param outputFile: An open file that receives the output of \
+`command` at its current position.
+		"""
 		try:
 			baseDir = os.path.abspath(forceFilename(baseDir))
 			if not os.path.isdir(baseDir):
 				raise Exception(u"Base dir '%s' not found" % baseDir)
-			os.chdir(baseDir)
 
 			logger.info(u"Executing: %s" % command)
+			if outputFile is not None:
+				outputFile.flush()
+			# Not changing the working directory of this process allows
+			# creating several archives at once.
 			proc = subprocess.Popen(command,
-				shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-				stderr=subprocess.PIPE
+				shell=True, stdin=subprocess.PIPE,
+				stdout=outputFile or subprocess.PIPE,
+				stderr=subprocess.PIPE, cwd=baseDir
 			)
 
 			encoding = proc.stdin.encoding
 			if not encoding:
 				encoding = locale.getpreferredencoding()
 
-			flags = fcntl.fcntl(proc.stdout, fcntl.F_GETFL)
-			fcntl.fcntl(proc.stdout, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+			if proc.stdout:
+				flags = fcntl.fcntl(proc.stdout, fcntl.F_GETFL)
+				fcntl.fcntl(proc.stdout, fcntl.F_SETFL, flags | os.O_NONBLOCK)
 			flags = fcntl.fcntl(proc.stderr, fcntl.F_GETFL)
 			fcntl.fcntl(proc.stderr, fcntl.F_SETFL, flags | os.O_NONBLOCK)
 
@@ -181,7 +223,7 @@ class BaseArchive(object):
 			for filename in fileList:
 				if not filename:
 					continue
-				if not os.path.exists(filename):
+				if not os.path.exists(os.path.join(baseDir, filename)):
 					raise Exception(u"File '%s' not found" % filename)
 				# python 2.6:
 				if filename.startswith(baseDir):
@@ -193,7 +235,7 @@ class BaseArchive(object):
 				proc.stdin.write("%s\n" % filename.encode(encoding))
 
 				try:
-					chunk = proc.stdout.read()
+					chunk = proc.stdout and proc.stdout.read()
 					if chunk:
 						filesAdded = chunk.count('\n')
 						if filesAdded > 0:
@@ -218,7 +260,8 @@ class BaseArchive(object):
 			while ret is None:
 				ret = proc.poll()
 				try:
-					chunk = proc.stdout.read()
+					if proc.stdout:
+						proc.stdout.read()
 				except Exception:
 					pass
 
@@ -240,7 +283,9 @@ class BaseArchive(object):
 			if self._progressSubject:
 				self._progressSubject.setState(len(fileList))
 		finally:
-			os.chdir(curDir)
+			if outputFile is not None:
+				# The command wrote through its own descriptor.
+				outputFile.seek(0, os.SEEK_END)
 
 
 class PigzMixin(object):
@@ -300,7 +345,14 @@ class TarArchive(BaseArchive, PigzMixin):
 		except Exception as e:
 			raise Exception(u"Failed to get archive content '%s': %s" % (self._filename, e))
 
-	def extract(self, targetPath='.', patterns=[]):
+	def extract(self, targetPath='.', patterns=[], inputFile=None):
+		"""
+		Extract the archive to `targetPath`.
+
+		:param inputFile: Read the archive from this file object instead \
+of the archive file. The content of the archive is not listed \
+beforehand in this case.
+		"""
 		try:
 			targetPath = os.path.abspath(forceFilename(targetPath))
 			patterns = forceUnicodeList(patterns)
@@ -320,32 +372,43 @@ class TarArchive(BaseArchive, PigzMixin):
 				options += u'--bzip2'
 
 			fileCount = 0
-			for filename in self.content():
-				match = False
-				if not patterns:
-					match = True
-				else:
-					for pattern in patterns:
-						try:
-							pattern = pattern.replace('*', '.*')
-							if re.search(pattern, filename):
-								match = True
-								break
-							fileCount += 1
-						except Exception as e:
-							raise Exception(u"Bad pattern '%s': %s" % (pattern, e))
-
-				if match:
-					fileCount += 1
-				else:
-					options += u' --exclude="%s"' % filename
-
-			command = u'%s %s --directory "%s" --extract --verbose --file "%s"' % (System.which('tar'), options, targetPath, self._filename)
-			self._extract(command, fileCount)
+			archiveFile = u'-'
+			if inputFile is None:
+				archiveFile = u'"%s"' % self._filename
+				for filename in self.content():
+					match = False
+					if not patterns:
+						match = True
+					else:
+						for pattern in patterns:
+							try:
+								pattern = pattern.replace('*', '.*')
+								if re.search(pattern, filename):
+									match = True
+									break
+								fileCount += 1
+							except Exception as e:
+								raise Exception(u"Bad pattern '%s': %s" % (pattern, e))
+
+					if match:
+						fileCount += 1
+					else:
+						options += u' --exclude="%s"' % filename
+			elif patterns:
+				raise Exception(u"Patterns are not supported when reading from a file object")
+
+			command = u'%s %s --directory "%s" --extract --verbose --file %s' % (System.which('tar'), options, targetPath, archiveFile)
+			self._extract(command, fileCount, inputFile)
 		except Exception as e:
 			raise Exception(u"Failed to extract archive '%s': %s" % (self._filename, e))
 
-	def create(self, fileList, baseDir='.', dereference=False):
+	def create(self, fileList, baseDir='.', dereference=False, outputFile=None):
+		"""
+		Create the archive from the files in `fileList`.
+
+		:param outputFile: Write the archive to this open file at its \
+current position instead of to the file of the archive.
+		"""
 		try:
 			fileList = forceUnicodeList(fileList)
 			baseDir = os.path.abspath(forceFilename(baseDir))
@@ -364,9 +427,10 @@ class TarArchive(BaseArchive, PigzMixin):
 					command += ' | %s --rsyncable' % System.which('gzip')
 			elif self._compression == 'bzip2':
 				command += ' | %s' % System.which('bzip2')
-			command += ' > "%s"' % self._filename
+			if outputFile is None:
+				command += ' > "%s"' % self._filename
 
-			self._create(fileList, baseDir, command)
+			self._create(fileList, baseDir, command, outputFile)
 		except Exception as e:
 			raise Exception(u"Failed to create archive '%s': %s" % (self._filename, e))
 
@@ -395,7 +459,14 @@ class CpioArchive(BaseArchive, PigzMixin):
 		except Exception as e:
 			raise Exception(u"Failed to get archive content '%s': %s" % (self._filename, e))
 
-	def extract(self, targetPath='.', patterns=[]):
+	def extract(self, targetPath='.', patterns=[], inputFile=None):
+		"""
+		Extract the archive to `targetPath`.
+
+		:param inputFile: Read the archive from this file object instead \
+of the archive file. The content of the archive is not listed \
+beforehand in this case.
+		"""
 		try:
 			targetPath = os.path.abspath(forceFilename(targetPath))
 			patterns = forceUnicodeList(patterns)
@@ -415,36 +486,39 @@ class CpioArchive(BaseArchive, PigzMixin):
 				cat = System.which('bzcat')
 
 			fileCount = 0
-			for filename in self.content():
-				match = False
-				if not patterns:
-					match = True
-				else:
-					for pattern in patterns:
-						try:
-							pattern = pattern.replace('*', '.*')
-							if re.search(pattern, filename):
-								match = True
-								break
-							fileCount += 1
-						except Exception as e:
-							raise Exception(u"Bad pattern '%s': %s" % (pattern, e))
-				if match:
-					fileCount += 1
+			if inputFile is None:
+				cat = u'%s "%s"' % (cat, self._filename)
+				for filename in self.content():
+					match = False
+					if not patterns:
+						match = True
+					else:
+						for pattern in patterns:
+							try:
+								pattern = pattern.replace('*', '.*')
+								if re.search(pattern, filename):
+									match = True
+									break
+								fileCount += 1
+							except Exception as e:
+								raise Exception(u"Bad pattern '%s': %s" % (pattern, e))
+					if match:
+						fileCount += 1
 
 			include = ' '.join('"%s"' % pattern for pattern in patterns)
 
-			curDir = os.path.abspath(os.getcwd())
-			os.chdir(targetPath)
-			try:
-				command = u'%s "%s" | %s --quiet -idumv %s' % (cat, self._filename, System.which('cpio'), include)
-				self._extract(command, fileCount)
-			finally:
-				os.chdir(curDir)
+			command = u'%s | %s --quiet -idumv %s' % (cat, System.which('cpio'), include)
+			self._extract(command, fileCount, inputFile, workingDirectory=targetPath)
 		except Exception as e:
 			raise Exception(u"Failed to extract archive '%s': %s" % (self._filename, e))
 
-	def create(self, fileList, baseDir='.', dereference=False):
+	def create(self, fileList, baseDir='.', dereference=False, outputFile=None):
+		"""
+		Create the archive from the files in `fileList`.
+
+		:param outputFile: Write the archive to this open file at its \
+current position instead of to the file of the archive.
+		"""
 		try:
 			fileList = forceUnicodeList(fileList)
 			baseDir = os.path.abspath(forceFilename(baseDir))
@@ -463,13 +537,217 @@ class CpioArchive(BaseArchive, PigzMixin):
 					command += ' | %s --rsyncable' % System.which('gzip')
 			elif self._compression == 'bzip2':
 				command += ' | %s' % System.which('bzip2')
-			command += ' > "%s"' % self._filename
+			if outputFile is None:
+				command += ' > "%s"' % self._filename
 
-			self._create(fileList, baseDir, command)
+			self._create(fileList, baseDir, command, outputFile)
 		except Exception as e:
 			raise Exception(u"Failed to create archive '%s': %s" % (self._filename, e))
 
 
+class ArchiveStreamWriter(object):
+	"""
+	Writes an uncompressed tar or cpio archive member by member.
+
+	The size of a member does not have to be known in advance: the
+	header is written with a size of 0 and corrected once the data of
+	the member is complete. This allows commands to write the data of
+	a member directly into the archive.
+	"""
+
+	CPIO_MAX_SIZE = 0xFFFFFFFF
+
+	def __init__(self, filename, format=u'cpio'):
+		self._filename = forceFilename(filename)
+		format = forceUnicodeLower(format)
+		if format not in (u'cpio', u'tar'):
+			raise Exception(u"Unsupported format '%s'" % format)
+		self._format = format
+		self._inode = 0
+		self._file = open(self._filename, 'wb')
+
+	def getFilename(self):
+		return self._filename
+
+	def addMember(self, name, writeData):
+		"""
+		Add a member called `name` to the archive.
+
+		:param writeData: Called with the open archive file. Has to \
+append the data of the member to it.
+		"""
+		self._inode += 1
+		headerOffset = self._file.tell()
+		self._file.write(self._getHeader(name, 0))
+		dataOffset = self._file.tell()
+
+		writeData(self._file)
+
+		self._file.seek(0, os.SEEK_END)
+		size = self._file.tell() - dataOffset
+		if self._format == u'cpio' and size > self.CPIO_MAX_SIZE:
+			raise Exception(u"Member '%s' is too large for cpio format" % name)
+
+		self._file.write(b'\0' * self._getPadding(size))
+		self._file.seek(headerOffset)
+		self._file.write(self._getHeader(name, size))
+		self._file.seek(0, os.SEEK_END)
+
+	def addFile(self, name, filename):
+		"""
+		Add the content of the file `filename` as member `name`.
+		"""
+		def copyFile(archiveFile):
+			with open(filename, 'rb') as f:
+				shutil.copyfileobj(f, archiveFile, 1024 * 1024)
+
+		self.addMember(name, copyFile)
+
+	def close(self):
+		try:
+			if self._format == u'cpio':
+				self._inode = 0
+				self._file.write(self._getHeader(u'TRAILER!!!', 0, mode=0))
+				blockSize = 512
+			else:
+				self._file.write(b'\0' * (tarfile.BLOCKSIZE * 2))
+				blockSize = tarfile.RECORDSIZE
+
+			remainder = self._file.tell() % blockSize
+			if remainder:
+				self._file.write(b'\0' * (blockSize - remainder))
+		finally:
+			self._file.close()
+
+	def _getHeader(self, name, size, mode=0o100644):
+		name = name.encode('utf-8')
+		mtime = int(time.time())
+
+		if self._format == u'tar':
+			tarInfo = tarfile.TarInfo(name)
+			tarInfo.size = size
+			tarInfo.mtime = mtime
+			tarInfo.mode = mode & 0o7777
+			return tarInfo.tobuf(format=tarfile.GNU_FORMAT)
+
+		# cpio "newc" format
+		header = b'070701' + b''.join(b'%08X' % value for value in (
+			self._inode, mode, os.getuid(), os.getgid(), 1, mtime, size,
+			0, 0, 0, 0, len(name) + 1, 0
+		)) + name + b'\0'
+		return header + b'\0' * (-len(header) % 4)
+
+	def _getPadding(self, size):
+		if self._format == u'tar':
+			return -size % tarfile.BLOCKSIZE
+		return -size % 4
+
+
+class ArchiveMember(object):
+	"""
+	A regular file stored uncompressed in an archive.
+	"""
+
+	def __init__(self, archiveFilename, name, offset, size):
+		self.archiveFilename = archiveFilename
+		self.name = name
+		self.offset = offset
+		self.size = size
+
+	def __repr__(self):
+		return u"<ArchiveMember(%r, offset=%d, size=%d)>" % (self.name, self.offset, self.size)
+
+	def open(self):
+		"""
+		Open the data of the member for reading.
+
+		:returns: A file-like object with `read` and `close`.
+		"""
+		return _FileSection(self.archiveFilename, self.offset, self.size)
+
+
+class _FileSection(object):
+	def __init__(self, filename, offset, size):
+		self._file = open(filename, 'rb')
+		self._file.seek(offset)
+		self._remaining = size
+
+	def read(self, size=-1):
+		if size < 0 or size > self._remaining:
+			size = self._remaining
+		data = self._file.read(size)
+		self._remaining -= len(data)
+		return data
+
+	def close(self):
+		self._file.close()
+
+
+def getArchiveMembers(filename):
+	"""
+	Get the regular files stored in the uncompressed archive `filename`.
+
+	Only the headers of the archive are read. Archives in tar format \
+and in the ASCII cpio formats (newc, crc and odc) are supported.
+
+	:rtype: [ArchiveMember, ...]
+	:raises ValueError: If `filename` is no supported archive.
+	"""
+	filename = forceFilename(filename)
+	with open(filename, 'rb') as f:
+		magicNumber = f.read(6)
+
+	if magicNumber in (b'070701', b'070702', b'070707'):
+		return _getCpioMembers(filename)
+
+	try:
+		with closing(tarfile.open(filename, 'r:')) as archive:
+			return [
+				ArchiveMember(filename, forceUnicode(member.name), member.offset_data, member.size)
+				for member in archive.getmembers() if member.isfile()
+			]
+	except tarfile.TarError as error:
+		raise ValueError(u"Unsupported archive '%s': %s" % (filename, error))
+
+
+def _getCpioMembers(filename):
+	members = []
+	with open(filename, 'rb') as f:
+		while True:
+			headerOffset = f.tell()
+			magicNumber = f.read(6)
+			if magicNumber in (b'070701', b'070702'):
+				fields = f.read(104)
+				if len(fields) != 104:
+					raise ValueError(u"Truncated cpio archive '%s'" % filename)
+				mode = int(fields[8:16], 16)
+				size = int(fields[48:56], 16)
+				nameSize = int(fields[88:96], 16)
+				name = f.read(nameSize)[:-1]
+				f.seek(-(110 + nameSize) % 4, os.SEEK_CUR)
+				dataOffset = f.tell()
+				nextOffset = dataOffset + size + (-size % 4)
+			elif magicNumber == b'070707':
+				fields = f.read(70)
+				if len(fields) != 70:
+					raise ValueError(u"Truncated cpio archive '%s'" % filename)
+				mode = int(fields[12:18], 8)
+				nameSize = int(fields[53:59], 8)
+				size = int(fields[59:70], 8)
+				name = f.read(nameSize)[:-1]
+				dataOffset = f.tell()
+				nextOffset = dataOffset + size
+			else:
+				raise ValueError(u"No cpio header at offset %d of '%s'" % (headerOffset, filename))
+
+			if name == b'TRAILER!!!':
+				return members
+
+			if mode & 0o170000 == 0o100000:
+				members.append(ArchiveMember(filename, name.decode('utf-8', 'replace'), dataOffset, size))
+			f.seek(nextOffset)
+
+
 def Archive(filename, format=None, compression=None, progressSubject=None):
 	filename = forceFilename(filename)
 	Class = None
@@ -68,7 +68,7 @@ from OPSI.Types import (BackendBadValueError, OpsiBackupBackendNotFound,
 	forceProductVersion, forceRequirementType, forceUnicode, forceUnicodeList,
 	forceUnicodeLower)
 from OPSI.Util.File import ConfigFile, IniFile, TextFile, requiresParsing
-from OPSI.Util import md5sum, toJson, fromJson
+from OPSI.Util import ChecksumCache, toJson, fromJson
 
 __version__ = '4.0.7.1'
 
@@ -282,6 +282,7 @@ class PackageContentFile(TextFile):
 		self._clientDataFiles = []
 		self._productServerDataDir = u'/'
 		self._serverDataFiles = []
+		self._checksumCache = None
 
 	def getClientDataFiles(self):
 		return self._clientDataFiles
@@ -298,6 +299,14 @@ class PackageContentFile(TextFile):
 	def setProductClientDataDir(self, productClientDataDir):
 		self._productClientDataDir = forceFilename(productClientDataDir)
 
+	def setChecksumCache(self, checksumCache):
+		"""
+		Use `checksumCache` to look up the checksums of unchanged files.
+
+		:type checksumCache: OPSI.Util.ChecksumCache
+		"""
+		self._checksumCache = checksumCache
+
 	def parse(self, lines=None):
 		if lines:
 			self._lines = forceUnicodeList(lines)
@@ -342,13 +351,13 @@ class PackageContentFile(TextFile):
 		return fileInfo
 
 	def generate(self):
-		self._lines = []
+		entries = []
 		for filename in self._clientDataFiles:
 			try:
 				#if (filename == self.clientDataDir):
 				#	continue
 				type = u'f'
-				md5 = u''
+				checksumPath = u''
 				target = u''
 				size = 0
 				path = os.path.join(self._productClientDataDir, filename)
@@ -364,21 +373,39 @@ class PackageContentFile(TextFile):
 							# link target not in client data dir => treat as file
 							type = u'f'
 							size = os.path.getsize(target)
-							md5 = md5sum(target)
+							checksumPath = target
 							target = u''
 				elif os.path.isdir(path):
 					type = u'd'
 				else:
 					size = os.path.getsize(path)
-					md5 = md5sum(path)
+					checksumPath = path
 
-				if target:
-					self._lines.append("%s '%s' %s '%s'" % (type, filename.replace(u'\'', u'\\\''), size, target.replace(u'\'', u'\\\'')))
-				else:
-					self._lines.append("%s '%s' %s %s" % (type, filename.replace(u'\'', u'\\\''), size, md5))
+				entries.append((type, filename, size, target, checksumPath))
 			except Exception as error:
 				logger.logException(error)
 
+		checksumCache = self._checksumCache
+		if checksumCache is None:
+			checksumCache = ChecksumCache()
+		checksums = checksumCache.md5sums(
+			set(entry[4] for entry in entries if entry[4])
+		)
+
+		self._lines = []
+		for (type, filename, size, target, checksumPath) in entries:
+			md5 = u''
+			if checksumPath:
+				if checksumPath not in checksums:
+					# The checksum cache already logged why.
+					continue
+				md5 = checksums[checksumPath]
+
+			if target:
+				self._lines.append("%s '%s' %s '%s'" % (type, filename.replace(u'\'', u'\\\''), size, target.replace(u'\'', u'\\\'')))
+			else:
+				self._lines.append("%s '%s' %s %s" % (type, filename.replace(u'\'', u'\\\''), size, md5))
+
 		self.open('w')
 		self.writelines()
 		self.close()
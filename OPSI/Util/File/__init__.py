@@ -1612,12 +1612,12 @@ class DHCPDConf_Block(DHCPDConf_Component):
 		return blocks
 
 	def asText(self):
-		text = u''
+		text = []
 		shifting = self.getShifting()
 		if not isinstance(self, DHCPDConf_GlobalBlock):
-			text += shifting + u' '.join(self.settings) + u' {\n'
+			text.append(shifting + u' '.join(self.settings) + u' {\n')
 
-		notWritten = self.components
+		written = set()
 		lineNumber = self.startLine
 		if lineNumber < 1:
 			lineNumber = 1
@@ -1631,21 +1631,21 @@ class DHCPDConf_Block(DHCPDConf_Component):
 				compText = lineRef.asText()
 				if i > 0 and isinstance(lineRef, DHCPDConf_Comment):
 					compText = u' ' + compText.lstrip()
-				text += compText
+				text.append(compText)
 				# Mark component as written
-				if lineRef in notWritten:
-					notWritten.remove(lineRef)
-			text += u'\n'
+				written.add(id(lineRef))
+			text.append(u'\n')
 			lineNumber += 1
 
-		for component in notWritten:
-			text += component.asText() + u'\n'
+		for component in self.components:
+			if id(component) not in written:
+				text.append(component.asText() + u'\n')
 
 		if not isinstance(self, DHCPDConf_GlobalBlock):
 			# Write '}' to close block
-			text += shifting + u'}'
+			text.append(shifting + u'}')
 
-		return text
+		return u''.join(text)
 
 
 class DHCPDConf_GlobalBlock(DHCPDConf_Block):
@@ -1654,6 +1654,14 @@ class DHCPDConf_GlobalBlock(DHCPDConf_Block):
 
 
 class DHCPDConfFile(TextFile):
+	"""
+	The configuration file of the DHCPD.
+
+	The parsed block tree is kept in memory. :meth:`parseIfChanged` \
+parses the file only if it was changed on disk since the last \
+:meth:`parse` or :meth:`generate`, so many host changes can be \
+made and written at once.
+	"""
 
 	def __init__(self, filename, lockFailTimeout=2000):
 		TextFile.__init__(self, filename, lockFailTimeout)
@@ -1665,12 +1673,24 @@ class DHCPDConfFile(TextFile):
 		self._currentBlock = None
 		self._globalBlock = None
 		self._parsed = False
+		self._fileState = None
+		self._index = None
 
 		logger.debug(u"Parsing dhcpd conf file '%s'" % self._filename)
 
 	def getGlobalBlock(self):
+		# The caller may change the block tree.
+		self._index = None
 		return self._globalBlock
 
+	def _getFileState(self):
+		try:
+			stat = os.stat(self._filename)
+		except OSError:
+			return None
+
+		return (stat.st_mtime, stat.st_size, stat.st_ino)
+
 	def parse(self, lines=None):
 		self._currentLine = 0
 		self._currentToken = None
@@ -1678,10 +1698,14 @@ class DHCPDConfFile(TextFile):
 		self._data = u''
 		self._currentBlock = self._globalBlock = DHCPDConf_GlobalBlock()
 		self._parsed = False
+		self._fileState = None
+		self._index = None
 
 		if lines:
 			self._lines = forceUnicodeList(lines)
+			fileState = None
 		else:
+			fileState = self._getFileState()
 			self.readlines()
 		self._globalBlock.endLine = len(self._lines)
 
@@ -1717,14 +1741,109 @@ class DHCPDConfFile(TextFile):
 			elif self._currentToken == '}':
 				self._parse_rbracket()
 		self._parsed = True
+		self._fileState = fileState
+
+	def parseIfChanged(self):
+		"""
+		Parse the file if it was not parsed yet or if it was changed \
+on disk since it was parsed or generated.
+
+		:returns: True if the file was parsed.
+		:rtype: bool
+		"""
+		if self._parsed and self._fileState is not None and self._fileState == self._getFileState():
+			return False
+
+		self.parse()
+		return True
 
 	def generate(self):
 		if not self._globalBlock:
 			raise Exception(u"Got no data to write")
 
+		# If writing fails the file has to be parsed again.
+		self._fileState = None
 		self.open('w')
 		self.write(self._globalBlock.asText())
 		self.close()
+		self._fileState = self._getFileState()
+
+	def _getIndex(self):
+		"""
+		Returns the index of the block tree.
+
+		Hosts are indexed by their lowercase name, fixed address and \
+hardware parameter. Subnets, groups and the parameters of blocks \
+are kept because they are not changed by adding or removing hosts.
+		"""
+		if self._index is None:
+			self._index = {
+				'hosts': {},
+				'fixed-address': {},
+				'hardware': {},
+				'subnets': [],
+				'groups': {},
+				'parameters': {},
+			}
+
+			def indexBlocks(parentBlock):
+				for block in parentBlock.components:
+					if not isinstance(block, DHCPDConf_Block):
+						continue
+
+					if block.type == 'host':
+						self._addHostToIndex(block)
+					elif block.type == 'subnet':
+						self._index['subnets'].append(block)
+					elif block.type == 'group':
+						self._index['groups'].setdefault(parentBlock, []).append(block)
+					indexBlocks(block)
+
+			indexBlocks(self._globalBlock)
+
+		return self._index
+
+	def _getIndexedParameters(self, block):
+		for (key, value) in block.getParameters_hash().items():
+			if key in ('fixed-address', 'hardware') and isinstance(value, (unicode, str)):
+				yield (key, value.lower())
+
+	def _addHostToIndex(self, block):
+		index = self._getIndex()
+		index['hosts'].setdefault(block.settings[1].lower(), []).append(block)
+		for (key, value) in self._getIndexedParameters(block):
+			index[key].setdefault(value, []).append(block)
+
+	def _removeHostFromIndex(self, block):
+		def removeBlock(blocksByKey, key):
+			blocks = [b for b in blocksByKey.get(key, []) if b is not block]
+			if blocks:
+				blocksByKey[key] = blocks
+			else:
+				blocksByKey.pop(key, None)
+
+		index = self._getIndex()
+		removeBlock(index['hosts'], block.settings[1].lower())
+		for (key, value) in self._getIndexedParameters(block):
+			removeBlock(index[key], value)
+
+	def _getInheritedParameters(self, block):
+		parameters = self._getIndex()['parameters']
+		if block not in parameters:
+			parameters[block] = block.getParameters_hash(inherit='global')
+		return parameters[block]
+
+	def _getHostBlocks(self, hostname):
+		"""
+		Returns the blocks of the host `hostname` and the blocks \
+using `hostname` as fixed address.
+		"""
+		index = self._getIndex()
+		hostBlocks = [block for block in index['hosts'].get(hostname, []) if block.settings[1] == hostname]
+		for block in index['fixed-address'].get(hostname, []):
+			if block.settings[1] != hostname and block.getParameters_hash().get('fixed-address') == hostname:
+				hostBlocks.append(block)
+		return hostBlocks
 
 	@requiresParsing
 	def addHost(self, hostname, hardwareAddress, ipAddress, fixedAddress, parameters=None):
@@ -1737,18 +1856,15 @@ class DHCPDConfFile(TextFile):
 		fixedAddress = forceUnicodeLower(fixedAddress)
 		parameters = forceDict(parameters)
 
-		existingHost = None
-		for block in self._globalBlock.getBlocks('host', recursive=True):
-			if block.settings[1].lower() == hostname:
-				existingHost = block
-			else:
-				for (key, value) in block.getParameters_hash().items():
-					if key == 'fixed-address' and value.lower() == fixedAddress:
-						raise BackendBadValueError(u"Host '%s' uses the same fixed address" % block.settings[1])
-					elif key == 'hardware' and value.lower() == 'ethernet %s' % hardwareAddress:
-						raise BackendBadValueError(u"Host '%s' uses the same hardware ethernet address" % block.settings[1])
+		index = self._getIndex()
+		for block in index['fixed-address'].get(fixedAddress, []):
+			if block.settings[1].lower() != hostname:
+				raise BackendBadValueError(u"Host '%s' uses the same fixed address" % block.settings[1])
+		for block in index['hardware'].get(u'ethernet %s' % hardwareAddress, []):
+			if block.settings[1].lower() != hostname:
+				raise BackendBadValueError(u"Host '%s' uses the same hardware ethernet address" % block.settings[1])
 
-		if existingHost:
+		if hostname in index['hosts']:
 			logger.info(u"Host '%s' already exists in config file '%s', deleting first" % (hostname, self._filename))
 			self.deleteHost(hostname)
 
@@ -1762,7 +1878,7 @@ class DHCPDConfFile(TextFile):
 		parentBlock = self._globalBlock
 
 		# Search the right subnet block
-		for block in self._globalBlock.getBlocks('subnet', recursive=True):
+		for block in index['subnets']:
 			if ipAddressInNetwork(ipAddress, u'%s/%s' % (block.settings[1], block.settings[3])):
 				logger.debug(u"Choosing subnet %s/%s for host %s" % (block.settings[1], block.settings[3], hostname))
 				parentBlock = block
@@ -1770,9 +1886,9 @@ class DHCPDConfFile(TextFile):
 		# Search the right group for the host
 		bestGroup = None
 		bestMatchCount = 0
-		for block in parentBlock.getBlocks('group'):
+		for block in index['groups'].get(parentBlock, []):
 			matchCount = 0
-			blockParameters = block.getParameters_hash(inherit='global')
+			blockParameters = self._getInheritedParameters(block)
 			if blockParameters:
 				# Block has parameters set, check if they match the hosts parameters
 				for (key, value) in blockParameters.items():
@@ -1792,7 +1908,7 @@ class DHCPDConfFile(TextFile):
 			parentBlock = bestGroup
 
 		# Remove parameters which are already defined in parents
-		blockParameters = parentBlock.getParameters_hash(inherit='global')
+		blockParameters = self._getInheritedParameters(parentBlock)
 		if blockParameters:
 			for (key, value) in blockParameters.items():
 				if key in parameters and parameters[key] == value:
@@ -1811,12 +1927,13 @@ class DHCPDConfFile(TextFile):
 				DHCPDConf_Parameter(startLine=-1, parentBlock=hostBlock, key=key, value=value))
 
 		parentBlock.addComponent(hostBlock)
+		self._addHostToIndex(hostBlock)
 
 	@requiresParsing
 	def getHost(self, hostname):
 		hostname = forceHostname(hostname)
 
-		for block in self._globalBlock.getBlocks('host', recursive=True):
+		for block in self._getIndex()['hosts'].get(hostname, []):
 			if block.settings[1] == hostname:
 				return block.getParameters_hash()
 		return None
@@ -1826,20 +1943,13 @@ class DHCPDConfFile(TextFile):
 		hostname = forceHostname(hostname)
 
 		logger.notice(u"Deleting host '%s' from dhcpd config file '%s'" % (hostname, self._filename))
-		hostBlocks = []
-		for block in self._globalBlock.getBlocks('host', recursive=True):
-			if block.settings[1] == hostname:
-				hostBlocks.append(block)
-			else:
-				for (key, value) in block.getParameters_hash().items():
-					if key == 'fixed-address' and value == hostname:
-						hostBlocks.append(block)
-
+		hostBlocks = self._getHostBlocks(hostname)
 		if not hostBlocks:
 			logger.warning(u"Failed to remove host '%s': not found" % hostname)
 			return
 
 		for block in hostBlocks:
+			self._removeHostFromIndex(block)
 			block.parentBlock.removeComponent(block)
 
 	@requiresParsing
@@ -1847,29 +1957,24 @@ class DHCPDConfFile(TextFile):
 		hostname = forceHostname(hostname)
 		parameters = forceDict(parameters)
 
-		logger.notice(u"Modifying host '%s' in dhcpd config file '%s'" % (hostname, self.filename))
+		logger.notice(u"Modifying host '%s' in dhcpd config file '%s'" % (hostname, self._filename))
 
-		hostBlocks = []
-		for block in self._globalBlock.getBlocks('host', recursive=True):
-			if block.settings[1] == hostname:
-				hostBlocks.append(block)
-			else:
-				for (key, value) in block.getParameters_hash().items():
-					if key == 'fixed-address' and value == hostname:
-						hostBlocks.append(block)
-					elif key == 'hardware' and value.lower() == parameters.get('hardware'):
-						raise BackendBadValueError(u"Host '%s' uses the same hardware ethernet address" % block.settings[1])
+		hostBlocks = self._getHostBlocks(hostname)
+		for block in self._getIndex()['hardware'].get(parameters.get('hardware'), []):
+			if block not in hostBlocks:
+				raise BackendBadValueError(u"Host '%s' uses the same hardware ethernet address" % block.settings[1])
 
 		if len(hostBlocks) != 1:
 			raise BackendBadValueError(u"Host '%s' found %d times" % (hostname, len(hostBlocks)))
 
 		hostBlock = hostBlocks[0]
+		self._removeHostFromIndex(hostBlock)
 		hostBlock.removeComponents()
 
 		for (key, value) in parameters.items():
 			parameters[key] = DHCPDConf_Parameter(-1, None, key, value).asHash()[key]
 
-		for (key, value) in hostBlock.parentBlock.getParameters_hash(inherit='global').items():
+		for (key, value) in self._getInheritedParameters(hostBlock.parentBlock).items():
 			if key not in parameters:
 				continue
 
@@ -1880,6 +1985,7 @@ class DHCPDConfFile(TextFile):
 			hostBlock.addComponent(
 				DHCPDConf_Parameter(startLine=-1, parentBlock=hostBlock, key=key, value=value)
 			)
+		self._addHostToIndex(hostBlock)
 
 	def _getNewData(self):
 		if self._currentLine >= len(self._lines):
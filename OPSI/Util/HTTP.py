@@ -39,6 +39,7 @@ import gzip
 import os
 import random
 import re
+import select
 import socket
 import time
 import zlib
@@ -442,7 +443,9 @@ class HTTPConnectionPool(object):
 			Custom headers to send (such as User-Agent, If-None-Match, etc.)
 
 		retry
-			Retry on connection failure in between self.retryTime seconds
+			Retry on connection failure in between self.retryTime seconds.
+			Without retry a request that failed on a kept alive connection
+			is only sent again if nothing was sent before the failure.
 
 		redirect
 			Automatically handle redirects (status codes 301, 302, 303, 307),
@@ -453,6 +456,8 @@ class HTTPConnectionPool(object):
 			firstTryTime = now
 
 		conn = None
+		reusedConnection = False
+		requestSent = False
 		if assert_same_host and not self.is_same_host(url):
 			host = "%s://%s" % (self.scheme, self.host)
 			if self.port:
@@ -461,6 +466,15 @@ class HTTPConnectionPool(object):
 
 		try:
 			conn = self._get_conn()
+			# A connection kept alive may have been closed by the server
+			# while it was waiting in the pool.
+			reusedConnection = getattr(conn, 'reused', False)
+			if reusedConnection and isConnectionDropped(conn):
+				logger.debug(u"Kept alive connection to {0!r} was closed, opening a new one", self.host)
+				closeConnection(conn)
+				self.num_connections -= 1
+				conn = self._new_conn()
+				reusedConnection = False
 
 			if self.httplibDebugLevel:
 				conn.set_debuglevel(self.httplibDebugLevel)
@@ -490,6 +504,7 @@ class HTTPConnectionPool(object):
 					randomKey = None
 
 			logger.debug2("Handing data to connection...")
+			requestSent = True
 			conn.request(method, url, body=body, headers=headers)
 			if self.socketTimeout:
 				conn.sock.settimeout(self.socketTimeout)
@@ -528,6 +543,7 @@ class HTTPConnectionPool(object):
 
 			# Put the connection back to be reused
 			if self.reuseConnection:
+				conn.reused = True
 				self._put_conn(conn)
 			else:
 				logger.debug(u"Closing connection: {0}", conn)
@@ -555,6 +571,12 @@ class HTTPConnectionPool(object):
 			self._put_conn(None)
 			closeConnection(conn)
 
+			# Without retry a request that may have reached the server
+			# must not be sent again.
+			if reusedConnection and (retry or not requestSent) and not isinstance(error, (SocketTimeout, Empty)):
+				logger.debug(u"Reused connection to {0!r} failed, retrying with a new connection", self.host)
+				return self.urlopen(method, url, body, headers, retry, redirect, assert_same_host, firstTryTime)
+
 			if retry and (now - firstTryTime < self.retryTime):
 				logger.debug(u"Request to {0!r} failed: {1}", self.host, forceUnicode(error))
 				logger.debug(u"Waiting before retry...")
@@ -708,6 +730,8 @@ def getSharedConnectionPool(scheme, host, port, **kw):
 		maxsize = kw.get('maxsize', 0)
 		if maxsize > connectionPools[poolKey].maxsize:
 			connectionPools[poolKey].adjustSize(maxsize)
+		if kw.get('reuseConnection'):
+			connectionPools[poolKey].reuseConnection = True
 
 	return connectionPools[poolKey]
 
@@ -726,6 +750,16 @@ def deflateEncode(data, level=1):
 	return zlib.compress(data, level)
 
 
+def deflateEncodeStream(chunks, level=1, chunkSize=65536):
+	"""
+	Compresses the byte strings from `chunks` like `deflateEncode`.
+
+	:returns: Chunks of compressed data of about `chunkSize` bytes.
+	:returntype: generator of str
+	"""
+	return _compressStream(chunks, zlib.compressobj(level), chunkSize)
+
+
 def deflateDecode(data):
 	return forceUnicode(zlib.decompress(data))
 
@@ -741,6 +775,36 @@ def gzipEncode(data, level=1):
 	return inmemoryFile.getvalue()
 
 
+def gzipEncodeStream(chunks, level=1, chunkSize=65536):
+	"""
+	Compresses the byte strings from `chunks` in the gzip format.
+
+	:returns: Chunks of compressed data of about `chunkSize` bytes.
+	:returntype: generator of str
+	"""
+	compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+	return _compressStream(chunks, compressor, chunkSize)
+
+
+def _compressStream(chunks, compressor, chunkSize):
+	buffered = []
+	bufferedSize = 0
+	for chunk in chunks:
+		data = compressor.compress(chunk)
+		if not data:
+			continue
+
+		buffered.append(data)
+		bufferedSize += len(data)
+		if bufferedSize >= chunkSize:
+			yield ''.join(buffered)
+			buffered = []
+			bufferedSize = 0
+
+	buffered.append(compressor.flush())
+	yield ''.join(buffered)
+
+
 def gzipDecode(data):
 	with closing(gzip.GzipFile(fileobj=StringIO(data), mode="r")) as gzipfile:
 		uncompressedData = gzipfile.read()
@@ -757,6 +821,25 @@ def closingConnection(connection):
 		closeConnection(connection)
 
 
+def isConnectionDropped(connection):
+	"""
+	Check if a connection kept alive can not be used anymore.
+
+	An idle connection must not be readable. If it is, the server has \
+closed it or sent data nobody asked for.
+	"""
+	sock = getattr(connection, 'sock', None)
+	if sock is None:
+		return True
+
+	try:
+		(readable, _, _) = select.select([sock], [], [], 0.0)
+	except (select.error, socket.error, ValueError):
+		return True
+
+	return bool(readable)
+
+
 def closeConnection(connection):
 	"Close the given connection and any socket that may be open on it."
 	try:
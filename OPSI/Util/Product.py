@@ -28,11 +28,12 @@ Products.
 import os
 import re
 import shutil
+import threading
 
 from OPSI.Logger import Logger, LOG_INFO, LOG_ERROR
 from OPSI.Util.File.Opsi import PackageControlFile, PackageContentFile
-from OPSI.Util.File.Archive import Archive
-from OPSI.Util import randomString, findFiles, removeDirectory
+from OPSI.Util.File.Archive import Archive, ArchiveStreamWriter, getArchiveMembers
+from OPSI.Util import ChecksumCache, randomString, findFiles, removeDirectory
 from OPSI.System import execute
 from OPSI.Types import (forceBool, forceFilename, forcePackageCustomName,
 	forceUnicode)
@@ -54,6 +55,8 @@ DEFAULT_CLIENT_DATA_USER = u'opsiconfd'
 EXCLUDE_DIRS_ON_PACK = u'(^\.svn$)|(^\.git$)'
 EXCLUDE_FILES_ON_PACK = u'~$'
 PACKAGE_SCRIPT_TIMEOUT = 600
+# Checksums of the client data files, one file per product.
+CHECKSUM_CACHE_DIR = u'/var/lib/opsi/checksums'
 
 logger = Logger()
 
@@ -64,7 +67,7 @@ def _(string):
 
 class ProductPackageFile(object):
 
-	def __init__(self, packageFile, tempDir=None):
+	def __init__(self, packageFile, tempDir=None, checksumCacheDir=None):
 		self.packageFile = os.path.abspath(forceFilename(packageFile))
 		if not os.path.exists(self.packageFile):
 			raise Exception(u"Package file '%s' not found" % self.packageFile)
@@ -76,10 +79,15 @@ class ProductPackageFile(object):
 		if not os.path.isdir(self.tempDir):
 			raise Exception(u"Temporary directory '%s' not found" % self.tempDir)
 
+		if not checksumCacheDir:
+			checksumCacheDir = CHECKSUM_CACHE_DIR
+		self.checksumCacheDir = os.path.abspath(forceFilename(checksumCacheDir))
+
 		self.clientDataDir = None
 		self.tmpUnpackDir = os.path.join(self.tempDir, u'.opsi.unpack.%s' % randomString(5))
 		self.packageControlFile = None
 		self.clientDataFiles = []
+		self._packageMembers = None
 
 	def cleanup(self):
 		logger.info(u"Cleaning up")
@@ -120,6 +128,45 @@ class ProductPackageFile(object):
 				logger.info("Deleting client data dir '%s'" % clientDataDir)
 				removeDirectory(clientDataDir)
 
+	def _getPackageMembers(self):
+		"""
+		Get the archives in the package file.
+
+		Knowing where the archives are stored allows to extract them
+		directly from the package file.
+
+		Names are normalized so that archives stored as \
+`./CLIENT_DATA.tar.gz` are found as `CLIENT_DATA.tar.gz`.
+
+		:returns: The members by name or `None` if the package file \
+can not be read this way.
+		:rtype: dict
+		"""
+		if self._packageMembers is None:
+			try:
+				self._packageMembers = dict(
+					(os.path.normpath(member.name), member)
+					for member in getArchiveMembers(self.packageFile)
+				)
+			except (ValueError, IOError) as error:
+				logger.info(u"Not reading archives directly from package '{0}': {1}", self.packageFile, error)
+				self._packageMembers = False
+
+		return self._packageMembers or None
+
+	def _extractPackageMember(self, member, targetPath):
+		match = re.search('\.(cpio|tar)(\.gz|\.bz2)?$', member.name)
+		if not match:
+			raise Exception(u"Unknown archive format of '%s'" % member.name)
+
+		compression = {u'.gz': u'gzip', u'.bz2': u'bzip2'}.get(match.group(2))
+		archive = Archive(
+			os.path.join(self.packageFile, member.name),
+			format=match.group(1),
+			compression=compression
+		)
+		archive.extract(targetPath=targetPath, inputFile=member.open())
+
 	def install(self, clientDataDir):
 		self.setClientDataDir(clientDataDir)
 		self.getMetaData()
@@ -201,13 +248,18 @@ class ProductPackageFile(object):
 				os.chmod(self.tmpUnpackDir, 0o700)
 
 			metaDataTmpDir = os.path.join(self.tmpUnpackDir, u'OPSI')
-			archive = Archive(self.packageFile)
+			packageMembers = self._getPackageMembers()
+			if packageMembers is None:
+				archive = Archive(self.packageFile)
 
-			logger.debug(u"Extracting meta data from package '%s' to: '%s'" % (self.packageFile, metaDataTmpDir))
-			archive.extract(targetPath=metaDataTmpDir, patterns=[u"OPSI*"])
+				logger.debug(u"Extracting meta data from package '%s' to: '%s'" % (self.packageFile, metaDataTmpDir))
+				archive.extract(targetPath=metaDataTmpDir, patterns=[u"OPSI*"])
+				archiveNames = os.listdir(metaDataTmpDir)
+			else:
+				archiveNames = [name for name in packageMembers if name.startswith(u'OPSI')]
 
 			metadataArchives = []
-			for f in os.listdir(metaDataTmpDir):
+			for f in archiveNames:
 				if not f.endswith(u'.cpio.gz') and not f.endswith(u'.tar.gz') and not f.endswith(u'.cpio') and not f.endswith(u'.tar'):
 					logger.warning(u"Unknown content in archive: %s" % f)
 					continue
@@ -222,8 +274,11 @@ class ProductPackageFile(object):
 			metadataArchives.sort()
 
 			for metadataArchive in metadataArchives:
-				archive = Archive(os.path.join(metaDataTmpDir, metadataArchive))
-				archive.extract(targetPath=metaDataTmpDir)
+				if packageMembers is None:
+					archive = Archive(os.path.join(metaDataTmpDir, metadataArchive))
+					archive.extract(targetPath=metaDataTmpDir)
+				else:
+					self._extractPackageMember(packageMembers[metadataArchive], metaDataTmpDir)
 
 			packageControlFile = os.path.join(metaDataTmpDir, u'control')
 			if not os.path.exists(packageControlFile):
@@ -250,14 +305,19 @@ class ProductPackageFile(object):
 
 			self.clientDataFiles = []
 
-			archive = Archive(self.packageFile)
+			packageMembers = self._getPackageMembers()
+			if packageMembers is None:
+				archive = Archive(self.packageFile)
 
-			logger.info(u"Extracting data from package '%s' to: '%s'" % (self.packageFile, self.tmpUnpackDir))
-			archive.extract(targetPath=self.tmpUnpackDir, patterns=[u"CLIENT_DATA*", u"SERVER_DATA*"])
+				logger.info(u"Extracting data from package '%s' to: '%s'" % (self.packageFile, self.tmpUnpackDir))
+				archive.extract(targetPath=self.tmpUnpackDir, patterns=[u"CLIENT_DATA*", u"SERVER_DATA*"])
+				archiveNames = os.listdir(self.tmpUnpackDir)
+			else:
+				archiveNames = list(packageMembers)
 
 			clientDataArchives = []
 			serverDataArchives = []
-			for f in os.listdir(self.tmpUnpackDir):
+			for f in archiveNames:
 				if f.startswith('OPSI'):
 					continue
 
@@ -286,22 +346,40 @@ class ProductPackageFile(object):
 			clientDataArchives = sorted(clientDataArchives, key=psort)
 			serverDataArchives = sorted(serverDataArchives, key=psort)
 
-			for serverDataArchive in serverDataArchives:
-				archiveFile = os.path.join(self.tmpUnpackDir, serverDataArchive)
-				logger.info(u"Extracting server-data archive '%s' to '/'" % archiveFile)
-				archive = Archive(archiveFile)
-				archive.extract(targetPath=u'/')
+			def extractArchives(archives, targetPath):
+				for archiveName in archives:
+					logger.info(u"Extracting archive '%s' to '%s'" % (archiveName, targetPath))
+					if packageMembers is None:
+						archive = Archive(os.path.join(self.tmpUnpackDir, archiveName))
+						archive.extract(targetPath=targetPath)
+					else:
+						self._extractPackageMember(packageMembers[archiveName], targetPath)
 
 			productClientDataDir = self.getProductClientDataDir()
 			if not os.path.exists(productClientDataDir):
 				os.mkdir(productClientDataDir)
 				os.chmod(productClientDataDir, 0o2770)
 
-			for clientDataArchive in clientDataArchives:
-				archiveFile = os.path.join(self.tmpUnpackDir, clientDataArchive)
-				logger.info(u"Extracting client-data archive '%s' to '%s'" % (archiveFile, productClientDataDir))
-				archive = Archive(archiveFile)
-				archive.extract(targetPath=productClientDataDir)
+			# Server and client data have different targets and are
+			# extracted at the same time.
+			serverDataErrors = []
+
+			def extractServerData():
+				try:
+					extractArchives(serverDataArchives, u'/')
+				except Exception as error:
+					serverDataErrors.append(error)
+
+			serverDataThread = threading.Thread(target=extractServerData)
+			serverDataThread.daemon = True
+			serverDataThread.start()
+			try:
+				extractArchives(clientDataArchives, productClientDataDir)
+			finally:
+				serverDataThread.join()
+
+			if serverDataErrors:
+				raise serverDataErrors[0]
 
 			logger.debug(u"Finished extracting data from package")
 		except Exception as e:
@@ -386,13 +464,26 @@ class ProductPackageFile(object):
 			packageContentFilename = productId + u'.files'
 			packageContentFile = os.path.join(productClientDataDir, packageContentFilename)
 
+			checksumCache = self._getChecksumCache(productId, productClientDataDir)
+
 			packageContentFile = PackageContentFile(packageContentFile)
 			packageContentFile.setProductClientDataDir(productClientDataDir)
+			packageContentFile.setChecksumCache(checksumCache)
 			cdf = self.getClientDataFiles()
 			if packageContentFilename in cdf:
 				cdf.remove(packageContentFilename)
 			packageContentFile.setClientDataFiles(self.getClientDataFiles())
 			packageContentFile.generate()
+
+			checksumCache.retain(
+				os.path.join(productClientDataDir, filename)
+				for filename in self.clientDataFiles
+			)
+			try:
+				checksumCache.save()
+			except Exception as error:
+				logger.warning(u"Failed to save checksums of product '%s': %s" % (productId, error))
+
 			if packageContentFilename not in self.clientDataFiles:
 				self.clientDataFiles.append(packageContentFilename)
 			logger.debug(u"Finished creating package content file")
@@ -401,6 +492,35 @@ class ProductPackageFile(object):
 			self.cleanup()
 			raise Exception(u"Failed to create package content file of package '%s': %s" % (self.packageFile, e))
 
+	def _getChecksumCache(self, productId, productClientDataDir):
+		"""
+		Get the checksums of the client data files of a product.
+
+		The checksums are kept outside of the product client data dir \
+so they survive deleting the dir on a reinstallation. They are only \
+used for files extracted from the same package file again.
+		"""
+		product = self.packageControlFile.getProduct()
+		packageStat = os.stat(self.packageFile)
+		origin = u'%s-%s:%d:%d:%r:%r' % (
+			product.getProductVersion(), product.getPackageVersion(),
+			packageStat.st_ino, packageStat.st_size,
+			packageStat.st_mtime, packageStat.st_ctime
+		)
+
+		try:
+			if not os.path.isdir(self.checksumCacheDir):
+				os.makedirs(self.checksumCacheDir)
+
+			return ChecksumCache(
+				os.path.join(self.checksumCacheDir, productId + u'.json'),
+				baseDir=productClientDataDir,
+				origin=origin
+			)
+		except Exception as error:
+			logger.warning(u"Failed to load checksums of product '%s': %s" % (productId, error))
+			return ChecksumCache(baseDir=productClientDataDir, origin=origin)
+
 	def _runPackageScript(self, scriptName, env={}):
 		logger.notice(u"Running package script '%s'" % scriptName)
 		try:
@@ -514,7 +634,6 @@ class ProductPackageSource(object):
 		os.mkdir(self.tmpPackDir)
 
 		try:
-			archives = []
 			diskusage = 0
 			dirs = [u'CLIENT_DATA', u'SERVER_DATA', u'OPSI']
 
@@ -531,24 +650,9 @@ class ProductPackageSource(object):
 				if not found:
 					raise Exception(u"No custom dirs found for '%s'" % self.customName)
 
-			# Try to define diskusage from Sourcedirectory to prevent a override from cpio sizelimit.
-			for d in dirs:
-				if not os.path.exists(os.path.join(self.packageSourceDir, d)) and d != u'OPSI':
-					logger.info(u"Directory '%s' does not exist" % os.path.join(self.packageSourceDir, d))
-					continue
-				fileList = findFiles(
-					os.path.join(self.packageSourceDir, d),
-					excludeDir=EXCLUDE_DIRS_ON_PACK,
-					excludeFile=EXCLUDE_FILES_ON_PACK,
-					followLinks=self.dereference)
-				if fileList:
-					for f in fileList:
-						diskusage = diskusage + os.path.getsize(os.path.join(self.packageSourceDir, d, f))
-
-			if diskusage >= 2147483648:
-				logger.info(u"Switching to tar format, because sourcefiles overrides cpio sizelimit.")
-				self.format = u'tar'
-
+			# Every directory is walked once, the file lists are used both
+			# for the disk usage and for the archives.
+			fileLists = []
 			for d in dirs:
 				if not os.path.exists(os.path.join(self.packageSourceDir, d)) and d != u'OPSI':
 					logger.info(u"Directory '%s' does not exist" % os.path.join(self.packageSourceDir, d))
@@ -560,6 +664,12 @@ class ProductPackageSource(object):
 					excludeFile=EXCLUDE_FILES_ON_PACK,
 					followLinks=self.dereference)
 
+				# Try to define diskusage from Sourcedirectory to prevent a override from cpio sizelimit.
+				dirDiskusage = 0
+				for f in fileList:
+					dirDiskusage += os.path.getsize(os.path.join(self.packageSourceDir, d, f))
+				diskusage += dirDiskusage
+
 				if d.startswith(u'SERVER_DATA'):
 					# Never change permissions of existing directories in /
 					tmp = []
@@ -575,23 +685,100 @@ class ProductPackageSource(object):
 					logger.notice(u"Skipping empty dir '%s'" % os.path.join(self.packageSourceDir, d))
 					continue
 
-				filename = os.path.join(self.tmpPackDir, u'%s.%s' % (d, self.format))
-				if self.compression == 'gzip':
-					filename += u'.gz'
-				elif self.compression == 'bzip2':
-					filename += u'.bz2'
-				archive = Archive(filename, format=self.format, compression=self.compression, progressSubject=progressSubject)
-				if progressSubject:
-					progressSubject.reset()
-					progressSubject.setMessage(u'Creating archive %s' % os.path.basename(archive.getFilename()))
-				archive.create(fileList=fileList, baseDir=os.path.join(self.packageSourceDir, d), dereference=self.dereference)
-				archives.append(filename)
+				fileLists.append((d, fileList, dirDiskusage))
 
-			archive = Archive(self.packageFile, format=self.format, compression=None, progressSubject=progressSubject)
-			if progressSubject:
-				progressSubject.reset()
-				progressSubject.setMessage(u'Creating archive %s' % os.path.basename(archive.getFilename()))
-			archive.create(fileList=archives, baseDir=self.tmpPackDir)
+			if diskusage >= 2147483648:
+				logger.info(u"Switching to tar format, because sourcefiles overrides cpio sizelimit.")
+				self.format = u'tar'
+
+			self._createPackageFile(fileLists, progressSubject)
 		except Exception as e:
 			self.cleanup()
 			raise Exception(u"Failed to create package '%s': %s" % (self.packageFile, e))
+
+	def _getArchiveName(self, directory):
+		name = u'%s.%s' % (directory, self.format)
+		if self.compression == 'gzip':
+			name += u'.gz'
+		elif self.compression == 'bzip2':
+			name += u'.bz2'
+		return name
+
+	def _createPackageFile(self, fileLists, progressSubject=None):
+		"""
+		Create the package file from the archives of the directories.
+
+		The archive of the largest directory is written directly into
+		the package file. The other archives are created in the
+		temporary directory at the same time and appended afterwards.
+		"""
+		archiveErrors = {}
+
+		def createArchive(directory, fileList):
+			try:
+				archive = Archive(
+					os.path.join(self.tmpPackDir, self._getArchiveName(directory)),
+					format=self.format,
+					compression=self.compression
+				)
+				archive.create(
+					fileList=fileList,
+					baseDir=os.path.join(self.packageSourceDir, directory),
+					dereference=self.dereference
+				)
+			except Exception as error:
+				archiveErrors[directory] = error
+
+		streamed = None
+		if fileLists:
+			streamed = max(fileLists, key=lambda entry: entry[2])
+
+		threads = []
+		for (directory, fileList, _) in fileLists:
+			if directory == streamed[0]:
+				continue
+			thread = threading.Thread(target=createArchive, args=(directory, fileList))
+			thread.daemon = True
+			thread.start()
+			threads.append((directory, thread))
+
+		packageFile = ArchiveStreamWriter(self.packageFile, format=self.format)
+		try:
+			if streamed:
+				(directory, fileList, _) = streamed
+				archiveName = self._getArchiveName(directory)
+				archive = Archive(
+					os.path.join(self.tmpPackDir, archiveName),
+					format=self.format,
+					compression=self.compression,
+					progressSubject=progressSubject
+				)
+				if progressSubject:
+					progressSubject.reset()
+					progressSubject.setMessage(u'Creating archive %s' % archiveName)
+
+				packageFile.addMember(
+					archiveName,
+					lambda outputFile: archive.create(
+						fileList=fileList,
+						baseDir=os.path.join(self.packageSourceDir, directory),
+						dereference=self.dereference,
+						outputFile=outputFile
+					)
+				)
+
+			for (directory, thread) in threads:
+				thread.join()
+				if directory in archiveErrors:
+					raise archiveErrors[directory]
+
+				archiveName = self._getArchiveName(directory)
+				packageFile.addFile(archiveName, os.path.join(self.tmpPackDir, archiveName))
+		except Exception:
+			for (_, thread) in threads:
+				thread.join()
+			packageFile.close()
+			os.remove(self.packageFile)
+			raise
+
+		packageFile.close()
@@ -36,6 +36,7 @@ import os
 import re
 import shutil
 import stat
+import threading
 import time
 import urllib
 
@@ -47,9 +48,10 @@ from OPSI.System import mount, umount
 from OPSI.Types import RepositoryError
 from OPSI.Types import forceBool, forceFilename, forceInt, forceUnicode, forceUnicodeList
 from OPSI.Util.Message import ProgressSubject
-from OPSI.Util import md5sum, randomString
+from OPSI.Util import ChecksumCache, randomString
 from OPSI.Util.File.Opsi import PackageContentFile
 from OPSI.Util.HTTP import getSharedConnectionPool, urlsplit, HTTPResponse
+from OPSI.Util.Thread import ThreadPool
 
 if os.name == 'nt':
 	from OPSI.System.Windows import getFreeDrive
@@ -107,7 +109,6 @@ class Repository:
 		self._networkPerformanceCounter = None
 		self._lastSpeedCalcTime = None
 		self._bufferSize = 16384
-		self._bytesTransfered = 0
 		self._networkBandwidth = 0.0
 		self._currentSpeed = 0.0
 		self._averageSpeed = 0.0
@@ -366,7 +367,8 @@ class Repository:
 		logger.debug(u"Transfer %s from %s to %s, dynamic bandwidth %s, max bandwidth %s" % (transferDirection, src, dst, self._dynamicBandwidth, self._maxBandwidth))
 		try:
 			self._transferDirection = transferDirection
-			self._bytesTransfered = 0
+			# Kept local as transfers may run in parallel.
+			bytesTransfered = 0
 			transferStartTime = time.time()
 			buf = True
 
@@ -376,12 +378,12 @@ class Repository:
 				fileSize = os.path.getsize(src.name)
 			logger.debug('Filesize is: {0}'.format(fileSize))
 
-			while buf and (bytes < 0 or self._bytesTransfered < bytes):
+			while buf and (bytes < 0 or bytesTransfered < bytes):
 				logger.debug2("self._bufferSize: '%d" % self._bufferSize)
-				logger.debug2("self._bytesTransfered: '%d'" % self._bytesTransfered)
+				logger.debug2("bytesTransfered: '%d'" % bytesTransfered)
 				logger.debug2("bytes: '%d'" % bytes)
 
-				remaining_bytes = fileSize - self._bytesTransfered
+				remaining_bytes = fileSize - bytesTransfered
 				logger.debug2("self._remainingBytes: '%d'" % remaining_bytes)
 				if remaining_bytes > 0 and remaining_bytes < self._bufferSize:
 					buf = src.read(remaining_bytes)
@@ -393,10 +395,10 @@ class Repository:
 				read = len(buf)
 
 				if read > 0:
-					if bytes >= 0 and (self._bytesTransfered + read) > bytes:
-						buf = buf[:bytes-self._bytesTransfered]
+					if bytes >= 0 and (bytesTransfered + read) > bytes:
+						buf = buf[:bytes-bytesTransfered]
 						read = len(buf)
-					self._bytesTransfered += read
+					bytesTransfered += read
 					if isinstance(dst, (httplib.HTTPConnection, httplib.HTTPSConnection)):
 						dst.send(buf)
 					else:
@@ -415,8 +417,8 @@ class Repository:
 			if transferTime == 0:
 				transferTime = 0.0000001
 			logger.info(u"Transfered %0.2f kByte in %0.2f minutes, average speed was %0.2f kByte/s" % \
-				((float(self._bytesTransfered) / 1024), (float(transferTime) / 60), (float(self._bytesTransfered)/transferTime) / 1024))
-			return self._bytesTransfered
+				((float(bytesTransfered) / 1024), (float(transferTime) / 60), (float(bytesTransfered)/transferTime) / 1024))
+			return bytesTransfered
 		except Exception as error:
 			logger.logException(error, LOG_INFO)
 			raise
@@ -821,6 +823,8 @@ class HTTPRepository(Repository):
 				self._username = forceUnicode(value)
 			elif key == 'password':
 				self._password = forceUnicode(value)
+			elif key == 'connectionpoolsize':
+				self._connectionPoolSize = forceInt(value)
 			elif key == 'proxy':
 				proxy = forceUnicode(value)
 			elif key == 'servercertfile':
@@ -1225,26 +1229,95 @@ class CIFSRepository(FileRepository):
 
 
 class DepotToLocalDirectorySychronizer(object):
-	def __init__(self, sourceDepot, destinationDirectory, productIds=[], maxBandwidth=0, dynamicBandwidth=False):
+	"""
+	Synchronizes products of a depot with a local directory.
+
+	With more than one worker several products and several files of a
+	product are synchronized at the same time. HTTP based repositories
+	should be created with a `connectionPoolSize` of at least `workers`
+	for the downloads to run in parallel.
+
+	Checksums of local files are only calculated again if a file
+	changed. If `checksumCacheFile` is given the checksums are kept in
+	this file for later synchronizations.
+	"""
+
+	def __init__(self, sourceDepot, destinationDirectory, productIds=[], maxBandwidth=0, dynamicBandwidth=False, workers=1, checksumCacheFile=None):
 		self._sourceDepot = sourceDepot
 		self._destinationDirectory = forceUnicode(destinationDirectory)
 		self._productIds = forceUnicodeList(productIds)
+		self._workers = max(forceInt(workers), 1)
+		self._checksumCache = ChecksumCache(checksumCacheFile)
+		self._progressLock = threading.Lock()
 		if not os.path.isdir(self._destinationDirectory):
 			os.mkdir(self._destinationDirectory)
 		self._sourceDepot.setBandwidth(dynamicBandwidth=dynamicBandwidth, maxBandwidth=maxBandwidth)
 
-	def _synchronizeDirectories(self, source, destination, progressSubject=None):
+	@staticmethod
+	def _appendFile(path, partPath):
+		logger.info(u"Appending '%s' to '%s'" % (partPath, path))
+		with open(path, 'ab') as f1:
+			with open(partPath, 'rb') as f2:
+				shutil.copyfileobj(f2, f1, 1048576)
+
+	@staticmethod
+	def _runJobs(pool, jobs):
+		"""
+		Run the jobs and wait until all of them are done.
+
+		:param pool: The ThreadPool to use. If this is `None` the jobs \
+run one after another and the first error stops the remaining jobs.
+		:param jobs: Tuples of a function and its arguments.
+		:raises: The first error raised by a job.
+		"""
+		if pool is None:
+			for (function, args) in jobs:
+				function(*args)
+			return
+
+		if not jobs:
+			return
+
+		lock = threading.Lock()
+		finished = threading.Event()
+		pending = [len(jobs)]
+		errors = []
+
+		def jobDone(success, result, error):
+			with lock:
+				if not success:
+					errors.append(error)
+				pending[0] -= 1
+				if not pending[0]:
+					finished.set()
+
+		for (function, args) in jobs:
+			pool.addJob(function, jobDone, *args)
+		finished.wait()
+
+		if errors:
+			for error in errors[1:]:
+				logger.error(forceUnicode(error))
+			raise errors[0]
+
+	def _synchronizeDirectories(self, productId, fileInfo, source, destination, linkFiles, transfers):
+		"""
+		Create the directories of a product and remove obsolete files.
+
+		The files to synchronize are added to `transfers`, links are \
+collected in `linkFiles`.
+		"""
 		source = forceUnicode(source)
 		destination = forceUnicode(destination)
-		logger.debug(u"Syncing directory %s to %s" % (source, destination))
+		logger.debug(u"Syncing directory {0} to {1}", source, destination)
 		if not os.path.isdir(destination):
 			os.mkdir(destination)
 
 		for f in os.listdir(destination):
 			relSource = (source + u'/' + f).split(u'/', 1)[1]
-			if relSource == self._productId + u'.files':
+			if relSource == productId + u'.files':
 				continue
-			if relSource in self._fileInfo:
+			if relSource in fileInfo:
 				continue
 
 			path = os.path.join(destination, f)
@@ -1255,86 +1328,162 @@ class DepotToLocalDirectorySychronizer(object):
 				if path.endswith(u'.opsi_sync_endpart'):
 					oPath = path[:-1 * len(".opsi_sync_endpart")]
 					if os.path.isfile(oPath):
-						logger.info(u"Appending '%s' to '%s'" % (path, oPath))
-						with open(oPath, 'ab') as f1:
-							with open(path, 'rb') as f2:
-								f1.write(f2.read())
+						self._appendFile(oPath, path)
 				logger.info(u"Deleting '%s'" % relSource)
 				os.remove(path)
+				self._checksumCache.discard(path)
 
 		for f in self._sourceDepot.content(source):
-			source = forceUnicode(source)
 			s = source + u'/' + f['name']
 			d = os.path.join(destination, f['name'])
 			relSource = s.split(u'/', 1)[1]
-			if relSource == self._productId + u'.files':
+			if relSource == productId + u'.files':
 				continue
-			if not self._fileInfo.has_key(relSource):
+			if relSource not in fileInfo:
 				continue
 			if f['type'] == 'dir':
-				self._synchronizeDirectories(s, d, progressSubject)
+				self._synchronizeDirectories(productId, fileInfo, s, d, linkFiles, transfers)
+			elif fileInfo[relSource]['type'] == 'l':
+				linkFiles[relSource] = fileInfo[relSource]['target']
 			else:
-				logger.debug(u"Syncing %s with %s %s" % (relSource, d, self._fileInfo[relSource]))
-				if self._fileInfo[relSource]['type'] == 'l':
-					self._linkFiles[relSource] = self._fileInfo[relSource]['target']
-					continue
-				size = 0
-				localSize = 0
-				exists = False
-				if self._fileInfo[relSource]['type'] == 'f':
-					size = int(self._fileInfo[relSource]['size'])
-					exists = os.path.exists(d)
-					if exists:
-						md5s = md5sum(d)
-						logger.debug(u"Destination file '%s' already exists (size: %s, md5sum: %s)" % (d, size, md5s))
-						localSize = os.path.getsize(d)
-						if (localSize == size) and (md5s == self._fileInfo[relSource]['md5sum']):
-							#if progressSubject: progressSubject.addToState(size)
-							continue
-
-				if progressSubject:
-					progressSubject.setMessage(_(u"Downloading file '%s'") % f['name'])
-
-				if exists and (localSize < size):
-					partialEndFile = d + u'.opsi_sync_endpart'
-					# First byte needed is byte number <localSize>
-					logger.info(u"Downloading file '%s' starting at byte number %d" % (f['name'], localSize))
-					if os.path.exists(partialEndFile):
-						os.remove(partialEndFile)
-					self._sourceDepot.download(s, partialEndFile, startByteNumber=localSize)
-
-					with open(d, 'ab') as f1:
-						with open(partialEndFile, 'rb') as f2:
-							f1.write(f2.read())
-
-					md5s = md5sum(d)
-					if md5s != self._fileInfo[relSource]['md5sum']:
-						logger.warning(u"MD5sum of composed file differs")
-						partialStartFile = d + u'.opsi_sync_startpart'
-						if os.path.exists(partialStartFile):
-							os.remove(partialStartFile)
-						# Last byte needed is byte number <localSize> - 1
-						logger.info(u"Downloading file '%s' ending at byte number %d" % (f['name'], localSize-1))
-						self._sourceDepot.download(s, partialStartFile, endByteNumber=localSize - 1)
-
-						with open(partialStartFile, 'ab') as f1:
-							with open(partialEndFile, 'rb') as f2:
-								f1.write(f2.read())
-
-						if os.path.exists(d):
-							os.remove(d)
-						os.rename(partialStartFile, d)
-					os.remove(partialEndFile)
+				transfers.append((s, d, f['name'], fileInfo[relSource]))
+
+	def _synchronizeFile(self, source, destination, name, info, progressSubject=None):
+		logger.debug(u"Syncing {0} with {1} {2}", source, destination, info)
+		size = 0
+		localSize = 0
+		exists = False
+		if info['type'] == 'f':
+			size = int(info['size'])
+			exists = os.path.exists(destination)
+			if exists:
+				localSize = os.path.getsize(destination)
+				logger.debug(u"Destination file '{0}' already exists (size: {1})", destination, localSize)
+				if localSize == size and self._checksumCache.md5sum(destination) == info['md5sum']:
+					return
+
+		if progressSubject:
+			progressSubject.setMessage(_(u"Downloading file '%s'") % name)
+
+		if exists and (localSize < size):
+			partialEndFile = destination + u'.opsi_sync_endpart'
+			# First byte needed is byte number <localSize>
+			logger.info(u"Downloading file '%s' starting at byte number %d" % (name, localSize))
+			if os.path.exists(partialEndFile):
+				os.remove(partialEndFile)
+			self._sourceDepot.download(source, partialEndFile, startByteNumber=localSize)
+			self._appendFile(destination, partialEndFile)
+
+			if self._checksumCache.md5sum(destination) != info['md5sum']:
+				logger.warning(u"MD5sum of composed file differs")
+				partialStartFile = destination + u'.opsi_sync_startpart'
+				if os.path.exists(partialStartFile):
+					os.remove(partialStartFile)
+				# Last byte needed is byte number <localSize> - 1
+				logger.info(u"Downloading file '%s' ending at byte number %d" % (name, localSize - 1))
+				self._sourceDepot.download(source, partialStartFile, endByteNumber=localSize - 1)
+				self._appendFile(partialStartFile, partialEndFile)
+
+				if os.path.exists(destination):
+					os.remove(destination)
+				os.rename(partialStartFile, destination)
+			os.remove(partialEndFile)
+		else:
+			if exists:
+				os.remove(destination)
+			logger.info(u"Downloading file '%s'" % name)
+			self._sourceDepot.download(source, destination, progressSubject=progressSubject)
+
+		md5s = self._checksumCache.md5sum(destination)
+		if md5s != info['md5sum']:
+			error = u"Failed to download '%s': MD5sum mismatch (local:%s != remote:%s)" % (name, md5s, info['md5sum'])
+			logger.error(error)
+			raise Exception(error)
+
+	@staticmethod
+	def _createLinks(productDestinationDirectory, linkFiles):
+		for f in sorted(linkFiles.keys()):
+			t = linkFiles[f]
+			if os.name == 'nt':
+				if t.startswith('/'):
+					t = t[1:]
+				if f.startswith('/'):
+					f = f[1:]
+				t = os.path.join(productDestinationDirectory, t.replace('/', '\\'))
+				f = os.path.join(productDestinationDirectory, f.replace('/', '\\'))
+				if os.path.exists(f):
+					if os.path.isdir(f):
+						shutil.rmtree(f)
+					else:
+						os.remove(f)
+				logger.info(u"Symlink => copying '%s' to '%s'" % (t, f))
+				if os.path.isdir(t):
+					shutil.copytree(t, f)
 				else:
-					if exists:
-						os.remove(d)
-					logger.info(u"Downloading file '%s'" % f['name'])
-					self._sourceDepot.download(s, d, progressSubject=progressSubject)
-				md5s = md5sum(d)
-				if md5s != self._fileInfo[relSource]['md5sum']:
-					error = u"Failed to download '%s': MD5sum mismatch (local:%s != remote:%s)" % (f['name'], md5s, self._fileInfo[relSource]['md5sum'])
-					logger.error(error)
-					raise Exception(error)
+					shutil.copyfile(t, f)
+			else:
+				# Not changing the working directory as other products
+				# may be synchronized at the same time.
+				linkPath = os.path.join(productDestinationDirectory, f)
+				if os.path.lexists(linkPath):
+					if os.path.isdir(linkPath) and not os.path.islink(linkPath):
+						shutil.rmtree(linkPath)
+					else:
+						os.remove(linkPath)
+				parts = len(f.split('/'))
+				parts -= len(t.split('/'))
+				for i in range(parts):
+					t = os.path.join('..', t)
+				logger.info(u"Symlink '%s' to '%s'" % (f, t))
+				os.symlink(t, linkPath)
+
+	def _synchronizeProduct(self, productId, overallProgressSubject, productProgressObserver=None, filePool=None):
+		productProgressSubject = ProgressSubject(id='sync_product_' + productId, type='product_sync', fireAlways=True)
+		productProgressSubject.setMessage(_(u"Synchronizing product %s") % productId)
+		if productProgressObserver:
+			productProgressSubject.attachObserver(productProgressObserver)
+		packageContentFile = None
+
+		try:
+			logger.notice(u"Syncing product %s of depot %s with local directory %s" \
+					% (productId, self._sourceDepot, self._destinationDirectory))
+
+			productDestinationDirectory = os.path.join(self._destinationDirectory, productId)
+			if not os.path.isdir(productDestinationDirectory):
+				os.mkdir(productDestinationDirectory)
+
+			logger.info(u"Downloading package content file")
+			packageContentFile = os.path.join(productDestinationDirectory, u'%s.files' % productId)
+			self._sourceDepot.download(u'%s/%s.files' % (productId, productId), packageContentFile)
+			fileInfo = PackageContentFile(packageContentFile).parse()
+
+			size = 0
+			for value in fileInfo.values():
+				if 'size' in value:
+					size += int(value['size'])
+			productProgressSubject.setMessage(_(u"Synchronizing product %s (%.2f kByte)") % (productId, (size / 1024)))
+			productProgressSubject.setEnd(size)
+			productProgressSubject.setEndChangable(False)
+
+			linkFiles = {}
+			transfers = []
+			self._synchronizeDirectories(productId, fileInfo, productId, productDestinationDirectory, linkFiles, transfers)
+			self._runJobs(
+				filePool,
+				[(self._synchronizeFile, transfer + (productProgressSubject,)) for transfer in transfers]
+			)
+
+			self._createLinks(productDestinationDirectory, linkFiles)
+		except Exception as error:
+			productProgressSubject.setMessage(_(u"Failed to sync product %s: %s") % (productId, error))
+			if packageContentFile and os.path.exists(packageContentFile):
+				os.unlink(packageContentFile)
+			raise
+
+		with self._progressLock:
+			overallProgressSubject.addToState(1)
+		if productProgressObserver:
+			productProgressSubject.detachObserver(productProgressObserver)
 
 	def synchronize(self, productProgressObserver=None, overallProgressObserver=None):
 		if not self._productIds:
@@ -1347,83 +1496,27 @@ class DepotToLocalDirectorySychronizer(object):
 		if overallProgressObserver:
 			overallProgressSubject.attachObserver(overallProgressObserver)
 
-		for self._productId in self._productIds:
-			productProgressSubject = ProgressSubject(id='sync_product_' + self._productId, type='product_sync', fireAlways=True)
-			productProgressSubject.setMessage(_(u"Synchronizing product %s") % self._productId)
-			if productProgressObserver:
-				productProgressSubject.attachObserver(productProgressObserver)
-			packageContentFile = None
-
-			try:
-				self._linkFiles = {}
-				logger.notice(u"Syncing product %s of depot %s with local directory %s" \
-						% (self._productId, self._sourceDepot, self._destinationDirectory))
-
-				productDestinationDirectory = os.path.join(self._destinationDirectory, self._productId)
-				if not os.path.isdir(productDestinationDirectory):
-					os.mkdir(productDestinationDirectory)
-
-				logger.info(u"Downloading package content file")
-				packageContentFile = os.path.join(productDestinationDirectory, u'%s.files' % self._productId)
-				self._sourceDepot.download(u'%s/%s.files' % (self._productId, self._productId), packageContentFile)
-				self._fileInfo = PackageContentFile(packageContentFile).parse()
-
-				size = 0
-				for value in self._fileInfo.values():
-					if 'size' in value:
-						size += int(value['size'])
-				productProgressSubject.setMessage(_(u"Synchronizing product %s (%.2f kByte)") % (self._productId, (size / 1024)))
-				productProgressSubject.setEnd(size)
-				productProgressSubject.setEndChangable(False)
-
-				self._synchronizeDirectories(self._productId, productDestinationDirectory, productProgressSubject)
-
-				fs = self._linkFiles.keys()
-				fs.sort()
-				for f in fs:
-					t = self._linkFiles[f]
-					cwd = os.getcwd()
-					os.chdir(productDestinationDirectory)
-					try:
-						if os.name == 'nt':
-							if t.startswith('/'):
-								t = t[1:]
-							if f.startswith('/'):
-								f = f[1:]
-							t = os.path.join(productDestinationDirectory, t.replace('/', '\\'))
-							f = os.path.join(productDestinationDirectory, f.replace('/', '\\'))
-							if os.path.exists(f):
-								if os.path.isdir(f):
-									shutil.rmtree(f)
-								else:
-									os.remove(f)
-							logger.info(u"Symlink => copying '%s' to '%s'" % (t, f))
-							if os.path.isdir(t):
-								shutil.copytree(t, f)
-							else:
-								shutil.copyfile(t, f)
-						else:
-							if os.path.exists(f):
-								if os.path.isdir(f) and not os.path.islink(f):
-									shutil.rmtree(f)
-								else:
-									os.remove(f)
-							parts = len(f.split('/'))
-							parts -= len(t.split('/'))
-							for i in range(parts):
-								t = os.path.join('..', t)
-							logger.info(u"Symlink '%s' to '%s'" % (f, t))
-							os.symlink(t, f)
-					finally:
-						os.chdir(cwd)
-			except Exception as error:
-				productProgressSubject.setMessage(_(u"Failed to sync product %s: %s") % (self._productId, error))
-				if packageContentFile and os.path.exists(packageContentFile):
-					os.unlink(packageContentFile)
-				raise
+		productPool = None
+		filePool = None
+		if self._workers > 1:
+			# Products and files use separate pools so that products
+			# waiting for their files never block the file transfers.
+			productPool = ThreadPool(size=max(min(self._workers, len(self._productIds)), 1))
+			filePool = ThreadPool(size=self._workers)
 
-			overallProgressSubject.addToState(1)
-			if productProgressObserver: productProgressSubject.detachObserver(productProgressObserver)
+		try:
+			self._runJobs(
+				productPool,
+				[
+					(self._synchronizeProduct, (productId, overallProgressSubject, productProgressObserver, filePool))
+					for productId in self._productIds
+				]
+			)
+		finally:
+			for pool in (productPool, filePool):
+				if pool:
+					pool.stop()
+			self._checksumCache.save()
 
 		if overallProgressObserver: overallProgressSubject.detachObserver(overallProgressObserver)
 
@@ -57,7 +57,7 @@ import re
 from OPSI.Backend.Backend import OPSI_GLOBAL_CONF
 from OPSI.Logger import Logger
 from OPSI.Types import forceHostId
-from OPSI.Util import findFiles, getfqdn
+from OPSI.Util import getfqdn, iterFiles
 from OPSI.Util.File.Opsi import OpsiConfFile
 from OPSI.System.Posix import isSLES
 
@@ -158,7 +158,7 @@ def setRights(path=u'/'):
 		LOGGER.debug2(u"Current setting: startPath={path}, uid={uid}, gid={gid}", path=startPath, uid=uid, gid=gid)
 		chown(startPath, uid, gid)
 		os.chmod(startPath, directoryMode)
-		for filepath in findFiles(startPath, prefix=startPath, returnLinks=correctLinks, excludeFile=re.compile("(.swp|~)$")):
+		for filepath in iterFiles(startPath, prefix=startPath, returnLinks=correctLinks, excludeFile=re.compile("(.swp|~)$")):
 			chown(filepath, uid, gid)
 			if os.path.isdir(filepath):
 				LOGGER.debug(u"Setting rights on directory {0!r}", filepath)
@@ -168,6 +168,10 @@ class ThreadPool(object):
 
 		self.worker = [worker for worker in self.worker if worker not in deleteWorkers]
 		if wait:
+			# Wake up idle workers instead of waiting for them to
+			# notice they have been stopped.
+			for _ in deleteWorkers:
+				self.jobQueue.put(None)
 			[worker.join(60) for worker in deleteWorkers]
 
 	def __createWorker(self):
@@ -209,7 +213,9 @@ class Worker(threading.Thread):
 
 			try:
 				callResult = self.threadPool.jobQueue.get(block=True, timeout=1)
-				if callResult:
+				if callResult is None:
+					self.threadPool.jobQueue.task_done()
+				elif callResult:
 					self.busy = True
 					(function, callback, args, kwargs) = callResult
 					success = False
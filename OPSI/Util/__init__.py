@@ -35,16 +35,21 @@ or to JSON, working with librsync and more.
 import base64
 import codecs
 import json
+import multiprocessing
+import operator
 import os
 import random
 import re
 import shutil
 import socket
+import stat
 import struct
+import threading
 import time
 import types
 from contextlib import closing
 from Crypto.Cipher import Blowfish
+from functools import partial
 from hashlib import md5
 from itertools import islice
 
@@ -53,7 +58,16 @@ try:
 except ImportError:
 	import _argparse as argparse
 
+try:
+	from os import scandir
+except ImportError:
+	try:
+		from scandir import scandir
+	except ImportError:
+		scandir = None
+
 from OPSI.Logger import Logger
+from OPSI.Util.Collections import LRUCache
 from OPSI.Types import (forceBool, forceFilename, forceFqdn, forceInt,
 						forceIPAddress, forceNetworkAddress, forceUnicode)
 
@@ -72,11 +86,32 @@ elif os.name == 'nt':
 BLOWFISH_IV = 'OPSI1234'
 OPSI_GLOBAL_CONF = u'/etc/opsi/global.conf'
 RANDOM_DEVICE = u'/dev/urandom'
+# Below this amount of data to hash starting processes does not pay off.
+_PARALLEL_HASHING_MIN_SIZE = 32 * 1024 * 1024
 _ACCEPTED_CHARACTERS = (
 	"abcdefghijklmnopqrstuvwxyz"
 	"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 	"0123456789"
 )
+_JSON_ENCODERS = {
+	False: json.JSONEncoder(ensure_ascii=False),
+	True: json.JSONEncoder(ensure_ascii=True),
+}
+_VERSION_CONDITIONS = {
+	u'': operator.eq,
+	u'==': operator.eq,
+	u'=': operator.eq,
+	u'<': operator.lt,
+	u'<=': operator.le,
+	u'>': operator.gt,
+	u'>=': operator.ge,
+}
+_VERSION_REGEX = re.compile('^\s*([\w\.]+)-*([\w\.]*)\s*$')
+_VERSION_PART_REGEX = re.compile('\d+|\D+')
+# Ends every part of a version key. When comparing a part with a
+# longer one it is greater than a number and lower than letters.
+_VERSION_PART_END = u'\x01'
+_VERSION_KEY_CACHE = LRUCache(8192)
 
 
 class PickleString(str):
@@ -152,6 +187,68 @@ def toJson(obj, ensureAscii=False):
 	return json.dumps(serialize(obj), ensure_ascii=ensureAscii)
 
 
+def iterJson(obj, ensureAscii=False, chunkSize=65536):
+	"""
+	Encodes `obj` to JSON in chunks of about `chunkSize` characters.
+
+	The result is the same as with `toJson` but lists and dicts are
+	walked and every object is serialized only when it is encoded.
+	Neither a serialized copy of `obj` nor the complete JSON has to be
+	kept in memory.
+
+	:returntype: generator of unicode
+	"""
+	encode = _JSON_ENCODERS[bool(ensureAscii)].encode
+
+	buffered = []
+	bufferedSize = 0
+	for piece in _iterJsonPieces(obj, encode):
+		buffered.append(piece)
+		bufferedSize += len(piece)
+		if bufferedSize >= chunkSize:
+			yield u''.join(buffered)
+			buffered = []
+			bufferedSize = 0
+
+	if buffered:
+		yield u''.join(buffered)
+
+
+def _iterJsonPieces(obj, encode):
+	if isinstance(obj, (unicode, str)):
+		yield encode(obj)
+	elif hasattr(obj, 'serialize'):
+		yield encode(obj.serialize())
+	elif isinstance(obj, (list, set, types.GeneratorType)):
+		yield u'['
+		separator = u''
+		for element in obj:
+			yield separator
+			separator = u', '
+			for piece in _iterJsonPieces(element, encode):
+				yield piece
+		yield u']'
+	elif isinstance(obj, dict):
+		yield u'{'
+		separator = u''
+		for key, value in obj.items():
+			if not isinstance(key, (unicode, str)):
+				if key is not None and not isinstance(key, (bool, int, long, float)):
+					raise TypeError("key {0!r} is not a string".format(key))
+				# Same conversion of keys as done by the json module
+				key = encode(key)
+
+			yield separator
+			separator = u', '
+			yield encode(key)
+			yield u': '
+			for piece in _iterJsonPieces(value, encode):
+				yield piece
+		yield u'}'
+	else:
+		yield encode(obj)
+
+
 def librsyncSignature(filename, base64Encoded=True):
 	try:
 		with open(filename, 'rb') as f:
@@ -217,6 +314,220 @@ def md5sum(filename):
 	return md5object.hexdigest()
 
 
+def _md5sumOrNone(filename):
+	try:
+		return md5sum(filename)
+	except (IOError, OSError):
+		return None
+
+
+class ChecksumCache(object):
+	"""
+	Remembers the md5sums of files.
+
+	A remembered checksum is used as long as size, modification time
+	and inode of the file are unchanged. If `filename` is given the
+	checksums are read from this file and written back on `save`.
+
+	If `baseDir` is given the checksums are kept by the path relative
+	to `baseDir` and size, modification time and `origin` are compared
+	instead. The checksums then stay valid if the files are extracted
+	again from the same source. `origin` has to identify that source,
+	because extracted files with changed content can have the same
+	size and modification time as before.
+	"""
+
+	def __init__(self, filename=None, baseDir=None, origin=None):
+		self._filename = None
+		if filename:
+			self._filename = forceFilename(filename)
+		self._baseDir = None
+		if baseDir:
+			self._baseDir = os.path.abspath(forceFilename(baseDir))
+		self._origin = None
+		if origin:
+			self._origin = forceUnicode(origin)
+		self._checksums = {}
+		self._modified = False
+		self._lock = threading.Lock()
+
+		if self._filename:
+			self.load()
+
+	def _getKey(self, path):
+		path = os.path.abspath(path)
+		if self._baseDir:
+			return os.path.relpath(path, self._baseDir)
+		return path
+
+	def _getFileState(self, path):
+		fileStat = os.stat(path)
+		if self._baseDir:
+			return [fileStat.st_size, fileStat.st_mtime, self._origin]
+		return [fileStat.st_size, fileStat.st_mtime, fileStat.st_ino]
+
+	def get(self, path):
+		"""
+		Get the remembered checksum of `path`.
+
+		:returns: The md5sum or `None` if the file changed since its \
+checksum was remembered.
+		"""
+		with self._lock:
+			entry = self._checksums.get(self._getKey(path))
+
+		if entry and entry[:-1] == self._getFileState(path):
+			return entry[-1]
+
+		return None
+
+	def set(self, path, checksum, fileState=None):
+		"""
+		Remember `checksum` for `path`.
+
+		:param fileState: The result of `_getFileState` when the \
+checksum was calculated. Defaults to the current state of the file.
+		"""
+		if fileState is None:
+			fileState = self._getFileState(path)
+
+		with self._lock:
+			self._checksums[self._getKey(path)] = list(fileState) + [checksum]
+			self._modified = True
+
+	def md5sums(self, paths, processes=None):
+		"""
+		Get the md5sums of several files.
+
+		Files that changed since their checksums were remembered are \
+read by `processes` worker processes if there is enough data to read.
+
+		:param processes: The number of processes to use. Defaults to \
+the number of CPUs.
+		:returns: The checksums with the given paths as keys. Files \
+that can not be read are left out.
+		:rtype: dict
+		"""
+		checksums = {}
+		changedFiles = []
+		changedSize = 0
+		for path in paths:
+			try:
+				fileState = self._getFileState(path)
+			except OSError as error:
+				logger.warning(u"Failed to get checksum of {0!r}: {1}", path, error)
+				continue
+
+			with self._lock:
+				entry = self._checksums.get(self._getKey(path))
+
+			if entry and entry[:-1] == fileState:
+				checksums[path] = entry[-1]
+			else:
+				changedFiles.append((path, fileState))
+				changedSize += fileState[0]
+
+		if processes is None:
+			try:
+				processes = multiprocessing.cpu_count()
+			except NotImplementedError:
+				processes = 1
+		processes = min(processes, len(changedFiles))
+
+		changedPaths = [path for (path, _) in changedFiles]
+		if processes > 1 and changedSize >= _PARALLEL_HASHING_MIN_SIZE:
+			logger.debug(u"Calculating {0} checksums with {1} processes", len(changedPaths), processes)
+			pool = multiprocessing.Pool(processes)
+			try:
+				newChecksums = pool.map(_md5sumOrNone, changedPaths, chunksize=1)
+			finally:
+				pool.close()
+				pool.join()
+		else:
+			newChecksums = [_md5sumOrNone(path) for path in changedPaths]
+
+		for (path, fileState), checksum in zip(changedFiles, newChecksums):
+			if checksum is None:
+				logger.warning(u"Failed to read {0!r}", path)
+				continue
+
+			checksums[path] = checksum
+			self.set(path, checksum, fileState)
+
+		return checksums
+
+	def retain(self, paths):
+		"""
+		Forget the checksums of all files not in `paths`.
+		"""
+		keys = set(self._getKey(path) for path in paths)
+		with self._lock:
+			for key in self._checksums.keys():
+				if key not in keys:
+					del self._checksums[key]
+					self._modified = True
+
+	def discard(self, path):
+		with self._lock:
+			if self._checksums.pop(self._getKey(path), None):
+				self._modified = True
+
+	def md5sum(self, path):
+		"""
+		Get the md5sum of `path`.
+
+		The file is only read if it changed since its checksum was \
+remembered.
+		"""
+		fileState = self._getFileState(path)
+		with self._lock:
+			entry = self._checksums.get(self._getKey(path))
+
+		if entry and entry[:-1] == fileState:
+			return entry[-1]
+
+		checksum = md5sum(path)
+		self.set(path, checksum, fileState)
+		return checksum
+
+	def load(self):
+		if not os.path.exists(self._filename):
+			return
+
+		try:
+			with open(self._filename) as cacheFile:
+				checksums = json.load(cacheFile)
+		except Exception as error:
+			logger.warning(u"Failed to read checksum cache {0!r}: {1}", self._filename, error)
+			return
+
+		with self._lock:
+			self._checksums = checksums
+			self._modified = False
+
+	def save(self):
+		"""
+		Write the checksums to the file given at creation.
+
+		The file is replaced at once so that a cache being written is \
+never read.
+		"""
+		if not self._filename or not self._modified:
+			return
+
+		with self._lock:
+			data = json.dumps(self._checksums)
+			self._modified = False
+
+		tempFilename = self._filename + u'.tmp'
+		with open(tempFilename, 'w') as cacheFile:
+			cacheFile.write(data)
+
+		if os.name == 'nt' and os.path.exists(self._filename):
+			os.remove(self._filename)
+		os.rename(tempFilename, self._filename)
+
+
 def randomString(length, characters=_ACCEPTED_CHARACTERS):
 	"""
 	Generates a random string for a given length.
@@ -419,105 +730,129 @@ def replaceSpecialHTMLCharacters(text):
 		.replace(u'\n', u'<br />\n')
 
 
-def compareVersions(v1, condition, v2):
-	def removePartAfterWave(versionString):
-		if "~" in versionString:
-			return versionString[:versionString.find("~")]
-		else:
-			return versionString
+class VersionKey(tuple):
+	"""
+	A parsed version that can be compared to other parsed versions.
+
+	It consists of the parts of the product version followed by the \
+parts of the package version.
+	Create instances through `parseVersion`.
+	"""
+	__slots__ = ()
+
+	def __repr__(self):
+		return '<VersionKey({0})>'.format(tuple.__repr__(self))
+
 
-	def splitProductAndPackageVersion(versionString):
-		productVersion = packageVersion = u'0'
+def _parseVersionPart(versionPart):
+	"""
+	Split `versionPart` into numbers and the text between them.
+	"""
+	tokens = []
+	for token in _VERSION_PART_REGEX.findall(versionPart):
+		if token.isdigit():
+			number = int(token)
+			# Numbers too big for an int have always been compared
+			# as text.
+			token = number if isinstance(number, int) else unicode(number)
+
+		tokens.append(token)
+
+	tokens.append(_VERSION_PART_END)
+	return tuple(tokens)
 
-		match = re.search('^\s*([\w\.]+)-*([\w\.]*)\s*$', versionString)
-		if not match:
-			raise Exception(u"Bad version string '%s'" % versionString)
 
-		productVersion = match.group(1)
-		if match.group(2):
-			packageVersion = match.group(2)
+def _parseVersionParts(version):
+	parts = [_parseVersionPart(part) for part in version.split(u'.')]
 
-		return (productVersion, packageVersion)
+	# Missing parts are compared as 0.
+	zero = (0, _VERSION_PART_END)
+	while parts and parts[-1] == zero:
+		parts.pop()
 
-	def makeEqualLength(first, second):
-		while len(first) < len(second):
-			first.append(u'0')
+	return tuple(parts)
+
+
+def parseVersion(version):
+	"""
+	Parse `version` into a `VersionKey`.
 
-	if not condition:
-		condition = u'=='
-	if condition not in (u'==', u'=', u'<', u'<=', u'>', u'>='):
+	Everything after a ``~`` is ignored. Product and package version \
+are separated by ``-``. If no package version is given it is ``0``.
+	Parsed versions are cached.
+
+	:raises Exception: If `version` is not a valid version string.
+	:rtype: VersionKey
+	"""
+	version = forceUnicode(version)
+	try:
+		return _VERSION_KEY_CACHE[version]
+	except KeyError:
+		pass
+
+	versionString = version
+	if u"~" in versionString:
+		versionString = versionString[:versionString.find(u"~")]
+
+	match = _VERSION_REGEX.search(versionString)
+	if not match:
+		raise Exception(u"Bad version string '%s'" % versionString)
+
+	key = VersionKey((
+		_parseVersionParts(match.group(1)),
+		_parseVersionParts(match.group(2) or u'0')
+	))
+	_VERSION_KEY_CACHE[version] = key
+	return key
+
+
+def _getVersionCondition(condition):
+	try:
+		return _VERSION_CONDITIONS[condition or u'']
+	except (KeyError, TypeError):
 		raise Exception(u"Bad condition '%s'" % condition)
-	if condition == u'=':
-		condition = u'=='
-
-	v1 = removePartAfterWave(forceUnicode(v1))
-	v2 = removePartAfterWave(forceUnicode(v2))
-
-	(v1ProductVersion, v1PackageVersion) = splitProductAndPackageVersion(v1)
-	(v2ProductVersion, v2PackageVersion) = splitProductAndPackageVersion(v2)
-
-	for (v1, v2) in ( (v1ProductVersion, v2ProductVersion), (v1PackageVersion, v2PackageVersion) ):
-		v1p = v1.split(u'.')
-		v2p = v2.split(u'.')
-		makeEqualLength(v1p, v2p)
-		makeEqualLength(v2p, v1p)
-		for i in range(len(v1p)):
-			while (len(v1p[i]) > 0) or (len(v2p[i]) > 0):
-				cv1 = u''
-				cv2 = u''
-
-				match = re.search('^(\d+)(\D*.*)$', v1p[i])
-				if match:
-					cv1 = int(match.group(1))
-					v1p[i] = match.group(2)
-				else:
-					match = re.search('^(\D+)(\d*.*)$', v1p[i])
-					if match:
-						cv1 = match.group(1)
-						v1p[i] = match.group(2)
-
-				match = re.search('^(\d+)(\D*.*)$', v2p[i])
-				if match:
-					cv2 = int(match.group(1))
-					v2p[i] = match.group(2)
-				else:
-					match = re.search('^(\D+)(\d*.*)$', v2p[i])
-					if match:
-						cv2 = match.group(1)
-						v2p[i] = match.group(2)
-
-				if cv1 == u'':
-					cv1 = chr(1)
-				if cv2 == u'':
-					cv2 = chr(1)
-				if cv1 == cv2:
-					logger.debug2(u"%s == %s => continue" % (cv1, cv2))
-					continue
 
-				if not isinstance(cv1, int):
-					cv1 = u"'%s'" % cv1
-				if not isinstance(cv2, int):
-					cv2 = u"'%s'" % cv2
 
-				b = eval(u"%s %s %s" % (cv1, condition, cv2))
-				logger.debug2(u"%s(%s) %s %s(%s) => %s | '%s' '%s'" % (type(cv1), cv1, condition, type(cv2), cv2, b, v1p[i], v2p[i]) )
-				if not b:
-					logger.debug(u"Unfulfilled condition: %s-%s %s %s-%s" \
-						% (v1ProductVersion, v1PackageVersion, condition, v2ProductVersion, v2PackageVersion ))
-					return False
-				else:
-					logger.debug(u"Fulfilled condition: %s-%s %s %s-%s" \
-						% (v1ProductVersion, v1PackageVersion, condition, v2ProductVersion, v2PackageVersion ))
-					return True
+def compareVersions(v1, condition, v2):
+	"""
+	Check if `v1` `condition` `v2` is fulfilled.
 
-	if u'=' not in condition:
-		logger.debug(u"Unfulfilled condition: %s-%s %s %s-%s" \
-			% (v1ProductVersion, v1PackageVersion, condition, v2ProductVersion, v2PackageVersion ))
-		return False
+	:param condition: One of ``==``, ``=``, ``<``, ``<=``, ``>`` or \
+``>=``. If no condition is given ``==`` is used.
+	:raises Exception: If a version or the condition is invalid.
+	:rtype: bool
+	"""
+	compare = _getVersionCondition(condition)
+	return compare(parseVersion(v1), parseVersion(v2))
 
-	logger.debug(u"Fulfilled condition: %s-%s %s %s-%s" \
-		% (v1ProductVersion, v1PackageVersion, condition, v2ProductVersion, v2PackageVersion ))
-	return True
+
+def compileVersionCondition(condition, version):
+	"""
+	Create a function checking if a version fulfills `condition` \
+`version`.
+
+	The returned function takes a version and gives the same result as \
+`compareVersions(v, condition, version)`. Condition and `version` are \
+parsed only once.
+	"""
+	compare = _getVersionCondition(condition)
+	versionKey = parseVersion(version)
+
+	def fulfillsCondition(v):
+		return compare(parseVersion(v), versionKey)
+
+	return fulfillsCondition
+
+
+def filterVersions(versions, condition, version):
+	"""
+	Get the versions from `versions` that fulfill `condition` `version`.
+
+	:raises Exception: If one of the versions or the condition is invalid.
+	:rtype: list
+	"""
+	fulfillsCondition = compileVersionCondition(condition, version)
+	return [v for v in versions if fulfillsCondition(v)]
 
 
 unitRegex = re.compile('^(\d+\.*\d*)\s*([\w]{0,4})$')
@@ -638,99 +973,152 @@ def decryptWithPrivateKeyFromPEMFile(data, filename):
 
 
 def findFiles(directory, prefix=u'', excludeDir=None, excludeFile=None, includeDir=None, includeFile=None, returnDirs=True, returnLinks=True, followLinks=False, repository=None):
-	directory = forceFilename(directory)
-	prefix = forceUnicode(prefix)
+	"""
+	Get the files in `directory` as a list.
 
-	if excludeDir:
-		if not isRegularExpressionPattern(excludeDir):
-			excludeDir = re.compile(forceUnicode(excludeDir))
-	else:
-		excludeDir = None
+	See :py:func:`iterFiles` for the parameters.
+	"""
+	return list(
+		iterFiles(
+			directory, prefix=prefix,
+			excludeDir=excludeDir, excludeFile=excludeFile,
+			includeDir=includeDir, includeFile=includeFile,
+			returnDirs=returnDirs, returnLinks=returnLinks,
+			followLinks=followLinks, repository=repository
+		)
+	)
 
-	if excludeFile:
-		if not isRegularExpressionPattern(excludeFile):
-			excludeFile = re.compile(forceUnicode(excludeFile))
-	else:
-		excludeFile = None
 
-	if includeDir:
-		if not isRegularExpressionPattern(includeDir):
-			includeDir = re.compile(forceUnicode(includeDir))
-	else:
-		includeDir = None
+def iterFiles(directory, prefix=u'', excludeDir=None, excludeFile=None, includeDir=None, includeFile=None, returnDirs=True, returnLinks=True, followLinks=False, repository=None):
+	"""
+	Walk through `directory` and yield the paths of the files in it.
+
+	A directory is yielded before its content. The filters are
+	regular expressions, either as string or compiled, that are
+	searched in the name of an entry.
+
+	:param prefix: Prepended to the yielded paths.
+	:param excludeDir: Skip matching directories and their content.
+	:param excludeFile: Skip matching files.
+	:param includeDir: Only descend into matching directories.
+	:param includeFile: Only yield matching files.
+	:param returnDirs: Yield directories.
+	:param returnLinks: Yield symbolic links.
+	:param followLinks: Descend into linked directories.
+	:param repository: Walk through this repository instead of the \
+local file system.
+	"""
+	directory = forceFilename(directory)
+	prefix = forceUnicode(prefix)
 
-	if includeFile:
-		if not isRegularExpressionPattern(includeFile):
-			includeFile = re.compile(forceUnicode(includeFile))
-	else:
-		includeFile = None
+	def compileFilter(pattern):
+		if not pattern:
+			return None
+		if isRegularExpressionPattern(pattern):
+			return pattern
+		return re.compile(forceUnicode(pattern))
+
+	excludeDir = compileFilter(excludeDir)
+	excludeFile = compileFilter(excludeFile)
+	includeDir = compileFilter(includeDir)
+	includeFile = compileFilter(includeFile)
 
 	returnDirs = forceBool(returnDirs)
 	returnLinks = forceBool(returnLinks)
 	followLinks = forceBool(followLinks)
 
-	islink = os.path.islink
-	isdir = os.path.isdir
-	listdir = os.listdir
+	def listLocalEntries(path):
+		for entry in os.listdir(path):
+			if isinstance(entry, str):
+				yield (entry, False, None)
+				continue
+
+			entryPath = os.path.join(path, entry)
+			try:
+				mode = os.lstat(entryPath).st_mode
+			except OSError:
+				yield (entry, False, lambda: False)
+				continue
+
+			if stat.S_ISLNK(mode):
+				yield (entry, True, partial(os.path.isdir, entryPath))
+			else:
+				yield (entry, False, partial(stat.S_ISDIR, mode))
+
 	if repository:
-		islink = repository.islink
-		isdir = repository.isdir
-		listdir = repository.listdir
+		def listEntries(path):
+			entries = []
+			for entry in repository.listdir(path):
+				if isinstance(entry, str):
+					entries.append((entry, False, None))
+					continue
+
+				entryPath = os.path.join(path, entry)
+				entries.append((entry, repository.islink(entryPath), partial(repository.isdir, entryPath)))
+			return entries
+	elif scandir is not None:
+		def listEntries(path):
+			try:
+				# The type of an entry is known from reading the directory.
+				return [
+					(entry.name, entry.is_symlink(), entry.is_dir)
+					for entry in scandir(path)
+				]
+			except UnicodeDecodeError:
+				# listdir reports undecodable names instead of failing.
+				return list(listLocalEntries(path))
+	else:
+		def listEntries(path):
+			return list(listLocalEntries(path))
+
+	# Depth-first walk without recursion. Every directory is read once.
+	stack = [(directory, prefix, iter(listEntries(directory)))]
+	while stack:
+		(currentDir, currentPrefix, entries) = stack[-1]
+		try:
+			(entry, isLink, isDir) = next(entries)
+		except StopIteration:
+			stack.pop()
+			continue
 
-	files = []
-	for entry in listdir(directory):
 		if isinstance(entry, str):  # TODO how to handle this with Python 3?
-			logger.error(u"Bad filename '%s' found in directory '%s', skipping entry!" % (unicode(entry, 'ascii', 'replace'), directory))
+			logger.error(u"Bad filename '{0}' found in directory '{1}', skipping entry!", unicode(entry, 'ascii', 'replace'), currentDir)
 			continue
-		pp = os.path.join(prefix, entry)
-		dp = os.path.join(directory, entry)
-		isLink = False
-		if islink(dp):
-			isLink = True
-			if not returnLinks and not followLinks:
-				continue
-		if isdir(dp) and (not isLink or followLinks):
-			if excludeDir and re.search(excludeDir, entry):
-				logger.debug(u"Excluding dir '%s' and containing files" % entry)
+
+		if isLink and not returnLinks and not followLinks:
+			continue
+
+		pp = os.path.join(currentPrefix, entry)
+		if (not isLink or followLinks) and isDir():
+			if excludeDir and excludeDir.search(entry):
+				logger.debug(u"Excluding dir '{0}' and containing files", entry)
 				continue
 			if includeDir:
-				if not re.search(includeDir, entry):
+				if not includeDir.search(entry):
 					continue
-				logger.debug(u"Including dir '%s' and containing files" % entry)
+				logger.debug(u"Including dir '{0}' and containing files", entry)
 			if returnDirs:
-				files.append(pp)
-			files.extend(
-				findFiles(
-					directory=dp,
-					prefix=pp,
-					excludeDir=excludeDir,
-					excludeFile=excludeFile,
-					includeDir=includeDir,
-					includeFile=includeFile,
-					returnDirs=returnDirs,
-					returnLinks=returnLinks,
-					followLinks=followLinks,
-					repository=repository
-				)
-			)
+				yield pp
+
+			dp = os.path.join(currentDir, entry)
+			stack.append((dp, pp, iter(listEntries(dp))))
 			continue
 
-		if excludeFile and re.search(excludeFile, entry):
+		if excludeFile and excludeFile.search(entry):
 			if isLink:
-				logger.debug(u"Excluding link '%s'" % entry)
+				logger.debug(u"Excluding link '{0}'", entry)
 			else:
-				logger.debug(u"Excluding file '%s'" % entry)
+				logger.debug(u"Excluding file '{0}'", entry)
 			continue
 
 		if includeFile:
-			if not re.search(includeFile, entry):
+			if not includeFile.search(entry):
 				continue
 			if isLink:
-				logger.debug(u"Including link '%s'" % entry)
+				logger.debug(u"Including link '{0}'", entry)
 			else:
-				logger.debug(u"Including file '%s'" % entry)
-		files.append(pp)
-	return files
+				logger.debug(u"Including file '{0}'", entry)
+		yield pp
 
 
 def isRegularExpressionPattern(object):
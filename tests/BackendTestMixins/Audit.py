@@ -797,6 +797,23 @@ class AuditTestsMixin(AuditHardwareMixin, AuditSoftwareMixin):
         auditHardwares = self.backend.auditHardware_getObjects()
         self.assertEqual(len(auditHardwares), len(auditHardwaresIn) - 2)
 
+    @pytest.mark.requiresHwauditConfigFile
+    def test_insertAndDeleteAuditHardwareWithQuotesAndBackslashes(self):
+        auditHardware = AuditHardware(
+            hardwareClass='COMPUTER_SYSTEM',
+            description=u"it's a \\\\server\\share",
+            vendor=u'"Vendor" \\',
+            model=u"x' or '1'='1",
+        )
+        otherAuditHardware = getAuditHardwares()[0]
+        self.backend.auditHardware_createObjects([auditHardware, otherAuditHardware])
+
+        auditHardwares = self.backend.auditHardware_getObjects(vendor=auditHardware.vendor)
+        self.assertEqual([auditHardware], auditHardwares)
+
+        self.backend.auditHardware_deleteObjects([auditHardware])
+        self.assertEqual([otherAuditHardware], self.backend.auditHardware_getObjects())
+
     @pytest.mark.requiresHwauditConfigFile
     def test_deleteAllAuditHardware(self):
         self.backend.auditHardware_deleteObjects(self.backend.auditHardware_getObjects())
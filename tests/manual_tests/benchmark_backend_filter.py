@@ -0,0 +1,150 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of matching object hashes against a filter.
+
+Compares the matching as done before the introduction of compiled
+filters with a filter that is compiled once per query.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import re
+import time
+
+from OPSI.Backend.Backend import compileFilter
+from OPSI.Object import *  # needed for eval
+from OPSI.Types import forceUnicode, forceUnicodeList
+from OPSI.Util import compareVersions
+
+CLIENTS = 8000
+PRODUCTS = 10
+
+FILTERS = (
+	{'clientId': 'client1*.test.local'},
+	{'productId': ['product1', 'product3', 'product5'], 'type': 'ProductOnClient'},
+	{'installationStatus': 'installed', 'productVersion': '>=1.5'},
+)
+
+
+def legacyObjectHashMatches(objHash, **filter):
+	"""
+	The matching as it was done by `Backend._objectHashMatches`.
+	"""
+	for attribute, value in objHash.iteritems():
+		if not filter.get(attribute):
+			continue
+		matched = False
+
+		filterValues = forceUnicodeList(filter[attribute])
+		if forceUnicodeList(value) == filterValues or forceUnicode(value) in filterValues:
+			matched = True
+		else:
+			for filterValue in filterValues:
+				if attribute == 'type':
+					Class = eval(filterValue)
+					for subClass in Class.subClasses:
+						if subClass == value:
+							matched = True
+							break
+
+					continue
+
+				if isinstance(value, list):
+					if filterValue in value:
+						matched = True
+						break
+
+					continue
+				elif value is None or isinstance(value, bool):
+					continue
+				elif isinstance(value, (float, long, int)) or re.search('^\s*([>=<]+)\s*([\d\.]+)', forceUnicode(filterValue)):
+					operator = '=='
+					v = forceUnicode(filterValue)
+					match = re.search('^\s*([>=<]+)\s*([\d\.]+)', filterValue)
+					if match:
+						operator = match.group(1)
+						v = match.group(2)
+
+					try:
+						matched = compareVersions(value, operator, v)
+						if matched:
+							break
+					except Exception:
+						pass
+
+					continue
+
+				if '*' in filterValue and re.search('^%s$' % filterValue.replace('*', '.*'), value):
+					matched = True
+					break
+
+		if not matched:
+			return False
+
+	return True
+
+
+def createObjectHashes():
+	objectHashes = []
+	for clientIndex in xrange(CLIENTS):
+		for productIndex in xrange(PRODUCTS):
+			objectHashes.append({
+				'type': 'ProductOnClient',
+				'clientId': u'client%d.test.local' % clientIndex,
+				'productId': u'product%d' % productIndex,
+				'productType': u'LocalbootProduct',
+				'productVersion': u'1.%d' % productIndex,
+				'packageVersion': u'1',
+				'installationStatus': (u'installed' if clientIndex % 2 else u'not_installed'),
+				'actionRequest': u'none',
+				'actionProgress': None,
+				'lastAction': None,
+				'modificationTime': None,
+			})
+
+	return objectHashes
+
+
+def main():
+	objectHashes = createObjectHashes()
+	print("Matching {0} object hashes".format(len(objectHashes)))
+
+	for filter in FILTERS:
+		start = time.time()
+		legacyResult = [h for h in objectHashes if legacyObjectHashMatches(h, **filter)]
+		legacyDuration = time.time() - start
+
+		start = time.time()
+		objectHashMatches = compileFilter(**filter)
+		compiledResult = [h for h in objectHashes if objectHashMatches(h)]
+		compiledDuration = time.time() - start
+
+		assert len(legacyResult) == len(compiledResult)
+		print(
+			"{0!r}: {1} matches, legacy {2:.3f}s, compiled {3:.3f}s "
+			"({4:.1f}x)".format(
+				filter, len(compiledResult), legacyDuration, compiledDuration,
+				legacyDuration / compiledDuration
+			)
+		)
+
+
+if __name__ == '__main__':
+	main()
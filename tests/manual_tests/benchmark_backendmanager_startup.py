@@ -0,0 +1,70 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of creating a BackendManager as done for every new session.
+
+The first session has to read the extensions and inspect all methods.
+Following sessions should be able to reuse this.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import os
+import time
+
+from OPSI.Backend.Backend import ConfigDataBackend
+from OPSI.Backend.BackendManager import BackendManager
+
+SESSIONS = 50
+
+EXTENSION_DIR = os.path.join(
+	os.path.dirname(__file__), '..', '..', 'data', 'backendManager', 'extend.d'
+)
+
+
+def createSession(backend):
+	backendManager = BackendManager(
+		backend=backend,
+		extensionConfigDir=EXTENSION_DIR,
+		hostControlSafeBackend=True,
+	)
+	backendManager.backend_getInterface()
+	return backendManager
+
+
+def main():
+	# The data backend does not matter for the time needed to build
+	# the layers around it.
+	backend = ConfigDataBackend()
+
+	start = time.time()
+	createSession(backend)
+	firstDuration = time.time() - start
+
+	start = time.time()
+	for _ in range(SESSIONS):
+		createSession(backend)
+	duration = (time.time() - start) / SESSIONS
+
+	print("First session: {0:.1f}ms".format(firstDuration * 1000))
+	print("Following {0} sessions: {1:.1f}ms per session".format(SESSIONS, duration * 1000))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,114 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of synchronizing a depot to a local directory.
+
+The depot is a local directory that is accessed with a fixed latency
+per request to simulate a remote depot. Every synchronization is done
+twice: the first run downloads all files, the second finds all files
+unchanged.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from OPSI.Util import md5sum
+from OPSI.Util.Repository import DepotToLocalDirectorySychronizer, FileRepository
+
+PRODUCTS = 20
+FILES = 50
+FILE_SIZE = 256 * 1024
+LATENCY = 0.01
+
+
+class LatencyFileRepository(FileRepository):
+	def content(self, source='', recursive=False):
+		time.sleep(LATENCY)
+		return FileRepository.content(self, source, recursive)
+
+	def download(self, source, destination, progressSubject=None, startByteNumber=-1, endByteNumber=-1):
+		time.sleep(LATENCY)
+		return FileRepository.download(self, source, destination, progressSubject, startByteNumber, endByteNumber)
+
+
+def createDepot(depotDir):
+	data = os.urandom(FILE_SIZE)
+	for productNumber in range(PRODUCTS):
+		productId = u'product%d' % productNumber
+		productDir = os.path.join(depotDir, productId)
+		os.makedirs(productDir)
+
+		lines = []
+		for fileNumber in range(FILES):
+			filename = u'file%d.bin' % fileNumber
+			path = os.path.join(productDir, filename)
+			with open(path, 'wb') as f:
+				f.write(data[fileNumber:] + data[:fileNumber])
+			lines.append("f '%s' %d %s" % (filename, FILE_SIZE, md5sum(path)))
+
+		with open(os.path.join(productDir, productId + u'.files'), 'w') as f:
+			f.write('\n'.join(lines))
+
+
+def synchronize(depotDir, localDir, **kwargs):
+	repository = LatencyFileRepository(u'file://%s' % depotDir)
+	start = time.time()
+	DepotToLocalDirectorySychronizer(repository, localDir, **kwargs).synchronize()
+	return time.time() - start
+
+
+def main():
+	tempDir = tempfile.mkdtemp()
+	try:
+		depotDir = os.path.join(tempDir, 'depot')
+		createDepot(depotDir)
+		print(
+			"{0} products with {1} files of {2} kByte, {3:.0f}ms latency".format(
+				PRODUCTS, FILES, FILE_SIZE / 1024, LATENCY * 1000
+			)
+		)
+
+		for (workers, useCacheFile) in ((1, False), (1, True), (4, True), (8, True)):
+			localDir = os.path.join(tempDir, 'local')
+			checksumCacheFile = None
+			if useCacheFile:
+				checksumCacheFile = os.path.join(tempDir, 'checksums')
+
+			firstRun = synchronize(depotDir, localDir, workers=workers, checksumCacheFile=checksumCacheFile)
+			secondRun = synchronize(depotDir, localDir, workers=workers, checksumCacheFile=checksumCacheFile)
+			print(
+				"workers {0}, checksum cache file {1}: first run {2:.2f}s, "
+				"unchanged {3:.2f}s".format(
+					workers, useCacheFile, firstRun, secondRun
+				)
+			)
+
+			shutil.rmtree(localDir)
+			if checksumCacheFile:
+				os.remove(checksumCacheFile)
+	finally:
+		shutil.rmtree(tempDir)
+
+
+if __name__ == '__main__':
+	main()
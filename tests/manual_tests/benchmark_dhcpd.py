@@ -0,0 +1,107 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of adding hosts to the configuration of the DHCPD backend.
+
+The hosts are added one after another and with a single call of
+dhcpd_updateHosts to a configuration that already contains many hosts.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from OPSI.Backend.DHCPD import DHCPDBackend
+from OPSI.Object import OpsiClient
+
+EXISTING_HOSTS = 10000
+NEW_HOSTS = 200
+
+CONFIG = u'''use-host-decl-names on;
+subnet 10.0.0.0 netmask 255.0.0.0 {
+	group {
+		next-server 10.0.0.1;
+		filename "linux/pxelinux.0";
+%s
+	}
+}
+'''
+
+
+def createClients(first, count):
+	clients = []
+	for number in range(first, first + count):
+		clients.append(
+			OpsiClient(
+				id=u'client%d.test.invalid' % number,
+				hardwareAddress=u'00:00:00:%02x:%02x:%02x' % (number >> 16, (number >> 8) & 0xff, number & 0xff),
+				ipAddress=u'10.%d.%d.%d' % (number >> 16, (number >> 8) & 0xff, number & 0xff)
+			)
+		)
+	return clients
+
+
+def createConfig(filename):
+	hosts = []
+	for client in createClients(1, EXISTING_HOSTS):
+		hosts.append(
+			u'\t\thost %s {\n\t\t\tfixed-address %s;\n\t\t\thardware ethernet %s;\n\t\t}' % (
+				client.id.split('.')[0], client.ipAddress, client.hardwareAddress
+			)
+		)
+
+	with open(filename, 'w') as f:
+		f.write(CONFIG % u'\n'.join(hosts))
+
+
+def createBackend(filename):
+	return DHCPDBackend(
+		dhcpdConfigFile=filename,
+		reloadConfigCommand=None,
+		defaultClientParameters={'next-server': '10.0.0.1', 'filename': 'linux/pxelinux.0'}
+	)
+
+
+def main():
+	tempDir = tempfile.mkdtemp()
+	try:
+		filename = os.path.join(tempDir, 'dhcpd.conf')
+		print("{0} existing hosts, adding {1} hosts".format(EXISTING_HOSTS, NEW_HOSTS))
+
+		createConfig(filename)
+		backend = createBackend(filename)
+		start = time.time()
+		for client in createClients(EXISTING_HOSTS + 1, NEW_HOSTS):
+			backend.dhcpd_updateHost(client)
+		print("dhcpd_updateHost: {0:.2f}s".format(time.time() - start))
+
+		createConfig(filename)
+		backend = createBackend(filename)
+		start = time.time()
+		backend.dhcpd_updateHosts(createClients(EXISTING_HOSTS + 1, NEW_HOSTS))
+		print("dhcpd_updateHosts: {0:.2f}s".format(time.time() - start))
+	finally:
+		shutil.rmtree(tempDir)
+
+
+if __name__ == '__main__':
+	main()
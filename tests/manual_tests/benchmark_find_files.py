@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of walking through a directory tree with findFiles.
+
+The tree is walked with scandir, if available, and with the fallback
+that uses one lstat call per entry.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import mock
+
+from OPSI.Util import findFiles
+
+DIRECTORIES = 1000
+FILES_PER_DIRECTORY = 100
+
+
+def createTree(baseDir):
+	for directoryNumber in range(DIRECTORIES):
+		directory = os.path.join(baseDir, 'dir%d' % (directoryNumber % 10), 'sub%d' % directoryNumber)
+		os.makedirs(directory)
+		for fileNumber in range(FILES_PER_DIRECTORY):
+			open(os.path.join(directory, 'file%d' % fileNumber), 'w').close()
+
+
+def main():
+	baseDir = tempfile.mkdtemp()
+	try:
+		createTree(baseDir)
+
+		for useScandir in (True, False):
+			start = time.time()
+			if useScandir:
+				files = findFiles(baseDir)
+			else:
+				with mock.patch('OPSI.Util.scandir', None):
+					files = findFiles(baseDir)
+
+			print(
+				"{0}: {1} entries in {2:.2f}s".format(
+					"scandir" if useScandir else "lstat",
+					len(files), time.time() - start
+				)
+			)
+	finally:
+		shutil.rmtree(baseDir)
+
+
+if __name__ == '__main__':
+	main()
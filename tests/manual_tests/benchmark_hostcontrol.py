@@ -0,0 +1,128 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of calling opsiclientd on many hosts at the same time.
+
+A local HTTPS server acts as opsiclientd of all simulated hosts and
+answers every request after a fixed latency. The rpcs are made with
+different numbers of concurrent connections.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import json
+import os
+import shutil
+import ssl
+import tempfile
+import threading
+import time
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+
+from OpenSSL import crypto
+
+from OPSI.Backend.HostControl import callOpsiclientd, runConcurrently
+
+HOSTS = 2000
+LATENCY = 0.2
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+	daemon_threads = True
+	request_queue_size = 1024
+
+
+class OpsiclientdHandler(BaseHTTPRequestHandler):
+	def do_POST(self):
+		rpc = json.loads(self.rfile.read(int(self.headers.getheader('content-length'))))
+		time.sleep(LATENCY)
+
+		response = json.dumps({'id': rpc['id'], 'result': rpc['params'], 'error': None})
+		self.send_response(200)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(response)))
+		self.end_headers()
+		self.wfile.write(response)
+
+	def log_message(self, format, *args):
+		pass
+
+
+def createCertificateFile(path):
+	key = crypto.PKey()
+	key.generate_key(crypto.TYPE_RSA, 2048)
+
+	certificate = crypto.X509()
+	certificate.get_subject().CN = 'localhost'
+	certificate.set_serial_number(1)
+	certificate.gmtime_adj_notBefore(0)
+	certificate.gmtime_adj_notAfter(3600)
+	certificate.set_issuer(certificate.get_subject())
+	certificate.set_pubkey(key)
+	certificate.sign(key, 'sha256')
+
+	with open(path, 'w') as certFile:
+		certFile.write(crypto.dump_privatekey(crypto.FILETYPE_PEM, key))
+		certFile.write(crypto.dump_certificate(crypto.FILETYPE_PEM, certificate))
+
+
+def main():
+	tempDir = tempfile.mkdtemp()
+	try:
+		certFile = os.path.join(tempDir, 'opsiclientd.pem')
+		createCertificateFile(certFile)
+
+		server = ThreadingHTTPServer(('127.0.0.1', 0), OpsiclientdHandler)
+		server.socket = ssl.wrap_socket(server.socket, certfile=certFile, server_side=True)
+		serverThread = threading.Thread(target=server.serve_forever)
+		serverThread.daemon = True
+		serverThread.start()
+		port = server.server_port
+
+		print("{0} hosts, {1:.0f}ms latency".format(HOSTS, LATENCY * 1000))
+
+		jobs = [
+			(u'host%d.test.invalid' % number, ('127.0.0.1', port, u'', u'secret', u'fireEvent', [u'on_demand'], 30))
+			for number in range(HOSTS)
+		]
+		for maxConnections in (10, 50, 200):
+			start = time.time()
+			firstResult = None
+			errors = 0
+			for (_, success, result) in runConcurrently(callOpsiclientd, jobs, maxConnections):
+				if firstResult is None:
+					firstResult = time.time() - start
+				if not success or result[1]:
+					errors += 1
+
+			print(
+				"max connections {0}: first result after {1:.2f}s, "
+				"all after {2:.2f}s, {3} errors".format(
+					maxConnections, firstResult, time.time() - start, errors
+				)
+			)
+
+		server.shutdown()
+	finally:
+		shutil.rmtree(tempDir)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,123 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of sequential and concurrent calls of the JSONRPCBackend.
+
+A local HTTP server answers every request after a fixed latency.
+The calls are made one after another and through the RpcQueue with
+different sizes of the connection pool.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import json
+import threading
+import time
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+
+from OPSI.Backend.JSONRPC import JSONRPCBackend
+
+CALLS = 200
+LATENCY = 0.02
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+	daemon_threads = True
+
+
+class JsonRpcHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+	# Send each response at once instead of line by line.
+	wbufsize = -1
+
+	def do_POST(self):
+		rpcs = json.loads(self.rfile.read(int(self.headers.getheader('content-length'))))
+		time.sleep(LATENCY)
+
+		if isinstance(rpcs, list):
+			response = [self.answer(rpc) for rpc in rpcs]
+		else:
+			response = self.answer(rpcs)
+		response = json.dumps(response)
+
+		self.send_response(200)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(response)))
+		self.end_headers()
+		self.wfile.write(response)
+
+	@staticmethod
+	def answer(rpc):
+		if rpc['method'] == 'backend_getInterface':
+			result = []
+		else:
+			result = rpc['params']
+
+		return {'id': rpc['id'], 'result': result, 'error': None}
+
+	def log_message(self, format, *args):
+		pass
+
+
+def createBackend(port, **kwargs):
+	return JSONRPCBackend(u'http://127.0.0.1:%d/rpc' % port, **kwargs)
+
+
+def main():
+	server = ThreadingHTTPServer(('127.0.0.1', 0), JsonRpcHandler)
+	serverThread = threading.Thread(target=server.serve_forever)
+	serverThread.daemon = True
+	serverThread.start()
+	port = server.server_port
+
+	print("{0} calls with {1:.0f}ms latency".format(CALLS, LATENCY * 1000))
+
+	backend = createBackend(port)
+	start = time.time()
+	for number in xrange(CALLS):
+		backend._jsonRPC(u'echo', [number])
+	print("sequential: {0:.2f}s".format(time.time() - start))
+	backend.backend_exit()
+
+	for (poolSize, queueSize) in ((1, 10), (4, 1), (4, 10)):
+		backend = createBackend(
+			port,
+			connectionPoolSize=poolSize,
+			rpcQueueSize=queueSize,
+			keepAlive=True
+		)
+		backend.setAsync(True)
+
+		start = time.time()
+		calls = [backend._jsonRPC(u'echo', [number]) for number in xrange(CALLS)]
+		for call in calls:
+			call.waitForResult()
+		print(
+			"async, pool size {0}, queue size {1}: {2:.2f}s".format(
+				poolSize, queueSize, time.time() - start
+			)
+		)
+		backend.stopRpcQueue()
+
+	server.shutdown()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,66 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of log calls below the active log level.
+
+Logs one million debug messages while only notices are written.
+The message is either formatted by the caller with ``%`` or the
+arguments are passed to the logger to be formatted only if needed.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import time
+
+from OPSI.Logger import Logger, LOG_NOTICE
+
+CALLS = 1000000
+
+
+def main():
+	logger = Logger()
+	logger.setConsoleLevel(LOG_NOTICE)
+	logger.setFileLevel(LOG_NOTICE)
+
+	objectId = u'client1.test.local'
+	attributes = {'productId': u'product1', 'installationStatus': u'installed'}
+
+	start = time.time()
+	for _ in xrange(CALLS):
+		logger.debug(u"Updating object %s: %s" % (objectId, attributes))
+	eagerDuration = time.time() - start
+
+	start = time.time()
+	for _ in xrange(CALLS):
+		logger.debug(u"Updating object {0}: {1}", objectId, attributes)
+	lazyDuration = time.time() - start
+
+	start = time.time()
+	for _ in xrange(CALLS):
+		logger.debug2(u"Updating object {0}: {1}", objectId, attributes)
+	debug2Duration = time.time() - start
+
+	print("{0} suppressed calls:".format(CALLS))
+	print("debug, formatted by caller:  {0:.3f}s".format(eagerDuration))
+	print("debug, formatted by logger:  {0:.3f}s".format(lazyDuration))
+	print("debug2, formatted by logger: {0:.3f}s".format(debug2Duration))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,102 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of creating objects from hashes.
+
+Compares the creation as done before the introduction of constructor
+plans with `fromHash` and `fromTrustedHash`.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import time
+
+from OPSI.Object import *  # needed for eval
+from OPSI.Object import decodeIdent
+
+CLIENTS = 5000
+PRODUCTS = 20
+
+
+def legacyFromHash(hash):
+	"""
+	The creation as it was done by `Relationship.fromHash`.
+	"""
+	Class = eval(hash['type'])
+	kwargs = {}
+	decodeIdent(Class, hash)
+	for varname in Class.__init__.func_code.co_varnames[1:]:
+		if varname in hash:
+			kwargs[varname] = hash[varname]
+
+	return Class(**kwargs)
+
+
+def createObjectHashes():
+	objectHashes = []
+	for clientIndex in xrange(CLIENTS):
+		for productIndex in xrange(PRODUCTS):
+			objectHashes.append({
+				'type': 'ProductOnClient',
+				'clientId': u'client%d.test.local' % clientIndex,
+				'productId': u'product%d' % productIndex,
+				'productType': u'LocalbootProduct',
+				'productVersion': u'1.%d' % productIndex,
+				'packageVersion': u'1',
+				'installationStatus': (u'installed' if clientIndex % 2 else u'not_installed'),
+				'actionRequest': u'none',
+				'actionProgress': None,
+				'actionResult': None,
+				'lastAction': None,
+				'targetConfiguration': None,
+				'actionSequence': -1,
+				'modificationTime': '2016-01-02 03:04:05',
+			})
+
+	return objectHashes
+
+
+def main():
+	objectHashes = createObjectHashes()
+	print("Creating {0} objects".format(len(objectHashes)))
+
+	durations = []
+	results = []
+	for name, create in (
+			('legacy', legacyFromHash),
+			('fromHash', ProductOnClient.fromHash),
+			('fromTrustedHash', ProductOnClient.fromTrustedHash)):
+
+		start = time.time()
+		objects = [create(h) for h in objectHashes]
+		duration = time.time() - start
+
+		durations.append(duration)
+		results.append([obj.toHash() for obj in objects])
+		print(
+			"{0}: {1:.3f}s ({2:.1f}x)".format(
+				name, duration, durations[0] / duration
+			)
+		)
+
+	assert results[0] == results[1] == results[2]
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,119 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of the memory used by objects kept in large numbers.
+
+Compares the size of the objects using __slots__ with the size the
+same objects had when their attributes were kept in a __dict__.
+The attribute values themselves are the same in both cases and are
+not counted.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import sys
+
+from OPSI.Object import (AuditHardwareOnHost, AuditSoftwareOnClient,
+	ConfigState, ProductOnClient)
+
+
+class LegacyObject(object):
+	"""
+	An object keeping its attributes in a __dict__ like before.
+	"""
+
+	def __init__(self, attributes):
+		for (attribute, value) in attributes.items():
+			setattr(self, attribute, value)
+
+
+def createObjects():
+	AuditHardwareOnHost.setHardwareConfig([
+		{
+			'Class': {'Opsi': 'COMPUTER_SYSTEM'},
+			'Values': [
+				{'Opsi': name, 'Type': 'varchar(100)'}
+				for name in (
+					'name', 'description', 'vendor', 'model', 'serialNumber',
+					'systemType', 'totalPhysicalMemory', 'dellexpresscode',
+					'sku', 'uuid', 'family', 'version', 'hardwareVersion',
+				)
+			]
+		},
+	])
+
+	return [
+		ProductOnClient(
+			productId='product1', productType='LocalbootProduct',
+			clientId='client1.test.local', installationStatus='installed',
+			actionRequest='none', productVersion='1.0', packageVersion='1',
+			modificationTime='2016-01-02 03:04:05'
+		),
+		ConfigState(
+			configId='opsiclientd.event_gui_startup.active',
+			objectId='client1.test.local', values=[True]
+		),
+		AuditSoftwareOnClient(
+			name='software', version='1.0', subVersion='', language='',
+			architecture='x64', clientId='client1.test.local',
+			uninstallString='uninstall.exe', binaryName='software.exe',
+			firstseen='2016-01-02 03:04:05', lastseen='2016-01-02 03:04:05',
+			state=1, usageFrequency=-1, lastUsed='2016-01-02 03:04:05'
+		),
+		AuditHardwareOnHost(
+			hardwareClass='COMPUTER_SYSTEM', hostId='client1.test.local',
+			name='client1', vendor='Vendor', model='Model',
+			serialNumber='123456', firstseen='2016-01-02 03:04:05',
+			lastseen='2016-01-02 03:04:05', state=1
+		),
+	]
+
+
+def getLegacySize(obj):
+	attributes = obj.toHash()
+	del attributes['type']
+	legacy = LegacyObject(attributes)
+	return sys.getsizeof(legacy) + sys.getsizeof(legacy.__dict__)
+
+
+def getSize(obj):
+	size = sys.getsizeof(obj)
+	if isinstance(obj, AuditHardwareOnHost):
+		# The layout is shared by all objects with the same attributes.
+		size += sys.getsizeof(obj._hardwareValues)
+
+	return size
+
+
+def main():
+	for obj in createObjects():
+		legacySize = getLegacySize(obj)
+		size = getSize(obj)
+
+		print(
+			"{0}: {1} bytes per object before, {2} bytes now "
+			"({3:.0f}% saved)".format(
+				obj.getType(), legacySize, size,
+				100.0 * (legacySize - size) / legacySize
+			)
+		)
+
+
+if __name__ == '__main__':
+	main()
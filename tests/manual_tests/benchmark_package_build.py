@@ -0,0 +1,113 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of building a package with ProductPackageSource.
+
+Reports the time needed for packing and the largest amount of space
+used in the temporary directory while packing.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from OPSI.Util.Product import ProductPackageSource
+
+FILES = 200
+FILE_SIZE = 1024 * 1024
+CONTROL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+	'..', 'testdata', 'util', 'file', 'opsi', 'control_with_german_umlauts')
+
+
+def createPackageSource(sourceDir):
+	os.makedirs(os.path.join(sourceDir, 'OPSI'))
+	shutil.copy(CONTROL_FILE, os.path.join(sourceDir, 'OPSI', 'control'))
+
+	clientDataDir = os.path.join(sourceDir, 'CLIENT_DATA')
+	os.makedirs(clientDataDir)
+	for fileNumber in range(FILES):
+		with open(os.path.join(clientDataDir, 'file%d.bin' % fileNumber), 'wb') as f:
+			# Half random, half compressible
+			f.write(os.urandom(FILE_SIZE // 2) + '\0' * (FILE_SIZE // 2))
+
+
+def getDirectorySize(directory):
+	size = 0
+	for (root, _, files) in os.walk(directory):
+		for filename in files:
+			try:
+				size += os.path.getsize(os.path.join(root, filename))
+			except OSError:
+				pass
+	return size
+
+
+def main():
+	tempDir = tempfile.mkdtemp()
+	try:
+		sourceDir = os.path.join(tempDir, 'source')
+		packTempDir = os.path.join(tempDir, 'tmp')
+		os.mkdir(packTempDir)
+		createPackageSource(sourceDir)
+		print("{0} files of {1} kByte".format(FILES, FILE_SIZE / 1024))
+
+		for format in ('cpio', 'tar'):
+			packageSource = ProductPackageSource(
+				sourceDir, tempDir=packTempDir, format=format, compression='gzip'
+			)
+
+			maximumTempSize = [0]
+			packing = threading.Event()
+
+			def measureTempSize():
+				while not packing.is_set():
+					maximumTempSize[0] = max(maximumTempSize[0], getDirectorySize(packTempDir))
+					time.sleep(0.05)
+
+			measuring = threading.Thread(target=measureTempSize)
+			measuring.start()
+			start = time.time()
+			try:
+				packageSource.pack()
+			except Exception as error:
+				print("{0}: {1}".format(format, error))
+				continue
+			finally:
+				packing.set()
+				measuring.join()
+				packageSource.cleanup()
+
+			print(
+				"{0}: {1:.2f}s, package {2} kByte, temporary files up to {3} kByte".format(
+					format, time.time() - start,
+					os.path.getsize(packageSource.getPackageFile()) / 1024,
+					maximumTempSize[0] / 1024
+				)
+			)
+			os.remove(packageSource.getPackageFile())
+	finally:
+		shutil.rmtree(tempDir)
+
+
+if __name__ == '__main__':
+	main()
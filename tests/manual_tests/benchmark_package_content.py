@@ -0,0 +1,82 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of generating the package content file of a product.
+
+The checksums are calculated in a single process, by one process per
+CPU and taken from a checksum cache after the first run.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import mock
+
+from OPSI.Util import ChecksumCache
+from OPSI.Util.File.Opsi import PackageContentFile
+
+FILES = 400
+FILE_SIZE = 1024 * 1024
+
+
+def createProduct(productDir):
+	data = os.urandom(FILE_SIZE)
+	clientDataFiles = []
+	for fileNumber in range(FILES):
+		filename = u'file%d.bin' % fileNumber
+		with open(os.path.join(productDir, filename), 'wb') as f:
+			f.write(data[fileNumber:] + data[:fileNumber])
+		clientDataFiles.append(filename)
+
+	return clientDataFiles
+
+
+def generate(productDir, clientDataFiles, checksumCache):
+	contentFile = PackageContentFile(os.path.join(productDir, u'product.files'))
+	contentFile.setProductClientDataDir(productDir)
+	contentFile.setClientDataFiles(clientDataFiles)
+	contentFile.setChecksumCache(checksumCache)
+
+	start = time.time()
+	contentFile.generate()
+	return time.time() - start
+
+
+def main():
+	productDir = tempfile.mkdtemp()
+	try:
+		clientDataFiles = createProduct(productDir)
+		print("{0} files of {1} kByte".format(FILES, FILE_SIZE / 1024))
+
+		with mock.patch('OPSI.Util.multiprocessing.cpu_count', return_value=1):
+			print("single process: {0:.2f}s".format(generate(productDir, clientDataFiles, ChecksumCache())))
+
+		checksumCache = ChecksumCache()
+		print("process per CPU: {0:.2f}s".format(generate(productDir, clientDataFiles, checksumCache)))
+		print("unchanged files: {0:.2f}s".format(generate(productDir, clientDataFiles, checksumCache)))
+	finally:
+		shutil.rmtree(productDir)
+
+
+if __name__ == '__main__':
+	main()
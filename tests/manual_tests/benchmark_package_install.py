@@ -0,0 +1,141 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of extracting the data of a package with ProductPackageFile.
+
+The archives are extracted directly from the package file and, for
+comparison, from a temporary copy as done for packages that can not
+be read directly.
+
+:license: GNU Affero General Public License version 3
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import mock
+
+from OPSI.Util.Product import ProductPackageFile, ProductPackageSource
+
+FILES = 200
+FILE_SIZE = 1024 * 1024
+CONTROL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+	'..', 'testdata', 'util', 'file', 'opsi', 'control_with_german_umlauts')
+
+
+def createPackage(tempDir, format):
+	sourceDir = os.path.join(tempDir, 'source')
+	if not os.path.exists(sourceDir):
+		os.makedirs(os.path.join(sourceDir, 'OPSI'))
+		shutil.copy(CONTROL_FILE, os.path.join(sourceDir, 'OPSI', 'control'))
+
+		clientDataDir = os.path.join(sourceDir, 'CLIENT_DATA')
+		os.makedirs(clientDataDir)
+		for fileNumber in range(FILES):
+			with open(os.path.join(clientDataDir, 'file%d.bin' % fileNumber), 'wb') as f:
+				f.write(os.urandom(FILE_SIZE // 2) + '\0' * (FILE_SIZE // 2))
+
+	packageSource = ProductPackageSource(sourceDir, tempDir=tempDir, format=format, compression='gzip')
+	try:
+		packageSource.pack()
+	finally:
+		packageSource.cleanup()
+	return packageSource.getPackageFile()
+
+
+def getDirectorySize(directory):
+	size = 0
+	for (root, _, files) in os.walk(directory):
+		for filename in files:
+			try:
+				size += os.path.getsize(os.path.join(root, filename))
+			except OSError:
+				pass
+	return size
+
+
+def extract(packageFile, tempDir, depotDir):
+	packageFile = ProductPackageFile(packageFile, tempDir=tempDir)
+	packageFile.setClientDataDir(depotDir)
+
+	maximumTempSize = [0]
+	extracting = threading.Event()
+
+	def measureTempSize():
+		while not extracting.is_set():
+			maximumTempSize[0] = max(maximumTempSize[0], getDirectorySize(tempDir))
+			time.sleep(0.05)
+
+	measuring = threading.Thread(target=measureTempSize)
+	measuring.start()
+	start = time.time()
+	try:
+		packageFile.getMetaData()
+		packageFile.extractData()
+	finally:
+		extracting.set()
+		measuring.join()
+		packageFile.cleanup()
+
+	return (time.time() - start, maximumTempSize[0])
+
+
+def main():
+	tempDir = tempfile.mkdtemp()
+	try:
+		print("{0} files of {1} kByte".format(FILES, FILE_SIZE / 1024))
+		for format in ('cpio', 'tar'):
+			try:
+				packageFile = createPackage(tempDir, format)
+			except Exception as error:
+				print("{0}: {1}".format(format, error))
+				continue
+
+			for direct in (False, True):
+				unpackDir = os.path.join(tempDir, 'unpack')
+				depotDir = os.path.join(tempDir, 'depot')
+				os.mkdir(unpackDir)
+				os.mkdir(depotDir)
+				try:
+					if direct:
+						duration, tempSize = extract(packageFile, unpackDir, depotDir)
+					else:
+						with mock.patch('OPSI.Util.Product.getArchiveMembers', side_effect=ValueError('disabled')):
+							duration, tempSize = extract(packageFile, unpackDir, depotDir)
+				finally:
+					shutil.rmtree(unpackDir)
+					shutil.rmtree(depotDir)
+
+				print(
+					"{0}, {1}: {2:.2f}s, temporary files up to {3} kByte".format(
+						format,
+						"directly from package" if direct else "from temporary copy",
+						duration, tempSize / 1024
+					)
+				)
+			os.remove(packageFile)
+	finally:
+		shutil.rmtree(tempDir)
+
+
+if __name__ == '__main__':
+	main()
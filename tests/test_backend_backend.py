@@ -27,9 +27,14 @@ from __future__ import absolute_import
 
 import os.path
 
-from OPSI.Backend.Backend import ExtendedBackend
+from OPSI.Backend.Backend import (Backend, ExtendedBackend,
+    ExtendedConfigDataBackend, compileFilter, _DEPOT_PRODUCT_CACHE,
+    _PRODUCT_SEQUENCE_CACHE)
+from OPSI.Object import (LocalbootProduct, OpsiClient, OpsiDepotserver,
+    ProductDependency, ProductOnClient, ProductOnDepot, UnicodeConfig)
 from OPSI.Types import BackendMissingDataError
 from OPSI.Util import randomString
+from .Backends import getTestBackend
 from .BackendTestMixins.Hosts import getConfigServer
 from .helpers import workInTemporaryDirectory
 
@@ -99,3 +104,214 @@ def fakeCredentialsBackend(configDataBackend):
             yield backend
         finally:
             backend._opsiPasswdFile = originalFile
+
+
+@pytest.mark.parametrize("filter, objHash, expected", [
+    ({}, {'id': 'client.test.local'}, True),
+    ({'id': None}, {'id': 'client.test.local'}, True),
+    ({'id': 'client.test.local'}, {'id': 'client.test.local'}, True),
+    ({'id': ['foo.test.local', 'client.test.local']}, {'id': 'client.test.local'}, True),
+    ({'id': 'client*'}, {'id': 'client.test.local'}, True),
+    ({'id': 'foo*'}, {'id': 'client.test.local'}, False),
+    ({'notInHash': 'foo'}, {'id': 'client.test.local'}, True),
+    ({'type': 'Host'}, {'type': 'OpsiClient'}, True),
+    ({'type': 'Product'}, {'type': 'OpsiClient'}, False),
+    ({'productVersion': '>=1.0'}, {'productVersion': '2.0'}, True),
+    ({'productVersion': '<1.0'}, {'productVersion': '2.0'}, False),
+    ({'priority': 10}, {'priority': 10}, True),
+    ({'priority': '>5'}, {'priority': 10}, True),
+    ({'groups': 'b'}, {'groups': ['a', 'b']}, True),
+    ({'groups': 'c'}, {'groups': ['a', 'b']}, False),
+    ({'editable': True}, {'editable': False}, False),
+    ({'id': 'client*', 'type': 'Product'}, {'id': 'client.test.local', 'type': 'OpsiClient'}, False),
+])
+def testCompiledFilterMatchesObjectHashes(filter, objHash, expected):
+    matches = compileFilter(**filter)
+
+    assert expected == matches(objHash)
+    assert expected == Backend()._objectHashMatches(objHash, **filter)
+
+
+def testCompiledFilterCanBeReused():
+    matches = compileFilter(id=['a*', 'c.test.local'])
+    hosts = [{'id': hostId} for hostId in ('a.test.local', 'b.test.local', 'c.test.local')]
+
+    assert ['a.test.local', 'c.test.local'] == [h['id'] for h in hosts if matches(h)]
+
+
+def testCompiledFilterFailsOnUnknownType():
+    matches = compileFilter(type='NoSuchClass')
+
+    with pytest.raises(Exception):
+        matches({'type': 'OpsiClient'})
+
+
+def fillBackendWithDependentProducts(backend):
+    depot = OpsiDepotserver(id='depotserver1.test.invalid')
+    client = OpsiClient(id='client1.test.invalid')
+    backend.host_createObjects([depot, client])
+
+    products = [
+        LocalbootProduct(id='firstproduct', productVersion='1.0', packageVersion='1', setupScript='setup.opsiscript'),
+        LocalbootProduct(id='secondproduct', productVersion='2.0', packageVersion='1', setupScript='setup.opsiscript'),
+    ]
+    backend.product_createObjects(products)
+    backend.productOnDepot_createObjects([
+        ProductOnDepot(
+            productId=product.id,
+            productType=product.getType(),
+            productVersion=product.productVersion,
+            packageVersion=product.packageVersion,
+            depotId=depot.id
+        )
+        for product in products
+    ])
+
+    dependency = ProductDependency(
+        productId='firstproduct',
+        productVersion='1.0',
+        packageVersion='1',
+        productAction='setup',
+        requiredProductId='secondproduct',
+        requiredAction='setup',
+        requirementType='before'
+    )
+    backend.productDependency_createObjects([dependency])
+
+    backend.config_createObjects(UnicodeConfig(id=u'clientconfig.depot.id', defaultValues=[depot.id]))
+
+    return client, dependency
+
+
+@pytest.yield_fixture
+def dependentProductsBackend():
+    with getTestBackend(extended=True) as backend:
+        yield backend
+
+
+def testAddingDependenciesUsesCacheUntilProductsChange(dependentProductsBackend):
+    backend = dependentProductsBackend
+    client, dependency = fillBackendWithDependentProducts(backend)
+
+    def getActionRequests():
+        poc = ProductOnClient(
+            productId='firstproduct',
+            productType='LocalbootProduct',
+            clientId=client.id,
+            actionRequest='setup'
+        )
+        productOnClients = backend.productOnClient_addDependencies([poc])
+        return dict((poc.productId, poc.actionRequest) for poc in productOnClients)
+
+    assert {'firstproduct': 'setup', 'secondproduct': 'setup'} == getActionRequests()
+    assert _DEPOT_PRODUCT_CACHE
+    assert {'firstproduct': 'setup', 'secondproduct': 'setup'} == getActionRequests()
+
+    backend.productDependency_deleteObjects([dependency])
+    assert not _DEPOT_PRODUCT_CACHE
+    assert {'firstproduct': 'setup'} == getActionRequests()
+
+
+def testGeneratingSequenceUsesCachedOrder(dependentProductsBackend):
+    backend = dependentProductsBackend
+    client, _ = fillBackendWithDependentProducts(backend)
+
+    productOnClients = [
+        ProductOnClient(
+            productId=productId,
+            productType='LocalbootProduct',
+            clientId=client.id,
+            actionRequest='setup'
+        )
+        for productId in ('firstproduct', 'secondproduct')
+    ]
+
+    for _ in range(2):
+        sequence = backend.productOnClient_generateSequence(productOnClients)
+        assert ['secondproduct', 'firstproduct'] == [poc.productId for poc in sorted(sequence, key=lambda poc: poc.actionSequence)]
+
+    assert _PRODUCT_SEQUENCE_CACHE
+
+    backend.product_updateObject(LocalbootProduct(id='firstproduct', productVersion='1.0', packageVersion='1', priority=10))
+    assert not _PRODUCT_SEQUENCE_CACHE
+
+
+def testBulkWritingProductOnClientsPreparesObjects(dependentProductsBackend):
+    backend = dependentProductsBackend
+    client, _ = fillBackendWithDependentProducts(backend)
+
+    backend.productOnClient_bulkInsertObjects([
+        ProductOnClient(
+            productId='firstproduct',
+            productType='LocalbootProduct',
+            clientId=client.id,
+            installationStatus='installed'
+        ),
+        ProductOnClient(
+            productId='secondproduct',
+            productType='LocalbootProduct',
+            clientId=client.id,
+            installationStatus='not_installed',
+            productVersion='2.0',
+            packageVersion='1'
+        ),
+    ])
+
+    productOnClients = dict(
+        (poc.productId, poc)
+        for poc in backend.productOnClient_getObjects(clientId=client.id)
+    )
+    assert '1.0' == productOnClients['firstproduct'].productVersion
+    assert '1' == productOnClients['firstproduct'].packageVersion
+    assert productOnClients['secondproduct'].productVersion is None
+    assert productOnClients['secondproduct'].packageVersion is None
+
+    backend.productOnClient_bulkUpdateObjects([
+        ProductOnClient(
+            productId='firstproduct',
+            productType='LocalbootProduct',
+            clientId=client.id,
+            actionRequest='setup'
+        )
+    ])
+
+    productOnClient = backend.productOnClient_getObjects(clientId=client.id, productId='firstproduct')[0]
+    assert 'setup' == productOnClient.actionRequest
+    assert 'installed' == productOnClient.installationStatus
+    assert '1.0' == productOnClient.productVersion
+
+
+def testCachedOrderDependsOnPrioritiesAndDependencies():
+    calls = []
+
+    def generateProductSequence(products, productDependencies):
+        calls.append(products)
+        return [product.id for product in products]
+
+    def getSequence(priority, requirementType):
+        products = [
+            LocalbootProduct(id='firstproduct', productVersion='1.0', packageVersion='1', priority=priority),
+            LocalbootProduct(id='secondproduct', productVersion='2.0', packageVersion='1'),
+        ]
+        dependencies = [
+            ProductDependency(
+                productId='firstproduct',
+                productVersion='1.0',
+                packageVersion='1',
+                productAction='setup',
+                requiredProductId='secondproduct',
+                requiredAction='setup',
+                requirementType=requirementType
+            )
+        ]
+        return ExtendedConfigDataBackend._getProductSequence(generateProductSequence, products, dependencies)
+
+    getSequence(0, 'before')
+    getSequence(0, 'before')
+    assert 1 == len(calls)
+
+    getSequence(10, 'before')
+    assert 2 == len(calls)
+
+    getSequence(10, 'after')
+    assert 3 == len(calls)
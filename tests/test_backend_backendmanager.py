@@ -61,6 +61,37 @@ class BackendExtensionTestCase(unittest.TestCase):
         bm.testMethod2()
 
 
+class BackendInterfaceCacheTestCase(unittest.TestCase):
+    def testInterfaceIsSharedForSameExtensions(self):
+        with workInTemporaryDirectory() as tempDir:
+            with open(os.path.join(tempDir, 'test.conf'), 'w') as extension:
+                extension.write('def testMethod(self, value):\n\treturn value\n')
+
+            first = BackendManager(backend=ConfigDataBackend(), extensionconfigdir=tempDir)
+            second = BackendManager(backend=ConfigDataBackend(), extensionconfigdir=tempDir)
+
+            self.assertTrue(first.backend_getInterface() is second.backend_getInterface())
+            self.assertTrue('testMethod' in [method['name'] for method in first.backend_getInterface()])
+
+    def testChangedExtensionsAreReadAgain(self):
+        with workInTemporaryDirectory() as tempDir:
+            extensionFile = os.path.join(tempDir, 'test.conf')
+            with open(extensionFile, 'w') as extension:
+                extension.write('def testMethod(self):\n\treturn 1\n')
+
+            bm = BackendManager(backend=ConfigDataBackend(), extensionconfigdir=tempDir)
+            self.assertEquals(1, bm.testMethod())
+
+            with open(extensionFile, 'w') as extension:
+                extension.write('def testMethod(self):\n\treturn 2\n\n')
+                extension.write('def otherMethod(self, value):\n\treturn value\n')
+
+            bm = BackendManager(backend=ConfigDataBackend(), extensionconfigdir=tempDir)
+            self.assertEquals(2, bm.testMethod())
+            self.assertEquals(3, bm.otherMethod(3))
+            self.assertTrue('otherMethod' in [method['name'] for method in bm.backend_getInterface()])
+
+
 class ExtendedBackendManagerTestCase(unittest.TestCase, FileBackendMixin,
         BackendTestsMixin, ProductsOnDepotMixin, ConfigStatesMixin, GroupsMixin):
     """
@@ -30,8 +30,10 @@ import unittest
 from OPSI.Backend.DHCPD import DHCPDBackend
 from OPSI.Object import OpsiClient
 from OPSI.Types import BackendIOError
+from OPSI.Util.File import DHCPDConfFile
 
 from .Backends.DHCPD import DHCPDConfMixin
+from .helpers import mock
 
 
 class DHCPDConfFileTestCase(unittest.TestCase, DHCPDConfMixin):
@@ -188,5 +190,109 @@ class DHCPBackendTestCase(unittest.TestCase, DHCPDConfMixin):
             self.assertFalse(isMacAddressInConfigFile(oldMAC))
 
 
+class DHCPBackendBatchTestCase(unittest.TestCase, DHCPDConfMixin):
+    def setUp(self):
+        self.setUpDHCPDConf()
+
+        self.backend = DHCPDBackend(
+            dhcpdConfigFile=self.dhcpdConfFile,
+            reloadConfigCommand=u'/bin/echo "Reloading dhcpd.conf"',
+            defaultClientParameters={
+                'next-server': '192.168.99.3',
+                'filename': 'linux/pxelinux.0'
+            }
+        )
+
+        self.clients = [
+            OpsiClient(
+                id='client{0}.test.invalid'.format(number),
+                hardwareAddress='00:01:02:03:04:{0:02x}'.format(number),
+                ipAddress='192.168.99.{0}'.format(100 + number),
+            )
+            for number in range(1, 6)
+        ]
+
+    def tearDown(self):
+        del self.backend
+
+        self.tearDownDHCPDConf()
+
+    def getHostsFromConfigFile(self):
+        dhcpdConf = DHCPDConfFile(self.dhcpdConfFile)
+        dhcpdConf.parse()
+        return dict(
+            (client.id.split('.')[0], dhcpdConf.getHost(client.id.split('.')[0]))
+            for client in self.clients
+        )
+
+    def testUpdatingHostsWritesConfigOnce(self):
+        confFile = self.backend._dhcpdConfFile
+        with mock.patch.object(confFile, 'generate', wraps=confFile.generate) as generate:
+            with mock.patch.object(self.backend, '_triggerReload') as triggerReload:
+                self.backend.dhcpd_updateHosts(self.clients)
+
+        self.assertEqual(1, generate.call_count)
+        self.assertEqual(1, triggerReload.call_count)
+
+        for client in self.clients:
+            host = self.getHostsFromConfigFile()[client.id.split('.')[0]]
+            self.assertEqual(client.ipAddress, host['fixed-address'])
+            self.assertEqual('ethernet %s' % client.hardwareAddress, host['hardware'])
+
+    def testUpdatingUnchangedHostsDoesNotWriteConfig(self):
+        self.backend.dhcpd_updateHosts(self.clients)
+
+        confFile = self.backend._dhcpdConfFile
+        with mock.patch.object(confFile, 'generate') as generate:
+            with mock.patch.object(self.backend, '_triggerReload') as triggerReload:
+                self.backend.dhcpd_updateHosts(self.clients)
+
+        self.assertFalse(generate.called)
+        self.assertFalse(triggerReload.called)
+
+    def testUpdatingHostsWithErrors(self):
+        clientWithoutAddress = OpsiClient(
+            id='unknown-client.test.invalid',
+            hardwareAddress='00:99:88:77:77:21'
+        )
+
+        self.assertRaises(
+            Exception,
+            self.backend.dhcpd_updateHosts,
+            [clientWithoutAddress] + self.clients
+        )
+
+        self.assertTrue(all(self.getHostsFromConfigFile().values()))
+
+    def testDeletingHostsWritesConfigOnce(self):
+        self.backend.dhcpd_updateHosts(self.clients)
+
+        confFile = self.backend._dhcpdConfFile
+        with mock.patch.object(confFile, 'generate', wraps=confFile.generate) as generate:
+            with mock.patch.object(self.backend, '_triggerReload') as triggerReload:
+                self.backend.host_deleteObjects(self.clients[:3])
+
+        self.assertEqual(1, generate.call_count)
+        self.assertEqual(1, triggerReload.call_count)
+
+        hosts = self.getHostsFromConfigFile()
+        for client in self.clients[:3]:
+            self.assertEqual(None, hosts[client.id.split('.')[0]])
+        for client in self.clients[3:]:
+            self.assertNotEqual(None, hosts[client.id.split('.')[0]])
+
+    def testChangesOnDiskAreRead(self):
+        self.backend.dhcpd_updateHosts(self.clients[:1])
+
+        dhcpdConf = DHCPDConfFile(self.dhcpdConfFile)
+        dhcpdConf.parse()
+        dhcpdConf.deleteHost('client1')
+        dhcpdConf.generate()
+
+        self.backend.dhcpd_updateHosts(self.clients[:1])
+
+        self.assertNotEqual(None, self.getHostsFromConfigFile()['client1'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -25,9 +25,15 @@ Testing the opsi file backend.
 
 from __future__ import absolute_import
 
-from .helpers import unittest
+import os
+import shutil
 
+from .helpers import mock, unittest
+
+from OPSI.Backend.File import _PARSED_FILES, _parseIniFile
+from OPSI.Object import LocalbootProduct, OpsiClient, ProductOnClient
 from OPSI.Types import BackendConfigurationError
+from OPSI.Util.File import IniFile
 
 from .Backends.File import FileBackendMixin
 from .BackendTestMixins import (ConfigStateTestsMixin, ProductPropertiesTestMixin,
@@ -63,5 +69,153 @@ class FileBackendTestCase(unittest.TestCase, FileBackendMixin,
         self.assertRaises(BackendConfigurationError, self.backend.getRawData, "blabla")
 
 
+class FileBackendParsedFileCacheTestCase(unittest.TestCase, FileBackendMixin):
+    """
+    Testing the caching of parsed files in the file backend.
+    """
+    def setUp(self):
+        self.setUpBackend()
+
+        self.client = OpsiClient(
+            id='cache.test.invalid',
+            description='Cached client',
+        )
+        self.backend.host_insertObject(self.client)
+        self.filename = self.backend._backend._getConfigFile(
+            'OpsiClient', {'id': self.client.id}, 'ini')
+
+    def tearDown(self):
+        self.tearDownBackend()
+
+    def getDescription(self):
+        client = self.backend.host_getObjects(id=self.client.id)[0]
+        return client.getDescription()
+
+    def testUnchangedFileIsParsedOnce(self):
+        _PARSED_FILES.clear()
+
+        with mock.patch('OPSI.Backend.File._parseIniFile', wraps=_parseIniFile) as parse:
+            self.assertEqual('Cached client', self.getDescription())
+            self.assertEqual('Cached client', self.getDescription())
+
+            parsedFiles = [args[0] for (args, _) in parse.call_args_list]
+
+        self.assertEqual(1, parsedFiles.count(self.filename))
+
+    def testWrittenContentIsCached(self):
+        self.client.setDescription('Updated client')
+
+        with mock.patch('OPSI.Backend.File._parseIniFile', wraps=_parseIniFile) as parse:
+            self.backend.host_updateObject(self.client)
+            self.assertEqual('Updated client', self.getDescription())
+
+            parseCalls = [args for (args, _) in parse.call_args_list if args[0] == self.filename]
+
+        # Only the written lines are parsed and the file is not read again.
+        self.assertEqual(1, len(parseCalls))
+        self.assertEqual(2, len(parseCalls[0]))
+
+    def testExternalModificationIsDetected(self):
+        self.assertEqual('Cached client', self.getDescription())
+
+        iniFile = IniFile(filename=self.filename, ignoreCase=False)
+        cp = iniFile.parse()
+        cp.set('info', 'description', 'Changed from outside')
+        iniFile.generate(cp)
+
+        self.assertEqual('Changed from outside', self.getDescription())
+
+    def testRecreatedFileIsDetected(self):
+        self.assertEqual('Cached client', self.getDescription())
+
+        with open(self.filename) as f:
+            content = f.read()
+        os.remove(self.filename)
+        with open(self.filename, 'w') as f:
+            f.write(content.replace('Cached client', 'Stored client'))
+
+        self.assertEqual('Stored client', self.getDescription())
+
+
+class FileBackendDirectoryIndexTestCase(unittest.TestCase, FileBackendMixin):
+    """
+    Testing the index of the directories used by the file backend.
+    """
+    def setUp(self):
+        self.setUpBackend()
+
+        self.clients = [
+            OpsiClient(id='index{0}.test.invalid'.format(number))
+            for number in range(3)
+        ]
+        self.backend.host_createObjects(self.clients)
+
+        self.product = LocalbootProduct('indexed', '1.0', '1')
+        self.backend.product_insertObject(self.product)
+        self.backend.productOnClient_insertObject(
+            ProductOnClient(
+                productId=self.product.id,
+                productType=self.product.getType(),
+                clientId=self.clients[0].id,
+                actionRequest='setup',
+            )
+        )
+
+        # Creating the index
+        self.backend.host_getIdents()
+        self.backend.product_getIdents()
+
+    def tearDown(self):
+        self.tearDownBackend()
+
+    def getClientIds(self, **filter):
+        return set(self.backend.host_getIdents(type='OpsiClient', returnType='unicode', **filter))
+
+    def testFilteringByIdDoesNotListDirectories(self):
+        with mock.patch('OPSI.Backend.File.os.listdir', side_effect=AssertionError('Directory listed')):
+            self.assertEqual(set([self.clients[1].id]), self.getClientIds(id=self.clients[1].id))
+            self.assertEqual(set(), self.getClientIds(id='missing.test.invalid'))
+
+            productOnClients = self.backend.productOnClient_getObjects(clientId=self.clients[0].id)
+            self.assertEqual(1, len(productOnClients))
+            self.assertEqual(self.product.id, productOnClients[0].productId)
+
+            products = self.backend.product_getObjects(id=self.product.id)
+            self.assertEqual(1, len(products))
+
+    def testFilteringWithWildcard(self):
+        self.assertEqual(
+            set(client.id for client in self.clients),
+            self.getClientIds(id='index*.test.invalid')
+        )
+
+    def testIndexIsUpdatedOnWrites(self):
+        newClient = OpsiClient(id='new.test.invalid')
+        clientConfigDir = os.path.dirname(
+            self.backend._backend._getConfigFile('OpsiClient', {'id': newClient.id}, 'ini'))
+
+        with mock.patch('OPSI.Backend.File.os.listdir', wraps=os.listdir) as listdir:
+            self.backend.host_insertObject(newClient)
+            self.assertTrue(newClient.id in self.getClientIds())
+
+            self.backend.host_deleteObjects([self.clients[2]])
+            self.assertFalse(self.clients[2].id in self.getClientIds())
+            self.assertTrue(self.clients[1].id in self.getClientIds())
+
+            listedDirectories = [args[0] for (args, _) in listdir.call_args_list]
+
+        self.assertFalse(clientConfigDir in listedDirectories)
+
+    def testExternalChangesAreDetected(self):
+        filename = self.backend._backend._getConfigFile(
+            'OpsiClient', {'id': self.clients[0].id}, 'ini')
+        copiedFilename = os.path.join(os.path.dirname(filename), 'copied.test.invalid.ini')
+        shutil.copyfile(filename, copiedFilename)
+        self.assertEqual(set(['copied.test.invalid']), self.getClientIds(id='copied.test.invalid'))
+
+        os.remove(copiedFilename)
+        self.assertEqual(set(), self.getClientIds(id='copied.test.invalid'))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -25,10 +25,30 @@ Testing the Host Control backend.
 
 from __future__ import absolute_import
 
+import json
+import os
+import shutil
+import socket
+import ssl
+import tempfile
+import threading
+import time
 import unittest
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+
+from OpenSSL import crypto
+
+from OPSI.Backend.HostControl import (HostControlBackend, callOpsiclientd,
+    compileBroadcastAddresses, createMagicPacket, runConcurrently,
+    sendWakeOnLanPackets)
+from OPSI.Backend.HostControlSafe import HostControlSafeBackend
+from OPSI.Object import OpsiClient
+from OPSI.Types import OpsiTimeoutError
 
 from .Backends.HostControl import HostControlBackendMixin
 from .BackendTestMixins.Clients import ClientsMixin
+from .helpers import mock
 
 
 class HostControlBackendTestCase(unittest.TestCase, HostControlBackendMixin, ClientsMixin):
@@ -52,5 +72,300 @@ class HostControlBackendTestCase(unittest.TestCase, HostControlBackendMixin, Cli
         self.backend.hostControl_shutdown([u'client1.test.invalid'])
 
 
+class StubOpsiclientdServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, certFile, delay=0):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubOpsiclientdHandler)
+        self.socket = ssl.wrap_socket(self.socket, certfile=certFile, server_side=True)
+        self.delay = delay
+
+
+class StubOpsiclientdHandler(BaseHTTPRequestHandler):
+    """
+    Answers every rpc with its parameters as result.
+    """
+    def do_POST(self):
+        rpc = json.loads(self.rfile.read(int(self.headers.getheader('content-length'))))
+        time.sleep(self.server.delay)
+
+        response = json.dumps({'id': rpc['id'], 'result': rpc['params'], 'error': None})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def createCertificateFile(path):
+    key = crypto.PKey()
+    key.generate_key(crypto.TYPE_RSA, 2048)
+
+    certificate = crypto.X509()
+    certificate.get_subject().CN = 'localhost'
+    certificate.set_serial_number(1)
+    certificate.gmtime_adj_notBefore(0)
+    certificate.gmtime_adj_notAfter(3600)
+    certificate.set_issuer(certificate.get_subject())
+    certificate.set_pubkey(key)
+    certificate.sign(key, 'sha256')
+
+    with open(path, 'w') as certFile:
+        certFile.write(crypto.dump_privatekey(crypto.FILETYPE_PEM, key))
+        certFile.write(crypto.dump_certificate(crypto.FILETYPE_PEM, certificate))
+
+
+class HostControlFanOutTestCase(unittest.TestCase, HostControlBackendMixin):
+    """
+    Testing the concurrent calls to opsiclientd.
+    """
+    def setUp(self):
+        self.setUpBackend()
+
+        self.certDir = tempfile.mkdtemp()
+        self.certFile = os.path.join(self.certDir, 'opsiclientd.pem')
+        createCertificateFile(self.certFile)
+
+        self.server = StubOpsiclientdServer(self.certFile)
+        self.serverThread = threading.Thread(target=self.server.serve_forever)
+        self.serverThread.daemon = True
+        self.serverThread.start()
+
+        self.clients = [
+            OpsiClient(
+                id='fanout{0}.test.invalid'.format(number),
+                ipAddress='127.0.0.1',
+                opsiHostKey='{0:032x}'.format(number)
+            )
+            for number in range(10)
+        ]
+        self.backend.host_createObjects(self.clients)
+        self.clientIds = [client.id for client in self.clients]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.certDir)
+        self.tearDownBackend()
+
+    def createHostControlBackend(self, backendClass=HostControlBackend, **kwargs):
+        return backendClass(
+            self.backend._backend,
+            opsiclientdPort=self.server.server_port,
+            **kwargs
+        )
+
+    def testRunningConcurrentlyIsLimitedByMaxConnections(self):
+        lock = threading.Lock()
+        running = [0]
+        maximum = [0]
+
+        def work(number):
+            with lock:
+                running[0] += 1
+                maximum[0] = max(maximum[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return number * 2
+
+        results = list(runConcurrently(work, [(number, (number,)) for number in range(12)], 3))
+
+        self.assertEqual(3, maximum[0])
+        self.assertEqual(
+            sorted((number, True, number * 2) for number in range(12)),
+            sorted(results)
+        )
+
+    def testRunningConcurrentlyReturnsResultsInOrderOfCompletion(self):
+        def work(delay):
+            time.sleep(delay)
+            if not delay:
+                raise ValueError("Failed")
+            return delay
+
+        results = list(runConcurrently(work, [('slow', (0.3,)), ('fast', (0,))], 2))
+
+        self.assertEqual(['fast', 'slow'], [hostId for (hostId, _, _) in results])
+        (_, success, error) = results[0]
+        self.assertFalse(success)
+        self.assertTrue(isinstance(error, ValueError))
+        self.assertEqual(('slow', True, 0.3), results[1])
+
+    def testFiringEventOnAllHosts(self):
+        backend = self.createHostControlBackend(maxConnections=4)
+
+        result = backend.hostControl_fireEvent(u'on_demand', self.clientIds)
+
+        self.assertEqual(set(self.clientIds), set(result))
+        for hostResult in result.values():
+            self.assertEqual({'result': [u'on_demand'], 'error': None}, hostResult)
+
+    def testSafeBackendUsesSameEngine(self):
+        backend = self.createHostControlBackend(HostControlSafeBackend)
+
+        result = backend.hostControlSafe_uptime(self.clientIds[:2])
+
+        self.assertEqual(set(self.clientIds[:2]), set(result))
+        for hostResult in result.values():
+            self.assertEqual({'result': [], 'error': None}, hostResult)
+
+    def testRpcTimesOut(self):
+        self.server.delay = 3
+        backend = self.createHostControlBackend()
+
+        started = time.time()
+        result = backend.hostControl_opsiclientdRpc(u'uptime', hostIds=self.clientIds[:3], timeout=1)
+
+        self.assertTrue(time.time() - started < 3)
+        for hostResult in result.values():
+            self.assertEqual(None, hostResult['result'])
+            self.assertTrue('timed out' in hostResult['error'])
+
+    def testRpcWithoutTimeoutIsLimitedBySocketTimeout(self):
+        self.server.delay = 3
+
+        started = time.time()
+        with mock.patch('OPSI.Backend.HostControl.SOCKET_TIMEOUT_WITHOUT_DEADLINE', 0.5):
+            self.assertRaises(
+                OpsiTimeoutError,
+                callOpsiclientd,
+                '127.0.0.1', self.server.server_port, u'', u'key', u'uptime',
+                timeout=0
+            )
+
+        self.assertTrue(time.time() - started < 3)
+
+    def testReachable(self):
+        backend = self.createHostControlBackend()
+        self.assertEqual(
+            dict((clientId, True) for clientId in self.clientIds),
+            backend.hostControl_reachable(self.clientIds)
+        )
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.assertEqual(
+            dict((clientId, False) for clientId in self.clientIds),
+            backend.hostControl_reachable(self.clientIds, timeout=1)
+        )
+
+
+class WakeOnLanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(('127.0.0.1', 0))
+        self.receiver.settimeout(1)
+        self.port = self.receiver.getsockname()[1]
+
+    def tearDown(self):
+        self.receiver.close()
+
+    def receive(self, count):
+        return [self.receiver.recv(1024) for _ in range(count)]
+
+    def testCreatingMagicPacket(self):
+        packet = createMagicPacket(u'00:11:22:AA:bb:FF')
+
+        self.assertEqual(102, len(packet))
+        self.assertEqual('\xff' * 6 + '\x00\x11\x22\xaa\xbb\xff' * 16, packet)
+
+    def testCreatingMagicPacketFailsWithoutHardwareAddress(self):
+        self.assertRaises(ValueError, createMagicPacket, u'')
+
+    def testBroadcastAddressesFromList(self):
+        getBroadcastAddresses = compileBroadcastAddresses([u'255.255.255.255', u'10.255.255.255'])
+
+        self.assertEqual([u'255.255.255.255', u'10.255.255.255'], getBroadcastAddresses(u'192.168.1.2'))
+        self.assertEqual([u'255.255.255.255', u'10.255.255.255'], getBroadcastAddresses(None))
+
+    def testBroadcastAddressesByNetwork(self):
+        getBroadcastAddresses = compileBroadcastAddresses({
+            u'0.0.0.0/0': [u'255.255.255.255'],
+            u'10.0.0.0/8': [u'10.255.255.255'],
+            u'10.1.0.0/16': [u'10.1.255.255', u'10.1.0.255'],
+            u'192.168.1.0/24': [],
+            u'172.16.0.0/255.255.0.0': [],
+        })
+
+        self.assertEqual([u'10.255.255.255'], getBroadcastAddresses(u'10.2.3.4'))
+        self.assertEqual([u'10.1.255.255', u'10.1.0.255'], getBroadcastAddresses(u'10.1.3.4'))
+        self.assertEqual([u'192.168.1.255'], getBroadcastAddresses(u'192.168.1.20'))
+        self.assertEqual([u'172.16.255.255'], getBroadcastAddresses(u'172.16.8.9'))
+        self.assertEqual([u'255.255.255.255'], getBroadcastAddresses(u'192.168.2.20'))
+        self.assertEqual([u'255.255.255.255'], getBroadcastAddresses(None))
+
+    def testHostsOutsideOfNetworksHaveNoBroadcastAddress(self):
+        getBroadcastAddresses = compileBroadcastAddresses({u'192.168.1.0/24': []})
+
+        self.assertEqual([], getBroadcastAddresses(u'192.168.2.20'))
+        self.assertEqual([], getBroadcastAddresses(None))
+
+    def testSendingPacketsInWaves(self):
+        packets = [
+            (u'host{0}.test.invalid'.format(number), 'packet{0}'.format(number), [u'127.0.0.1'])
+            for number in range(3)
+        ]
+        packets.append((u'nowhere.test.invalid', 'packet', []))
+
+        result = sendWakeOnLanPackets(packets, port=self.port, waves=2, waveInterval=0)
+
+        self.assertEqual(None, result[u'host0.test.invalid'])
+        self.assertEqual(None, result[u'host2.test.invalid'])
+        self.assertTrue(result[u'nowhere.test.invalid'])
+        self.assertEqual(
+            ['packet0', 'packet1', 'packet2'] * 2,
+            self.receive(6)
+        )
+
+    def testSendingPacketsWithRate(self):
+        packets = [
+            (u'host{0}.test.invalid'.format(number), 'packet', [u'127.0.0.1'])
+            for number in range(6)
+        ]
+
+        started = time.time()
+        sendWakeOnLanPackets(packets, port=self.port, rate=20)
+
+        self.assertTrue(time.time() - started >= 0.25)
+        self.assertEqual(6, len(self.receive(6)))
+
+
+class HostControlWakeOnLanTestCase(unittest.TestCase, HostControlBackendMixin):
+    def setUp(self):
+        self.setUpBackend()
+
+    def tearDown(self):
+        self.tearDownBackend()
+
+    def testStartingHosts(self):
+        clients = [
+            OpsiClient(
+                id='wol{0}.test.invalid'.format(number),
+                ipAddress='127.0.0.{0}'.format(number + 1),
+                hardwareAddress='00:00:00:00:00:{0:02x}'.format(number)
+            )
+            for number in range(3)
+        ]
+        clients.append(OpsiClient(id='nomac.test.invalid', ipAddress='127.0.0.1'))
+        self.backend.host_createObjects(clients)
+
+        backend = HostControlBackend(
+            self.backend._backend,
+            broadcastAddresses={u'127.0.0.0/8': [u'127.0.0.1']},
+            wakeOnLanWaves=2,
+            wakeOnLanWaveInterval=0
+        )
+        result = backend.hostControl_start([client.id for client in clients])
+
+        for client in clients[:3]:
+            self.assertEqual({'result': 'sent', 'error': None}, result[client.id])
+        self.assertEqual(None, result['nomac.test.invalid']['result'])
+        self.assertTrue(result['nomac.test.invalid']['error'])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
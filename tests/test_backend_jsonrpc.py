@@ -24,6 +24,10 @@ Testing the JSON-RPC backend.
 """
 from __future__ import absolute_import
 
+import json
+import threading
+import time
+
 from OPSI.Backend.JSONRPC import JSONRPCBackend
 from OPSI.Logger import Logger, LOG_DEBUG, LOG_NONE
 from OPSI.Util.HTTP import deflateEncode, gzipEncode
@@ -95,6 +99,119 @@ class JSONRPCBackendCompressionTestCase(unittest.TestCase):
         self.assertEquals("This is deflated", backend._processResponse(response))
 
 
+class JSONRPCBackendRpcQueueTestCase(unittest.TestCase):
+    def createAsyncBackend(self, request, **kwargs):
+        backend = JSONRPCBackend("localhost", connectoninit=False, **kwargs)
+        backend._request = request
+        backend._connected = True
+        backend.setAsync(True)
+        self.addCleanup(backend.stopRpcQueue)
+        return backend
+
+    @staticmethod
+    def answer(data, skipIds=()):
+        return json.dumps([
+            {'id': rpc['id'], 'result': rpc['params'][0], 'error': None}
+            for rpc in json.loads(data) if rpc['id'] not in skipIds
+        ])
+
+    def testCallsAreBatchedBySize(self):
+        requests = []
+
+        def request(baseUrl, data, retry=True):
+            requests.append(json.loads(data))
+            return self.answer(data)
+
+        backend = self.createAsyncBackend(request, rpcQueueSize=5, rpcQueuePollingTime=30)
+
+        start = time.time()
+        calls = [backend._jsonRPC(u'echo', [number]) for number in range(5)]
+        results = [call.waitForResult() for call in calls]
+
+        self.assertEquals(list(range(5)), results)
+        self.assertEquals(1, len(requests))
+        self.assertEquals(5, len(requests[0]))
+        self.assertTrue(time.time() - start < 10)
+
+    def testBatchIsSentAfterPollingTime(self):
+        backend = self.createAsyncBackend(lambda baseUrl, data, retry=True: self.answer(data), rpcQueueSize=100, rpcQueuePollingTime=0.05)
+
+        self.assertEquals(u'single', backend._jsonRPC(u'echo', [u'single']).waitForResult())
+
+    def testCallbackIsCalledForResult(self):
+        backend = self.createAsyncBackend(lambda baseUrl, data, retry=True: self.answer(data))
+
+        finished = threading.Event()
+        results = []
+
+        def callback(jsonrpc):
+            results.append(jsonrpc.result)
+            finished.set()
+
+        backend._jsonRPC(u'echo', [u'value']).setCallback(callback)
+
+        finished.wait(10)
+        self.assertEquals([u'value'], results)
+
+    def testRequestsAreSentConcurrently(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'maximum': 0}
+        allRunning = threading.Event()
+
+        def request(baseUrl, data, retry=True):
+            with lock:
+                state['running'] += 1
+                state['maximum'] = max(state['maximum'], state['running'])
+                if state['running'] == 3:
+                    allRunning.set()
+
+            allRunning.wait(10)
+            with lock:
+                state['running'] -= 1
+
+            return self.answer(data)
+
+        backend = self.createAsyncBackend(request, rpcQueueSize=1, connectionPoolSize=3)
+
+        calls = [backend._jsonRPC(u'echo', [number]) for number in range(6)]
+        self.assertEquals(list(range(6)), [call.waitForResult() for call in calls])
+        self.assertEquals(3, state['maximum'])
+
+    def testSingleWorkerSendsCallsInOrder(self):
+        requests = []
+
+        def request(baseUrl, data, retry=True):
+            requests.append([rpc['params'][0] for rpc in json.loads(data)])
+            return self.answer(data)
+
+        backend = self.createAsyncBackend(request, rpcQueueSize=3, connectionPoolSize=1)
+
+        calls = [backend._jsonRPC(u'echo', [number]) for number in range(10)]
+        self.assertEquals(list(range(10)), [call.waitForResult() for call in calls])
+        self.assertEquals(list(range(10)), [number for batch in requests for number in batch])
+
+    def testMissingResponseIsAnError(self):
+        def request(baseUrl, data, retry=True):
+            return self.answer(data, skipIds=[json.loads(data)[-1]['id']])
+
+        backend = self.createAsyncBackend(request, rpcQueueSize=2, rpcQueuePollingTime=30)
+
+        first = backend._jsonRPC(u'echo', [1])
+        second = backend._jsonRPC(u'echo', [2])
+
+        self.assertEquals(1, first.waitForResult())
+        self.assertRaises(Exception, second.waitForResult)
+
+    def testStoppingExecutesQueuedCalls(self):
+        backend = self.createAsyncBackend(lambda baseUrl, data, retry=True: self.answer(data), rpcQueueSize=3, rpcQueuePollingTime=30)
+
+        calls = [backend._jsonRPC(u'echo', [number]) for number in range(2)]
+        backend.stopRpcQueue()
+
+        self.assertFalse(backend._rpcQueue.is_alive())
+        self.assertEquals([0, 1], [call.waitForResult() for call in calls])
+
+
 class JSONRPCBackendUsingTestCase(unittest.TestCase, JSONRPCTestCase,
     # ExtendedBackendTestsMixin,
     BackendTestsMixin,
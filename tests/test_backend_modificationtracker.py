@@ -124,6 +124,22 @@ class ModificationTrackerTestCase(unittest.TestCase):
             self.assertEqual(modifications[0]['command'], 'delete', u"Expected command %s, but got '%s'" % ('delete', modifications[0]['command']))
             self.assertEqual(modifications[0]['ident'], host.getIdent(), u"Expected ident %s, but got '%s'" % (host.getIdent(), modifications[0]['ident']))
 
+    def testGettingModificationsAfterId(self):
+        with prepareBackendAndTracker() as (backend, tracker):
+            host = OpsiClient(id='client1.test.invalid')
+            backend.host_insertObject(host)
+            backend.host_updateObject(host)
+            backend.host_deleteObjects(host)
+
+            modifications = tracker.getModifications()
+            self.assertEqual(['insert', 'update', 'delete'], [m['command'] for m in modifications])
+
+            modifications = tracker.getModifications(afterId=modifications[0]['id'])
+            self.assertEqual(['update', 'delete'], [m['command'] for m in modifications])
+
+            modifications = tracker.getModifications(afterId=modifications[-1]['id'])
+            self.assertEqual([], modifications)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -27,11 +27,16 @@ from __future__ import absolute_import
 
 import os
 import sys
+import threading
 import unittest
 
+from OPSI.Backend.Backend import (ExtendedBackend, ExtendedConfigDataBackend,
+    ModificationTrackingBackend)
 from OPSI.Backend.Replicator import BackendReplicator
+from OPSI.Object import OpsiClient
 
 from .Backends import getTestBackend
+from .Backends.SQLite import getSQLiteModificationTracker
 from .BackendTestMixins.Audit import (getAuditHardwares,
     getAuditHardwareOnHost, getAuditSoftwares, getAuditSoftwareOnClient)
 from .BackendTestMixins.Clients import getClients
@@ -81,6 +86,76 @@ class ReplicatorTestCase(unittest.TestCase):
                 self.assertEquals(0, len(writeBackend.auditHardwareOnHost_getObjects()))
                 self.assertEquals(0, len(writeBackend.auditSoftwareOnClient_getObjects()))
 
+    def testParallelReplication(self):
+        with getTestBackend(extended=True) as readBackend:
+            fillBackend(readBackend)
+
+            with getTestBackend() as writeBackend:
+                replicator = BackendReplicator(readBackend, SerializingBackend(writeBackend), workers=4)
+                replicator.replicate()
+
+                self.checkBackendDataIsEqual(readBackend, writeBackend)
+
+    def testReplicationInSmallHostBatches(self):
+        with getTestBackend(extended=True) as readBackend:
+            fillBackend(readBackend)
+
+            with getTestBackend() as writeBackend:
+                replicator = BackendReplicator(readBackend, writeBackend)
+                replicator.HOST_BATCH_SIZE = 1
+                replicator.replicate()
+
+                self.checkBackendDataIsEqual(readBackend, writeBackend)
+
+    def testSingleWorkerReadsFromCallingThread(self):
+        with getTestBackend(extended=True) as readBackend:
+            fillBackend(readBackend)
+
+            with getTestBackend() as writeBackend:
+                threadRecordingBackend = ThreadRecordingBackend(readBackend)
+                replicator = BackendReplicator(threadRecordingBackend, writeBackend)
+                replicator.HOST_BATCH_SIZE = 1
+                replicator.replicate()
+
+                self.assertTrue(threadRecordingBackend.threads)
+                self.assertEquals(set([threading.current_thread()]), threadRecordingBackend.threads)
+                self.checkBackendDataIsEqual(readBackend, writeBackend)
+
+    def testReplicatingModifications(self):
+        with getTestBackend() as baseBackend:
+            trackingBackend = ModificationTrackingBackend(baseBackend)
+            readBackend = ExtendedConfigDataBackend(trackingBackend)
+
+            with getSQLiteModificationTracker() as tracker:
+                trackingBackend.addBackendChangeListener(tracker)
+                fillBackend(readBackend)
+
+                with getTestBackend() as writeBackend:
+                    replicator = BackendReplicator(readBackend, writeBackend, cleanupFirst=False)
+                    lastModification = replicator.replicateModifications(tracker)
+                    self.assertTrue(lastModification > 0)
+                    self.checkBackendDataIsEqual(readBackend, writeBackend)
+
+                    client = readBackend.host_getObjects(type='OpsiClient')[0]
+                    client.setDescription(u'Changed description')
+                    readBackend.host_updateObject(client)
+
+                    productOnClient = readBackend.productOnClient_getObjects()[0]
+                    readBackend.productOnClient_deleteObjects(productOnClient)
+
+                    newClient = OpsiClient(id='newclient.test.invalid')
+                    readBackend.host_insertObject(newClient)
+                    readBackend.host_deleteObjects(newClient)
+                    readBackend.host_insertObject(OpsiClient(id='otherclient.test.invalid'))
+
+                    newLastModification = replicator.replicateModifications(tracker, since=lastModification)
+                    self.assertTrue(newLastModification > lastModification)
+                    self.checkBackendDataIsEqual(readBackend, writeBackend)
+                    self.assertEqual(u'Changed description', writeBackend.host_getObjects(id=client.id)[0].description)
+                    self.assertEqual([], writeBackend.host_getObjects(id='newclient.test.invalid'))
+
+                    self.assertEqual(newLastModification, replicator.replicateModifications(tracker, since=newLastModification))
+
     def checkBackendDataIsEqual(self, first, second, checkAuditData=True):
         self.assertEquals(first.host_getObjects(), second.host_getObjects())
         self.assertEquals(first.product_getObjects(), second.product_getObjects())
@@ -107,6 +182,36 @@ class ReplicatorTestCase(unittest.TestCase):
             self.assertEquals(first.auditSoftwareOnClient_getObjects(), second.auditSoftwareOnClient_getObjects())
 
 
+class SerializingBackend(ExtendedBackend):
+    """
+    Backend allowing calls from multiple threads by executing one at a time.
+    """
+
+    def __init__(self, backend):
+        ExtendedBackend.__init__(self, backend, overwrite=True)
+        self._lock = threading.Lock()
+        self._createInstanceMethods()
+
+    def _executeMethod(self, methodName, **kwargs):
+        with self._lock:
+            return ExtendedBackend._executeMethod(self, methodName, **kwargs)
+
+
+class ThreadRecordingBackend(ExtendedBackend):
+    """
+    Backend remembering the threads it is called from.
+    """
+
+    def __init__(self, backend):
+        ExtendedBackend.__init__(self, backend, overwrite=True)
+        self.threads = set()
+        self._createInstanceMethods()
+
+    def _executeMethod(self, methodName, **kwargs):
+        self.threads.add(threading.current_thread())
+        return ExtendedBackend._executeMethod(self, methodName, **kwargs)
+
+
 def fillBackend(backend, licenseManagementData=False):
     configServer, depotServer, clients = fillBackendWithHosts(backend)
     products = fillBackendWithProducts(backend)
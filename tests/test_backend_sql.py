@@ -28,6 +28,9 @@ import unittest
 
 import OPSI.Backend.SQL as sql
 import OPSI.Object as ob
+from OPSI.Types import BackendBadValueError, BackendReferentialIntegrityError
+
+from .helpers import mock
 
 if sys.version_info > (3, ):
     long = int
@@ -109,6 +112,175 @@ class FilterToSQLTestCase(SQLBackendWithoutConnectionTestCase):
         self.assertEquals(u"(`a` <=> 1)", self.backend._filterToSql({'a': '<=> 1'}))
 
 
+class ParameterizedFilterTestCase(SQLBackendWithoutConnectionTestCase):
+    def testValuesArePassedAsParameters(self):
+        condition, params = self.backend._filterToParameterizedSql({'a': 'foo'})
+        self.assertEquals(u'(`a` = %s)', condition)
+        self.assertEquals([u'foo'], params)
+
+    def testValuesAreNotEscaped(self):
+        condition, params = self.backend._filterToParameterizedSql({'a': "it's"})
+        self.assertEquals(u'(`a` = %s)', condition)
+        self.assertEquals([u"it's"], params)
+
+    def testBoolValuesArePassedAsNumbers(self):
+        condition, params = self.backend._filterToParameterizedSql({'a': [True, False]})
+        self.assertEquals(u'(`a` = %s or `a` = %s)', condition)
+        self.assertEquals([1, 0], params)
+
+    def testNoneHasNoParameter(self):
+        condition, params = self.backend._filterToParameterizedSql({'a': [None]})
+        self.assertEquals(u'(`a` is NULL)', condition)
+        self.assertEquals([], params)
+
+    def testWildcardCreatesLikeParameter(self):
+        condition, params = self.backend._filterToParameterizedSql({'a': '*b_c'})
+        self.assertEquals(u'(`a` LIKE %s)', condition)
+        self.assertEquals([u'%b\\_c'], params)
+
+    def testOperatorValueIsPassedAsNumber(self):
+        condition, params = self.backend._filterToParameterizedSql({'a': '>= 1.5'})
+        self.assertEquals(u'(`a` >= %s)', condition)
+        self.assertEquals([1.5], params)
+
+    def testConditionIsReusedForSameShape(self):
+        first, firstParams = self.backend._filterToParameterizedSql({'a': 'foo'})
+        second, secondParams = self.backend._filterToParameterizedSql({'a': 'bar'})
+
+        self.assertTrue(first is second)
+        self.assertEquals([u'foo'], firstParams)
+        self.assertEquals([u'bar'], secondParams)
+
+    def testPlaceholderOfConnection(self):
+        class QuestionMarkSQL(sql.SQL):
+            PARAMETER_PLACEHOLDER = u'?'
+
+        self.backend._sql = QuestionMarkSQL()
+        condition, params = self.backend._filterToParameterizedSql({'a': 1})
+        self.assertEquals(u'(`a` = ?)', condition)
+        self.assertEquals([1], params)
+
+
+class StatementCreationTestCase(SQLBackendWithoutConnectionTestCase):
+    def testCreatingInsertStatement(self):
+        self.assertEquals(
+            u'INSERT INTO `foo` (`a`, `b`) VALUES (%s, %s);',
+            self.backend._sql.createInsertStatement('foo', ('a', 'b'))
+        )
+
+    def testCreatingUpdateStatement(self):
+        self.assertEquals(
+            u'UPDATE `foo` SET `a` = %s, `b` = %s WHERE `c` = %s;',
+            self.backend._sql.createUpdateStatement('foo', ('a', 'b'), u'`c` = %s')
+        )
+
+    def testRenderingQuery(self):
+        self.assertEquals(
+            u"select * from `foo` where `a` = 'it\\'s' and `b` = 1 and `c` is NULL",
+            self.backend._sql.renderQuery(
+                u"select * from `foo` where `a` = %s and `b` = %s and `c` is NULL",
+                [u"it's", True]
+            )
+        )
+
+    def testRenderingQueryFailsOnParameterMismatch(self):
+        self.assertRaises(ValueError, self.backend._sql.renderQuery, u'`a` = %s', [1, 2])
+
+    def testParametersAreConverted(self):
+        self.assertEquals(1, sql.SQL.toParameter(True))
+        self.assertEquals(u'\xe4', sql.SQL.toParameter('\xc3\xa4'))
+        self.assertEquals(2.5, sql.SQL.toParameter(2.5))
+        self.assertEquals(None, sql.SQL.toParameter(None))
+
+
+class BulkStatementTestCase(SQLBackendWithoutConnectionTestCase):
+    def testCreatingInsertStatementForMultipleRows(self):
+        self.assertEquals(
+            u'INSERT INTO `foo` (`a`, `b`) VALUES (%s, %s), (%s, %s), (%s, %s);',
+            self.backend._sql.createInsertStatement('foo', ('a', 'b'), rowCount=3)
+        )
+
+    def testGroupingByColumns(self):
+        groups = self.backend._sql.groupByColumns([
+            {'a': 1, 'b': u'x'},
+            {'a': 2},
+            {'b': u'y', 'a': True},
+        ])
+
+        self.assertEquals(
+            [(('a', 'b'), [[1, u'x'], [1, u'y']]), (('a', ), [[2]])],
+            groups
+        )
+
+    def testGroupingByColumnsCanSkipNone(self):
+        groups = self.backend._sql.groupByColumns(
+            [{'a': 1, 'b': None}, {'a': 2}],
+            updateWhereNone=False
+        )
+
+        self.assertEquals([(('a', ), [[1], [2]])], groups)
+
+    def testInsertingWithUpdateOnDuplicateKeyRequiresSupport(self):
+        self.assertFalse(self.backend._sql.ON_DUPLICATE_KEY_UPDATE_SUPPORTED)
+        self.assertRaises(
+            BackendBadValueError,
+            self.backend._sql.insertMany, 'foo', [{'a': 1}], updateOnDuplicateKey=True
+        )
+
+    def testInsertingManyFallsBackToSingleInserts(self):
+        inserted = []
+
+        class RecordingSQL(sql.SQL):
+            def insert(self, table, valueHash):
+                inserted.append((table, valueHash))
+
+        RecordingSQL().insertMany('foo', [{'a': 1}, {'a': 2}])
+        self.assertEquals([('foo', {'a': 1}), ('foo', {'a': 2})], inserted)
+
+
+class ReadingRowsByKeyTestCase(SQLBackendWithoutConnectionTestCase):
+    def setUp(self):
+        super(ReadingRowsByKeyTestCase, self).setUp()
+
+        rows = [
+            {'configId': u'a', 'value': 1},
+            {'configId': u'b', 'value': 2},
+            {'configId': u'a', 'value': 3},
+        ]
+        queries = self.queries = []
+
+        class RecordingSQL(sql.SQL):
+            def getSet(self, query, params=None):
+                queries.append((query, params))
+                return [row for row in rows if row['configId'] in params]
+
+        self.backend._sql = RecordingSQL()
+
+    def testRowsAreGroupedByKey(self):
+        result = self.backend._getRowsByKey('CONFIG_VALUE', 'configId', ['a', 'b', 'c'])
+
+        self.assertEquals([1, 3], [row['value'] for row in result['a']])
+        self.assertEquals([2], [row['value'] for row in result['b']])
+        self.assertTrue('c' not in result)
+        self.assertEquals(1, len(self.queries))
+        self.assertTrue(u'`configId` in (%s, %s, %s)' in self.queries[0][0])
+
+    def testKeysAreQueriedInBatches(self):
+        self.backend._MAX_KEYS_PER_QUERY = 2
+        self.backend._getRowsByKey('CONFIG_VALUE', 'configId', ['a', 'b', 'c', 'a'])
+
+        self.assertEquals(2, len(self.queries))
+        queriedKeys = set()
+        for _, params in self.queries:
+            self.assertTrue(len(params) <= 2)
+            queriedKeys.update(params)
+        self.assertEquals(set(['a', 'b', 'c']), queriedKeys)
+
+    def testNoQueryWithoutKeys(self):
+        self.assertEquals({}, self.backend._getRowsByKey('CONFIG_VALUE', 'configId', []))
+        self.assertEquals([], self.queries)
+
+
 class QueryCreationTestCase(SQLBackendWithoutConnectionTestCase):
     def testCreatingQueryIncludesTableName(self):
         self.assertTrue("foo" in self.backend._createQuery('foo'))
@@ -215,6 +387,21 @@ class UniqueConditionTestCase(SQLBackendWithoutConnectionTestCase):
         self.assertEquals('`param` = 4', self.backend._uniqueCondition(FooParam(long(4))))
 
 
+class UniqueParameterizedConditionTestCase(SQLBackendWithoutConnectionTestCase):
+    def testHostObject(self):
+        host = ob.Host('foo.bar.baz')
+        self.assertEquals(
+            (u"`hostId` = %s", [u'foo.bar.baz']),
+            self.backend._uniqueParameterizedCondition(host)
+        )
+
+    def testConditionForHostGroupHasTypeParameter(self):
+        group = ob.HostGroup(id='group1')
+        condition, params = self.backend._uniqueParameterizedCondition(group)
+        self.assertEquals(u"`groupId` = %s and `type` = %s", condition)
+        self.assertEquals([u'group1', 'HostGroup'], params)
+
+
 class UniqueAuditHardwareConditionTestCase(SQLBackendWithoutConnectionTestCase):
     def testCreatingUniqueHardwareConditionIgnoresHardwareClassAndType(self):
         hwDict = {
@@ -222,7 +409,7 @@ class UniqueAuditHardwareConditionTestCase(SQLBackendWithoutConnectionTestCase):
             "type": 'def'
         }
 
-        self.assertEquals('', self.backend._uniqueAuditHardwareCondition(hwDict))
+        self.assertEquals((u'', []), self.backend._uniqueAuditHardwareCondition(hwDict))
 
     def testCreatingConditionWithNoneTypes(self):
         testDict = {
@@ -230,10 +417,11 @@ class UniqueAuditHardwareConditionTestCase(SQLBackendWithoutConnectionTestCase):
             'def': [None]
         }
 
-        condition = self.backend._uniqueAuditHardwareCondition(testDict)
+        condition, params = self.backend._uniqueAuditHardwareCondition(testDict)
         self.assertTrue(u'`abc` is NULL' in condition)
         self.assertTrue(u' and ' in condition)
         self.assertTrue(u'`def` is NULL' in condition)
+        self.assertEquals([], params)
 
     def testAddingMultipleParametersWithAnd(self):
         testDict = {
@@ -241,7 +429,7 @@ class UniqueAuditHardwareConditionTestCase(SQLBackendWithoutConnectionTestCase):
             'def': [None]
         }
 
-        condition = self.backend._uniqueAuditHardwareCondition(testDict)
+        condition, _ = self.backend._uniqueAuditHardwareCondition(testDict)
         self.assertTrue(u' and ' in condition)
         self.assertFalse(condition.strip().endswith('and'))
         self.assertFalse(condition.strip().startswith('and'))
@@ -256,14 +444,71 @@ class UniqueAuditHardwareConditionTestCase(SQLBackendWithoutConnectionTestCase):
             "string": "caramba",
         }
 
-        condition = self.backend._uniqueAuditHardwareCondition(testDict)
+        condition, params = self.backend._uniqueAuditHardwareCondition(testDict)
         self.assertTrue(u' and ' in condition)
-        self.assertTrue(u'`int` = 1' in condition)
-        self.assertTrue(u'`float` = 2.3' in condition)
-        self.assertTrue(u'`long` = 4' in condition)
-        self.assertTrue(u'`bool_false` = False' in condition)
-        self.assertTrue(u'`bool_true` = True' in condition)
-        self.assertTrue(u"`string` = 'caramba'" in condition)
+        for attribute in testDict:
+            self.assertTrue(u'`{0}` = %s'.format(attribute) in condition)
+        self.assertEquals(
+            sorted([1, 2.3, 4, 1, 0, u'caramba']),
+            sorted(params)
+        )
+
+    def testValuesWithQuotesArePassedAsParameters(self):
+        testDict = {
+            "name": u"it's a \\server",
+            "model": u'100% *',
+        }
+
+        condition, params = self.backend._uniqueAuditHardwareCondition(testDict)
+        self.assertFalse(u"it's" in condition)
+        self.assertEquals(2, condition.count(u'%s'))
+        self.assertEquals(sorted([u"it's a \\server", u'100% *']), sorted(params))
+
+
+class UniqueAuditHardwareOnHostConditionTestCase(SQLBackendWithoutConnectionTestCase):
+    def setUp(self):
+        super(UniqueAuditHardwareOnHostConditionTestCase, self).setUp()
+        self.backend._auditHardwareConfig = {
+            'COMPUTER_SYSTEM': {
+                'name': {'Type': 'varchar(100)', 'Scope': 'g'},
+                'serialNumber': {'Type': 'varchar(50)', 'Scope': 'i'},
+            }
+        }
+
+    def testValuesArePassedAsParameters(self):
+        auditHardwareOnHost = {
+            'hardwareClass': 'COMPUTER_SYSTEM',
+            'hostId': 'client.test.invalid',
+            'name': 'Model 100% compatible',
+            'serialNumber': "50% it's",
+        }
+
+        with mock.patch.object(self.backend, '_getHardwareIds', return_value=[3, 5]):
+            condition, params = self.backend._uniqueAuditHardwareOnHostCondition(auditHardwareOnHost)
+
+        self.assertFalse('client.test.invalid' in condition)
+        self.assertFalse('50' in condition)
+        self.assertEquals(4, condition.count(u'%s'))
+        self.assertTrue(condition.endswith(u'(`hardware_id` = %s or `hardware_id` = %s)'))
+        self.assertEquals(
+            sorted([u'client.test.invalid', u"50% it's"]),
+            sorted(params[:2])
+        )
+        self.assertEquals([3, 5], params[2:])
+
+    def testMissingHardwareFails(self):
+        auditHardwareOnHost = {
+            'hardwareClass': 'COMPUTER_SYSTEM',
+            'hostId': 'client.test.invalid',
+            'name': 'foo',
+        }
+
+        with mock.patch.object(self.backend, '_getHardwareIds', return_value=[]):
+            self.assertRaises(
+                BackendReferentialIntegrityError,
+                self.backend._uniqueAuditHardwareOnHostCondition,
+                auditHardwareOnHost
+            )
 
 
 class AvoidingMaliciousQueryTestCase(SQLBackendWithoutConnectionTestCase):
@@ -27,6 +27,7 @@ from __future__ import absolute_import
 
 import os
 import sys
+import threading
 import warnings
 from contextlib import contextmanager
 from io import BytesIO as StringIO
@@ -265,6 +266,146 @@ def testSettingLogPathToNone(logger):
 	logger.setLogFile(None)
 
 
+def readLog(logger, path):
+	logger.flush()
+	with open(path) as logFile:
+		return logFile.read().decode('utf-8').splitlines()
+
+
+def testLoggingToFileFromManyThreads(logger):
+	with workInTemporaryDirectory() as tempDir:
+		logPath = os.path.join(tempDir, 'test.log')
+		logger.setLogFile(logPath)
+		logger.setFileFormat(u'%M')
+		logger.setFileLevel(OPSI.Logger.LOG_DEBUG)
+
+		def logMessages(prefix):
+			for index in range(200):
+				logger.info(u'{0} {1} ä', prefix, index)
+
+		threads = [
+			threading.Thread(target=logMessages, args=(prefix, ))
+			for prefix in ('a', 'b', 'c', 'd')
+		]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		lines = readLog(logger, logPath)
+		assert 800 == len(lines)
+		for prefix in ('a', 'b', 'c', 'd'):
+			messages = [line for line in lines if line.startswith(prefix)]
+			assert [u'{0} {1} ä'.format(prefix, index) for index in range(200)] == messages
+
+
+def testLogFilesForThreadsAndObjects(logger):
+	class Component(object):
+		def work(self):
+			logger.notice(u'object message')
+
+	with workInTemporaryDirectory() as tempDir:
+		defaultLog = os.path.join(tempDir, 'default.log')
+		threadLog = os.path.join(tempDir, 'thread.log')
+		objectLog = os.path.join(tempDir, 'object.log')
+
+		logger.setLogFile(defaultLog)
+		logger.setFileFormat(u'%M')
+		logger.setFileLevel(OPSI.Logger.LOG_NOTICE)
+
+		def logInThread():
+			logger.setLogFile(threadLog, currentThread=True)
+			logger.notice(u'thread message')
+			logger.exit()
+
+		thread = threading.Thread(target=logInThread)
+		thread.start()
+		thread.join()
+
+		component = Component()
+		logger.setLogFile(objectLog, object=component)
+		component.work()
+		logger.exit(object=component)
+		logger.notice(u'default message')
+
+		assert [u'thread message'] == readLog(logger, threadLog)
+		assert [u'object message'] == readLog(logger, objectLog)
+		assert [u'default message'] == readLog(logger, defaultLog)
+
+
+def testLogFileIsOpenedAgainAfterRotation(logger):
+	with workInTemporaryDirectory() as tempDir:
+		logPath = os.path.join(tempDir, 'test.log')
+		logger.setLogFile(logPath)
+		logger.setFileFormat(u'%M')
+		logger.setFileLevel(OPSI.Logger.LOG_NOTICE)
+
+		logger.notice(u'first')
+		logger.flush()
+		os.rename(logPath, logPath + '.1')
+
+		logger.notice(u'second')
+
+		assert [u'first'] == readLog(logger, logPath + '.1')
+		assert [u'second'] == readLog(logger, logPath)
+
+
+def testWritingToNewFileIsNotBlockedByLockedFile():
+	writer = OPSI.Logger._LogFileWriter()
+	locked = threading.Event()
+	release = threading.Event()
+
+	def lockFile(logFile):
+		locked.set()
+		release.wait(5)
+		return True
+
+	with workInTemporaryDirectory() as tempDir:
+		lockedPath = os.path.join(tempDir, 'locked.log')
+		newPath = os.path.join(tempDir, 'new.log')
+		try:
+			with mock.patch('OPSI.Logger._lockFile', lockFile):
+				thread = threading.Thread(target=writer._writeFile, args=(lockedPath, [u'waiting\n']))
+				thread.start()
+				assert locked.wait(5)
+
+				newFileWriter = threading.Thread(target=writer.write, args=(newPath, u'new\n'))
+				newFileWriter.start()
+				newFileWriter.join(1)
+				assert not newFileWriter.is_alive()
+				assert os.path.exists(newPath)
+
+				release.set()
+				thread.join()
+		finally:
+			writer.close()
+
+
+def testMessagesAreDroppedIfFileStaysLocked():
+	writer = OPSI.Logger._LogFileWriter()
+	with workInTemporaryDirectory() as tempDir:
+		logPath = os.path.join(tempDir, 'test.log')
+		try:
+			with mock.patch('OPSI.Logger._lockFile', return_value=False):
+				writer._writeFile(logPath, [u'dropped\n'])
+		finally:
+			writer.close()
+
+		with open(logPath) as logFile:
+			assert '' == logFile.read()
+
+
+def testFlushGivesUpOnFullQueue():
+	writer = OPSI.Logger._LogFileWriter()
+	writer._thread = mock.Mock()
+	writer._queue = mock.Mock()
+	writer._queue.put.side_effect = OPSI.Logger.queue.Full
+
+	writer.flush()
+
+	writer._queue.put.assert_called_once_with(mock.ANY, True, 5)
+
+
 def testCallingLogMethods(logger):
 	logger.confidential('test message')
 	logger.debug2('test message')
@@ -335,3 +476,60 @@ def testLoggerDoesFormattingIfMessageWillGetLogged(loglevel, function_name):
 
 	print("Messages: {0!r}".format(messages))
 	assert 'This 1.0 must be shown here: many kwargs' in messages
+
+
+@pytest.mark.parametrize("logLevel", LOGGING_LEVELS)
+def testIsEnabledForFollowsHighestOutputLevel(logger, logLevel):
+	assert not logger.isEnabledFor(logLevel)
+
+	logger.setFileLevel(logLevel)
+	assert logger.isEnabledFor(logLevel)
+	assert logger.isEnabledFor(OPSI.Logger.LOG_ESSENTIAL)
+
+	if logLevel < OPSI.Logger.LOG_CONFIDENTIAL:
+		assert not logger.isEnabledFor(logLevel + 1)
+
+	logger.setFileLevel(OPSI.Logger.LOG_NONE)
+	assert not logger.isEnabledFor(logLevel)
+
+
+def testSuppressedMessagesAreNotFormatted(logger):
+	class FormatSpy(object):
+		def __format__(self, spec):
+			raise AssertionError("Formatted a suppressed message.")
+
+	logger.setConsoleLevel(OPSI.Logger.LOG_NOTICE)
+
+	with mock.patch.object(logger, 'log') as logMethod:
+		logger.debug(u"Value: {0}", FormatSpy())
+		logger.debug2(u"Value: {0}", FormatSpy())
+		logger.info(u"Value: {0}", FormatSpy())
+
+		assert not logMethod.called
+
+	with catchMessages() as messageBuffer:
+		logger.info(u"Value: {0}", FormatSpy())
+
+	assert not messageBuffer.getvalue()
+
+
+def testMessageWithoutArgumentsIsLoggedVerbatim(logger):
+	logger.setConsoleLevel(OPSI.Logger.LOG_DEBUG)
+
+	with catchMessages() as messageBuffer:
+		logger.debug(u"Filter: {'productId': u'{0}'}")
+
+	assert u"Filter: {'productId': u'{0}'}" in messageBuffer.getvalue()
+
+
+def testLoggerHandlesShareState():
+	first = OPSI.Logger.Logger()
+	second = OPSI.Logger.Logger()
+
+	originalLevel = first.getConsoleLevel()
+	try:
+		first.setConsoleLevel(OPSI.Logger.LOG_DEBUG)
+		assert second.getConsoleLevel() == OPSI.Logger.LOG_DEBUG
+		assert second.isEnabledFor(OPSI.Logger.LOG_DEBUG)
+	finally:
+		first.setConsoleLevel(originalLevel)
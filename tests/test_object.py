@@ -25,11 +25,13 @@ Testing OPSI.Objects
 
 from __future__ import absolute_import, print_function
 
+import pickle
 import unittest
 
-from OPSI.Object import (AuditHardwareOnHost, Host, LocalbootProduct,
-    OpsiConfigserver, OpsiDepotserver, Product, ProductDependency,
-    UnicodeConfig, getPossibleClassAttributes, mandatoryConstructorArgs)
+from OPSI.Object import (AuditHardwareOnHost, AuditSoftwareOnClient,
+    BoolConfig, ConfigState, Host, LocalbootProduct, OpsiConfigserver, OpsiDepotserver,
+    Product, ProductDependency, ProductOnClient, UnicodeConfig,
+    getObjectClass, getPossibleClassAttributes, mandatoryConstructorArgs)
 
 from .helpers import mock
 
@@ -193,6 +195,31 @@ class AuditHardwareOnHostTestCase(unittest.TestCase):
         self.ahoh.name = "Ünicöde name."
         self.ahoh.__unicode__()
 
+    def testHardwareAttributesAreAccessible(self):
+        self.assertEqual(u'Desktop', self.ahoh.systemType)
+        self.assertEqual(u'Desktop', self.ahoh.toHash()['systemType'])
+        self.assertRaises(AttributeError, getattr, self.ahoh, 'unknownAttribute')
+
+        self.ahoh.systemType = u'Notebook'
+        self.ahoh.someAttribute = 1
+        hash = self.ahoh.toHash()
+        self.assertEqual(u'Notebook', hash['systemType'])
+        self.assertEqual(1, hash['someAttribute'])
+
+    def testObjectsWithSameAttributesShareTheLayout(self):
+        other = AuditHardwareOnHost(
+            hostId="client2.test.local",
+            hardwareClass='COMPUTER_SYSTEM',
+            description="Other description",
+            vendor="Vendor",
+            model="Model",
+            serialNumber='1234',
+            systemType='Notebook',
+            totalPhysicalMemory=1073741824
+        )
+
+        self.assertTrue(self.ahoh._hardwareLayout is other._hardwareLayout)
+
 
 class HelpfulErrorMessageWhenCreationFromHashFailsTestCase(unittest.TestCase):
     """
@@ -352,3 +379,195 @@ class ProductTestCase(unittest.TestCase):
 
         self.assertEqual(newName, nameFromProd)
         self.assertEqual(128, len(nameFromProd))
+
+
+class GetObjectClassTestCase(unittest.TestCase):
+    def testGettingClassByName(self):
+        self.assertEqual(ProductOnClient, getObjectClass('ProductOnClient'))
+        self.assertEqual(LocalbootProduct, getObjectClass(u'LocalbootProduct'))
+
+    def testUnknownTypesAreRejected(self):
+        self.assertRaises(NameError, getObjectClass, 'NoSuchObject')
+        self.assertRaises(NameError, getObjectClass, 'forceUnicode')
+        self.assertRaises(NameError, getObjectClass, '__import__("os")')
+
+
+class FromTrustedHashTestCase(unittest.TestCase):
+    """
+    Objects created from trusted hashes must equal the ones created
+    through the validating constructor.
+    """
+
+    def testProductOnClient(self):
+        hashes = [
+            {
+                'type': 'ProductOnClient',
+                'clientId': u'client1.test.invalid',
+                'productId': u'product1',
+                'productType': u'LocalbootProduct',
+                'installationStatus': u'installed',
+                'actionRequest': u'none',
+                'productVersion': u'1.0',
+                'packageVersion': u'2',
+                'modificationTime': '2016-01-02 03:04:05',
+            },
+            {
+                'type': 'ProductOnClient',
+                'clientId': u'client2.test.invalid',
+                'productId': u'product2',
+                'productType': u'NetbootProduct',
+                'actionProgress': None,
+            },
+        ]
+
+        for hash in hashes:
+            trusted = ProductOnClient.fromTrustedHash(hash)
+            validated = ProductOnClient.fromHash(hash)
+
+            self.assertEqual(ProductOnClient, trusted.__class__)
+            self.assertEqual(validated.toHash(), trusted.toHash())
+
+        self.assertTrue(isinstance(ProductOnClient.fromTrustedHash(hashes[0]).getModificationTime(), unicode))
+
+    def testAuditSoftwareOnClient(self):
+        hash = {
+            'type': 'AuditSoftwareOnClient',
+            'clientId': u'client1.test.invalid',
+            'name': u'software',
+            'version': u'1.0',
+            'subVersion': u'',
+            'language': u'',
+            'architecture': u'x64',
+            'state': 1,
+            'usageFrequency': -1,
+            'firstseen': u'2016-01-02 03:04:05',
+        }
+
+        trusted = AuditSoftwareOnClient.fromTrustedHash(hash)
+        self.assertEqual(AuditSoftwareOnClient.fromHash(hash).toHash(), trusted.toHash())
+
+    def testMissingTypeUsesCalledClass(self):
+        poc = ProductOnClient.fromTrustedHash({
+            'clientId': u'client1.test.invalid',
+            'productId': u'product1',
+            'productType': u'LocalbootProduct',
+        })
+
+        self.assertEqual(ProductOnClient, poc.__class__)
+
+    def testMissingMandatoryValuesAreReported(self):
+        try:
+            ProductOnClient.fromTrustedHash({
+                'type': 'ProductOnClient',
+                'clientId': u'client1.test.invalid',
+            })
+            self.fail('Should not get here.')
+        except TypeError as typo:
+            self.assertTrue('productId' in str(typo))
+            self.assertTrue('productType' in str(typo))
+
+    def testMutableDefaultsAreNotShared(self):
+        first = BoolConfig.fromTrustedHash({'type': 'BoolConfig', 'id': u'first'})
+        second = BoolConfig.fromTrustedHash({'type': 'BoolConfig', 'id': u'second'})
+
+        self.assertEqual(BoolConfig(id=u'first').toHash(), first.toHash())
+        self.assertEqual(BoolConfig(id=u'second').getPossibleValues(), second.getPossibleValues())
+        self.assertFalse(first.getPossibleValues() is second.getPossibleValues())
+
+
+class SlottedObjectsTestCase(unittest.TestCase):
+    """
+    Objects using __slots__ must behave like the ones using a __dict__.
+    """
+
+    def setUp(self):
+        self.objects = [
+            ProductOnClient(
+                productId='product1', productType='LocalbootProduct',
+                clientId='client1.test.invalid', actionRequest='setup',
+                modificationTime='2016-01-02 03:04:05'
+            ),
+            ConfigState(
+                configId='some.config', objectId='client1.test.invalid',
+                values=[True]
+            ),
+            AuditSoftwareOnClient(
+                name='software', version='1.0', subVersion='', language='',
+                architecture='x64', clientId='client1.test.invalid',
+                state=1
+            ),
+            AuditHardwareOnHost(
+                hardwareClass='COMPUTER_SYSTEM', hostId='client1.test.invalid',
+                name='client1', serialNumber='1234', state=1
+            ),
+        ]
+
+    def testNoInstanceDict(self):
+        for obj in self.objects:
+            self.assertFalse(hasattr(obj, '__dict__'), obj)
+
+    def testToHashContainsAllAttributes(self):
+        poc = self.objects[0]
+        self.assertEqual(
+            {
+                'type': u'ProductOnClient',
+                'productId': u'product1',
+                'productType': u'LocalbootProduct',
+                'clientId': u'client1.test.invalid',
+                'targetConfiguration': None,
+                'installationStatus': None,
+                'actionRequest': u'setup',
+                'lastAction': None,
+                'actionProgress': None,
+                'actionResult': None,
+                'productVersion': None,
+                'packageVersion': None,
+                'modificationTime': u'2016-01-02 03:04:05',
+                'actionSequence': -1,
+            },
+            poc.toHash()
+        )
+
+    def testGeneratedDefaultIsKept(self):
+        poc = self.objects[0]
+        self.assertFalse(poc.isGeneratedDefault())
+        self.assertTrue('_isGeneratedDefault' not in poc.toHash())
+
+        poc.setGeneratedDefault(True)
+        self.assertTrue(poc.isGeneratedDefault())
+        self.assertTrue(poc.toHash()['_isGeneratedDefault'])
+        self.assertNotEqual(poc, poc.clone())
+
+    def testCloningAndPickling(self):
+        for obj in self.objects:
+            self.assertEqual(obj.toHash(), obj.clone().toHash())
+            for protocol in (0, pickle.HIGHEST_PROTOCOL):
+                self.assertEqual(
+                    obj.toHash(),
+                    pickle.loads(pickle.dumps(obj, protocol)).toHash()
+                )
+
+    def testUpdate(self):
+        poc = self.objects[0]
+        update = ProductOnClient(
+            productId='product1', productType='LocalbootProduct',
+            clientId='client1.test.invalid', installationStatus='installed'
+        )
+
+        poc.update(update, updateWithNoneValues=False)
+        self.assertEqual(u'installed', poc.installationStatus)
+        self.assertEqual(u'setup', poc.actionRequest)
+
+        poc.update(update)
+        self.assertEqual(None, poc.actionRequest)
+
+    def testEmptyValues(self):
+        for obj in self.objects:
+            identAttributes = obj.getIdentAttributes()
+            obj.emptyValues()
+
+            for (attribute, value) in obj.toHash().items():
+                if attribute != 'type' and attribute not in identAttributes:
+                    self.assertEqual(None, value, attribute)
+
+            self.assertEqual(obj.getIdent(), obj.clone().getIdent())
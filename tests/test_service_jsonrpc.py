@@ -24,7 +24,7 @@ from __future__ import absolute_import, print_function
 
 import pytest
 
-from OPSI.Service.JsonRpc import JsonRpc
+from OPSI.Service.JsonRpc import JsonRpc, getDispatchTable
 
 from .helpers import mock
 
@@ -133,3 +133,63 @@ def testGettingMetainformation():
 	assert j.isStarted()
 	assert j.hasEnded()
 	assert j.getDuration() != None
+
+
+class KeywordInstance(object):
+	def keywordMethod(self, first, **kwargs):
+		return [first, kwargs]
+
+
+KEYWORD_INTERFACE = [
+	{
+		"name": "keywordMethod",
+		"args": ["self", "first"],
+		"varargs": None,
+		"keywords": "kwargs",
+	}
+]
+
+
+def testPassingKeywordArguments():
+	j = JsonRpc(
+		instance=KeywordInstance(),
+		interface=KEYWORD_INTERFACE,
+		rpc={"id": 1, "method": "keywordMethod", "params": ["a", {"b": 1}]}
+	)
+	j.execute()
+
+	assert not j.exception
+	assert j.result == ["a", {"b": 1}]
+
+
+def testDispatchTableIsReusedForSameInstanceAndInterface():
+	instance = KeywordInstance()
+	table = getDispatchTable(instance, KEYWORD_INTERFACE)
+
+	assert table is getDispatchTable(instance, KEYWORD_INTERFACE)
+	assert table is not getDispatchTable(KeywordInstance(), KEYWORD_INTERFACE)
+	assert table is not getDispatchTable(instance, list(KEYWORD_INTERFACE))
+
+
+def testDispatchTableRejectsMethodsNotInInterface():
+	table = getDispatchTable(KeywordInstance(), [])
+
+	with pytest.raises(Exception) as excinfo:
+		table.getMethod("keywordMethod")
+
+	assert "Method 'keywordMethod' is not valid" in str(excinfo.value)
+
+
+def testExecutingWithGivenDispatchTable():
+	instance = KeywordInstance()
+	table = getDispatchTable(instance, KEYWORD_INTERFACE)
+	j = JsonRpc(
+		instance=instance,
+		interface=None,
+		rpc={"id": 1, "method": "keywordMethod", "params": ["a"]},
+		dispatchTable=table
+	)
+	j.execute()
+
+	assert not j.exception
+	assert j.result == ["a", {}]
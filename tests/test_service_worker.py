@@ -34,9 +34,12 @@ try:
 except ImportError:
 	from io import StringIO
 
+from twisted.internet import defer
+
 from .helpers import unittest, mock
 
 from OPSI.Service.Worker import WorkerOpsi, WorkerOpsiJsonRpc
+from OPSI.Util import toJson
 
 
 class FakeHeader(object):
@@ -147,6 +150,54 @@ class WorkerOpsiJsonRpcTestCase(unittest.TestCase):
 		self.assertFalse(result.headers.hasHeader('content-encoding'))
 		self.assertEquals('["Eins", "Zwei", "Drei"]', str(result.stream.read()))
 
+	def testLargeResultIsStreamed(self):
+		"""
+		Large results are returned in multiple chunks.
+		"""
+		testHeader = FakeHeader({"Accept-Encoding": "gzip"})
+		worker = WorkerOpsiJsonRpc(service=None, request=FakeRequest(testHeader), resource=None)
+		values = [u"value %d" % i for i in range(200000)]
+		worker._rpcs = [FakeRPC(values)]
+
+		result = worker._generateResponse(None)
+		self.assertEquals(['gzip'], result.headers.getRawHeaders('content-encoding'))
+
+		chunks = []
+		while True:
+			chunk = result.stream.read()
+			if chunk is None:
+				break
+			chunks.append(chunk)
+
+		self.assertTrue(len(chunks) > 1)
+
+		with closing(gzip.GzipFile(fileobj=StringIO(''.join(chunks)), mode="r")) as gzipfile:
+			data = gzipfile.read()
+
+		self.assertEquals(toJson(values), data)
+
+	def testErrorWhileEncodingResultReturnsError(self):
+		"""
+		Errors while encoding the result must result in an error response.
+		"""
+		class Unserializable(object):
+			def serialize(self):
+				raise ValueError(u"Can not serialize")
+
+		worker = WorkerOpsiJsonRpc(service=None, request=FakeRequest(), resource=None)
+		worker._rpcs = [FakeRPC([Unserializable()])]
+
+		self.assertRaises(ValueError, worker._generateResponse, None)
+
+		results = []
+		deferred = defer.succeed(None)
+		deferred.addCallback(worker._generateResponse)
+		deferred.addErrback(worker._errback)
+		deferred.addCallback(results.append)
+
+		self.assertEquals(500, results[0].code)
+		self.assertTrue('Can not serialize' in str(results[0].stream.read()))
+
 
 class CompressedResultsWithWorkerOpsiJsonRpcTestCase(unittest.TestCase):
 	def setUp(self):
@@ -35,15 +35,16 @@ import sys
 from collections import defaultdict
 from contextlib import contextmanager
 
-from OPSI.Util import (chunk, compareVersions, findFiles, flattenSequence,
-    formatFileSize, fromJson, generateOpsiHostKey, getfqdn, getGlobalConfig,
-    ipAddressInNetwork, isRegularExpressionPattern, librsyncDeltaFile,
+from OPSI.Util import (ChecksumCache, chunk, compareVersions, compileVersionCondition,
+    filterVersions, findFiles, flattenSequence, formatFileSize, fromJson,
+    generateOpsiHostKey, getfqdn, getGlobalConfig, ipAddressInNetwork,
+    iterFiles, iterJson, isRegularExpressionPattern, librsyncDeltaFile,
     librsyncSignature, librsyncPatchFile, md5sum, objectToBeautifiedText,
-    objectToHtml, randomString, removeUnit, toJson)
+    objectToHtml, parseVersion, randomString, removeUnit, toJson)
 from OPSI.Object import LocalbootProduct, OpsiClient
 
-from .helpers import (fakeGlobalConf, patchAddress, patchEnvironmentVariables,
-    unittest, workInTemporaryDirectory)
+from .helpers import (fakeGlobalConf, mock, patchAddress,
+    patchEnvironmentVariables, unittest, workInTemporaryDirectory)
 
 
 class IPAddressInNetwork(unittest.TestCase):
@@ -374,6 +375,147 @@ class UtilTestCase(unittest.TestCase):
         self.assertEqual('5f345ca76574c528903c1022b05acb4c', md5sum(testFile))
 
 
+class ChecksumCacheTestCase(unittest.TestCase):
+    def createFile(self, path, content):
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def testUnchangedFileIsNotReadAgain(self):
+        with workInTemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, 'file')
+            self.createFile(path, 'content')
+
+            cache = ChecksumCache()
+            checksum = cache.md5sum(path)
+            self.assertEqual(md5sum(path), checksum)
+
+            with mock.patch('OPSI.Util.md5sum') as md5sumFunction:
+                self.assertEqual(checksum, cache.md5sum(path))
+                self.assertFalse(md5sumFunction.called)
+
+    def testChangedFileIsReadAgain(self):
+        with workInTemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, 'file')
+            self.createFile(path, 'content')
+
+            cache = ChecksumCache()
+            cache.md5sum(path)
+
+            self.createFile(path, 'changed content')
+            self.assertEqual(None, cache.get(path))
+            self.assertEqual(md5sum(path), cache.md5sum(path))
+
+    def testChecksumsAreKeptInFile(self):
+        with workInTemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, 'file')
+            cacheFile = os.path.join(tempDir, 'checksums')
+            self.createFile(path, 'content')
+
+            cache = ChecksumCache(cacheFile)
+            checksum = cache.md5sum(path)
+            cache.save()
+
+            self.assertEqual(checksum, ChecksumCache(cacheFile).get(path))
+
+            os.remove(path)
+            self.createFile(path, 'other content')
+            self.assertEqual(None, ChecksumCache(cacheFile).get(path))
+
+    def testChecksumsRelativeToBaseDirSurviveRecreation(self):
+        with workInTemporaryDirectory() as tempDir:
+            productDir = os.path.join(tempDir, 'product')
+            os.mkdir(productDir)
+            path = os.path.join(productDir, 'file')
+            cacheFile = os.path.join(tempDir, 'checksums')
+            self.createFile(path, 'content')
+            mtime = 1500000000
+            os.utime(path, (mtime, mtime))
+
+            cache = ChecksumCache(cacheFile, baseDir=productDir)
+            checksum = cache.md5sum(path)
+            cache.save()
+
+            shutil.rmtree(productDir)
+            os.mkdir(productDir)
+            self.createFile(path, 'content')
+            os.utime(path, (mtime, mtime))
+
+            cache = ChecksumCache(cacheFile, baseDir=productDir)
+            with mock.patch('OPSI.Util.md5sum') as md5sumFunction:
+                self.assertEqual(checksum, cache.md5sum(path))
+                self.assertFalse(md5sumFunction.called)
+
+            os.utime(path, (mtime + 10, mtime + 10))
+            self.assertEqual(None, cache.get(path))
+
+    def testChecksumsRelativeToBaseDirDependOnOrigin(self):
+        with workInTemporaryDirectory() as tempDir:
+            productDir = os.path.join(tempDir, 'product')
+            os.mkdir(productDir)
+            path = os.path.join(productDir, 'file')
+            cacheFile = os.path.join(tempDir, 'checksums')
+            self.createFile(path, 'content')
+            os.utime(path, (1500000000, 1500000000))
+
+            cache = ChecksumCache(cacheFile, baseDir=productDir, origin='package1')
+            cache.md5sum(path)
+            cache.save()
+
+            self.createFile(path, 'changed')
+            os.utime(path, (1500000000, 1500000000))
+
+            cache = ChecksumCache(cacheFile, baseDir=productDir, origin='package2')
+            self.assertEqual(None, cache.get(path))
+            self.assertEqual(md5sum(path), cache.md5sum(path))
+
+    def testDamagedCacheFileIsIgnored(self):
+        with workInTemporaryDirectory() as tempDir:
+            cacheFile = os.path.join(tempDir, 'checksums')
+            self.createFile(cacheFile, '{"broken')
+
+            cache = ChecksumCache(cacheFile)
+            self.assertEqual(None, cache.get(cacheFile))
+
+    def testMd5sumsOfSeveralFiles(self):
+        with workInTemporaryDirectory() as tempDir:
+            paths = [os.path.join(tempDir, 'file%d' % number) for number in range(3)]
+            for number, path in enumerate(paths):
+                self.createFile(path, 'content %d' % number)
+            missingPath = os.path.join(tempDir, 'missing')
+
+            cache = ChecksumCache()
+            checksums = cache.md5sums(paths + [missingPath])
+
+            self.assertEqual(dict((path, md5sum(path)) for path in paths), checksums)
+            for path in paths:
+                self.assertEqual(checksums[path], cache.get(path))
+
+    def testMd5sumsCalculatedByProcesses(self):
+        with workInTemporaryDirectory() as tempDir:
+            paths = [os.path.join(tempDir, 'file%d' % number) for number in range(4)]
+            for number, path in enumerate(paths):
+                self.createFile(path, 'content %d' % number)
+
+            with mock.patch('OPSI.Util._PARALLEL_HASHING_MIN_SIZE', 0):
+                checksums = ChecksumCache().md5sums(paths, processes=2)
+
+            self.assertEqual(dict((path, md5sum(path)) for path in paths), checksums)
+
+    def testRetainForgetsOtherFiles(self):
+        with workInTemporaryDirectory() as tempDir:
+            keptPath = os.path.join(tempDir, 'kept')
+            removedPath = os.path.join(tempDir, 'removed')
+            self.createFile(keptPath, 'content')
+            self.createFile(removedPath, 'content')
+
+            cache = ChecksumCache()
+            cache.md5sums([keptPath, removedPath])
+            cache.retain([keptPath])
+
+            self.assertNotEqual(None, cache.get(keptPath))
+            self.assertEqual(None, cache.get(removedPath))
+
+
 class ChunkingTestCase(unittest.TestCase):
     def testChunkingList(self):
         base = list(range(10))
@@ -582,6 +724,49 @@ class CompareVersionsTestCase(unittest.TestCase):
         self.assertTrue(compareVersions('1-2', '<', '1-3'))
         self.assertTrue(compareVersions('1-2.0', '<', '1-2.1'))
 
+    def testComparingMissingPartsAsZero(self):
+        self.assertTrue(compareVersions('1', '==', '1.0.0'))
+        self.assertTrue(compareVersions('1.0', '==', '1-0'))
+        self.assertTrue(compareVersions('1.0', '<', '1.0-1'))
+        self.assertTrue(compareVersions('01.2', '==', '1.02'))
+
+    def testComparingNumbersWithLetters(self):
+        self.assertTrue(compareVersions('1.0', '<', '1.0a'))
+        self.assertTrue(compareVersions('1.0a', '<', '1.0b'))
+        self.assertTrue(compareVersions('1.9', '<', '1.10'))
+        self.assertTrue(compareVersions('1.a', '>', '1.9'))
+        # A part ending early is greater than one going on with a number
+        self.assertTrue(compareVersions('1a', '>', '1a2'))
+
+    def testComparingWithoutStrings(self):
+        self.assertTrue(compareVersions(2, '>', 1))
+        self.assertTrue(compareVersions(1.5, '<', '1.10'))
+
+    def testParsedVersionsAreReused(self):
+        self.assertTrue(parseVersion(u'1.0-2') is parseVersion('1.0-2'))
+        self.assertEqual(parseVersion('1.0-2~beta'), parseVersion('1.0-2'))
+        self.assertTrue(parseVersion('1.0-2') < parseVersion('1.0-10'))
+
+    def testParsingInvalidVersionFails(self):
+        self.assertRaises(Exception, parseVersion, 'abc-1.2.3-4')
+        self.assertRaises(Exception, parseVersion, '')
+
+    def testCompilingCondition(self):
+        isOlder = compileVersionCondition('<', '4.0.7-1')
+
+        self.assertTrue(isOlder('4.0.6-12'))
+        self.assertFalse(isOlder('4.0.7-1'))
+        self.assertFalse(isOlder('4.0.7.1-1'))
+        self.assertRaises(Exception, compileVersionCondition, '<>', '1.0')
+
+    def testFilteringVersions(self):
+        versions = ['1.0-1', '1.0-2', '2.0-1', '0.9-5']
+
+        self.assertEqual(['1.0-2', '2.0-1'], filterVersions(versions, '>', '1.0-1'))
+        self.assertEqual(['1.0-1', '1.0-2', '2.0-1', '0.9-5'], filterVersions(versions, '>=', '0'))
+        self.assertEqual(['1.0-1'], filterVersions(versions, None, '1.0-1'))
+        self.assertEqual([], filterVersions([], '==', '1.0'))
+
 
 class GetGlobalConfigTestCase(unittest.TestCase):
     def setUp(self):
@@ -869,6 +1054,43 @@ class JSONSerialisiationTestCase(unittest.TestCase):
         self.assertEquals('[1, 2, 3, 4]', toJson(values))
 
 
+class IteratingJSONTestCase(unittest.TestCase):
+    def testResultIsSameAsWithToJson(self):
+        values = [
+            None,
+            u'M\xf6t\xf6rhe\xe4d',
+            [1, 2.5, True, None, (3, 4), set(['a'])],
+            {u'a': [{'b': {}}, []], 1: 'one', None: 'none', True: 'true'},
+            {'result': [OpsiClient(id='client%d.test.invalid' % i) for i in range(3)]},
+        ]
+
+        for value in values:
+            self.assertEquals(toJson(value), u''.join(iterJson(value)))
+            self.assertEquals(toJson(value, ensureAscii=True), u''.join(iterJson(value, ensureAscii=True)))
+
+    def testEncodingGenerator(self):
+        def gen():
+            yield 1
+            yield u"a"
+
+        self.assertEquals(u'[1, "a"]', u''.join(iterJson(gen())))
+
+    def testChunksAreLimitedInSize(self):
+        value = [u'x' * 10] * 100
+        chunks = list(iterJson(value, chunkSize=100))
+
+        self.assertTrue(len(chunks) > 1)
+        self.assertTrue(all(len(chunk) < 120 for chunk in chunks))
+        self.assertEquals(toJson(value), u''.join(chunks))
+
+    def testUnserialisableThingsFail(self):
+        class Foo(object):
+            pass
+
+        self.assertRaises(TypeError, list, iterJson([Foo()]))
+        self.assertRaises(TypeError, list, iterJson({(1, 2): 'a'}))
+
+
 class FindFilesTestCase(unittest.TestCase):
 
     def testEmptyDirectory(self):
@@ -883,6 +1105,59 @@ class FindFilesTestCase(unittest.TestCase):
             for folder in expectedFolders:
                 assert folder in folders
 
+    def testDirectoryIsReturnedBeforeItsContent(self):
+        with preparedDemoFolders() as demoFolder:
+            files = findFiles(demoFolder)
+            self.assertTrue(
+                files.index('top1') < files.index(os.path.join('top1', 'sub11'))
+            )
+
+    def testIteratingFilesIsLazy(self):
+        with preparedDemoFolders() as demoFolder:
+            files = iterFiles(demoFolder)
+            self.assertFalse(isinstance(files, list))
+            self.assertEquals(sorted(findFiles(demoFolder)), sorted(files))
+
+    def testFilters(self):
+        with preparedDemoFolders() as demoFolder:
+            for filename in ('file.txt', os.path.join('top1', 'sub11', 'file.txt'), 'file.txt~'):
+                with open(os.path.join(demoFolder, filename), 'w'):
+                    pass
+
+            files = findFiles(
+                demoFolder, prefix=demoFolder,
+                excludeDir=re.compile('^top2$'), excludeFile=u'~$'
+            )
+            self.assertEquals(
+                sorted(os.path.join(demoFolder, filename) for filename in (
+                    'file.txt', 'top1', os.path.join('top1', 'sub11'),
+                    os.path.join('top1', 'sub11', 'file.txt')
+                )),
+                sorted(files)
+            )
+
+            self.assertEquals(
+                ['file.txt', os.path.join('top1', 'sub11', 'file.txt')],
+                sorted(findFiles(demoFolder, includeFile=r'\.txt$', returnDirs=False))
+            )
+
+    def testLinks(self):
+        with preparedDemoFolders() as demoFolder:
+            os.symlink(os.path.join(demoFolder, 'top1'), os.path.join(demoFolder, 'link'))
+
+            self.assertTrue('link' in findFiles(demoFolder))
+            self.assertFalse(os.path.join('link', 'sub11') in findFiles(demoFolder))
+            self.assertFalse('link' in findFiles(demoFolder, returnLinks=False))
+            self.assertTrue(os.path.join('link', 'sub11') in findFiles(demoFolder, followLinks=True))
+
+    def testFindingFilesWithoutScandir(self):
+        with preparedDemoFolders() as demoFolder:
+            os.symlink(os.path.join(demoFolder, 'top1'), os.path.join(demoFolder, 'link'))
+            expectedFiles = sorted(findFiles(demoFolder, followLinks=True))
+
+            with mock.patch('OPSI.Util.scandir', None):
+                self.assertEquals(expectedFiles, sorted(findFiles(demoFolder, followLinks=True)))
+
 
 @contextmanager
 def preparedDemoFolders():
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+#-*- coding: utf-8 -*-
+
+# This file is part of python-opsi.
+# Copyright (C) 2016 uib GmbH <info@uib.de>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Testing OPSI.Util.Collections.
+
+:license: GNU Affero General Public License version 3
+"""
+
+from __future__ import absolute_import
+
+import unittest
+
+from OPSI.Util.Collections import LRUCache
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    def testGettingAndSettingValues(self):
+        cache = LRUCache(10)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache['a'] = 3
+
+        self.assertEqual(3, cache['a'])
+        self.assertEqual(2, cache.get('b'))
+        self.assertEqual(None, cache.get('c'))
+        self.assertEqual('x', cache.get('c', 'x'))
+        self.assertRaises(KeyError, cache.__getitem__, 'c')
+        self.assertEqual(2, len(cache))
+        self.assertTrue('a' in cache)
+        self.assertFalse('c' in cache)
+
+    def testLeastRecentlyUsedEntryIsRemoved(self):
+        cache = LRUCache(3)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache['c'] = 3
+        cache['a']
+        cache['d'] = 4
+
+        self.assertEqual(3, len(cache))
+        self.assertFalse('b' in cache)
+        for key in ('a', 'c', 'd'):
+            self.assertTrue(key in cache)
+
+        cache['c'] = 30
+        cache['e'] = 5
+        self.assertFalse('a' in cache)
+        self.assertEqual(30, cache['c'])
+
+    def testClearing(self):
+        cache = LRUCache(2)
+        cache['a'] = 1
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+        self.assertFalse('a' in cache)
+
+        cache['b'] = 2
+        self.assertEqual(2, cache['b'])
+
+    def testSizeMustBePositive(self):
+        self.assertRaises(ValueError, LRUCache, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,9 +24,15 @@ Testing the work with archives.
 """
 
 import mock
+import os
+import tarfile
 import unittest
+from contextlib import closing
 
-from OPSI.Util.File.Archive import Archive, PigzMixin, TarArchive
+from OPSI.Util.File.Archive import (Archive, ArchiveStreamWriter, PigzMixin,
+    TarArchive, getArchiveMembers)
+
+from .helpers import workInTemporaryDirectory
 
 
 class ArchiveFactoryTestCase(unittest.TestCase):
@@ -74,5 +80,112 @@ class PigzMixinAppliedTestCase(unittest.TestCase):
             self.assertEqual(False, self.test_object.is_pigz_available())
 
 
+class ArchiveStreamWriterTestCase(unittest.TestCase):
+    def writeArchive(self, filename, format):
+        writer = ArchiveStreamWriter(filename, format=format)
+        writer.addMember(u'first', lambda f: f.write('first content'))
+
+        otherFile = filename + '.other'
+        with open(otherFile, 'wb') as f:
+            f.write('x' * 1000)
+        writer.addFile(u'second', otherFile)
+        writer.close()
+
+    def readCpioMembers(self, filename):
+        members = []
+        with open(filename, 'rb') as f:
+            data = f.read()
+
+        self.assertEqual(0, len(data) % 512)
+        offset = 0
+        while True:
+            self.assertEqual('070701', data[offset:offset + 6])
+            fields = [int(data[offset + 6 + i * 8:offset + 14 + i * 8], 16) for i in range(13)]
+            size, nameSize = fields[6], fields[11]
+            nameOffset = offset + 110
+            name = data[nameOffset:nameOffset + nameSize - 1]
+            dataOffset = nameOffset + nameSize + (-(110 + nameSize) % 4)
+            if name == 'TRAILER!!!':
+                return members
+            members.append((name, data[dataOffset:dataOffset + size]))
+            offset = dataOffset + size + (-size % 4)
+
+    def testWritingTarArchive(self):
+        with workInTemporaryDirectory() as tempDir:
+            filename = os.path.join(tempDir, 'archive.tar')
+            self.writeArchive(filename, 'tar')
+
+            self.assertEqual(0, os.path.getsize(filename) % tarfile.RECORDSIZE)
+            with tarfile.open(filename) as archive:
+                self.assertEqual(['first', 'second'], archive.getnames())
+                self.assertEqual('first content', archive.extractfile('first').read())
+                self.assertEqual('x' * 1000, archive.extractfile('second').read())
+
+    def testWritingCpioArchive(self):
+        with workInTemporaryDirectory() as tempDir:
+            filename = os.path.join(tempDir, 'archive.cpio')
+            self.writeArchive(filename, 'cpio')
+
+            self.assertEqual(
+                [('first', 'first content'), ('second', 'x' * 1000)],
+                self.readCpioMembers(filename)
+            )
+
+    def testUnknownFormatRaisesException(self):
+        self.assertRaises(Exception, ArchiveStreamWriter, 'archive', format='zip')
+
+
+class GettingArchiveMembersTestCase(unittest.TestCase):
+    def assertMembers(self, filename, expectedMembers):
+        members = getArchiveMembers(filename)
+        self.assertEqual([name for (name, _) in expectedMembers], [member.name for member in members])
+
+        for member, (_, content) in zip(members, expectedMembers):
+            memberFile = member.open()
+            try:
+                self.assertEqual(content, memberFile.read())
+            finally:
+                memberFile.close()
+
+    def testGettingMembers(self):
+        for format in ('cpio', 'tar'):
+            with workInTemporaryDirectory() as tempDir:
+                filename = os.path.join(tempDir, 'archive')
+                writer = ArchiveStreamWriter(filename, format=format)
+                writer.addMember(u'CLIENT_DATA.cpio.gz', lambda f: f.write('client data'))
+                writer.addMember(u'OPSI.cpio.gz', lambda f: f.write('opsi'))
+                writer.close()
+
+                self.assertMembers(filename, [
+                    (u'CLIENT_DATA.cpio.gz', 'client data'),
+                    (u'OPSI.cpio.gz', 'opsi'),
+                ])
+
+    def testGettingMembersOfOdcCpioArchive(self):
+        def odcEntry(name, content, mode=0o100644):
+            return (
+                '070707' + '%06o' * 7 % (0, 1, mode, 0, 0, 1, 0)
+                + '%011o%06o%011o' % (0, len(name) + 1, len(content))
+                + name + '\0' + content
+            )
+
+        with workInTemporaryDirectory() as tempDir:
+            filename = os.path.join(tempDir, 'archive.cpio')
+            with open(filename, 'wb') as f:
+                f.write(odcEntry('dir', '', mode=0o40755))
+                f.write(odcEntry('dir/file', 'content'))
+                f.write(odcEntry('TRAILER!!!', '', mode=0))
+
+            self.assertMembers(filename, [(u'dir/file', 'content')])
+
+    def testCompressedArchiveIsNotSupported(self):
+        with workInTemporaryDirectory() as tempDir:
+            filename = os.path.join(tempDir, 'archive.tar.gz')
+            with closing(tarfile.open(filename, 'w:gz')):
+                pass
+
+            self.assertRaises(ValueError, getArchiveMembers, filename)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -26,11 +26,14 @@ Testing the work with the DHCPD configuration files.
 from __future__ import absolute_import
 
 import os
+import shutil
+import tempfile
 import unittest
 
+from OPSI.Types import BackendBadValueError
 from OPSI.Util.File import DHCPDConfFile
 
-from .helpers import createTemporaryTestfile
+from .helpers import createTemporaryTestfile, mock
 
 
 class DHCPDConfFileTestCase(unittest.TestCase):
@@ -45,5 +48,81 @@ class DHCPDConfFileTestCase(unittest.TestCase):
             confFile.parse()
 
 
+class DHCPDConfFileInMemoryTestCase(unittest.TestCase):
+    def setUp(self):
+        testExample = os.path.join(
+            os.path.dirname(__file__), 'testdata',
+            'util', 'dhcpd', 'dhcpd_1.conf'
+        )
+        self.tempDir = tempfile.mkdtemp()
+        shutil.copy(testExample, self.tempDir)
+        self.fileName = os.path.join(self.tempDir, 'dhcpd_1.conf')
+        self.confFile = DHCPDConfFile(self.fileName)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def testUnchangedFileIsNotParsedAgain(self):
+        self.assertTrue(self.confFile.parseIfChanged())
+
+        with mock.patch.object(self.confFile, 'readlines', wraps=self.confFile.readlines) as readlines:
+            self.assertFalse(self.confFile.parseIfChanged())
+            self.confFile.addHost('client1', '00:01:02:03:04:05', '192.168.20.82', '192.168.20.82')
+            self.confFile.generate()
+            self.assertFalse(self.confFile.parseIfChanged())
+
+        self.assertFalse(readlines.called)
+
+    def testFileChangedOnDiskIsParsedAgain(self):
+        self.confFile.parseIfChanged()
+
+        with open(self.fileName, 'a') as f:
+            f.write('host client2 {\n\thardware ethernet 00:01:02:03:04:06;\n\tfixed-address 192.168.20.83;\n}\n')
+
+        self.assertTrue(self.confFile.parseIfChanged())
+        self.assertEqual('192.168.20.83', self.confFile.getHost('client2')['fixed-address'])
+
+    def testGeneratingKeepsParsedBlocks(self):
+        self.confFile.parse()
+        self.confFile.generate()
+
+        self.assertEqual('192.168.20.81', self.confFile.getHost('bh-win7')['fixed-address'])
+
+        self.confFile.addHost('client1', '00:01:02:03:04:05', '192.168.20.82', '192.168.20.82')
+        self.confFile.generate()
+
+        confFile = DHCPDConfFile(self.fileName)
+        confFile.parse()
+        for hostname in ('bh-win7', 'client1'):
+            self.assertEqual(
+                self.confFile.getHost(hostname),
+                confFile.getHost(hostname)
+            )
+
+        subnet = confFile.getGlobalBlock().getBlocks('subnet')[0]
+        group = subnet.getBlocks('group')[0]
+        self.assertEqual(
+            ['bh-win7', 'client1'],
+            [block.settings[1] for block in group.getBlocks('host')]
+        )
+
+    def testAddressesOfDeletedHostCanBeReused(self):
+        self.confFile.parse()
+        self.assertRaises(
+            BackendBadValueError,
+            self.confFile.addHost,
+            'client1', '52:54:00:29:23:16', '192.168.20.82', '192.168.20.82'
+        )
+
+        self.confFile.deleteHost('bh-win7')
+        self.assertEqual(None, self.confFile.getHost('bh-win7'))
+
+        self.confFile.addHost('client1', '52:54:00:29:23:16', '192.168.20.81', '192.168.20.81')
+        self.assertEqual(
+            'ethernet 52:54:00:29:23:16',
+            self.confFile.getHost('client1')['hardware']
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
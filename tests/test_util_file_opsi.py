@@ -27,7 +27,11 @@ from __future__ import absolute_import
 import os
 import unittest
 
-from OPSI.Util.File.Opsi import BackendDispatchConfigFile, OpsiConfFile, PackageControlFile
+from OPSI.Util import ChecksumCache, md5sum
+from OPSI.Util.File.Opsi import (BackendDispatchConfigFile, OpsiConfFile,
+	PackageContentFile, PackageControlFile)
+
+from .helpers import mock, workInTemporaryDirectory
 
 
 class BackendDispatchConfigFileTestCase(unittest.TestCase):
@@ -147,3 +151,61 @@ class OpsiControlFileTestCase(unittest.TestCase):
 			u'Startet die Druckerwarteschlange auf dem Client neu / oder überhaupt.',
 			product.description
 		)
+
+
+class PackageContentFileTestCase(unittest.TestCase):
+
+	def createProduct(self, productDir):
+		os.mkdir(os.path.join(productDir, 'dir'))
+		for filename in ('setup.opsiscript', os.path.join('dir', 'data.bin')):
+			with open(os.path.join(productDir, filename), 'w') as f:
+				f.write(filename)
+		return ['dir', os.path.join('dir', 'data.bin'), 'setup.opsiscript']
+
+	def generate(self, productDir, clientDataFiles, checksumCache=None):
+		contentFile = PackageContentFile(os.path.join(productDir, 'product.files'))
+		contentFile.setProductClientDataDir(productDir)
+		contentFile.setClientDataFiles(clientDataFiles)
+		if checksumCache is not None:
+			contentFile.setChecksumCache(checksumCache)
+		contentFile.generate()
+
+		return PackageContentFile(contentFile.getFilename()).parse()
+
+	def testGeneratingFileInfo(self):
+		with workInTemporaryDirectory() as tempDir:
+			clientDataFiles = self.createProduct(tempDir)
+
+			fileInfo = self.generate(tempDir, clientDataFiles)
+
+			self.assertEquals(set(clientDataFiles), set(fileInfo.keys()))
+			self.assertEquals('d', fileInfo['dir']['type'])
+			self.assertEquals('f', fileInfo['setup.opsiscript']['type'])
+			self.assertEquals(len('setup.opsiscript'), fileInfo['setup.opsiscript']['size'])
+			self.assertEquals(
+				md5sum(os.path.join(tempDir, 'setup.opsiscript')),
+				fileInfo['setup.opsiscript']['md5sum']
+			)
+
+	def testUnchangedFilesAreNotReadAgain(self):
+		with workInTemporaryDirectory() as tempDir:
+			clientDataFiles = self.createProduct(tempDir)
+			checksumCache = ChecksumCache()
+			fileInfo = self.generate(tempDir, clientDataFiles, checksumCache)
+
+			with mock.patch('OPSI.Util.md5sum') as md5sumFunction:
+				self.assertEquals(fileInfo, self.generate(tempDir, clientDataFiles, checksumCache))
+				self.assertFalse(md5sumFunction.called)
+
+	def testChangedFilesAreReadAgain(self):
+		with workInTemporaryDirectory() as tempDir:
+			clientDataFiles = self.createProduct(tempDir)
+			checksumCache = ChecksumCache()
+			self.generate(tempDir, clientDataFiles, checksumCache)
+
+			path = os.path.join(tempDir, 'setup.opsiscript')
+			with open(path, 'w') as f:
+				f.write('changed')
+
+			fileInfo = self.generate(tempDir, clientDataFiles, checksumCache)
+			self.assertEquals(md5sum(path), fileInfo['setup.opsiscript']['md5sum'])
@@ -25,9 +25,12 @@ Testing functionality of OPSI.Util.HTTP
 
 import random
 import string
+import threading
+import time
 import unittest
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
 
-from OPSI.Util.HTTP import hybi10Decode, hybi10Encode
+from OPSI.Util.HTTP import HTTPConnectionPool, hybi10Decode, hybi10Encode
 
 
 class Hybi10EncodeTestCase(unittest.TestCase):
@@ -72,5 +75,121 @@ class Hybi10EncodeTestCase(unittest.TestCase):
         self.assertEquals('', hybi10Decode('    a    '))
 
 
+
+class EchoRequestHandler(BaseHTTPRequestHandler):
+    "Answers with the request body and keeps the connection alive."
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.__class__.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.getheader('content-length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ClosingRequestHandler(EchoRequestHandler):
+    """
+    Closes the connection after every request without telling the client
+    like a server would do after its keep-alive timeout.
+    """
+    connections = 0
+
+    def do_POST(self):
+        EchoRequestHandler.do_POST(self)
+        self.close_connection = True
+
+
+class DroppingRequestHandler(EchoRequestHandler):
+    """
+    Answers the first request of a connection and closes the connection
+    without an answer on the second one.
+    """
+    connections = 0
+    requests = 0
+
+    def setup(self):
+        EchoRequestHandler.setup(self)
+        self.requestsOnConnection = 0
+
+    def do_POST(self):
+        self.__class__.requests += 1
+        self.requestsOnConnection += 1
+        if self.requestsOnConnection == 1:
+            EchoRequestHandler.do_POST(self)
+        else:
+            self.rfile.read(int(self.headers.getheader('content-length', 0)))
+            self.close_connection = True
+
+
+class HTTPConnectionPoolKeepAliveTestCase(unittest.TestCase):
+    def setUp(self):
+        for handler in (EchoRequestHandler, ClosingRequestHandler, DroppingRequestHandler):
+            handler.connections = 0
+        DroppingRequestHandler.requests = 0
+
+    def startServer(self, handler):
+        server = HTTPServer(('127.0.0.1', 0), handler)
+        serverThread = threading.Thread(target=server.serve_forever)
+        serverThread.daemon = True
+        serverThread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        return HTTPConnectionPool(
+            '127.0.0.1', server.server_port,
+            retryTime=0, reuseConnection=True
+        )
+
+    def sendRequests(self, pool, count, interval=0):
+        for number in range(count):
+            if number:
+                time.sleep(interval)
+            response = pool.urlopen('POST', '/', body='request %d' % number, retry=False)
+            self.assertEquals(200, response.status)
+            self.assertEquals('request %d' % number, response.data)
+
+    def testConnectionIsReused(self):
+        pool = self.startServer(EchoRequestHandler)
+        self.sendRequests(pool, 3)
+
+        self.assertEquals(1, EchoRequestHandler.connections)
+
+    def testConnectionClosedByServerIsReplaced(self):
+        pool = self.startServer(ClosingRequestHandler)
+        self.sendRequests(pool, 3, interval=0.1)
+
+        # The closed connections are replaced before sending.
+        self.assertEquals(3, pool.num_requests)
+        self.assertEquals(3, ClosingRequestHandler.connections)
+
+    def testRequestIsNotSentAgainWithoutRetry(self):
+        pool = self.startServer(DroppingRequestHandler)
+        self.sendRequests(pool, 1)
+
+        self.assertRaises(
+            Exception,
+            pool.urlopen, 'POST', '/', body='request 1', retry=False
+        )
+        self.assertEquals(2, DroppingRequestHandler.requests)
+
+    def testRequestIsSentAgainWithRetry(self):
+        pool = self.startServer(DroppingRequestHandler)
+        self.sendRequests(pool, 1)
+
+        response = pool.urlopen('POST', '/', body='request 1', retry=True)
+        self.assertEquals('request 1', response.data)
+        self.assertEquals(3, DroppingRequestHandler.requests)
+        self.assertEquals(2, DroppingRequestHandler.connections)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -25,8 +25,8 @@ Testing functionality for compression in an HTTP context.
 
 import unittest
 
-from OPSI.Util.HTTP import deflateEncode, deflateDecode
-from OPSI.Util.HTTP import gzipEncode, gzipDecode
+from OPSI.Util.HTTP import deflateEncode, deflateDecode, deflateEncodeStream
+from OPSI.Util.HTTP import gzipEncode, gzipDecode, gzipEncodeStream
 
 
 class DeflateCompressionTestCase(unittest.TestCase):
@@ -90,3 +90,26 @@ class GzipCompressionTestCase(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
+
+
+class StreamCompressionTestCase(unittest.TestCase):
+    CHUNKS = ["Das ist ein Test und so. %d" % i for i in range(1000)]
+
+    def testDeflatingStream(self):
+        deflated = ''.join(deflateEncodeStream(self.CHUNKS))
+        self.assertEquals(''.join(self.CHUNKS), deflateDecode(deflated))
+
+    def testGzippingStream(self):
+        gzipped = ''.join(gzipEncodeStream(self.CHUNKS))
+        self.assertEquals(''.join(self.CHUNKS), gzipDecode(gzipped))
+
+    def testCompressedDataIsReturnedInChunks(self):
+        chunks = [str(i) for i in range(100000)]
+        compressed = list(deflateEncodeStream(chunks, chunkSize=1024))
+
+        self.assertTrue(len(compressed) > 1)
+        self.assertEquals(''.join(chunks), deflateDecode(''.join(compressed)))
+
+    def testEmptyStream(self):
+        self.assertEquals('', deflateDecode(''.join(deflateEncodeStream([]))))
+        self.assertEquals('', gzipDecode(''.join(gzipEncodeStream([]))))
@@ -28,10 +28,14 @@ from __future__ import absolute_import
 import mock
 import os
 import re
+import shutil
+import tarfile
 import tempfile
 import unittest
 
 import OPSI.Util.Product as Product
+from OPSI.Util import md5sum
+from OPSI.Util.File.Opsi import PackageContentFile
 
 from .helpers import cd, workInTemporaryDirectory
 
@@ -93,6 +97,213 @@ class ProductPackageFileTestCase(unittest.TestCase):
 	def testSettigUpWithNonExistingFileFails(self):
 		self.assertRaises(Exception, Product.ProductPackageFile, 'nonexisting.opsi')
 
+	def testExtractingArchivesDirectlyFromPackage(self):
+		with workInTemporaryDirectory() as tempDir:
+			sourceDir = os.path.join(tempDir, 'source')
+			ProductPackageSourceTestCase.createPackageSource(sourceDir)
+			packageSource = Product.ProductPackageSource(
+				sourceDir, tempDir=tempDir, format='tar', compression='gzip'
+			)
+			packageSource.pack()
+			packageSource.cleanup()
+
+			depotDir = os.path.join(tempDir, 'depot')
+			os.mkdir(depotDir)
+			ppf = Product.ProductPackageFile(packageSource.getPackageFile(), tempDir=tempDir)
+			ppf.setClientDataDir(depotDir)
+			try:
+				product = ppf.getMetaData().getProduct()
+				ppf.extractData()
+
+				self.assertEquals(['OPSI'], os.listdir(ppf.tmpUnpackDir))
+			finally:
+				ppf.cleanup()
+
+			for filename in ('setup.opsiscript', os.path.join('files', 'data.bin')):
+				with open(os.path.join(sourceDir, 'CLIENT_DATA', filename), 'rb') as f:
+					with open(os.path.join(depotDir, product.id, filename), 'rb') as extracted:
+						self.assertEquals(f.read(), extracted.read())
+
+	def testExtractingPackageWithDotSlashMemberNames(self):
+		with workInTemporaryDirectory() as tempDir:
+			sourceDir = os.path.join(tempDir, 'source')
+			ProductPackageSourceTestCase.createPackageSource(sourceDir)
+			packageSource = Product.ProductPackageSource(
+				sourceDir, tempDir=tempDir, format='tar', compression='gzip'
+			)
+			packageSource.pack()
+			packageSource.cleanup()
+
+			archivesDir = os.path.join(tempDir, 'archives')
+			with tarfile.open(packageSource.getPackageFile()) as package:
+				package.extractall(archivesDir)
+
+			packageFile = os.path.join(tempDir, 'dotslash.opsi')
+			with tarfile.open(packageFile, 'w') as package:
+				for name in ('CLIENT_DATA.tar.gz', 'OPSI.tar.gz'):
+					package.add(os.path.join(archivesDir, name), arcname='./' + name)
+
+			depotDir = os.path.join(tempDir, 'depot')
+			os.mkdir(depotDir)
+			ppf = Product.ProductPackageFile(packageFile, tempDir=tempDir)
+			ppf.setClientDataDir(depotDir)
+			try:
+				self.assertEquals(
+					set(['CLIENT_DATA.tar.gz', 'OPSI.tar.gz']),
+					set(ppf._getPackageMembers())
+				)
+				product = ppf.getMetaData().getProduct()
+				ppf.extractData()
+			finally:
+				ppf.cleanup()
+
+			for filename in ('setup.opsiscript', os.path.join('files', 'data.bin')):
+				with open(os.path.join(sourceDir, 'CLIENT_DATA', filename), 'rb') as f:
+					with open(os.path.join(depotDir, product.id, filename), 'rb') as extracted:
+						self.assertEquals(f.read(), extracted.read())
+
+	def testChecksumsAreKeptOutsideOfProductDir(self):
+		with workInTemporaryDirectory() as tempDir:
+			sourceDir = os.path.join(tempDir, 'source')
+			ProductPackageSourceTestCase.createPackageSource(sourceDir)
+			packageSource = Product.ProductPackageSource(
+				sourceDir, tempDir=tempDir, format='tar', compression='gzip'
+			)
+			packageSource.pack()
+			packageSource.cleanup()
+
+			depotDir = os.path.join(tempDir, 'depot')
+			os.mkdir(depotDir)
+			checksumCacheDir = os.path.join(tempDir, 'checksums')
+
+			def install():
+				ppf = Product.ProductPackageFile(
+					packageSource.getPackageFile(), tempDir=tempDir,
+					checksumCacheDir=checksumCacheDir
+				)
+				ppf.setClientDataDir(depotDir)
+				try:
+					product = ppf.getMetaData().getProduct()
+					ppf.deleteProductClientDataDir()
+					ppf.extractData()
+					ppf.createPackageContentFile()
+				finally:
+					ppf.cleanup()
+				return product
+
+			product = install()
+			self.assertEquals(
+				set(['files', 'setup.opsiscript', product.id + '.files']),
+				set(os.listdir(os.path.join(depotDir, product.id)))
+			)
+			self.assertEquals([product.id + '.json'], os.listdir(checksumCacheDir))
+
+			with mock.patch('OPSI.Util.md5sum') as md5sumFunction:
+				install()
+				self.assertFalse(md5sumFunction.called)
+
+	def testChecksumsOfRebuiltPackageAreCalculatedAgain(self):
+		with workInTemporaryDirectory() as tempDir:
+			sourceDir = os.path.join(tempDir, 'source')
+			ProductPackageSourceTestCase.createPackageSource(sourceDir)
+			scriptPath = os.path.join(sourceDir, 'CLIENT_DATA', 'setup.opsiscript')
+			depotDir = os.path.join(tempDir, 'depot')
+			os.mkdir(depotDir)
+			checksumCacheDir = os.path.join(tempDir, 'checksums')
+
+			def buildAndInstall(content):
+				with open(scriptPath, 'wb') as f:
+					f.write(content)
+				os.utime(scriptPath, (1500000000, 1500000000))
+
+				packageSource = Product.ProductPackageSource(
+					sourceDir, tempDir=tempDir, format='tar', compression='gzip'
+				)
+				if os.path.exists(packageSource.getPackageFile()):
+					os.remove(packageSource.getPackageFile())
+				packageSource.pack()
+				packageSource.cleanup()
+
+				ppf = Product.ProductPackageFile(
+					packageSource.getPackageFile(), tempDir=tempDir,
+					checksumCacheDir=checksumCacheDir
+				)
+				ppf.setClientDataDir(depotDir)
+				try:
+					product = ppf.getMetaData().getProduct()
+					ppf.deleteProductClientDataDir()
+					ppf.extractData()
+					ppf.createPackageContentFile()
+				finally:
+					ppf.cleanup()
+
+				productDir = os.path.join(depotDir, product.id)
+				fileInfo = PackageContentFile(os.path.join(productDir, product.id + '.files')).parse()
+				return fileInfo['setup.opsiscript']['md5sum']
+
+			buildAndInstall(b'a' * 4096)
+			checksum = buildAndInstall(b'b' * 4096)
+			self.assertEquals(md5sum(scriptPath), checksum)
+
+
+class ProductPackageSourceTestCase(unittest.TestCase):
+
+	CONTROL_FILE = os.path.join(os.path.dirname(__file__),
+		'testdata', 'util', 'file', 'opsi', 'control_with_german_umlauts')
+
+	@classmethod
+	def createPackageSource(cls, sourceDir):
+		os.makedirs(os.path.join(sourceDir, 'OPSI'))
+		shutil.copy(cls.CONTROL_FILE, os.path.join(sourceDir, 'OPSI', 'control'))
+
+		os.makedirs(os.path.join(sourceDir, 'CLIENT_DATA', 'files'))
+		for filename in ('setup.opsiscript', os.path.join('files', 'data.bin')):
+			with open(os.path.join(sourceDir, 'CLIENT_DATA', filename), 'wb') as f:
+				f.write(os.urandom(4096))
+
+	def testPackingIntoTarFormat(self):
+		with workInTemporaryDirectory() as tempDir:
+			sourceDir = os.path.join(tempDir, 'source')
+			self.createPackageSource(sourceDir)
+
+			packageSource = Product.ProductPackageSource(
+				sourceDir, tempDir=tempDir, format='tar', compression='gzip'
+			)
+			try:
+				packageSource.pack()
+			finally:
+				packageSource.cleanup()
+
+			with tarfile.open(packageSource.getPackageFile()) as package:
+				self.assertEquals(
+					['CLIENT_DATA.tar.gz', 'OPSI.tar.gz'],
+					package.getnames()
+				)
+
+				clientData = tarfile.open(fileobj=package.extractfile('CLIENT_DATA.tar.gz'))
+				self.assertEquals(
+					set(['files', 'files/data.bin', 'setup.opsiscript']),
+					set(clientData.getnames())
+				)
+				with open(os.path.join(sourceDir, 'CLIENT_DATA', 'setup.opsiscript'), 'rb') as f:
+					self.assertEquals(f.read(), clientData.extractfile('setup.opsiscript').read())
+
+				opsiData = tarfile.open(fileobj=package.extractfile('OPSI.tar.gz'))
+				self.assertEquals(['control'], opsiData.getnames())
+
+	def testPackageFileIsRemovedOnFailure(self):
+		with workInTemporaryDirectory() as tempDir:
+			sourceDir = os.path.join(tempDir, 'source')
+			self.createPackageSource(sourceDir)
+
+			packageSource = Product.ProductPackageSource(
+				sourceDir, tempDir=tempDir, format='tar', compression='gzip'
+			)
+			with mock.patch('OPSI.Util.Product.Archive', side_effect=Exception(u'failed')):
+				self.assertRaises(Exception, packageSource.pack)
+
+			self.assertFalse(os.path.exists(packageSource.getPackageFile()))
+
 
 if __name__ == '__main__':
 	unittest.main()
@@ -29,9 +29,11 @@ import os
 import unittest
 
 from OPSI.Types import RepositoryError
-from OPSI.Util.Repository import FileRepository, getRepository
+from OPSI.Util import md5sum
+from OPSI.Util.Repository import (DepotToLocalDirectorySychronizer,
+    FileRepository, getRepository)
 
-from .helpers import workInTemporaryDirectory
+from .helpers import mock, workInTemporaryDirectory
 
 
 class GetRepositoryTestCase(unittest.TestCase):
@@ -68,5 +70,124 @@ class FileRepositoryTestCase(unittest.TestCase):
         self.assertRaises(RepositoryError, FileRepository, u'nofile://nada')
 
 
+class DepotToLocalDirectorySychronizerTestCase(unittest.TestCase):
+    PRODUCTS = {
+        u'product1': {
+            u'setup.ins': 'setup',
+            u'files/data.bin': 'data' * 1000,
+            u'files/more/readme.txt': 'readme',
+        },
+        u'product2': {
+            u'install.cmd': 'install',
+            u'big.bin': '0123456789' * 10000,
+        },
+    }
+
+    def createDepot(self, depotDir):
+        for productId, files in self.PRODUCTS.items():
+            productDir = os.path.join(depotDir, productId)
+            lines = []
+            for path in sorted(files):
+                filePath = os.path.join(productDir, path)
+                parentDir = os.path.dirname(filePath)
+                if not os.path.isdir(parentDir):
+                    os.makedirs(parentDir)
+                    lines.append("d '%s' 0 " % os.path.dirname(path))
+                with open(filePath, 'wb') as f:
+                    f.write(files[path])
+                lines.append("f '%s' %d %s" % (path, len(files[path]), md5sum(filePath)))
+
+            with open(os.path.join(productDir, productId + u'.files'), 'w') as f:
+                f.write('\n'.join(sorted(lines)))
+
+    def assertSynchronized(self, localDir):
+        for productId, files in self.PRODUCTS.items():
+            for path, content in files.items():
+                with open(os.path.join(localDir, productId, path), 'rb') as f:
+                    self.assertEquals(content, f.read())
+
+    def synchronize(self, depotDir, localDir, **kwargs):
+        repository = FileRepository(u'file://{0}'.format(depotDir))
+        DepotToLocalDirectorySychronizer(repository, localDir, **kwargs).synchronize()
+
+    def testSynchronizing(self):
+        with workInTemporaryDirectory() as tempDir:
+            depotDir = os.path.join(tempDir, 'depot')
+            localDir = os.path.join(tempDir, 'local')
+            self.createDepot(depotDir)
+
+            self.synchronize(depotDir, localDir)
+
+            self.assertSynchronized(localDir)
+
+    def testSynchronizingWithWorkers(self):
+        with workInTemporaryDirectory() as tempDir:
+            depotDir = os.path.join(tempDir, 'depot')
+            localDir = os.path.join(tempDir, 'local')
+            self.createDepot(depotDir)
+
+            self.synchronize(depotDir, localDir, workers=4)
+
+            self.assertSynchronized(localDir)
+
+    def testObsoleteFilesAreRemoved(self):
+        with workInTemporaryDirectory() as tempDir:
+            depotDir = os.path.join(tempDir, 'depot')
+            localDir = os.path.join(tempDir, 'local')
+            self.createDepot(depotDir)
+            obsoleteFile = os.path.join(localDir, 'product1', 'obsolete.txt')
+            os.makedirs(os.path.dirname(obsoleteFile))
+            with open(obsoleteFile, 'w') as f:
+                f.write('obsolete')
+
+            self.synchronize(depotDir, localDir, workers=2)
+
+            self.assertFalse(os.path.exists(obsoleteFile))
+            self.assertSynchronized(localDir)
+
+    def testPartialFileIsCompleted(self):
+        with workInTemporaryDirectory() as tempDir:
+            depotDir = os.path.join(tempDir, 'depot')
+            localDir = os.path.join(tempDir, 'local')
+            self.createDepot(depotDir)
+            partialFile = os.path.join(localDir, 'product2', 'big.bin')
+            os.makedirs(os.path.dirname(partialFile))
+            with open(partialFile, 'wb') as f:
+                f.write(self.PRODUCTS['product2']['big.bin'][:12345])
+
+            self.synchronize(depotDir, localDir, productIds=['product2'])
+
+            with open(partialFile, 'rb') as f:
+                self.assertEquals(self.PRODUCTS['product2']['big.bin'], f.read())
+
+    def testFailingProductRaisesError(self):
+        with workInTemporaryDirectory() as tempDir:
+            depotDir = os.path.join(tempDir, 'depot')
+            localDir = os.path.join(tempDir, 'local')
+            self.createDepot(depotDir)
+            with open(os.path.join(depotDir, 'product1', 'setup.ins'), 'wb') as f:
+                f.write('changed after creating the package content file')
+
+            self.assertRaises(Exception, self.synchronize, depotDir, localDir, workers=2)
+            self.assertFalse(os.path.exists(os.path.join(localDir, 'product1', 'product1.files')))
+            self.assertTrue(os.path.exists(os.path.join(localDir, 'product2', 'product2.files')))
+
+    def testUnchangedFilesAreNotHashedAgain(self):
+        with workInTemporaryDirectory() as tempDir:
+            depotDir = os.path.join(tempDir, 'depot')
+            localDir = os.path.join(tempDir, 'local')
+            checksumCacheFile = os.path.join(tempDir, 'checksums')
+            self.createDepot(depotDir)
+
+            self.synchronize(depotDir, localDir, checksumCacheFile=checksumCacheFile)
+            self.assertTrue(os.path.exists(checksumCacheFile))
+
+            with mock.patch('OPSI.Util.md5sum') as md5sumFunction:
+                self.synchronize(depotDir, localDir, checksumCacheFile=checksumCacheFile)
+                self.assertFalse(md5sumFunction.called)
+
+            self.assertSynchronized(localDir)
+
+
 if __name__ == '__main__':
     unittest.main()